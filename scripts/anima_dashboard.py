@@ -11,7 +11,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.resolve()
 sys.path.append(str(project_root))
 
-from src.anima_mcp.shared_memory import SharedMemoryClient  # noqa: E402
+from src.anima_mcp.shared_memory import SharedMemoryClient, SHM_BACKEND  # noqa: E402
 
 def draw_bar(stdscr, y, x, label, value, max_val=1.0, width=20, color_pair=1):
     """Draw a progress bar."""
@@ -39,8 +39,8 @@ def main(stdscr):
     curses.init_pair(5, curses.COLOR_CYAN, -1)    # Info
     
     # Initialize Shared Memory Client in READ mode
-    # Force file backend to match stable_creature.py configuration
-    client = SharedMemoryClient(mode="read", backend="file")
+    # Same backend stable_creature.py writes (ANIMA_SHM_BACKEND)
+    client = SharedMemoryClient(mode="read", backend=SHM_BACKEND)
     
     # Header logic
     title = " ANIMA SYSTEM DASHBOARD (SIMULATION) "
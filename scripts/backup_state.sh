@@ -14,11 +14,13 @@ mkdir -p "$DEST"
 FILES=(
     messages.json
     canvas.json
+    canvas_pixels.png
     knowledge.json
     preferences.json
     patterns.json
     self_model.json
     anima_history.json
+    anima_history.bin
     display_brightness.json
     metacognition_baselines.json
     trajectory_genesis.json
@@ -4,21 +4,32 @@ Sync anima.db between Mac backup and Pi (Lumen's body).
 
 The Pi is the source of truth. The Mac keeps a backup.
 
+By default only what the other side is missing is sent: new rows of the
+history tables plus any small state tables that changed (see
+anima_mcp.replication). --full copies the whole file with scp as before.
+
 Usage:
-    python3 scripts/sync_state.py pull   # Pi -> Mac (backup)
-    python3 scripts/sync_state.py push   # Mac -> Pi (restore)
+    python3 scripts/sync_state.py pull          # Pi -> Mac (backup)
+    python3 scripts/sync_state.py push          # Mac -> Pi (restore missing history rows)
+    python3 scripts/sync_state.py verify        # Compare history checksums
+    python3 scripts/sync_state.py pull --full   # Whole-file scp copy
 """
+import os
 import sys
 import argparse
+import json
 import subprocess
 import shutil
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
 # Pi connection — using explicit credentials
 REMOTE_HOST = "lumen.local"
 REMOTE_USER = "unitares-anima"
 REMOTE_DB = "~/.anima/anima.db"
+REMOTE_PYTHON = "~/anima-mcp/.venv/bin/python"
 
 # Mac backup location
 LOCAL_DIR = Path.home() / ".anima"
@@ -47,6 +58,64 @@ def _backup_local():
             old.unlink()
 
 
+def _transport():
+    from anima_mcp.replication import SshTransport
+    return SshTransport(f"{REMOTE_USER}@{REMOTE_HOST}", REMOTE_DB, python=REMOTE_PYTHON)
+
+
+def _print_applied(applied, transport):
+    for table, rows in sorted(applied.items()):
+        print(f"  {table}: {rows} rows")
+    kb = (transport.bytes_sent + transport.bytes_received) / 1024
+    print(f"  Transferred {kb:.1f} KB" if applied else "  Already up to date")
+
+
+def sync_pull_incremental():
+    """Pull only what the local backup is missing."""
+    from anima_mcp.replication import ReplicationError, pull
+    print(f"Pulling new state from Pi ({REMOTE_HOST})...")
+    LOCAL_DIR.mkdir(parents=True, exist_ok=True)
+    transport = _transport()
+    try:
+        applied = pull(LOCAL_DB, transport)
+    except (ReplicationError, subprocess.TimeoutExpired) as e:
+        print(f"  Pull failed: {e}")
+        sys.exit(1)
+    _print_applied(applied, transport)
+
+
+def sync_push_incremental():
+    """Push history rows the Pi is missing. Never replaces the Pi's live state tables."""
+    from anima_mcp.replication import ReplicationError, push
+    if not LOCAL_DB.exists():
+        print(f"No local database at {LOCAL_DB}")
+        sys.exit(1)
+    print(f"Pushing missing history rows to Pi ({REMOTE_HOST})...")
+    transport = _transport()
+    try:
+        applied = push(LOCAL_DB, transport)
+    except (ReplicationError, subprocess.TimeoutExpired) as e:
+        print(f"  Push failed: {e}")
+        sys.exit(1)
+    _print_applied(applied, transport)
+
+
+def sync_verify():
+    """Compare per-table checksums of the history both sides hold."""
+    from anima_mcp.replication import ReplicationError, verify
+    if not LOCAL_DB.exists():
+        print(f"No local database at {LOCAL_DB}")
+        sys.exit(1)
+    try:
+        report = verify(LOCAL_DB, _transport())
+    except (ReplicationError, subprocess.TimeoutExpired) as e:
+        print(f"  Verify failed: {e}")
+        sys.exit(1)
+    print(json.dumps(report, indent=2))
+    if not all(r["match"] for r in report.values()):
+        sys.exit(2)
+
+
 def sync_pull():
     """Pull Pi's database to Mac (backup). Pi is source of truth."""
     print(f"Pulling Lumen's state from Pi ({REMOTE_HOST})...")
@@ -88,15 +157,28 @@ def main():
     )
     parser.add_argument(
         "direction",
-        choices=["pull", "push"],
-        help="pull = Pi->Mac (backup), push = Mac->Pi (restore)"
+        choices=["pull", "push", "verify"],
+        help="pull = Pi->Mac (backup), push = Mac->Pi (restore), verify = compare checksums"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Copy the whole database file with scp instead of syncing incrementally"
     )
     args = parser.parse_args()
 
-    if args.direction == "pull":
-        sync_pull()
+    if args.direction == "verify":
+        sync_verify()
+    elif args.direction == "pull":
+        if args.full:
+            sync_pull()
+        else:
+            sync_pull_incremental()
     elif args.direction == "push":
-        sync_push()
+        if args.full:
+            sync_push()
+        else:
+            sync_push_incremental()
 
 
 if __name__ == "__main__":
@@ -8,7 +8,7 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.anima_mcp.shared_memory import SharedMemoryClient
+from src.anima_mcp.shared_memory import SharedMemoryClient, SHM_BACKEND
 from src.anima_mcp.sensors import get_sensors
 import subprocess
 
@@ -39,7 +39,7 @@ print()
 # 2. Check shared memory
 print("2. Checking shared memory...")
 try:
-    shm_client = SharedMemoryClient(mode="read", backend="file")
+    shm_client = SharedMemoryClient(mode="read", backend=SHM_BACKEND)
     print(f"   Backend: {shm_client.backend}")
     print(f"   File path: {shm_client.filepath}")
     
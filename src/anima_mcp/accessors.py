@@ -9,6 +9,7 @@ set_ctx() for backward compatibility and reads _ctx via the ctx_ref module.
 Server flags (SERVER_READY, etc.) remain in server.py.
 """
 
+import copy
 import logging
 import os
 import sys
@@ -21,7 +22,7 @@ from .sensors import get_sensors, SensorBackend, SensorReadings
 from .anima import sense_self_with_memory, Anima
 from .memory import anticipate_state
 from .display import get_display, DisplayRenderer
-from .shared_memory import SharedMemoryClient
+from .shared_memory import SharedMemoryClient, SHM_BACKEND
 from .config import get_calibration
 from .server_state import (
     SHM_STALE_THRESHOLD_SECONDS,
@@ -73,9 +74,9 @@ def _get_sensors() -> SensorBackend:
 def _get_shm_client() -> SharedMemoryClient:
     """Get shared memory client for reading broker data."""
     if _cr._ctx is None:
-        return SharedMemoryClient(mode="read", backend="file")
+        return SharedMemoryClient(mode="read", backend=SHM_BACKEND)
     if _cr._ctx.shm_client is None:
-        _cr._ctx.shm_client = SharedMemoryClient(mode="read", backend="file")
+        _cr._ctx.shm_client = SharedMemoryClient(mode="read", backend=SHM_BACKEND)
     return _cr._ctx.shm_client
 
 
@@ -223,6 +224,15 @@ def _get_warm_start_anticipation():
     )
 
 
+def _copy_readings_and_anima(readings: SensorReadings, anima: Anima) -> tuple[SensorReadings, Anima]:
+    """Shallow copies of a memoized pair — callers adjust presence/led_brightness in place."""
+    readings_copy = copy.copy(readings)
+    anima_copy = copy.copy(anima)
+    if anima.readings is readings:
+        anima_copy.readings = readings_copy
+    return readings_copy, anima_copy
+
+
 def _get_readings_and_anima(fallback_to_sensors: bool = True) -> tuple[SensorReadings | None, Anima | None]:
     """
     Read sensor data from shared memory (broker) or fallback to direct sensor access.
@@ -233,6 +243,9 @@ def _get_readings_and_anima(fallback_to_sensors: bool = True) -> tuple[SensorRea
     # Try shared memory first (broker mode)
     # SharedMemoryClient.read() already returns envelope["data"] (the inner dict)
     shm_client = _get_shm_client()
+    # Generation is sampled before read() so a publish in between only costs
+    # a recompute next time, never a stale memo.
+    generation = getattr(shm_client, "generation", None)
     shm_data = shm_client.read()
     if _cr._ctx:
         _cr._ctx.last_shm_data = shm_data  # Cache for reuse within same iteration
@@ -263,6 +276,11 @@ def _get_readings_and_anima(fallback_to_sensors: bool = True) -> tuple[SensorRea
 
     # Try to use shared memory if valid
     if shm_valid:
+        # Broker publishes every ~2s but the display loop asks at 5 Hz:
+        # reuse the derived pair until the broker writes again.
+        memoizable = isinstance(generation, int) and _cr._ctx is not None
+        if memoizable and _cr._ctx.shm_derived and _cr._ctx.shm_derived[0] == generation:
+            return _copy_readings_and_anima(*_cr._ctx.shm_derived[1:])
         try:
             # Reconstruct SensorReadings from shared memory
             readings = _readings_from_dict(shm_data["readings"])
@@ -278,6 +296,9 @@ def _get_readings_and_anima(fallback_to_sensors: bool = True) -> tuple[SensorRea
             drift = _get_calibration_drift()
             anima = sense_self_with_memory(readings, anticipation, calibration, drift_midpoints=drift.get_midpoints())
 
+            if memoizable:
+                _cr._ctx.shm_derived = (generation, readings, anima)
+                return _copy_readings_and_anima(readings, anima)
             return readings, anima
         except Exception as e:
             logger.debug("[Server] Error reading from shared memory: %s", e)
@@ -364,6 +385,10 @@ def _get_display_update_task():
     return _cr._ctx.display_update_task if _cr._ctx else None
 
 
+def _get_loop_scheduler():
+    return _cr._ctx.loop_scheduler if _cr._ctx else None
+
+
 def _get_activity():
     return _cr._ctx.activity if _cr._ctx else None
 
@@ -16,7 +16,7 @@ import math
 import json
 from pathlib import Path
 
-from .atomic_write import atomic_json_write
+from .persistence import get_persistence
 
 
 @dataclass
@@ -143,26 +143,28 @@ class AdaptivePredictionModel:
             except Exception as e:
                 print(f"[AdaptivePrediction] Could not load patterns: {e}")
 
+    def _patterns_snapshot(self) -> dict:
+        return {
+            "patterns": {
+                variable: {
+                    key: {
+                        "mean": p.mean,
+                        "variance": p.variance,
+                        "sample_count": p.sample_count,
+                        "confidence": p.confidence,
+                    }
+                    for key, p in list(patterns.items())
+                }
+                for variable, patterns in list(self._patterns.items())
+            },
+            "last_saved": datetime.now().isoformat(),
+        }
+
     def _save_patterns(self):
-        """Save learned patterns to disk."""
+        """Save learned patterns to disk (coalesced by the persistence manager)."""
         try:
             self.persistence_path.parent.mkdir(parents=True, exist_ok=True)
-            data = {
-                "patterns": {
-                    variable: {
-                        key: {
-                            "mean": p.mean,
-                            "variance": p.variance,
-                            "sample_count": p.sample_count,
-                            "confidence": p.confidence,
-                        }
-                        for key, p in patterns.items()
-                    }
-                    for variable, patterns in self._patterns.items()
-                },
-                "last_saved": datetime.now().isoformat(),
-            }
-            atomic_json_write(self.persistence_path, data, indent=2)
+            get_persistence().mark_dirty(self.persistence_path, self._patterns_snapshot, indent=2)
         except Exception as e:
             print(f"[AdaptivePrediction] Could not save patterns: {e}")
 
@@ -27,6 +27,8 @@ import math
 import sqlite3
 import sys
 
+from . import storage
+
 
 class ActionType(Enum):
     """Types of actions Lumen can take."""
@@ -136,11 +138,7 @@ class ActionSelector:
         last_error = None
         for attempt in range(max_retries):
             try:
-                conn = sqlite3.connect(self._db_path, timeout=10.0)
-                conn.row_factory = sqlite3.Row
-                conn.execute("PRAGMA journal_mode=WAL")
-                conn.execute("PRAGMA busy_timeout=10000")
-                return conn
+                return storage.connect(self._db_path, timeout=10.0, busy_timeout_ms=10000)
             except sqlite3.Error as e:
                 last_error = e
                 if attempt < max_retries - 1:
@@ -168,6 +166,7 @@ class ActionSelector:
 
     def _load_state(self):
         try:
+            storage.flush(self._db_path)
             conn = self._get_conn()
             for row in conn.execute("SELECT action_key, value, count FROM agency_values"):
                 self._action_values[row["action_key"]] = row["value"]
@@ -186,18 +185,17 @@ class ActionSelector:
 
     def _persist_action(self, action_key: str):
         try:
-            conn = self._get_conn()
+            writer = storage.get_writer(self._db_path)
             value = self._action_values.get(action_key, 0.5)
             count = self._action_counts.get(action_key, 0)
-            conn.execute(
+            writer.submit(
                 "INSERT OR REPLACE INTO agency_values (action_key, value, count) VALUES (?, ?, ?)",
                 (action_key, value, count),
             )
-            conn.execute(
+            writer.submit(
                 "INSERT OR REPLACE INTO agency_state (key, data) VALUES (?, ?)",
                 ("exploration_rate", json.dumps(self._exploration_rate)),
             )
-            conn.commit()
         except Exception as e:
             print(f"[Agency] DB persist error (non-fatal): {e}", file=sys.stderr, flush=True)
 
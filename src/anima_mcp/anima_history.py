@@ -10,10 +10,12 @@ See: docs/theory/TRAJECTORY_IDENTITY_PAPER.md
 
 from collections import deque
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 import json
+import os
+import struct
 import sys
 
 from .atomic_write import atomic_json_write
@@ -26,6 +28,22 @@ except ImportError:
     HAS_NUMPY = False
 
 
+DIMENSIONS = ["warmth", "clarity", "stability", "presence"]
+
+# Ring timestamps are wall-clock seconds since this (naive) epoch, so they
+# round-trip exactly to the naive datetimes AnimaSnapshot carries.
+_EPOCH = datetime(1970, 1, 1)
+
+# Binary journal: 16-byte header, then fixed-width records of
+# epoch seconds (float64) + warmth/clarity/stability/presence (float32).
+_JOURNAL_MAGIC = b"ANHJ"
+_JOURNAL_VERSION = 1
+_JOURNAL_HEADER = struct.Struct("<4sHH8x")  # magic, version, record size
+_JOURNAL_RECORD = struct.Struct("<d4f")
+JOURNAL_KEEP = 500          # Records kept when the journal is compacted
+JOURNAL_COMPACT_AT = 2000   # Compact once the journal holds this many records
+
+
 @dataclass
 class DaySummary:
     """Consolidated summary of one active period."""
@@ -96,13 +114,262 @@ class AnimaSnapshot:
         )
 
 
+class _AnimaRing:
+    """
+    Fixed-capacity float64 ring buffer of [epoch_s, warmth, clarity, stability, presence] rows.
+
+    Every row is written twice (slot i and slot i + capacity), so the newest
+    n rows are always one contiguous slice and window() returns a view rather
+    than a copy. Running mean/covariance of the four dimensions are kept with
+    Welford updates (add on append, remove on eviction) so whole-buffer
+    statistics are O(1); they are resynced from the buffer once per capacity
+    appends to stop rounding drift.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._buf = np.zeros((2 * self.capacity, 5))
+        self._next = 0  # Slot the next row is written to
+        self._len = 0
+        self.total = 0  # Rows ever appended; changes whenever the contents do
+        self._mean = np.zeros(4)
+        self._m2 = np.zeros((4, 4))
+        self._since_resync = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def append(self, snapshot: AnimaSnapshot):
+        """Append a snapshot, evicting the oldest row when full."""
+        self.append_values(_to_epoch(snapshot.timestamp), snapshot.warmth,
+                           snapshot.clarity, snapshot.stability, snapshot.presence)
+
+    def append_values(self, epoch_s: float, warmth: float, clarity: float,
+                      stability: float, presence: float):
+        """Append one observation without building a snapshot object."""
+        if self._len == self.capacity:
+            self._welford_remove(self._buf[self._next, 1:].copy())
+        else:
+            self._len += 1
+
+        row = self._buf[self._next]
+        row[0] = epoch_s
+        row[1] = warmth
+        row[2] = clarity
+        row[3] = stability
+        row[4] = presence
+        self._buf[self._next + self.capacity] = row
+        self._next = (self._next + 1) % self.capacity
+        self.total += 1
+
+        self._since_resync += 1
+        if self._since_resync >= self.capacity:
+            self._resync()
+        else:
+            self._welford_add(row[1:])
+
+    def window(self, n: Optional[int] = None) -> "np.ndarray":
+        """Zero-copy (n, 5) view of the newest n rows, oldest first. Do not write to it."""
+        if n is None or n <= 0 or n > self._len:
+            n = self._len
+        end = self._next + self.capacity
+        return self._buf[end - n:end]
+
+    def snapshot(self, row) -> AnimaSnapshot:
+        """Materialize one window row as an AnimaSnapshot."""
+        return AnimaSnapshot(
+            timestamp=_EPOCH + timedelta(seconds=float(row[0])),
+            warmth=float(row[1]),
+            clarity=float(row[2]),
+            stability=float(row[3]),
+            presence=float(row[4]),
+        )
+
+    def __getitem__(self, index: int) -> AnimaSnapshot:
+        return self.snapshot(self.window()[index])
+
+    def __iter__(self):
+        return (self.snapshot(row) for row in self.window())
+
+    @property
+    def mean(self) -> "np.ndarray":
+        """Mean of each dimension over the whole buffer."""
+        return self._mean.copy()
+
+    def covariance(self, ddof: int = 1) -> "np.ndarray":
+        """4x4 covariance over the whole buffer (ddof=1 matches np.cov)."""
+        if self._len - ddof <= 0:
+            return np.full((4, 4), np.nan)
+        return self._m2 / (self._len - ddof)
+
+    def load_rows(self, rows: "np.ndarray"):
+        """Bulk-fill an empty ring from an (n, 5) array (newest rows win)."""
+        rows = rows[-self.capacity:]
+        n = len(rows)
+        self._buf[:n] = rows
+        self._buf[self.capacity:self.capacity + n] = rows
+        self._next = n % self.capacity
+        self._len = n
+        self.total += n
+        if n:
+            self._resync()
+
+    def clear(self):
+        self._next = 0
+        self._len = 0
+        self.total += 1
+        self._mean = np.zeros(4)
+        self._m2 = np.zeros((4, 4))
+        self._since_resync = 0
+
+    def _welford_add(self, x):
+        n = self._len
+        delta = x - self._mean
+        self._mean += delta / n
+        self._m2 += np.outer(delta, x - self._mean)
+
+    def _welford_remove(self, x):
+        n = self._len - 1
+        if n == 0:
+            self._mean = np.zeros(4)
+            self._m2 = np.zeros((4, 4))
+            return
+        delta = x - self._mean
+        self._mean -= delta / n
+        self._m2 -= np.outer(delta, x - self._mean)
+
+    def _resync(self):
+        dims = self.window()[:, 1:]
+        self._mean = dims.mean(axis=0)
+        centered = dims - self._mean
+        self._m2 = centered.T @ centered
+        self._since_resync = 0
+
+
+def _to_epoch(timestamp: datetime) -> float:
+    """Wall-clock seconds since _EPOCH for a (naive or aware) datetime."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone().replace(tzinfo=None)
+    return (timestamp - _EPOCH).total_seconds()
+
+
+class _HistoryJournal:
+    """
+    Append-only binary journal for AnimaHistory.
+
+    New observations are appended as fixed-width records, so a save writes
+    only what changed instead of rewriting the whole history. A torn record
+    left by a crash mid-append is truncated away on open; compaction
+    rewrites the newest records to a temp file and renames it into place.
+    The fixed layout can be mapped with np.memmap and sliced without parsing.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.count = 0
+        self._valid = False  # Header checked (or written) and count is known
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _open(self):
+        """Validate the header, truncate a torn tail and count the records."""
+        size = self.path.stat().st_size
+        with open(self.path, "rb") as f:
+            header = f.read(_JOURNAL_HEADER.size)
+        if len(header) < _JOURNAL_HEADER.size:
+            raise ValueError("journal header truncated")
+        magic, version, record_size = _JOURNAL_HEADER.unpack(header)
+        if magic != _JOURNAL_MAGIC or version != _JOURNAL_VERSION or record_size != _JOURNAL_RECORD.size:
+            raise ValueError(f"unrecognized journal header {magic!r} v{version}")
+
+        body = size - _JOURNAL_HEADER.size
+        torn = body % _JOURNAL_RECORD.size
+        if torn:
+            os.truncate(self.path, size - torn)
+            print(f"[AnimaHistory] Dropped {torn} byte torn record from journal", file=sys.stderr)
+        self.count = body // _JOURNAL_RECORD.size
+        self._valid = True
+
+    def read(self, limit: int):
+        """
+        The newest `limit` records, oldest first.
+
+        Returns an (n, 5) float64 array when numpy is available (read through
+        np.memmap), otherwise a list of (epoch_s, w, c, s, p) tuples.
+        """
+        self._open()
+        n = min(limit, self.count)
+        if n == 0:
+            return np.empty((0, 5)) if HAS_NUMPY else []
+        skip = self.count - n
+        offset = _JOURNAL_HEADER.size + skip * _JOURNAL_RECORD.size
+
+        if HAS_NUMPY:
+            dtype = np.dtype([("t", "<f8"), ("v", "<f4", (4,))])
+            records = np.memmap(self.path, dtype=dtype, mode="r", offset=offset, shape=(n,))
+            rows = np.empty((n, 5))
+            rows[:, 0] = records["t"]
+            rows[:, 1:] = records["v"]
+            del records
+            return rows
+
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            data = f.read(n * _JOURNAL_RECORD.size)
+        return list(_JOURNAL_RECORD.iter_unpack(data))
+
+    def append(self, rows) -> None:
+        """Append (epoch_s, w, c, s, p) records."""
+        if not rows:
+            return
+        if not self._valid and self.exists():
+            try:
+                self._open()
+            except (OSError, ValueError) as e:
+                print(f"[AnimaHistory] Rewriting unreadable journal: {e}", file=sys.stderr)
+                self.rewrite(rows)
+                return
+        if not self._valid:
+            self.rewrite(rows)
+            return
+
+        data = b"".join(_JOURNAL_RECORD.pack(*row) for row in rows)
+        with open(self.path, "ab") as f:
+            f.write(data)
+        self.count += len(rows)
+
+    def rewrite(self, rows) -> None:
+        """Atomically replace the journal with exactly these records."""
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(_JOURNAL_HEADER.pack(_JOURNAL_MAGIC, _JOURNAL_VERSION, _JOURNAL_RECORD.size))
+                f.write(b"".join(_JOURNAL_RECORD.pack(*row) for row in rows))
+                f.flush()
+                os.fsync(f.fileno())
+            tmp_path.replace(self.path)
+        except BaseException:
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            raise
+        self.count = len(rows)
+        self._valid = True
+
+
 class AnimaHistory:
     """
     Track anima state history for trajectory computation.
 
     Implements a sliding window of observations with periodic persistence.
     This is the foundation for computing attractor basins and other
-    trajectory invariants.
+    trajectory invariants. With numpy the window lives in a preallocated
+    _AnimaRing; without it, in a deque of AnimaSnapshot. Observations are
+    persisted to an append-only binary journal next to persistence_path
+    (anima_history.bin); a legacy anima_history.json is migrated on load.
 
     Usage:
         history = get_anima_history()
@@ -119,8 +386,14 @@ class AnimaHistory:
         self.max_size = max_size
         self.persistence_path = persistence_path or Path.home() / ".anima" / "anima_history.json"
         self.auto_save_interval = auto_save_interval
-        self._history: deque = deque(maxlen=max_size)
+        self.journal_path = self.persistence_path.with_suffix(".bin")
+        self._journal = _HistoryJournal(self.journal_path)
+        self._ring: Optional[_AnimaRing] = _AnimaRing(max_size) if HAS_NUMPY else None
+        self._history = self._ring if self._ring is not None else deque(maxlen=max_size)
+        self._basin_cache: Dict[int, tuple] = {}  # window -> (ring.total, basin arrays)
         self._records_since_save = 0
+        self._unjournaled = 0  # Records not yet appended to the journal
+        self._journal_stale = False  # Journal holds records no longer in history
         self._load()
 
     def record(
@@ -141,14 +414,19 @@ class AnimaHistory:
             presence: Presence dimension [0, 1]
             timestamp: Optional timestamp (defaults to now)
         """
-        self._history.append(AnimaSnapshot(
-            timestamp=timestamp or datetime.now(),
-            warmth=warmth,
-            clarity=clarity,
-            stability=stability,
-            presence=presence,
-        ))
-
+        if self._ring is not None:
+            self._ring.append_values(_to_epoch(timestamp or datetime.now()),
+                                     warmth, clarity, stability, presence)
+        else:
+            self._history.append(AnimaSnapshot(
+                timestamp=timestamp or datetime.now(),
+                warmth=warmth,
+                clarity=clarity,
+                stability=stability,
+                presence=presence,
+            ))
+
+        self._unjournaled += 1
         self._records_since_save += 1
         if self._records_since_save >= self.auto_save_interval:
             self._save()
@@ -186,37 +464,18 @@ class AnimaHistory:
         if len(self._history) < 10:
             return None
 
-        recent = list(self._history)[-window:]
-
-        if HAS_NUMPY:
-            matrix = np.array([s.to_vector() for s in recent])
-            center = np.mean(matrix, axis=0)
-            covariance = np.cov(matrix.T)
-
-            # Handle edge case of constant values
-            if np.any(np.isnan(covariance)):
-                covariance = np.eye(4) * 0.001
-
-            # Regularization: add epsilon to diagonal to prevent singularity
-            # This ensures det(covariance) > 0 for Bhattacharyya computation
-            epsilon = 1e-6
-            covariance = covariance + np.eye(4) * epsilon
-
-            # Compute eigenvalues for principal component analysis
-            try:
-                eigenvalues = np.linalg.eigvalsh(covariance)
-            except np.linalg.LinAlgError:
-                eigenvalues = [0.001] * 4
-
+        if self._ring is not None:
+            center, covariance, eigenvalues, n, time_span = self._basin_arrays(window)
             return {
                 "center": center.tolist(),
                 "covariance": covariance.tolist(),
                 "eigenvalues": sorted(eigenvalues.tolist(), reverse=True),
-                "n_observations": len(recent),
-                "time_span_seconds": (recent[-1].timestamp - recent[0].timestamp).total_seconds(),
-                "dimensions": ["warmth", "clarity", "stability", "presence"],
+                "n_observations": n,
+                "time_span_seconds": time_span,
+                "dimensions": list(DIMENSIONS),
             }
         else:
+            recent = list(self._history)[-window:]
             # Fallback without numpy - basic statistics only
             n = len(recent)
             center = [
@@ -245,6 +504,50 @@ class AnimaHistory:
                 "_note": "Full covariance requires numpy",
             }
 
+    def _basin_arrays(self, window: int) -> tuple:
+        """
+        Center, regularized covariance, eigenvalues, n and time span for a window.
+
+        Whole-buffer windows read the ring's running accumulators; smaller
+        windows are computed from a zero-copy view. Either way the result is
+        cached until the next record.
+        """
+        ring = self._ring
+        cached = self._basin_cache.get(window)
+        if cached is not None and cached[0] == ring.total:
+            return cached[1]
+
+        view = ring.window(window)
+        n = len(view)
+        if n == len(ring):
+            center = ring.mean
+            covariance = ring.covariance()
+        else:
+            dims = view[:, 1:]
+            center = dims.mean(axis=0)
+            covariance = np.cov(dims.T)
+
+        # Handle edge case of constant values
+        if np.any(np.isnan(covariance)):
+            covariance = np.eye(4) * 0.001
+
+        # Regularization: add epsilon to diagonal to prevent singularity
+        # This ensures det(covariance) > 0 for Bhattacharyya computation
+        epsilon = 1e-6
+        covariance = covariance + np.eye(4) * epsilon
+
+        # Compute eigenvalues for principal component analysis
+        try:
+            eigenvalues = np.linalg.eigvalsh(covariance)
+        except np.linalg.LinAlgError:
+            eigenvalues = np.full(4, 0.001)
+
+        result = (center, covariance, eigenvalues, n, float(view[-1, 0] - view[0, 0]))
+        if len(self._basin_cache) > 8:
+            self._basin_cache.clear()
+        self._basin_cache[window] = (ring.total, result)
+        return result
+
     def get_recent_trajectory(self, n: int = 20) -> List[Dict[str, Any]]:
         """
         Get the most recent N observations as a trajectory.
@@ -257,6 +560,8 @@ class AnimaHistory:
         Returns:
             List of observation dictionaries
         """
+        if self._ring is not None:
+            return [self._ring.snapshot(row).to_dict() for row in self._ring.window(n)]
         recent = list(self._history)[-n:]
         return [s.to_dict() for s in recent]
 
@@ -274,6 +579,16 @@ class AnimaHistory:
         if len(self._history) < 5:
             return None
 
+        if self._ring is not None:
+            values = self._ring.window(window)[:, 1 + DIMENSIONS.index(dimension)]
+            return {
+                "mean": round(float(values.mean()), 4),
+                "std": round(float(values.std()), 4),
+                "min": round(float(values.min()), 4),
+                "max": round(float(values.max()), 4),
+                "n": len(values),
+            }
+
         recent = list(self._history)[-window:]
         values = [getattr(s, dimension) for s in recent]
 
@@ -310,6 +625,22 @@ class AnimaHistory:
             return None
 
         center = basin["center"]
+
+        if self._ring is not None:
+            recent = self._ring.window(5)
+            distances = np.linalg.norm(recent[:, 1:] - np.asarray(center), axis=1)
+            over = np.flatnonzero(distances > threshold)
+            if len(over):
+                snapshot = self._ring.snapshot(recent[over[0]])
+                return {
+                    "detected": True,
+                    "distance": round(float(distances[over[0]]), 4),
+                    "timestamp": snapshot.timestamp.isoformat(),
+                    "state": snapshot.to_dict(),
+                    "center": center,
+                }
+            return {"detected": False, "distance": 0.0}
+
         recent = list(self._history)[-5:]
 
         for snapshot in recent:
@@ -352,21 +683,24 @@ class AnimaHistory:
             return None
 
         center = basin["center"]
-        recent = list(self._history)[-window:]
 
-        # Compute integral as sum of distances (discrete approximation)
-        total_deviation = 0.0
-        deviations = []
+        if self._ring is not None:
+            recent = self._ring.window(window)
+            deviations = np.linalg.norm(recent[:, 1:] - np.asarray(center), axis=1).tolist()
+            time_span = float(recent[-1, 0] - recent[0, 0])
+        else:
+            recent = list(self._history)[-window:]
+            deviations = []
+            for snapshot in recent:
+                current = snapshot.to_vector()
+                deviations.append(sum((c - v)**2 for c, v in zip(center, current)) ** 0.5)
+            time_span = (recent[-1].timestamp - recent[0].timestamp).total_seconds()
 
-        for i, snapshot in enumerate(recent):
-            current = snapshot.to_vector()
-            distance = sum((c - v)**2 for c, v in zip(center, current)) ** 0.5
-            deviations.append(distance)
-            total_deviation += distance
+        # Compute integral as sum of distances (discrete approximation)
+        total_deviation = sum(deviations)
 
         # Time span for rate calculation
         if len(recent) >= 2:
-            time_span = (recent[-1].timestamp - recent[0].timestamp).total_seconds()
             if time_span > 0:
                 rate = total_deviation / time_span
             else:
@@ -376,7 +710,7 @@ class AnimaHistory:
             rate = 0.0
 
         # Average deviation (normalized void)
-        avg_deviation = total_deviation / len(recent) if recent else 0.0
+        avg_deviation = total_deviation / len(recent) if len(recent) else 0.0
 
         return {
             "void_integral": round(total_deviation, 4),
@@ -404,6 +738,48 @@ class AnimaHistory:
         if len(self._history) < 100:
             return None
 
+        if self._ring is not None:
+            center, variance, time_span_hours, perturbation_count = self._consolidate_arrays()
+            n = len(self._ring)
+        else:
+            center, variance, time_span_hours, perturbation_count = self._consolidate_lists()
+            n = len(self._history)
+
+        # Dimension trends (just the means, labeled)
+        trends = {name: round(center[i], 4) for i, name in enumerate(DIMENSIONS)}
+
+        summary = DaySummary(
+            date=datetime.now().isoformat(),
+            attractor_center=[round(c, 4) for c in center],
+            attractor_variance=[round(v, 6) for v in variance],
+            n_observations=n,
+            time_span_hours=time_span_hours,
+            notable_perturbations=perturbation_count,
+            dimension_trends=trends,
+        )
+
+        # Persist to day summaries file
+        self._save_day_summary(summary)
+
+        return summary
+
+    def _consolidate_arrays(self) -> tuple:
+        """Whole-buffer center/variance from the ring's accumulators, perturbations vectorized."""
+        ring = self._ring
+        view = ring.window()
+        center = ring.mean
+        variance = np.diag(ring.covariance(ddof=0))
+        # Count perturbations (distance from center > 0.15)
+        distances = np.linalg.norm(view[:, 1:] - center, axis=1)
+        return (
+            center.tolist(),
+            variance.tolist(),
+            float(view[-1, 0] - view[0, 0]) / 3600.0,
+            int(np.count_nonzero(distances > 0.15)),
+        )
+
+    def _consolidate_lists(self) -> tuple:
+        """Whole-buffer center/variance/perturbations for the deque (no numpy) backend."""
         observations = list(self._history)
         n = len(observations)
 
@@ -437,24 +813,7 @@ class AnimaHistory:
             if dist > 0.15:
                 perturbation_count += 1
 
-        # Dimension trends (just the means, labeled)
-        dim_names = ["warmth", "clarity", "stability", "presence"]
-        trends = {name: round(center[i], 4) for i, name in enumerate(dim_names)}
-
-        summary = DaySummary(
-            date=datetime.now().isoformat(),
-            attractor_center=[round(c, 4) for c in center],
-            attractor_variance=[round(v, 6) for v in variance],
-            n_observations=n,
-            time_span_hours=time_span_hours,
-            notable_perturbations=perturbation_count,
-            dimension_trends=trends,
-        )
-
-        # Persist to day summaries file
-        self._save_day_summary(summary)
-
-        return summary
+        return center, variance, time_span_hours, perturbation_count
 
     def get_day_summaries(self, limit: int = 30) -> List[DaySummary]:
         """
@@ -566,22 +925,48 @@ class AnimaHistory:
     def __len__(self) -> int:
         return len(self._history)
 
+    def _rows(self, n: int) -> List[tuple]:
+        """The newest n observations as (epoch_s, w, c, s, p) tuples."""
+        if n <= 0:
+            return []
+        if self._ring is not None:
+            return [tuple(row) for row in self._ring.window(n).tolist()]
+        recent = list(self._history)[-n:]
+        return [(_to_epoch(s.timestamp), s.warmth, s.clarity, s.stability, s.presence)
+                for s in recent]
+
     def _save(self):
-        """Persist history to disk."""
+        """Append unsaved observations to the journal, compacting it when it grows too long."""
         try:
-            # Only save last 500 for disk efficiency
-            recent = list(self._history)[-500:]
-            data = {
-                "observations": [s.to_dict() for s in recent],
-                "saved_at": datetime.now().isoformat(),
-                "version": "1.0",
-            }
-            atomic_json_write(self.persistence_path, data)
+            pending = min(self._unjournaled, len(self._history))
+            if self._journal_stale or self._journal.count + pending > JOURNAL_COMPACT_AT:
+                # Only keep last JOURNAL_KEEP for disk efficiency
+                self._journal.rewrite(self._rows(JOURNAL_KEEP))
+            else:
+                self._journal.append(self._rows(pending))
+            self._unjournaled = 0
+            self._journal_stale = False
         except Exception as e:
             print(f"[AnimaHistory] Could not save: {e}", file=sys.stderr)
 
     def _load(self):
-        """Load history from disk."""
+        """Load history from the journal, or migrate a legacy JSON file."""
+        if self._journal.exists():
+            try:
+                rows = self._journal.read(self.max_size)
+                if self._ring is not None:
+                    self._ring.load_rows(rows)
+                else:
+                    for epoch_s, w, c, s, p in rows:
+                        self._history.append(AnimaSnapshot(
+                            timestamp=_EPOCH + timedelta(seconds=epoch_s),
+                            warmth=w, clarity=c, stability=s, presence=p,
+                        ))
+                print(f"[AnimaHistory] Loaded {len(self._history)} observations", file=sys.stderr)
+            except Exception as e:
+                print(f"[AnimaHistory] Could not load journal: {e}", file=sys.stderr)
+            return
+
         if not self.persistence_path.exists():
             return
 
@@ -595,6 +980,15 @@ class AnimaHistory:
             print(f"[AnimaHistory] Loaded {len(self._history)} observations", file=sys.stderr)
         except Exception as e:
             print(f"[AnimaHistory] Could not load: {e}", file=sys.stderr)
+            return
+
+        # One-time migration to the journal; the JSON file is left for backups
+        try:
+            self._journal.rewrite(self._rows(JOURNAL_KEEP))
+            print(f"[AnimaHistory] Migrated {self._journal.count} observations to {self.journal_path.name}",
+                  file=sys.stderr)
+        except Exception as e:
+            print(f"[AnimaHistory] Could not migrate to journal: {e}", file=sys.stderr)
 
     def save(self):
         """Explicitly save the history."""
@@ -603,6 +997,8 @@ class AnimaHistory:
     def clear(self):
         """Clear all history (use with caution)."""
         self._history.clear()
+        self._unjournaled = 0
+        self._journal_stale = True
 
 
 # === Singleton Pattern ===
@@ -3,20 +3,38 @@ PDM Microphone capture for Braincraft HAT.
 
 The Braincraft HAT has 2x PDM MEMS microphones for stereo audio input.
 This module captures audio and provides it for speech recognition.
+
+With VAD on, every block is written as int16 into a preallocated ring
+buffer and classified by frame energy inside the audio callback; the
+callback allocates no arrays per block and never calls user code. A
+separate stream thread hands each utterance's audio to on_speech_audio
+while the speaker is still talking (so recognition overlaps capture),
+then delivers the whole utterance to on_speech_end.
 """
 
 import sys
 import time
 import threading
 import queue
-from typing import Optional, Callable
+from collections import deque
+from typing import Optional, Callable, Dict
 from dataclasses import dataclass
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 # Audio settings for speech recognition
 SAMPLE_RATE = 16000  # 16kHz - standard for speech recognition
 CHANNELS = 1  # Mono for speech (mix stereo down)
 CHUNK_SIZE = 1024  # Samples per chunk
 
+MAX_UTTERANCE_SECONDS = 30.0  # Longer speech is cut into several utterances
+PREROLL_SECONDS = 0.2         # Audio kept from before the onset so the first phoneme isn't clipped
+RING_SLACK_SECONDS = 2.0      # Room for the stream thread to fall behind the callback
+
 
 @dataclass
 class AudioChunk:
@@ -26,6 +44,48 @@ class AudioChunk:
     duration: float  # seconds
 
 
+class AudioRing:
+    """
+    Fixed-size int16 ring buffer addressed by absolute sample index.
+
+    `written` counts every sample ever written; sample i lives at
+    i % capacity until it is overwritten capacity samples later.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.buf = np.zeros(capacity, dtype=np.int16)
+        self.written = 0
+
+    def write(self, samples) -> int:
+        """Write float samples in [-1, 1] as int16. Returns the start index."""
+        start = self.written
+        n = len(samples)
+        pos = start % self.capacity
+        first = min(n, self.capacity - pos)
+        # Scale straight into the ring (unsafe cast truncates like astype did)
+        np.multiply(samples[:first], 32767, out=self.buf[pos:pos + first], casting="unsafe")
+        if first < n:
+            np.multiply(samples[first:], 32767, out=self.buf[:n - first], casting="unsafe")
+        self.written = start + n
+        return start
+
+    def oldest(self) -> int:
+        """Smallest absolute index still held."""
+        return max(0, self.written - self.capacity)
+
+    def read(self, start: int, end: int) -> bytes:
+        """Samples [start, end) as int16 bytes; start is clamped to oldest()."""
+        start = max(start, self.oldest())
+        end = min(end, self.written)
+        if end <= start:
+            return b""
+        a, n = start % self.capacity, end - start
+        if a + n <= self.capacity:
+            return self.buf[a:a + n].tobytes()
+        return self.buf[a:].tobytes() + self.buf[:a + n - self.capacity].tobytes()
+
+
 class MicCapture:
     """
     Capture audio from Braincraft HAT PDM microphones.
@@ -49,11 +109,35 @@ class MicCapture:
         # Voice activity detection
         self._vad_enabled = True
         self._silence_threshold = 500  # RMS threshold for silence
-        self._speech_timeout = 1.5  # Seconds of silence before stopping
+        self._speech_timeout = 1.5  # Seconds of silence before stopping (hangover)
+        self._max_utterance_samples = int(MAX_UTTERANCE_SECONDS * sample_rate)
+        self._preroll_samples = int(PREROLL_SECONDS * sample_rate)
+
+        # Ring buffer and VAD state (allocated on first use; written only by the callback)
+        self._ring: Optional[AudioRing] = None
+        self._mono = None            # Scratch buffer for stereo mixdown
+        self._vad_lock = threading.Lock()
+        self._in_speech = False
+        self._utterance_start = 0
+        self._last_end = 0
+        self._silent_samples = 0
+        # ("start", index) / ("end", start, end) for the stream thread
+        self._events: deque = deque()
+        self._data_ready = threading.Event()
+
+        # Stream thread state
+        self._stream_thread: Optional[threading.Thread] = None
+        self._stream_pos: Optional[int] = None
+
+        # Stats
+        self._utterances = 0
+        self._truncated = 0   # Utterances cut at MAX_UTTERANCE_SECONDS
+        self._overruns = 0    # Reads that found audio already overwritten
 
         # Callbacks
         self._on_speech_start: Optional[Callable] = None
         self._on_speech_end: Optional[Callable[[bytes], None]] = None
+        self._on_speech_audio: Optional[Callable[[bytes], None]] = None
 
     def _init_audio(self) -> bool:
         """Initialize audio interface."""
@@ -62,6 +146,12 @@ class MicCapture:
         if self._init_failed:
             return False  # Don't retry or print warnings again
 
+        if not HAS_NUMPY:
+            print("[Mic] numpy not installed. Run: pip install numpy",
+                  file=sys.stderr, flush=True)
+            self._init_failed = True
+            return False
+
         try:
             import sounddevice as sd
 
@@ -109,6 +199,8 @@ class MicCapture:
         self._running = True
         self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
         self._capture_thread.start()
+        self._stream_thread = threading.Thread(target=self._stream_loop, name="mic-stream", daemon=True)
+        self._stream_thread.start()
         print("[Mic] Started capturing", file=sys.stderr, flush=True)
         return True
 
@@ -118,75 +210,20 @@ class MicCapture:
         if self._capture_thread:
             self._capture_thread.join(timeout=2.0)
             self._capture_thread = None
+        if self._stream_thread:
+            self._data_ready.set()
+            self._stream_thread.join(timeout=2.0)
+            self._stream_thread = None
         print("[Mic] Stopped capturing", file=sys.stderr, flush=True)
 
     def _capture_loop(self):
         """Main capture loop - runs in background thread."""
-        import numpy as np
         sd = self._audio_interface
 
-        speech_buffer = []
-        in_speech = False
-        silence_start = None
-
         def audio_callback(indata, frames, time_info, status):
-            nonlocal speech_buffer, in_speech, silence_start
-
             if status:
                 print(f"[Mic] Status: {status}", file=sys.stderr, flush=True)
-
-            # Convert to mono if stereo
-            if indata.shape[1] > 1:
-                audio_data = np.mean(indata, axis=1)
-            else:
-                audio_data = indata[:, 0]
-
-            # Calculate RMS for VAD
-            rms = np.sqrt(np.mean(audio_data ** 2)) * 32768
-
-            timestamp = time.time()
-            duration = frames / self._sample_rate
-
-            if self._vad_enabled:
-                # Voice activity detection
-                if rms > self._silence_threshold:
-                    # Speech detected
-                    if not in_speech:
-                        in_speech = True
-                        speech_buffer = []
-                        if self._on_speech_start:
-                            self._on_speech_start()
-
-                    silence_start = None
-                    speech_buffer.append(audio_data.copy())
-
-                elif in_speech:
-                    # Possible end of speech
-                    speech_buffer.append(audio_data.copy())
-
-                    if silence_start is None:
-                        silence_start = timestamp
-                    elif timestamp - silence_start > self._speech_timeout:
-                        # Speech ended
-                        in_speech = False
-                        if speech_buffer and self._on_speech_end:
-                            # Concatenate and convert to bytes
-                            full_audio = np.concatenate(speech_buffer)
-                            audio_bytes = (full_audio * 32768).astype(np.int16).tobytes()
-                            self._on_speech_end(audio_bytes)
-                        speech_buffer = []
-            else:
-                # No VAD - just queue all audio
-                audio_bytes = (audio_data * 32768).astype(np.int16).tobytes()
-                chunk = AudioChunk(
-                    data=audio_bytes,
-                    timestamp=timestamp,
-                    duration=duration
-                )
-                try:
-                    self._audio_queue.put_nowait(chunk)
-                except queue.Full:
-                    pass  # Drop oldest if queue full
+            self._process_block(indata, frames)
 
         try:
             with sd.InputStream(
@@ -194,6 +231,7 @@ class MicCapture:
                 samplerate=self._sample_rate,
                 channels=self._channels,
                 blocksize=CHUNK_SIZE,
+                dtype="float32",
                 callback=audio_callback
             ):
                 while self._running:
@@ -202,6 +240,120 @@ class MicCapture:
             print(f"[Mic] Capture error: {e}", file=sys.stderr, flush=True)
             self._running = False
 
+    def _ensure_buffers(self, frames: int):
+        if self._ring is None:
+            capacity = (self._max_utterance_samples + self._preroll_samples
+                        + int(RING_SLACK_SECONDS * self._sample_rate))
+            self._ring = AudioRing(capacity)
+        if self._channels > 1 and (self._mono is None or len(self._mono) < frames):
+            self._mono = np.zeros(max(frames, CHUNK_SIZE), dtype=np.float32)
+
+    def _process_block(self, indata, frames: int):
+        """Handle one block from the audio callback (float samples, frames x channels)."""
+        self._ensure_buffers(frames)
+
+        # Convert to mono if stereo
+        if indata.shape[1] > 1:
+            audio_data = self._mono[:frames]
+            np.mean(indata, axis=1, out=audio_data)
+        else:
+            audio_data = indata[:, 0]
+
+        if not self._vad_enabled:
+            # No VAD - just queue all audio
+            audio_bytes = (audio_data * 32768).astype(np.int16).tobytes()
+            chunk = AudioChunk(
+                data=audio_bytes,
+                timestamp=time.time(),
+                duration=frames / self._sample_rate
+            )
+            try:
+                self._audio_queue.put_nowait(chunk)
+            except queue.Full:
+                pass  # Drop oldest if queue full
+            return
+
+        # Frame energy (RMS on the int16 scale)
+        rms = (float(np.dot(audio_data, audio_data)) / frames) ** 0.5 * 32768
+
+        with self._vad_lock:
+            block_start = self._ring.write(audio_data)
+            block_end = block_start + frames
+
+            if rms > self._silence_threshold:
+                if not self._in_speech:
+                    self._in_speech = True
+                    # Pre-roll, but never back into the previous utterance
+                    self._utterance_start = max(self._ring.oldest(), self._last_end,
+                                                block_start - self._preroll_samples)
+                    self._events.append(("start", self._utterance_start))
+                self._silent_samples = 0
+            elif self._in_speech:
+                self._silent_samples += frames
+                if self._silent_samples > self._speech_timeout * self._sample_rate:
+                    self._end_utterance(block_end)
+
+            if self._in_speech and block_end - self._utterance_start >= self._max_utterance_samples:
+                self._truncated += 1
+                self._end_utterance(block_end)
+
+        self._data_ready.set()
+
+    def _end_utterance(self, end: int):
+        self._in_speech = False
+        self._silent_samples = 0
+        self._last_end = end
+        self._utterances += 1
+        self._events.append(("end", self._utterance_start, end))
+
+    def _stream_loop(self):
+        """Deliver speech audio to callbacks outside the audio callback."""
+        while self._running:
+            self._data_ready.wait(timeout=0.1)
+            self._data_ready.clear()
+            try:
+                self._drain_stream()
+            except Exception as e:
+                print(f"[Mic] Stream callback error: {e}", file=sys.stderr, flush=True)
+
+    def _drain_stream(self):
+        """Run speech callbacks for everything captured since the last drain."""
+        if self._ring is None:
+            return
+        with self._vad_lock:
+            events = list(self._events)
+            self._events.clear()
+            written = self._ring.written
+
+        for event in events:
+            if event[0] == "start":
+                self._stream_pos = event[1]
+                if self._on_speech_start:
+                    self._on_speech_start()
+            else:
+                _, start, end = event
+                if self._stream_pos is not None:
+                    self._emit_audio(self._stream_pos, end)
+                self._stream_pos = None
+                if self._on_speech_end:
+                    if start < self._ring.oldest():
+                        self._overruns += 1
+                    audio_bytes = self._ring.read(start, end)
+                    if audio_bytes:
+                        self._on_speech_end(audio_bytes)
+
+        if self._stream_pos is not None and written > self._stream_pos:
+            self._emit_audio(self._stream_pos, written)
+            self._stream_pos = written
+
+    def _emit_audio(self, start: int, end: int):
+        if start < self._ring.oldest():
+            self._overruns += 1
+        if self._on_speech_audio and end > start:
+            audio_bytes = self._ring.read(start, end)
+            if audio_bytes:
+                self._on_speech_audio(audio_bytes)
+
     def get_chunk(self, timeout: float = 0.1) -> Optional[AudioChunk]:
         """Get next audio chunk from queue."""
         try:
@@ -225,6 +377,22 @@ class MicCapture:
         """Set callback for when speech ends (receives audio bytes)."""
         self._on_speech_end = callback
 
+    def on_speech_audio(self, callback: Callable[[bytes], None]):
+        """Set callback receiving speech audio incrementally while it is captured.
+
+        Called from the stream thread with consecutive int16 chunks of the
+        current utterance, before on_speech_end for that utterance.
+        """
+        self._on_speech_audio = callback
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "utterances": self._utterances,
+            "truncated": self._truncated,
+            "overruns": self._overruns,
+            "ring_bytes": self._ring.buf.nbytes if self._ring is not None else 0,
+        }
+
     @property
     def sample_rate(self) -> int:
         return self._sample_rate
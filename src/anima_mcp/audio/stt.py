@@ -188,6 +188,31 @@ class SpeechToText:
             print(f"[STT] Streaming error: {e}", file=sys.stderr, flush=True)
             return None
 
+    def finish_streaming(self) -> Optional[TranscriptionResult]:
+        """
+        Flush the streaming recognizer at the end of an utterance.
+
+        Returns the text Vosk had not yet finalized (None if there was none);
+        the recognizer is ready for the next utterance afterwards.
+        """
+        if not self._initialized:
+            return None
+
+        try:
+            result = json.loads(self._recognizer.FinalResult())
+            text = result.get("text", "").strip()
+            if not text:
+                return None
+            return TranscriptionResult(
+                text=text,
+                confidence=self._calculate_confidence(result),
+                is_final=True,
+                alternatives=[]
+            )
+        except Exception as e:
+            print(f"[STT] Streaming finish error: {e}", file=sys.stderr, flush=True)
+            return None
+
     def reset(self):
         """Reset the recognizer state for a new utterance."""
         if self._recognizer:
@@ -13,17 +13,36 @@ Voices are downloaded automatically on first use, or manually:
 
     # Download a voice (~100MB each)
     # Voices are stored in ~/.local/share/piper/voices/
+
+Synthesis normally goes through a PiperWorker: one long-lived piper
+process per (voice, speed) that keeps the model loaded, instead of a
+process (and model load) per utterance. Results are kept in a
+PhraseCache keyed by (text, voice, speed), so the phrases Lumen repeats
+are synthesized once.
 """
 
+import hashlib
+import os
+import queue
+import shutil
 import sys
 import subprocess
 import tempfile
+import threading
 import wave
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+DEFAULT_CACHE_DIR = Path.home() / ".anima" / "tts_cache"
+DEFAULT_MEMORY_CACHE_BYTES = 8 * 1024 * 1024   # ~3 minutes of 22050Hz 16-bit mono
+DEFAULT_DISK_CACHE_BYTES = 64 * 1024 * 1024
+SYNTHESIS_TIMEOUT = 30.0
+WORKER_MAX_FAILURES = 3   # Stop using the worker after this many failed utterances in a row
+SPEED_STEP = 0.05         # Speeds are snapped to this grid so worker and cache keys stay stable
+
 
 class VoiceStyle(Enum):
     """Available voice styles - affects how Lumen sounds."""
@@ -52,6 +71,290 @@ RECOMMENDED_VOICES = {
 }
 
 
+def _quantize_speed(speed: float) -> float:
+    """Snap a speaking speed to SPEED_STEP (anima-driven speeds are continuous)."""
+    return round(round(speed / SPEED_STEP) * SPEED_STEP, 2)
+
+
+def _piper_command(voice: Voice, speed: float, *args: str) -> List[str]:
+    """piper invocation for a voice/speed, followed by output arguments."""
+    cmd = ["piper", "--model", voice.name, *args]
+    if speed != 1.0:
+        cmd.extend(["--length_scale", str(1.0 / speed)])
+    return cmd
+
+
+def _read_wav_frames(path: str) -> bytes:
+    with wave.open(path, 'rb') as wav:
+        return wav.readframes(wav.getnframes())
+
+
+class PhraseCache:
+    """
+    Synthesized audio keyed by (text, voice, speed).
+
+    An in-memory LRU bounded by bytes, optionally backed by a directory of
+    raw PCM files named by the key's hash (so cached phrases survive
+    restarts). The directory is pruned oldest-first by mtime; hits refresh
+    a file's mtime.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None,
+                 max_memory_bytes: int = DEFAULT_MEMORY_CACHE_BYTES,
+                 max_disk_bytes: int = DEFAULT_DISK_CACHE_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None  # Measured on first disk write
+        self._lock = threading.Lock()
+
+        # Stats
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text: str, voice: Voice, speed: float) -> str:
+        raw = f"{voice.name}|{voice.speaker_id}|{speed:.3f}|{text.strip()}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return audio
+
+        audio = self._read_disk(key)
+        with self._lock:
+            if audio is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, audio)
+        return audio
+
+    def put(self, key: str, audio: bytes):
+        with self._lock:
+            self._remember(key, audio)
+        self._write_disk(key, audio)
+
+    def clear(self):
+        """Drop the in-memory entries (disk files are kept)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def _remember(self, key: str, audio: bytes):
+        if len(audio) > self.max_memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pcm"
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            audio = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            return None
+        return audio or None
+
+    def _write_disk(self, key: str, audio: bytes):
+        if self.cache_dir is None or len(audio) > self.max_disk_bytes:
+            return
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            existed = path.exists()
+            tmp_path.write_bytes(audio)
+            tmp_path.replace(path)
+        except OSError as e:
+            print(f"[TTS] Cache write failed: {e}", file=sys.stderr, flush=True)
+            return
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._measure_disk()
+            elif not existed:
+                self._disk_bytes += len(audio)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._prune_disk()
+
+    def _measure_disk(self) -> int:
+        return sum(p.stat().st_size for p in self.cache_dir.glob("*.pcm"))
+
+    def _prune_disk(self):
+        """Delete least recently used files until the directory is 90% of its budget."""
+        target = int(self.max_disk_bytes * 0.9)
+        files = []
+        for p in self.cache_dir.glob("*.pcm"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, p in files:
+            if total <= target:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+        self._disk_bytes = total
+
+    def get_stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+class PiperWorker:
+    """
+    Long-lived piper process with one voice model loaded.
+
+    piper reads one utterance per stdin line. Its --output-raw stream has
+    no utterance boundaries, so the worker runs it in --output_dir mode:
+    each line becomes a WAV in a private temp directory (tmpfs when
+    /dev/shm exists) and piper prints that file's path once it is written,
+    which marks the end of the utterance.
+    """
+
+    def __init__(self, voice: Voice, speed: float = 1.0, timeout: float = SYNTHESIS_TIMEOUT):
+        self.voice = voice
+        self.speed = speed
+        self.timeout = timeout
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._output_dir: Optional[str] = None
+        self._lock = threading.RLock()
+        self.utterances = 0
+
+    @property
+    def key(self) -> Tuple[str, float]:
+        return (self.voice.name, self.speed)
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self) -> bool:
+        """Spawn piper. Returns False if it could not be started."""
+        shm = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        try:
+            self._output_dir = tempfile.mkdtemp(prefix="anima-tts-", dir=shm)
+            self._proc = subprocess.Popen(
+                _piper_command(self.voice, self.speed, "--output_dir", self._output_dir),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+            )
+        except Exception as e:
+            print(f"[TTS] Could not start piper worker: {e}", file=sys.stderr, flush=True)
+            self.close()
+            return False
+
+        threading.Thread(
+            target=self._read_lines, args=(self._proc.stdout,), name="tts-piper-reader", daemon=True
+        ).start()
+        return True
+
+    def _read_lines(self, stdout):
+        try:
+            for line in stdout:
+                line = line.strip()
+                if line:
+                    self._lines.put(line)
+        except (OSError, ValueError):
+            pass
+        self._lines.put(None)  # EOF: the process exited
+
+    def synthesize(self, text: str) -> Optional[bytes]:
+        """Speak one utterance through the running process; None on failure."""
+        # One line per utterance
+        line = " ".join(text.split())
+        with self._lock:
+            if not self.alive:
+                return None
+            try:
+                self._proc.stdin.write(line + "\n")
+                self._proc.stdin.flush()
+                path = self._lines.get(timeout=self.timeout)
+            except queue.Empty:
+                print("[TTS] Piper worker timed out", file=sys.stderr, flush=True)
+                self.close()
+                return None
+            except (OSError, ValueError) as e:
+                print(f"[TTS] Piper worker pipe error: {e}", file=sys.stderr, flush=True)
+                self.close()
+                return None
+            if path is None:
+                print("[TTS] Piper worker exited", file=sys.stderr, flush=True)
+                self.close()
+                return None
+
+            try:
+                audio = _read_wav_frames(path)
+            except Exception as e:
+                print(f"[TTS] Piper worker output unreadable: {e}", file=sys.stderr, flush=True)
+                return None
+            finally:
+                Path(path).unlink(missing_ok=True)
+            self.utterances += 1
+            return audio
+
+    def close(self):
+        """Stop piper and remove the output directory."""
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        proc, self._proc = self._proc, None
+        if proc is not None:
+            try:
+                proc.stdin.close()
+            except Exception:
+                pass
+            try:
+                proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+            except Exception:
+                pass
+        if self._output_dir is not None:
+            shutil.rmtree(self._output_dir, ignore_errors=True)
+            self._output_dir = None
+
+
 class TextToSpeech:
     """
     Convert text to speech using Piper.
@@ -60,9 +363,12 @@ class TextToSpeech:
     - Multiple voices
     - Speed/pitch adjustment
     - Mood-influenced voice parameters
+    - A persistent piper worker (falls back to one process per utterance)
+    - Phrase caching (pass a PhraseCache with a cache_dir to persist it)
     """
 
-    def __init__(self, voice: Optional[Voice] = None):
+    def __init__(self, voice: Optional[Voice] = None, cache: Optional[PhraseCache] = None,
+                 use_worker: bool = True):
         self._voice = voice or RECOMMENDED_VOICES["default"]
         self._piper_path: Optional[Path] = None
         self._initialized = False
@@ -73,6 +379,13 @@ class TextToSpeech:
         self._pitch = 1.0      # 0.5 = low, 2.0 = high
         self._volume = 1.0     # 0.0 = silent, 1.0 = normal
 
+        self._cache = cache if cache is not None else PhraseCache()
+        self._use_worker = use_worker
+        self._worker: Optional[PiperWorker] = None
+        self._worker_failures = 0
+        self._worker_lock = threading.Lock()
+        self._oneshot_syntheses = 0
+
     def initialize(self) -> bool:
         """Check if Piper is available."""
         if self._initialized:
@@ -118,22 +431,54 @@ class TextToSpeech:
         if not self._initialized and not self.initialize():
             return None
 
+        key = PhraseCache.key(text, self._voice, self._speed)
+        audio_bytes = self._cache.get(key)
+        if audio_bytes is not None:
+            return audio_bytes
+
+        audio_bytes = self._synthesize_with_worker(text)
+        if audio_bytes is None:
+            audio_bytes = self._synthesize_once(text)
+        if audio_bytes:
+            self._cache.put(key, audio_bytes)
+        return audio_bytes
+
+    def _synthesize_with_worker(self, text: str) -> Optional[bytes]:
+        if not self._use_worker:
+            return None
+        with self._worker_lock:
+            worker = self._worker
+            if worker is None or worker.key != (self._voice.name, self._speed) or not worker.alive:
+                if worker is not None:
+                    worker.close()
+                worker = self._worker = PiperWorker(self._voice, self._speed)
+                if not worker.start():
+                    self._worker = None
+                    self._use_worker = False  # Spawning failed; don't retry every utterance
+                    return None
+
+        audio_bytes = worker.synthesize(text)
+        if audio_bytes is None:
+            self._worker_failures += 1
+            if self._worker_failures >= WORKER_MAX_FAILURES:
+                print("[TTS] Piper worker keeps failing, using one process per utterance",
+                      file=sys.stderr, flush=True)
+                self._use_worker = False
+                self.close()
+        else:
+            self._worker_failures = 0  # Only consecutive failures give up on the worker
+        return audio_bytes
+
+    def _synthesize_once(self, text: str) -> Optional[bytes]:
+        """Run a fresh piper process for one utterance (loads the model each time)."""
+        self._oneshot_syntheses += 1
         try:
             # Create temp file for output
             with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
                 output_path = f.name
 
             try:
-                # Build piper command
-                cmd = [
-                    "piper",
-                    "--model", self._voice.name,
-                    "--output_file", output_path,
-                ]
-
-                # Add speed adjustment if not default
-                if self._speed != 1.0:
-                    cmd.extend(["--length_scale", str(1.0 / self._speed)])
+                cmd = _piper_command(self._voice, self._speed, "--output_file", output_path)
 
                 # Run piper with text input
                 result = subprocess.run(
@@ -149,10 +494,7 @@ class TextToSpeech:
                     return None
 
                 # Read the generated audio
-                with wave.open(output_path, 'rb') as wav:
-                    audio_bytes = wav.readframes(wav.getnframes())
-
-                return audio_bytes
+                return _read_wav_frames(output_path)
             finally:
                 Path(output_path).unlink(missing_ok=True)
 
@@ -181,14 +523,7 @@ class TextToSpeech:
             return False
 
         try:
-            cmd = [
-                "piper",
-                "--model", self._voice.name,
-                "--output_file", str(output_path),
-            ]
-
-            if self._speed != 1.0:
-                cmd.extend(["--length_scale", str(1.0 / self._speed)])
+            cmd = _piper_command(self._voice, self._speed, "--output_file", str(output_path))
 
             result = subprocess.run(
                 cmd,
@@ -238,7 +573,7 @@ class TextToSpeech:
         base_speed = 1.0
         if stability < 0.5:
             base_speed = 1.0 + (0.5 - stability) * 0.2  # Up to 1.1x when unstable
-        self._speed = base_speed
+        self._speed = _quantize_speed(base_speed)
 
         # Voice selection based on warmth and clarity
         if warmth > 0.7:
@@ -256,7 +591,7 @@ class TextToSpeech:
 
     @speed.setter
     def speed(self, value: float):
-        self._speed = max(0.5, min(2.0, value))
+        self._speed = _quantize_speed(max(0.5, min(2.0, value)))
 
     @property
     def voice(self) -> Voice:
@@ -266,6 +601,23 @@ class TextToSpeech:
     def is_initialized(self) -> bool:
         return self._initialized
 
+    def close(self):
+        """Stop the piper worker (the next synthesize() starts a new one)."""
+        with self._worker_lock:
+            if self._worker is not None:
+                self._worker.close()
+                self._worker = None
+
+    def get_stats(self) -> Dict[str, object]:
+        worker = self._worker
+        return {
+            "cache": self._cache.get_stats(),
+            "worker_running": worker is not None and worker.alive,
+            "worker_utterances": worker.utterances if worker is not None else 0,
+            "worker_failures": self._worker_failures,
+            "oneshot_syntheses": self._oneshot_syntheses,
+        }
+
     @staticmethod
     def list_voices() -> List[str]:
         """List available Piper voices."""
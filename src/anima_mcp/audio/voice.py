@@ -18,8 +18,8 @@ from typing import Optional, Callable, List
 from dataclasses import dataclass, field
 
 from .mic import MicCapture
-from .stt import SpeechToText
-from .tts import TextToSpeech
+from .stt import SpeechToText, TranscriptionResult
+from .tts import TextToSpeech, PhraseCache, DEFAULT_CACHE_DIR
 from .speaker import Speaker
 
 
@@ -34,6 +34,9 @@ class VoiceConfig:
     acknowledge_hearing: bool = True  # Say "hmm" or similar when hearing speech
     speak_responses: bool = True  # Actually speak responses (vs just text)
 
+    # Recognize speech while it is being captured (instead of after it ends)
+    stream_transcription: bool = True
+
     # Timeouts
     listen_timeout: float = 10.0  # Max seconds to listen for speech
     response_timeout: float = 30.0  # Max seconds to wait for response generation
@@ -56,6 +59,7 @@ class VoiceState:
     last_heard: Optional[Utterance] = None
     last_spoken: Optional[str] = None
     conversation_active: bool = False
+    partial_text: str = ""  # Recognizer's running guess while speech is in progress
     utterance_history: List[Utterance] = field(default_factory=list)
 
 
@@ -73,7 +77,7 @@ class LumenVoice:
         # Components
         self._mic = MicCapture()
         self._stt = SpeechToText()
-        self._tts = TextToSpeech()
+        self._tts = TextToSpeech(cache=PhraseCache(DEFAULT_CACHE_DIR))
         self._speaker = Speaker()
 
         # Callbacks
@@ -91,6 +95,10 @@ class LumenVoice:
         self._initialized = False
         self._warnings_logged = False  # Suppress repeated warnings
 
+        # Streaming transcription of the current utterance
+        self._stream_segments: List[str] = []
+        self._streamed = False
+
     def initialize(self) -> bool:
         """Initialize all voice components."""
         # Only initialize once
@@ -131,6 +139,8 @@ class LumenVoice:
         # Set up speech callbacks
         self._mic.on_speech_start(self._on_speech_start)
         self._mic.on_speech_end(self._on_speech_end)
+        if self._config.stream_transcription:
+            self._mic.on_speech_audio(self._on_speech_audio)
 
         self._running = True
         print("[Voice] Lumen is now listening", file=sys.stderr, flush=True)
@@ -151,20 +161,60 @@ class LumenVoice:
 
         self._mic.stop()
         self._speaker.stop()
+        self._tts.close()
         print("[Voice] Voice system stopped", file=sys.stderr, flush=True)
 
     def _on_speech_start(self):
         """Called when speech is detected."""
         self._state.is_listening = True
+        self._state.partial_text = ""
+        self._stream_segments = []
+        self._streamed = False
         print("[Voice] Hearing speech...", file=sys.stderr, flush=True)
 
+    def _on_speech_audio(self, audio_bytes: bytes):
+        """Called with each new piece of speech audio while it is captured."""
+        if not self._stt.is_initialized:
+            return
+        self._streamed = True
+        result = self._stt.transcribe_streaming(audio_bytes)
+        if result is None:
+            return
+        if result.is_final:
+            # Vosk found a pause inside the utterance; keep the segment
+            self._stream_segments.append(result.text)
+            self._state.partial_text = ""
+        else:
+            self._state.partial_text = result.text
+
+    def _finish_streamed(self) -> Optional[TranscriptionResult]:
+        """Combine streamed segments with whatever the recognizer still holds."""
+        tail = self._stt.finish_streaming()
+        texts = list(self._stream_segments)
+        if tail is not None:
+            texts.append(tail.text)
+        self._stream_segments = []
+        self._streamed = False
+        self._state.partial_text = ""
+        if not texts:
+            return None
+        return TranscriptionResult(
+            text=" ".join(texts),
+            confidence=tail.confidence if tail is not None else 0.7,
+            is_final=True,
+            alternatives=[]
+        )
+
     def _on_speech_end(self, audio_bytes: bytes):
         """Called when speech ends - process what was heard."""
         self._state.is_listening = False
         start_time = time.time()
 
-        # Transcribe
-        result = self._stt.transcribe(audio_bytes)
+        # Transcribe (most of the work already happened while streaming)
+        if self._streamed:
+            result = self._finish_streamed()
+        else:
+            result = self._stt.transcribe(audio_bytes)
 
         if result and result.text:
             utterance = Utterance(
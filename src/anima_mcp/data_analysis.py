@@ -24,10 +24,15 @@ Data sources:
 import json
 import logging
 import sqlite3
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, List, Dict
 
+from . import storage
+from .identity import rollups
+from .identity.store import state_history_is_columnar
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,11 +43,8 @@ def _get_db_path() -> Path:
 
 
 def _connect() -> sqlite3.Connection:
-    """Open a read-only connection to anima.db."""
-    db_path = _get_db_path()
-    conn = sqlite3.connect(db_path, timeout=5.0)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Read-only connection to anima.db, pooled per thread (do not close)."""
+    return storage.read_connection(_get_db_path())
 
 
 def _safe_mean(values: List[float]) -> Optional[float]:
@@ -79,7 +81,6 @@ def get_drawing_summary() -> Optional[str]:
         rows = conn.execute(
             "SELECT * FROM drawing_records ORDER BY timestamp ASC"
         ).fetchall()
-        conn.close()
     except Exception:
         logger.warning("get_drawing_summary: DB query failed", exc_info=True)
         return None
@@ -123,7 +124,6 @@ def get_drawing_summary() -> Optional[str]:
             "SELECT AVG(warmth) as w, AVG(clarity) as c, AVG(stability) as s "
             "FROM state_history"
         ).fetchone()
-        conn.close()
         if baseline and baseline["w"] is not None:
             bw = baseline["w"]
             bs = baseline["s"]
@@ -176,7 +176,6 @@ def analyze_correlation(dimension: str,
     try:
         conn = _connect()
         rows = conn.execute("SELECT * FROM drawing_records").fetchall()
-        conn.close()
     except Exception:
         logger.warning("analyze_correlation: DB query failed", exc_info=True)
         return None
@@ -266,7 +265,6 @@ def analyze_drawing_effect(dimension: str) -> Optional[str]:
         ).fetchall()
 
         if not drawings:
-            conn.close()
             return None
 
         before_vals = []
@@ -300,7 +298,6 @@ def analyze_drawing_effect(dimension: str) -> Optional[str]:
             if after and after["val"] is not None:
                 after_vals.append(after["val"])
 
-        conn.close()
     except Exception:
         logger.warning("analyze_drawing_effect: DB query failed", exc_info=True)
         return None
@@ -347,7 +344,6 @@ def analyze_sleep_effects(dimension: str) -> Optional[str]:
         ).fetchall()
 
         if len(events) < 2:
-            conn.close()
             return None
 
         before_sleep_vals = []
@@ -389,7 +385,6 @@ def analyze_sleep_effects(dimension: str) -> Optional[str]:
                 if row and row["val"] is not None:
                     after_wake_vals.append(row["val"])
 
-        conn.close()
     except Exception:
         logger.warning("analyze_sleep_effects: DB query failed", exc_info=True)
         return None
@@ -433,12 +428,19 @@ def analyze_neural_correlation(dimension: str) -> Optional[str]:
 
     try:
         conn = _connect()
-        rows = conn.execute(
-            f"SELECT {col}, sensors FROM state_history "
-            "WHERE timestamp > ? AND sensors IS NOT NULL",
-            (cutoff,)
-        ).fetchall()
-        conn.close()
+        columnar = state_history_is_columnar(conn)
+        if columnar:
+            rows = conn.execute(
+                f"SELECT {col}, {', '.join(bands)} FROM state_history "
+                "WHERE ts_epoch > ?",
+                (int(time.time() - 7 * 86400),)
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                f"SELECT {col}, sensors FROM state_history "
+                "WHERE timestamp > ? AND sensors IS NOT NULL",
+                (cutoff,)
+            ).fetchall()
     except Exception:
         logger.warning("analyze_neural_correlation: DB query failed", exc_info=True)
         return None
@@ -452,12 +454,15 @@ def analyze_neural_correlation(dimension: str) -> Optional[str]:
         dim_val = row[col]
         if dim_val is None:
             continue
-        try:
-            sensors = json.loads(row["sensors"]) if row["sensors"] else {}
-        except (json.JSONDecodeError, TypeError):
-            continue
+        if columnar:
+            sensors = row
+        else:
+            try:
+                sensors = json.loads(row["sensors"]) if row["sensors"] else {}
+            except (json.JSONDecodeError, TypeError):
+                continue
         for b in bands:
-            bv = sensors.get(b)
+            bv = sensors[b] if columnar else sensors.get(b)
             if bv is not None:
                 band_pairs[b].append((dim_val, bv))
 
@@ -513,34 +518,46 @@ def analyze_pressure_effect(dimension: str) -> Optional[str]:
 
     try:
         conn = _connect()
-        rows = conn.execute(
-            f"SELECT {col}, sensors FROM state_history "
-            "WHERE sensors IS NOT NULL"
-        ).fetchall()
-        conn.close()
+        if rollups.is_current(conn, "state_history"):
+            # Pressure barely moves within an hour: split hourly buckets by mean pressure
+            return _pressure_effect_from_rollups(conn, col, dimension)
+        columnar = state_history_is_columnar(conn)
+        if columnar:
+            # Already sorted by pressure via idx_state_history_pressure
+            pairs = [tuple(r) for r in conn.execute(
+                f"SELECT {col}, pressure_hpa FROM state_history "
+                f"WHERE pressure_hpa IS NOT NULL AND {col} IS NOT NULL "
+                "ORDER BY pressure_hpa"
+            )]
+        else:
+            rows = conn.execute(
+                f"SELECT {col}, sensors FROM state_history "
+                "WHERE sensors IS NOT NULL"
+            ).fetchall()
     except Exception:
         logger.warning("analyze_pressure_effect: DB query failed", exc_info=True)
         return None
 
-    # Extract (dim_val, pressure) pairs
-    pairs = []
-    for row in rows:
-        dim_val = row[col]
-        if dim_val is None:
-            continue
-        try:
-            sensors = json.loads(row["sensors"]) if row["sensors"] else {}
-        except (json.JSONDecodeError, TypeError):
-            continue
-        p = sensors.get("pressure_hpa")
-        if p is not None:
-            pairs.append((dim_val, p))
+    if not columnar:
+        # Extract (dim_val, pressure) pairs
+        pairs = []
+        for row in rows:
+            dim_val = row[col]
+            if dim_val is None:
+                continue
+            try:
+                sensors = json.loads(row["sensors"]) if row["sensors"] else {}
+            except (json.JSONDecodeError, TypeError):
+                continue
+            p = sensors.get("pressure_hpa")
+            if p is not None:
+                pairs.append((dim_val, p))
+        pairs.sort(key=lambda x: x[1])
 
     if len(pairs) < 30:
         return None
 
-    # Sort by pressure, split into thirds
-    pairs.sort(key=lambda x: x[1])
+    # Split into pressure thirds
     third = len(pairs) // 3
     low = pairs[:third]
     mid = pairs[third:2 * third]
@@ -561,11 +578,52 @@ def analyze_pressure_effect(dimension: str) -> Optional[str]:
             f"mid={_fmt(avg_mid)} (n={len(pairs)})")
 
 
+def _pressure_effect_from_rollups(conn: sqlite3.Connection, col: str, dimension: str) -> Optional[str]:
+    """analyze_pressure_effect over hourly rollups, thirds split by reading count."""
+    groups = sorted(rollups.paired_means(conn, "state_history", "pressure_hpa", col, rollups.HOUR))
+    total = sum(n for _, _, n in groups)
+    if total < 30:
+        return None
+
+    # Thirds by cumulative reading count: (sum, n, first pressure, last pressure) each
+    thirds = [[0.0, 0, None, None] for _ in range(3)]
+    seen = 0
+    for pressure, value_sum, n in groups:
+        t = thirds[min(2, seen * 3 // total)]
+        t[0] += value_sum
+        t[1] += n
+        t[2] = pressure if t[2] is None else t[2]
+        t[3] = pressure
+        seen += n
+    low, mid, high = thirds
+    if not low[1] or not high[1]:
+        return None
+
+    avg_mid = mid[0] / mid[1] if mid[1] else None
+    return (f"When pressure is high (>{high[2]:.0f} hPa), my {dimension} averages "
+            f"{_fmt(high[0] / high[1])} vs {_fmt(low[0] / low[1])} at low pressure (<{low[3]:.0f} hPa), "
+            f"mid={_fmt(avg_mid)} (n={total})")
+
+
+def _edge_sum(bucket_rows, count: int):
+    """Sum of the first count readings across (bucket, n, sum, ...) rows (partial bucket at its mean)."""
+    total = 0.0
+    remaining = count
+    for row in bucket_rows:
+        n, bucket_sum = row[1], row[2]
+        take = min(n, remaining)
+        total += bucket_sum * take / n
+        remaining -= take
+        if not remaining:
+            break
+    return total
+
+
 def analyze_session_trajectory(dimension: str) -> Optional[str]:
     """How does anima drift over a single awake session?
 
     For each wake-to-sleep session, compares the first 20% of readings
-    vs the last 20%.
+    vs the last 20%. Recent sessions are read from minute rollups.
     """
     col = _valid_dim(dimension)
     if not col:
@@ -579,11 +637,13 @@ def analyze_session_trajectory(dimension: str) -> Optional[str]:
         ).fetchall()
 
         if len(events) < 2:
-            conn.close()
             return None
 
-        first_20_vals = []
-        last_20_vals = []
+        use_rollups = rollups.is_current(conn, "state_history")
+        minute_cutoff = time.time() - rollups.MINUTE_RETENTION_S
+        # Running (sum, count) of the first and last 20% of each session
+        first_sum = last_sum = 0.0
+        first_n = last_n = 0
 
         # Walk events: find wake->sleep pairs
         for i in range(len(events) - 1):
@@ -593,6 +653,25 @@ def analyze_session_trajectory(dimension: str) -> Optional[str]:
             end_ts = events[i + 1]["timestamp"]
             wake_ts = events[i]["timestamp"]
 
+            span = None
+            if use_rollups:
+                try:
+                    span = (datetime.fromisoformat(wake_ts).timestamp(),
+                            datetime.fromisoformat(end_ts).timestamp())
+                except (ValueError, TypeError):
+                    span = None
+            if span is not None and span[0] >= minute_cutoff:
+                minutes = rollups.buckets(conn, "state_history", col, rollups.MINUTE, *span)
+                count = sum(r[1] for r in minutes)
+                if count < 10:
+                    continue
+                cut = max(1, count // 5)
+                first_sum += _edge_sum(minutes, cut)
+                last_sum += _edge_sum(reversed(minutes), cut)
+                first_n += cut
+                last_n += cut
+                continue
+
             states = conn.execute(
                 f"SELECT {col} FROM state_history "
                 "WHERE timestamp BETWEEN ? AND ? ORDER BY timestamp ASC",
@@ -604,21 +683,20 @@ def analyze_session_trajectory(dimension: str) -> Optional[str]:
                 continue
 
             cut = max(1, len(vals) // 5)
-            first_20_vals.extend(vals[:cut])
-            last_20_vals.extend(vals[-cut:])
+            first_sum += sum(vals[:cut])
+            last_sum += sum(vals[-cut:])
+            first_n += cut
+            last_n += cut
 
-        conn.close()
     except Exception:
         logger.warning("analyze_session_trajectory: DB query failed", exc_info=True)
         return None
 
-    if not first_20_vals or not last_20_vals:
+    if not first_n or not last_n:
         return None
 
-    avg_start = _safe_mean(first_20_vals)
-    avg_end = _safe_mean(last_20_vals)
-    if avg_start is None or avg_end is None:
-        return None
+    avg_start = first_sum / first_n
+    avg_end = last_sum / last_n
 
     diff = avg_end - avg_start
     if abs(diff) < 0.02:
@@ -641,50 +719,65 @@ def analyze_temporal_full(dimension: str) -> Optional[str]:
 
     try:
         conn = _connect()
-        rows = conn.execute(
-            f"SELECT timestamp, {col} FROM state_history "
-            f"WHERE {col} IS NOT NULL"
-        ).fetchall()
-        conn.close()
+        if rollups.is_current(conn, "state_history"):
+            # Hourly rollups: a few rows per day instead of every reading
+            hourly = conn.execute(
+                "SELECT CAST(strftime('%H', bucket, 'unixepoch', 'localtime') AS INTEGER), "
+                "SUM(sum), SUM(n) FROM rollups "
+                "WHERE source = 'state_history' AND resolution = ? AND field = ? GROUP BY 1",
+                (rollups.HOUR, col)
+            ).fetchall()
+        elif state_history_is_columnar(conn):
+            # Per-hour (sum, count) aggregated in SQLite — no per-row work here
+            hourly = conn.execute(
+                f"SELECT CAST(strftime('%H', ts_epoch, 'unixepoch', 'localtime') AS INTEGER), "
+                f"SUM({col}), COUNT({col}) FROM state_history "
+                f"WHERE {col} IS NOT NULL AND ts_epoch > 0 GROUP BY 1"
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                f"SELECT timestamp, {col} FROM state_history "
+                f"WHERE {col} IS NOT NULL"
+            ).fetchall()
+            hourly = []
+            for row in rows:
+                try:
+                    h = datetime.fromisoformat(row["timestamp"]).hour
+                except (ValueError, TypeError):
+                    continue
+                hourly.append((h, row[col], 1))
     except Exception:
         logger.warning("analyze_temporal_full: DB query failed", exc_info=True)
         return None
 
-    if len(rows) < 50:
+    if sum(n for _, _, n in hourly) < 50:
         return None
 
+    # period -> [sum, count]
     buckets: Dict[str, List[float]] = {
-        "night (22-6)": [], "morning (6-12)": [],
-        "afternoon (12-18)": [], "evening (18-22)": [],
+        "night (22-6)": [0.0, 0], "morning (6-12)": [0.0, 0],
+        "afternoon (12-18)": [0.0, 0], "evening (18-22)": [0.0, 0],
     }
 
-    for row in rows:
-        val = row[col]
-        ts = row["timestamp"]
-        try:
-            h = datetime.fromisoformat(ts).hour
-        except (ValueError, TypeError):
-            continue
-
+    for h, total, n in hourly:
         if 22 <= h or h < 6:
-            buckets["night (22-6)"].append(val)
+            period = "night (22-6)"
         elif h < 12:
-            buckets["morning (6-12)"].append(val)
+            period = "morning (6-12)"
         elif h < 18:
-            buckets["afternoon (12-18)"].append(val)
+            period = "afternoon (12-18)"
         else:
-            buckets["evening (18-22)"].append(val)
+            period = "evening (18-22)"
+        buckets[period][0] += total
+        buckets[period][1] += n
 
-    parts = []
-    for period, vals in buckets.items():
-        if vals:
-            parts.append(f"{period}: {_fmt(_safe_mean(vals))} (n={len(vals)})")
+    avgs = {p: total / n for p, (total, n) in buckets.items() if n}
+    parts = [f"{p}: {_fmt(avgs[p])} (n={buckets[p][1]})" for p in avgs]
 
     if not parts:
         return None
 
     # Find peak period
-    avgs = {p: _safe_mean(v) for p, v in buckets.items() if v}
     peak = max(avgs, key=lambda k: avgs[k] or 0)
 
     return (f"My {dimension} across all data by time of day: {', '.join(parts)}. "
@@ -709,7 +802,6 @@ def analyze_crash_vs_clean(dimension: str) -> Optional[str]:
         ).fetchall()
 
         if len(events) < 4:
-            conn.close()
             return None
 
         clean_vals = []
@@ -749,7 +841,6 @@ def analyze_crash_vs_clean(dimension: str) -> Optional[str]:
                 else:
                     crash_vals.append(row["val"])
 
-        conn.close()
     except Exception:
         logger.warning("analyze_crash_vs_clean: DB query failed", exc_info=True)
         return None
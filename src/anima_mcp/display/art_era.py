@@ -80,7 +80,9 @@ class ArtEra(Protocol):
     ) -> None:
         """Place a mark at the focus point using the active gesture.
 
-        Calls canvas.draw_pixel(x, y, color) for each pixel.
+        Draws through canvas.draw_pixel(x, y, color) for single pixels and
+        canvas.draw_points / canvas.draw_mask for multi-pixel marks (the
+        canvas clips to its bounds).
         Energy modulates mark scale (high = bold, low = delicate).
         Direction is the current heading (radians) for directional gestures.
         """
@@ -20,9 +20,16 @@ import json
 import math
 import random
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 from ..atomic_write import atomic_json_write
 from ..anima import Anima
 from ..expression_moods import ExpressionMoodTracker
+from .pixel_grid import PixelGrid, is_single_color
 
 
 def _get_drawing_bridge():
@@ -41,12 +48,18 @@ def _get_canvas_path() -> Path:
     return anima_dir / "canvas.json"
 
 
+def _get_canvas_pixels_path() -> Path:
+    """Get persistent path for the canvas pixel PNG (sits beside canvas.json)."""
+    path = _get_canvas_path()
+    return path.with_name(f"{path.stem}_pixels.png")
+
+
 @dataclass
 class CanvasState:
     """Drawing canvas state for notepad mode - persists across restarts."""
     width: int = 240
     height: int = 240
-    pixels: Dict[Tuple[int, int], Tuple[int, int, int]] = field(default_factory=dict)
+    pixels: Optional[PixelGrid] = None  # (x, y) -> (r, g, b) mapping; built in __post_init__
     # Drawing memory - helps Lumen build on previous work
     recent_locations: List[Tuple[int, int]] = field(default_factory=list)
     drawing_phase: str = "opening"  # opening, developing, resolving, closing
@@ -87,6 +100,13 @@ class CanvasState:
     _dirty: bool = True  # Set by draw_pixel(), cleared after render
     _cached_image: object = None  # Cached PIL Image of all pixels
     _new_pixels: list = field(default_factory=list)  # Pixels added since last render
+    _saved_pixels_version: int = -1  # pixels.version last written to the PNG
+
+    def __post_init__(self):
+        if not isinstance(self.pixels, PixelGrid):
+            initial = self.pixels or {}
+            self.pixels = PixelGrid(self.width, self.height)
+            self.pixels.update(initial)
 
     def draw_pixel(self, x: int, y: int, color: Tuple[int, int, int]):
         """Draw a pixel at position."""
@@ -101,6 +121,47 @@ class CanvasState:
             # Drawing resets satisfaction
             self.is_satisfied = False
 
+    def draw_points(self, xs, ys, colors):
+        """Draw many pixels in one call (same effect as draw_pixel per point).
+
+        colors is a single (r, g, b) or one color per point. Out-of-bounds
+        points are skipped.
+        """
+        written = self.pixels.set_many(xs, ys, colors)
+        if not written:
+            return
+        self._new_pixels.extend(written)
+        self._dirty = True
+        self.recent_locations.extend((x, y) for x, y, _ in written[-20:])
+        del self.recent_locations[:-20]
+        self.is_satisfied = False
+
+    def draw_mask(self, x0: int, y0: int, mask, colors):
+        """Draw every set cell of a 2-D mask with its top-left corner at (x0, y0).
+
+        mask is indexed [row][col] (a NumPy bool array or nested lists).
+        colors is a single (r, g, b) or an array of colors shaped like the
+        mask (only cells where the mask is set are used).
+        """
+        if HAS_NUMPY:
+            m = np.asarray(mask, dtype=bool)
+            rows, cols = np.nonzero(m)
+            if not is_single_color(colors):
+                colors = np.asarray(colors).reshape(m.shape + (3,))[rows, cols]
+            self.draw_points(cols + x0, rows + y0, colors)
+            return
+
+        single = is_single_color(colors)
+        xs, ys, cs = [], [], []
+        for r, row in enumerate(mask):
+            for c, on in enumerate(row):
+                if on:
+                    xs.append(x0 + c)
+                    ys.append(y0 + r)
+                    if not single:
+                        cs.append(colors[r][c])
+        self.draw_points(xs, ys, colors if single else cs)
+
     def clear(self):
         """Clear the canvas."""
         self.pixels.clear()
@@ -152,12 +213,8 @@ class CanvasState:
             coverage = 1.0  # Sweet spot: 5-25%
 
         # Balance score: spatial distribution across quadrants
-        # Divide canvas into 4 quadrants and check for reasonable distribution
-        quadrants = [0, 0, 0, 0]
-        mid_x, mid_y = self.width // 2, self.height // 2
-        for (x, y) in self.pixels.keys():
-            quad = (0 if x < mid_x else 1) + (0 if y < mid_y else 2)
-            quadrants[quad] += 1
+        # (counts are maintained by the pixel grid as pixels are drawn)
+        quadrants = self.pixels.quadrant_counts()
 
         total = len(self.pixels)
         quadrant_ratios = [q / total for q in quadrants]
@@ -175,6 +232,26 @@ class CanvasState:
         satisfaction = 0.4 * coverage + 0.3 * balance + 0.3 * coherence
         return min(1.0, max(0.0, satisfaction))
 
+    def composition_stats(self) -> Dict[str, object]:
+        """Running composition aggregates (O(1), no pixel scan).
+
+        - occupied: pixel count; quadrants: (TL, TR, BL, BR) counts
+        - density_grid: 8x8 occupied counts, as rows
+        - spread: fraction of density cells holding at least 1% of the pixels
+        - color_bins_used: coarse color bins in use (of 64)
+        """
+        total = len(self.pixels)
+        grid = self.pixels.density_grid()
+        threshold = max(1, total // 100)
+        cells = [n for row in grid for n in row]
+        return {
+            "occupied": total,
+            "quadrants": list(self.pixels.quadrant_counts()),
+            "density_grid": grid,
+            "spread": round(sum(1 for n in cells if n >= threshold) / len(cells), 3) if total else 0.0,
+            "color_bins_used": sum(1 for n in self.pixels.color_histogram() if n),
+        }
+
     def mark_satisfied(self):
         """Mark that Lumen feels satisfied with current drawing."""
         if not self.is_satisfied:
@@ -185,10 +262,14 @@ class CanvasState:
     def save_to_disk(self):
         """Persist canvas state to disk."""
         try:
-            # Convert pixel dict keys to strings for JSON
-            pixel_data = {f"{x},{y}": list(color) for (x, y), color in self.pixels.items()}
+            # Pixels go to a PNG beside the JSON, re-encoded only when they changed
+            pixels_path = _get_canvas_pixels_path()
+            if self.pixels.version != self._saved_pixels_version or not pixels_path.exists():
+                self.pixels.save_png(pixels_path)
+                self._saved_pixels_version = self.pixels.version
             data = {
-                "pixels": pixel_data,
+                "pixels_file": pixels_path.name,
+                "pixel_count": len(self.pixels),
                 "recent_locations": self.recent_locations,
                 "drawing_phase": self.drawing_phase,
                 "phase_start_time": self.phase_start_time,
@@ -254,7 +335,17 @@ class CanvasState:
         # Load pixels with validation
         loaded_pixels = 0
         skipped_pixels = 0
+        pixels_file = data.get("pixels_file")
+        if isinstance(pixels_file, str) and pixels_file:
+            try:
+                pixels_path = path.with_name(Path(pixels_file).name)
+                loaded_pixels = self.pixels.load_png(pixels_path)
+                self._saved_pixels_version = self.pixels.version
+            except Exception as e:
+                self.pixels.clear()
+                print(f"[Canvas] Error loading pixel image: {e}", file=sys.stderr, flush=True)
         try:
+            # Legacy format: {"x,y": [r, g, b]} inline in the JSON
             pixels_data = data.get("pixels", {})
             if isinstance(pixels_data, dict):
                 for key, color in pixels_data.items():
@@ -1373,19 +1464,12 @@ class DrawingEngine:
             return None
 
         try:
-            from PIL import Image
-
             # Create drawings directory
             drawings_dir = Path.home() / ".anima" / "drawings"
             drawings_dir.mkdir(parents=True, exist_ok=True)
 
-            # Create image from canvas
-            img = Image.new("RGB", (self.canvas.width, self.canvas.height), (0, 0, 0))
-
-            # Draw all pixels
-            for (x, y), color in self.canvas.pixels.items():
-                if 0 <= x < self.canvas.width and 0 <= y < self.canvas.height:
-                    img.putpixel((x, y), color)
+            # Create image from canvas (unset pixels are black)
+            img = self.canvas.pixels.to_image().copy()
 
             # Generate filename with timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1396,7 +1480,7 @@ class DrawingEngine:
 
             # Atomic save: write to temp file, then rename to prevent 0-byte files on crash
             tmp_path = filepath.with_suffix(".tmp")
-            img.save(tmp_path)
+            img.save(tmp_path, format="PNG")  # .tmp suffix: format can't be inferred
             tmp_path.rename(filepath)
 
             # Update tracking
@@ -141,16 +141,15 @@ class FieldEra:
         elif gesture == "flow_dash":
             # 3-6 pixel line along field direction
             length = random.randint(3, 6)
-            for i in range(length):
-                px = int(x + math.cos(field_dir) * i)
-                py = int(y + math.sin(field_dir) * i)
-                if 0 <= px < 240 and 0 <= py < 240:
-                    canvas.draw_pixel(px, py, color)
+            xs = [int(x + math.cos(field_dir) * i) for i in range(length)]
+            ys = [int(y + math.sin(field_dir) * i) for i in range(length)]
+            canvas.draw_points(xs, ys, color)
 
         elif gesture == "flow_strand":
             # 8-15 pixel curve following field, with slight drift
             length = random.randint(8, 15)
             cx, cy = float(x), float(y)
+            xs, ys = [], []
             for i in range(length):
                 # Re-sample field direction at each step for organic curves
                 local_dir = self._field_angle(state, cx, cy)
@@ -158,9 +157,9 @@ class FieldEra:
                 local_dir += random.gauss(0, 0.15)
                 cx += math.cos(local_dir) * 1.2
                 cy += math.sin(local_dir) * 1.2
-                px, py = int(cx), int(cy)
-                if 0 <= px < 240 and 0 <= py < 240:
-                    canvas.draw_pixel(px, py, color)
+                xs.append(int(cx))
+                ys.append(int(cy))
+            canvas.draw_points(xs, ys, color)
 
     def drift_focus(
         self,
@@ -15,7 +15,12 @@ import random
 from dataclasses import dataclass
 from typing import List, Tuple
 
+from .. import raster
 from ..art_era import EraState
+from ..raster import HAS_NUMPY
+
+if HAS_NUMPY:
+    import numpy as np
 
 
 @dataclass
@@ -187,38 +192,32 @@ class GeometricEra:
             self._draw_drip(canvas, cx, cy, length, color, wobble)
 
     # --- Shape drawing methods ---
+    # Each shape is rasterized whole and handed to the canvas in one
+    # draw_mask/draw_points call (the canvas clips to its bounds).
 
     def _draw_circle(self, canvas, cx, cy, radius, color):
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                if dx * dx + dy * dy <= radius * radius:
-                    px, py = cx + dx, cy + dy
-                    if 0 <= px < 240 and 0 <= py < 240:
-                        canvas.draw_pixel(px, py, color)
+        canvas.draw_mask(cx - radius, cy - radius, raster.disc_mask(radius), color)
 
     def _draw_circle_gradient(self, canvas, cx, cy, radius, color, clarity):
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                dist_sq = dx * dx + dy * dy
-                if dist_sq <= radius * radius:
-                    dist = math.sqrt(dist_sq)
-                    gradient = 1.0 - (dist / max(radius, 1)) * 0.4
-                    gradient = gradient * (0.7 + clarity * 0.3)
-                    c = tuple(int(v * gradient) for v in color)
-                    px, py = cx + dx, cy + dy
-                    if 0 <= px < 240 and 0 <= py < 240:
-                        canvas.draw_pixel(px, py, c)
+        if HAS_NUMPY:
+            gradient = 1.0 - (raster.disc_distances(radius) / max(radius, 1)) * 0.4
+            gradient = gradient * (0.7 + clarity * 0.3)
+        else:
+            gradient = [[(1.0 - (d / max(radius, 1)) * 0.4) * (0.7 + clarity * 0.3) for d in row]
+                        for row in raster.disc_distances(radius)]
+        canvas.draw_mask(cx - radius, cy - radius, raster.disc_mask(radius),
+                         raster.shade(color, gradient))
 
     def _draw_spiral(self, canvas, cx, cy, max_radius, color, tightness):
         turns = 2 + int(tightness * 3)
         steps = turns * 20
+        xs, ys = [], []
         for i in range(steps):
             angle = i * 2 * math.pi / 20
             radius = (i / max(steps, 1)) * max_radius
-            x = int(cx + radius * math.cos(angle))
-            y = int(cy + radius * math.sin(angle))
-            if 0 <= x < 240 and 0 <= y < 240:
-                canvas.draw_pixel(x, y, color)
+            xs.append(int(cx + radius * math.cos(angle)))
+            ys.append(int(cy + radius * math.sin(angle)))
+        canvas.draw_points(xs, ys, color)
 
     def _draw_line(self, canvas, x1, y1, x2, y2, color):
         dx = abs(x2 - x1)
@@ -227,9 +226,10 @@ class GeometricEra:
         sy = 1 if y1 < y2 else -1
         err = dx - dy
         x, y = x1, y1
+        xs, ys = [], []
         for _ in range(max(dx, dy) + 1):
-            if 0 <= x < 240 and 0 <= y < 240:
-                canvas.draw_pixel(x, y, color)
+            xs.append(x)
+            ys.append(y)
             if x == x2 and y == y2:
                 break
             e2 = 2 * err
@@ -239,123 +239,127 @@ class GeometricEra:
             if e2 < dx:
                 err += dx
                 y += sy
+        canvas.draw_points(xs, ys, color)
 
     def _draw_curve(self, canvas, x1, y1, x2, y2, color, width):
         mid_x = (x1 + x2) // 2 + random.randint(-30, 30)
         mid_y = (y1 + y2) // 2 + random.randint(-30, 30)
         steps = 20
+        offsets = range(-width // 2, width // 2 + 1)
+        xs, ys = [], []
         for i in range(steps + 1):
             t = i / steps
             x = int((1 - t) * (1 - t) * x1 + 2 * (1 - t) * t * mid_x + t * t * x2)
             y = int((1 - t) * (1 - t) * y1 + 2 * (1 - t) * t * mid_y + t * t * y2)
-            for wx in range(-width // 2, width // 2 + 1):
-                for wy in range(-width // 2, width // 2 + 1):
-                    px, py = x + wx, y + wy
-                    if 0 <= px < 240 and 0 <= py < 240:
-                        canvas.draw_pixel(px, py, color)
+            for wx in offsets:
+                for wy in offsets:
+                    xs.append(x + wx)
+                    ys.append(y + wy)
+        canvas.draw_points(xs, ys, color)
 
     def _draw_arc(self, canvas, cx, cy, radius, start_angle, arc_length, color):
         steps = max(1, int(arc_length * radius / 2))
+        xs, ys = [], []
         for i in range(steps):
             angle = start_angle + (i / max(steps, 1)) * arc_length
-            x = int(cx + radius * math.cos(angle))
-            y = int(cy + radius * math.sin(angle))
-            if 0 <= x < 240 and 0 <= y < 240:
-                canvas.draw_pixel(x, y, color)
+            xs.append(int(cx + radius * math.cos(angle)))
+            ys.append(int(cy + radius * math.sin(angle)))
+        canvas.draw_points(xs, ys, color)
 
     def _draw_wave(self, canvas, start_x, y_center, amplitude, wavelength, color):
+        xs, ys = [], []
         for x in range(max(0, start_x), min(240, start_x + 100)):
             y = int(y_center + amplitude * math.sin(
                 (x - start_x) * 2 * math.pi / max(wavelength, 1)))
-            if 0 <= y < 240:
-                canvas.draw_pixel(x, y, color)
-            if 0 <= y + 1 < 240:
-                canvas.draw_pixel(x, y + 1, color)
+            xs += (x, x)
+            ys += (y, y + 1)
+        canvas.draw_points(xs, ys, color)
 
     def _draw_rings(self, canvas, cx, cy, num_rings, max_radius, color):
+        xs, ys = [], []
         for ring in range(1, num_rings + 1):
             radius = int(ring * max_radius / num_rings)
             for angle_deg in range(0, 360, 3):
                 rad = math.radians(angle_deg)
-                x = int(cx + radius * math.cos(rad))
-                y = int(cy + radius * math.sin(rad))
-                if 0 <= x < 240 and 0 <= y < 240:
-                    canvas.draw_pixel(x, y, color)
+                xs.append(int(cx + radius * math.cos(rad)))
+                ys.append(int(cy + radius * math.sin(rad)))
+        canvas.draw_points(xs, ys, color)
 
     def _draw_starburst(self, canvas, cx, cy, num_rays, ray_length, color):
+        xs, ys = [], []
         for i in range(num_rays):
             angle = (i / num_rays) * 2 * math.pi
             for r in range(1, ray_length + 1):
-                x = int(cx + r * math.cos(angle))
-                y = int(cy + r * math.sin(angle))
-                if 0 <= x < 240 and 0 <= y < 240:
-                    canvas.draw_pixel(x, y, color)
-        if 0 <= cx < 240 and 0 <= cy < 240:
-            canvas.draw_pixel(cx, cy, color)
+                xs.append(int(cx + r * math.cos(angle)))
+                ys.append(int(cy + r * math.sin(angle)))
+        xs.append(cx)
+        ys.append(cy)
+        canvas.draw_points(xs, ys, color)
 
     def _draw_pattern(self, canvas, cx, cy, size, color):
         pattern_type = random.choice(["cross", "star", "grid"])
+        xs, ys = [], []
         if pattern_type == "cross":
             for i in range(-size, size + 1):
-                if 0 <= cx + i < 240 and 0 <= cy < 240:
-                    canvas.draw_pixel(cx + i, cy, color)
-                if 0 <= cx < 240 and 0 <= cy + i < 240:
-                    canvas.draw_pixel(cx, cy + i, color)
+                xs += (cx + i, cx)
+                ys += (cy, cy + i)
         elif pattern_type == "star":
             for angle in [0, math.pi / 2, math.pi, 3 * math.pi / 2]:
                 for r in range(1, size + 1):
-                    x = int(cx + r * math.cos(angle))
-                    y = int(cy + r * math.sin(angle))
-                    if 0 <= x < 240 and 0 <= y < 240:
-                        canvas.draw_pixel(x, y, color)
+                    xs.append(int(cx + r * math.cos(angle)))
+                    ys.append(int(cy + r * math.sin(angle)))
         else:  # grid
             for i in range(-size, size + 1, 2):
                 for j in range(-size, size + 1, 2):
-                    x, y = cx + i, cy + j
-                    if 0 <= x < 240 and 0 <= y < 240:
-                        canvas.draw_pixel(x, y, color)
+                    xs.append(cx + i)
+                    ys.append(cy + j)
+        canvas.draw_points(xs, ys, color)
 
     def _draw_rectangle(self, canvas, cx, cy, width, height, color, filled):
         x1, y1 = cx - width // 2, cy - height // 2
         x2, y2 = cx + width // 2, cy + height // 2
         if filled:
-            for x in range(max(0, x1), min(240, x2 + 1)):
-                for y in range(max(0, y1), min(240, y2 + 1)):
-                    canvas.draw_pixel(x, y, color)
+            w, h = max(0, x2 - x1 + 1), max(0, y2 - y1 + 1)
+            mask = np.ones((h, w), dtype=bool) if HAS_NUMPY else [[True] * w] * h
+            canvas.draw_mask(x1, y1, mask, color)
         else:
-            for x in range(max(0, x1), min(240, x2 + 1)):
-                if 0 <= y1 < 240:
-                    canvas.draw_pixel(x, y1, color)
-                if 0 <= y2 < 240:
-                    canvas.draw_pixel(x, y2, color)
-            for y in range(max(0, y1), min(240, y2 + 1)):
-                if 0 <= x1 < 240:
-                    canvas.draw_pixel(x1, y, color)
-                if 0 <= x2 < 240:
-                    canvas.draw_pixel(x2, y, color)
+            xs, ys = [], []
+            for x in range(x1, x2 + 1):
+                xs += (x, x)
+                ys += (y1, y2)
+            for y in range(y1, y2 + 1):
+                xs += (x1, x2)
+                ys += (y, y)
+            canvas.draw_points(xs, ys, color)
 
     def _draw_triangle(self, canvas, cx, cy, size, color):
+        xs, ys = [], []
         for y_offset in range(size):
             width_at_y = int((y_offset / max(size, 1)) * size)
             y = cy + y_offset - size // 2
             for x_offset in range(-width_at_y // 2, width_at_y // 2 + 1):
-                x = cx + x_offset
-                if 0 <= x < 240 and 0 <= y < 240:
-                    canvas.draw_pixel(x, y, color)
+                xs.append(cx + x_offset)
+                ys.append(y)
+        canvas.draw_points(xs, ys, color)
 
     def _draw_organic(self, canvas, cx, cy, color, energy, scale):
         # Radius scaled for 240×240 canvas: 3-8px produces 28-200px marks,
         # comparable to other eras. Previous values (8-34px) filled 20%+ of
         # the 15,000px canvas cap in a single mark.
         base_radius = int((3 + energy * 5) * scale)
-        for dx in range(-base_radius, base_radius + 1):
-            for dy in range(-base_radius, base_radius + 1):
-                px, py = cx + dx, cy + dy
-                if 0 <= px < 240 and 0 <= py < 240:
-                    dist = math.sqrt(dx * dx + dy * dy)
-                    if dist < base_radius * 1.1:
-                        if random.random() < 0.75:
-                            canvas.draw_pixel(px, py, color)
+        x0, y0 = cx - base_radius, cy - base_radius
+        disc = raster.disc_mask(base_radius, reach=base_radius * 1.1)
+        # Only on-canvas cells get a coin flip (keeps the RNG stream per mark)
+        if HAS_NUMPY:
+            disc = disc.copy()
+            disc[:, :max(0, -x0)] = False
+            disc[:, max(0, 240 - x0):] = False
+            disc[:max(0, -y0), :] = False
+            disc[max(0, 240 - y0):, :] = False
+        else:
+            disc = [[on and 0 <= x0 + c < 240 and 0 <= y0 + r < 240 for c, on in enumerate(row)]
+                    for r, row in enumerate(disc)]
+        canvas.draw_mask(x0, y0, raster.random_subset(disc, 0.75, random.random), color)
 
     def _draw_layered(self, canvas, cx, cy, color, energy, scale):
         num_elements = random.randint(2, 3)
@@ -375,27 +379,28 @@ class GeometricEra:
                     size = int((2 + energy * 3) * scale)
                     self._draw_pattern(canvas, ox, oy, size, layer_color)
             else:
+                xs, ys = [], []
                 for _ in range(random.randint(2, 4)):
-                    dx = ox + random.randint(-10, 10)
-                    dy = oy + random.randint(-10, 10)
-                    if 0 <= dx < 240 and 0 <= dy < 240:
-                        canvas.draw_pixel(dx, dy, layer_color)
+                    xs.append(ox + random.randint(-10, 10))
+                    ys.append(oy + random.randint(-10, 10))
+                canvas.draw_points(xs, ys, layer_color)
 
     def _draw_scatter(self, canvas, cx, cy, num_particles, spread, color):
+        xs, ys = [], []
         for _ in range(num_particles):
-            dx = int(random.gauss(0, spread / 3))
-            dy = int(random.gauss(0, spread / 3))
-            x, y = cx + dx, cy + dy
-            if 0 <= x < 240 and 0 <= y < 240:
-                canvas.draw_pixel(x, y, color)
+            xs.append(cx + int(random.gauss(0, spread / 3)))
+            ys.append(cy + int(random.gauss(0, spread / 3)))
+        canvas.draw_points(xs, ys, color)
 
     def _draw_drip(self, canvas, x, start_y, length, color, wobble):
         current_x = x
+        xs, ys = [], []
         for y in range(start_y, min(240, start_y + length)):
-            if 0 <= current_x < 240:
-                canvas.draw_pixel(current_x, y, color)
+            xs.append(current_x)
+            ys.append(y)
             current_x += random.randint(-wobble, wobble)
             current_x = max(0, min(239, current_x))
+        canvas.draw_points(xs, ys, color)
 
     def drift_focus(
         self,
@@ -87,54 +87,51 @@ class GesturalEra:
 
         if gesture == "dot":
             if 0 <= x < 240 and 0 <= y < 240:
-                canvas.draw_pixel(x, y, color)
+                xs, ys = [x], [y]
                 # High energy: dots become 2-3px clusters
                 if scale > 1.2 and random.random() < 0.5:
                     for dx, dy in [(1, 0), (0, 1), (-1, 0), (0, -1)]:
                         if random.random() < scale - 1.0:
-                            px, py = x + dx, y + dy
-                            if 0 <= px < 240 and 0 <= py < 240:
-                                canvas.draw_pixel(px, py, color)
+                            xs.append(x + dx)
+                            ys.append(y + dy)
+                canvas.draw_points(xs, ys, color)
 
         elif gesture == "stroke":
             length = int(random.randint(2, 6) * scale)
             direction = direction  # passed via _direction attr
-            for i in range(length):
-                px = int(x + math.cos(direction) * i)
-                py = int(y + math.sin(direction) * i)
-                if 0 <= px < 240 and 0 <= py < 240:
-                    canvas.draw_pixel(px, py, color)
+            xs = [int(x + math.cos(direction) * i) for i in range(length)]
+            ys = [int(y + math.sin(direction) * i) for i in range(length)]
+            canvas.draw_points(xs, ys, color)
 
         elif gesture == "curve":
             length = int(random.randint(3, 8) * scale)
             angle = direction
             cx, cy = float(x), float(y)
             step_size = 1.0 + scale * 0.5  # bigger steps when bold
+            xs, ys = [], []
             for i in range(length):
                 angle += random.gauss(0, 0.3)
                 cx += math.cos(angle) * step_size
                 cy += math.sin(angle) * step_size
-                px, py = int(cx), int(cy)
-                if 0 <= px < 240 and 0 <= py < 240:
-                    canvas.draw_pixel(px, py, color)
+                xs.append(int(cx))
+                ys.append(int(cy))
+            canvas.draw_points(xs, ys, color)
 
         elif gesture == "cluster":
             count = int(random.randint(2, 5) * scale)
             spread = int(2 * scale)
+            xs, ys = [], []
             for _ in range(count):
-                px = x + random.randint(-spread, spread)
-                py = y + random.randint(-spread, spread)
-                if 0 <= px < 240 and 0 <= py < 240:
-                    canvas.draw_pixel(px, py, color)
+                xs.append(x + random.randint(-spread, spread))
+                ys.append(y + random.randint(-spread, spread))
+            canvas.draw_points(xs, ys, color)
 
         elif gesture == "drag":
             length = int(random.randint(8, 15) * scale)
             angle = direction + random.gauss(0, 0.1)
-            for i in range(length):
-                px = int(x + math.cos(angle) * i)
-                py = int(y + math.sin(angle) * i)
-                if 0 <= px < 240 and 0 <= py < 240:
-                    canvas.draw_pixel(px, py, color)
+            xs = [int(x + math.cos(angle) * i) for i in range(length)]
+            ys = [int(y + math.sin(angle) * i) for i in range(length)]
+            canvas.draw_points(xs, ys, color)
 
     def drift_focus(
         self,
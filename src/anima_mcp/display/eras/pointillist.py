@@ -98,26 +98,16 @@ class PointillistEra:
 
         elif gesture == "pair":
             # Two adjacent pixels
-            if 0 <= x < 240 and 0 <= y < 240:
-                canvas.draw_pixel(x, y, color)
             dx, dy = random.choice([(1, 0), (0, 1), (-1, 0), (0, -1)])
-            px, py = x + dx, y + dy
-            if 0 <= px < 240 and 0 <= py < 240:
-                canvas.draw_pixel(px, py, color)
+            canvas.draw_points((x, x + dx), (y, y + dy), color)
 
         elif gesture == "trio":
             # Three pixels in an L-shape
-            if 0 <= x < 240 and 0 <= y < 240:
-                canvas.draw_pixel(x, y, color)
             dx1, dy1 = random.choice([(1, 0), (0, 1), (-1, 0), (0, -1)])
             px1, py1 = x + dx1, y + dy1
-            if 0 <= px1 < 240 and 0 <= py1 < 240:
-                canvas.draw_pixel(px1, py1, color)
             # L-turn: perpendicular to first step
             dx2, dy2 = -dy1, dx1  # rotate 90 degrees
-            px2, py2 = px1 + dx2, py1 + dy2
-            if 0 <= px2 < 240 and 0 <= py2 < 240:
-                canvas.draw_pixel(px2, py2, color)
+            canvas.draw_points((x, px1, px1 + dx2), (y, py1, py1 + dy2), color)
 
     def drift_focus(
         self,
@@ -0,0 +1,231 @@
+"""
+Frame Stream - shared encoded-frame cache for remote screen viewers.
+
+Remote viewers used to poll capture_screen, which re-encoded the current
+frame to PNG and base64 on every call whether or not anything had changed,
+so each dashboard watching Lumen added its own encode cost on the Pi.
+
+The renderer publishes every frame it pushes (publish() only stores a
+reference, so it costs nothing when nobody is watching). Consumers
+resolve the latest published frame to a version number: a frame whose
+pixels match the previous one keeps its version. Encoded bytes are cached
+per (version, format), so one encode per changed frame serves capture_screen
+and every stream client alike.
+
+Stream clients (rest_api.rest_screen_stream) wait for a newer version,
+pace themselves to their own frame-rate cap, and always send the newest
+frame. A client slower than the frame rate therefore skips the versions
+published while it was still receiving (counted as dropped frames) instead
+of queueing them.
+"""
+
+import asyncio
+import base64
+import threading
+import time
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+
+FORMATS = {"png": "image/png", "jpeg": "image/jpeg"}
+JPEG_QUALITY = 85
+DEFAULT_STREAM_FPS = 4.0
+MAX_STREAM_FPS = 10.0
+MAX_STREAM_CLIENTS = 8
+
+
+class FrameHub:
+    """Latest rendered frame, its version, and its encodings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()        # Guards published/current frame state
+        self._encode_lock = threading.Lock() # One encode at a time; waiters then hit the cache
+        self._published = None               # Latest image from the renderer (unresolved)
+        self._image = None                   # Image behind the current version
+        self._raw: Optional[bytes] = None
+        self._version = 0
+        self._cache: Dict[str, bytes] = {}   # format -> encoded bytes for _version
+        self._b64_cache: Dict[str, str] = {}
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+        self._clients = 0
+
+        # Stats
+        self.publishes = 0
+        self.unchanged = 0
+        self.encodes: Dict[str, int] = {}
+        self.cache_hits = 0
+        self.frames_sent = 0
+        self.frames_dropped = 0
+
+    # -- producer -------------------------------------------------------------
+
+    def publish(self, image) -> None:
+        """Record the frame the renderer just pushed. Safe from any thread."""
+        if image is None:
+            return
+        with self._lock:
+            if image is self._published:
+                return
+            self._published = image
+            self.publishes += 1
+            waiters, self._waiters = self._waiters, []
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # Loop already closed
+
+    # -- consumers ------------------------------------------------------------
+
+    def current(self) -> Tuple[int, Any]:
+        """(version, image) of the latest frame; version 0 means none yet."""
+        with self._lock:
+            published = self._published
+            if published is not None and published is not self._image:
+                raw = published.tobytes()
+                if raw == self._raw and published.size == self._image.size:
+                    self.unchanged += 1
+                else:
+                    self._version += 1
+                    self._raw = raw
+                    self._cache = {}
+                    self._b64_cache = {}
+                self._image = published
+            return self._version, self._image
+
+    def encoded(self, fmt: str = "png", image=None) -> Tuple[int, bytes]:
+        """(version, bytes) of the current frame in fmt, encoding at most once per version.
+
+        If image is given and it isn't the current frame (e.g. a renderer that
+        never published), it is encoded without caching and version is 0.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"unsupported format {fmt!r}")
+        version, current = self.current()
+        if image is not None and image is not current:
+            return 0, _encode(image, fmt)
+        if current is None:
+            raise LookupError("no frame published yet")
+        with self._encode_lock:
+            with self._lock:
+                data = self._cache.get(fmt) if self._version == version else None
+            if data is not None:
+                self.cache_hits += 1
+                return version, data
+            data = _encode(current, fmt)
+            self.encodes[fmt] = self.encodes.get(fmt, 0) + 1
+            with self._lock:
+                if self._version == version:
+                    self._cache[fmt] = data
+            return version, data
+
+    def encoded_base64(self, fmt: str = "png", image=None) -> str:
+        """Base64 text of encoded(), cached alongside the bytes."""
+        version, data = self.encoded(fmt, image)
+        if not version:
+            return base64.b64encode(data).decode("ascii")
+        with self._lock:
+            text = self._b64_cache.get(fmt) if self._version == version else None
+        if text is None:
+            text = base64.b64encode(data).decode("ascii")
+            with self._lock:
+                if self._version == version:
+                    self._b64_cache[fmt] = text
+        return text
+
+    async def wait_newer(self, version: int, timeout: Optional[float] = None) -> int:
+        """Wait until the current version is newer than version; returns it (may equal on timeout)."""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            event = asyncio.Event()
+            with self._lock:
+                self._waiters.append((loop, event))
+            current, _ = self.current()
+            if current > version:
+                return current
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return current
+            try:
+                await asyncio.wait_for(event.wait(), remaining)
+            except asyncio.TimeoutError:
+                with self._lock:
+                    if (loop, event) in self._waiters:
+                        self._waiters.remove((loop, event))
+
+    # -- streaming ------------------------------------------------------------
+
+    def has_capacity(self) -> bool:
+        """Whether another stream client may connect."""
+        with self._lock:
+            return self._clients < MAX_STREAM_CLIENTS
+
+    async def stream(self, fmt: str = "jpeg", fps: float = DEFAULT_STREAM_FPS,
+                     boundary: str = "frame"):
+        """Multipart (MJPEG-style) body: one part per changed frame, at most fps per second.
+
+        Takes a client slot while iterating and ends immediately if all
+        MAX_STREAM_CLIENTS slots are taken.
+        """
+        with self._lock:
+            if self._clients >= MAX_STREAM_CLIENTS:
+                return
+            self._clients += 1
+        interval = 1.0 / max(0.1, min(fps, MAX_STREAM_FPS))
+        content_type = FORMATS[fmt]
+        sent_version = 0
+        last_sent = 0.0
+        try:
+            while True:
+                version = await self.wait_newer(sent_version, timeout=30.0)
+                if version <= sent_version:
+                    continue
+                wait = last_sent + interval - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                version, data = await asyncio.to_thread(self.encoded, fmt)
+                if sent_version:
+                    self.frames_dropped += max(0, version - sent_version - 1)
+                sent_version = version
+                last_sent = time.monotonic()
+                self.frames_sent += 1
+                # The yield blocks while the client drains; newer versions pile up as drops
+                yield (f"--{boundary}\r\nContent-Type: {content_type}\r\n"
+                       f"Content-Length: {len(data)}\r\n\r\n").encode("ascii") + data + b"\r\n"
+        finally:
+            with self._lock:
+                self._clients -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "version": self._version,
+                "publishes": self.publishes,
+                "unchanged": self.unchanged,
+                "encodes": dict(self.encodes),
+                "cache_hits": self.cache_hits,
+                "clients": self._clients,
+                "frames_sent": self.frames_sent,
+                "frames_dropped": self.frames_dropped,
+            }
+
+
+def _encode(image, fmt: str) -> bytes:
+    buffer = BytesIO()
+    if fmt == "jpeg":
+        image.convert("RGB").save(buffer, format="JPEG", quality=JPEG_QUALITY)
+    else:
+        image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+# Singleton instance
+_hub: Optional[FrameHub] = None
+
+
+def get_frame_hub() -> FrameHub:
+    """Get the frame hub singleton."""
+    global _hub
+    if _hub is None:
+        _hub = FrameHub()
+    return _hub
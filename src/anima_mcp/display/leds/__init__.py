@@ -6,7 +6,8 @@ Refactored into submodules:
 - colors: derive_led_state, get_shape_color_bias, blend_colors, transition_color
 - dances: DanceType, Dance, render_dance, EVENT_TO_DANCE
 - patterns: detect_state_change, get_pattern_colors
-- brightness: get_pulse, estimate_instantaneous_brightness
+- brightness: get_pulse, pulse_at, estimate_instantaneous_brightness
+- animation: AnimationEngine, PulseTable, compile_dance (frame tables, keyframe timelines)
 - display: LEDDisplay
 """
 
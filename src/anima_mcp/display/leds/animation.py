@@ -0,0 +1,302 @@
+"""Animation engine: precomputed breathing frames and keyframed dances.
+
+The animation thread used to wake every 250ms and recompute the per-LED
+sine modulation and pulse, then push a frame over SPI whether or not
+anything visible changed. Here the breathing waves are tabulated once
+per pulse cycle and each (colors, brightness) gets a frame table over
+one full breathing period, compared by what the DotStars would actually
+show, so the loop can skip identical frames and sleep until the next
+visible change. Dances and flashes are compiled
+into keyframe timelines that play at the loop's frame rate instead of
+at the anima update rate.
+
+Colors here are in DotStar order: (led2, led1, led0).
+"""
+
+import math
+from bisect import bisect_right
+from fractions import Fraction
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+
+from .brightness import BREATH_CYCLE, pulse_at
+from .dances import Dance, render_dance_at
+from .types import LEDState
+
+RGB = Tuple[int, int, int]
+Colors = Tuple[RGB, RGB, RGB]
+
+FRAME_STEP = 0.05          # Seconds between table entries / timeline keyframes (20fps)
+MAX_TABLE_PERIOD = 120.0   # Longest breathing period tabulated exactly
+MAX_IDLE_SLEEP = 1.0       # Upper bound on a sleep, so state changes are picked up
+
+
+def dotstar_colors(state: LEDState) -> Colors:
+    """LEDState colors in DotStar index order."""
+    return (state.led2, state.led1, state.led0)
+
+
+def combined_period(pulse_cycle: float) -> float:
+    """Smallest period after which both breath waves repeat.
+
+    Falls back to the primary cycle when the exact period would exceed
+    MAX_TABLE_PERIOD (the secondary wave then jumps slightly at the wrap).
+    """
+    a = Fraction(pulse_cycle).limit_denominator(100)
+    b = Fraction(BREATH_CYCLE).limit_denominator(100)
+    num = math.lcm(a.numerator * b.denominator, b.numerator * a.denominator)
+    period = num / (a.denominator * b.denominator)
+    return period if period <= MAX_TABLE_PERIOD else pulse_cycle
+
+
+class Frame(NamedTuple):
+    """One LED frame: colors before global brightness, plus that brightness."""
+    colors: Colors
+    brightness: float
+
+    def visible(self) -> Tuple[int, ...]:
+        """Bytes the DotStar driver shifts out (it scales each channel by brightness)."""
+        b = self.brightness
+        return tuple(int(v * b) for c in self.colors for v in c)
+
+
+class PulseTable:
+    """One breathing period of frames for fixed colors and brightness.
+
+    The color-independent waves (pulse and per-LED sine) are computed once
+    per pulse cycle and shared between tables. Frames are filled in lazily
+    as the loop reaches them and kept for the next period, so a table
+    costs nothing up front when colors or brightness change often.
+    """
+
+    def __init__(self, colors: Colors, brightness: float, base_brightness: float,
+                 pulse_cycle: float = 12.0, pulse_amount: float = 0.05,
+                 floor: float = 0.008, step: float = FRAME_STEP):
+        self.period = combined_period(pulse_cycle)
+        n = max(1, round(self.period / step))
+        self.step = self.period / n
+        self.colors = colors
+
+        self._brightness = max(floor, brightness)
+        self._floor = floor
+        self._amplitude = pulse_amount * min(1.0, max(0.15, self._brightness / 0.04))
+        self._cap = max(0.005, self._brightness * 0.08)
+        # Dim below base via RGB values (hardware brightness has a floor)
+        self._rgb_scale = min(1.0, self._brightness / base_brightness) if base_brightness > 0 else 1.0
+        self._pulses, self._waves = _breath_waves(pulse_cycle, self.period, n)
+        self._frames: List[Optional[Frame]] = [None] * n
+        self.filled = 0
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def _index(self, t: float) -> int:
+        return int((t % self.period) / self.step) % len(self._frames)
+
+    def _hardware_brightness(self, k: int) -> float:
+        pulse = min(self._pulses[k] * self._amplitude, self._cap)
+        return max(self._floor, min(0.5, self._brightness + pulse))
+
+    def _mods(self, k: int) -> Tuple[float, float, float]:
+        w0, w1, w2 = self._waves[k]
+        scale = self._rgb_scale
+        return (w0 * scale, w1 * scale, w2 * scale)
+
+    def _frame(self, k: int) -> Frame:
+        frame = self._frames[k]
+        if frame is None:
+            frame = self._frames[k] = Frame(_modulate(self.colors, self._mods(k)), self._hardware_brightness(k))
+            self.filled += 1
+        return frame
+
+    def frame_at(self, t: float) -> Frame:
+        return self._frame(self._index(t))
+
+    def apply(self, colors: Colors, t: float) -> Frame:
+        """Frame for other colors (a dance or flash) at this point of the breath."""
+        k = self._index(t)
+        return Frame(_modulate(colors, self._mods(k)), self._hardware_brightness(k))
+
+    def next_change(self, t: float, horizon: float = MAX_IDLE_SLEEP) -> float:
+        """Seconds from t until the base frame's visible output changes.
+
+        Looks at most `horizon` ahead and returns math.inf if nothing
+        changes within it.
+        """
+        n = len(self._frames)
+        k = self._index(t)
+        visible = self._frame(k).visible()
+        into_step = (t % self.period) - k * self.step
+        for ahead in range(1, min(n, math.ceil(horizon / self.step) + 1)):
+            if self._frame((k + ahead) % n).visible() != visible:
+                return max(0.0, ahead * self.step - into_step)
+        return math.inf
+
+
+@lru_cache(maxsize=8)
+def _breath_waves(pulse_cycle: float, period: float, n: int):
+    """Pulse value and per-LED sine modulation at each step (color independent)."""
+    step = period / n
+    phase_step = 2 * math.pi / pulse_cycle
+    offsets = [i * math.pi * 2 / 3 for i in range(3)]
+    pulses = []
+    waves = []
+    for k in range(n):
+        t = k * step
+        pulses.append(pulse_at(t, pulse_cycle))
+        waves.append(tuple(0.92 + 0.08 * math.sin(t * phase_step + o) for o in offsets))
+    return pulses, waves
+
+
+def _modulate(colors: Colors, mods) -> Colors:
+    return tuple(
+        tuple(max(0, min(255, int(v * m))) for v in c)
+        for c, m in zip(colors, mods)
+    )
+
+
+class Timeline:
+    """Colors held from each keyframe to the next, for `duration` seconds."""
+
+    def __init__(self, start: float, duration: float, offsets: List[float], colors: List[Colors]):
+        self.start = start
+        self.duration = duration
+        self.offsets = offsets
+        self.colors = colors
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+    def is_complete(self, t: float) -> bool:
+        return t >= self.end
+
+    def colors_at(self, t: float) -> Optional[Colors]:
+        if t < self.start or t >= self.end:
+            return None
+        return self.colors[bisect_right(self.offsets, t - self.start) - 1]
+
+    def next_keyframe(self, t: float) -> float:
+        """Seconds from t until the colors next change (or the timeline ends)."""
+        i = bisect_right(self.offsets, t - self.start)
+        nxt = self.start + self.offsets[i] if i < len(self.offsets) else self.end
+        return max(0.0, nxt - t)
+
+
+def compile_dance(dance: Dance, base_state: LEDState, step: float = FRAME_STEP) -> Timeline:
+    """Sample a dance over its whole duration; identical neighbours are merged."""
+    offsets: List[float] = []
+    colors: List[Colors] = []
+    n = max(1, math.ceil(dance.duration / step))
+    for k in range(n):
+        elapsed = k * step
+        frame = dotstar_colors(render_dance_at(dance, base_state, elapsed))
+        if not colors or frame != colors[-1]:
+            offsets.append(elapsed)
+            colors.append(frame)
+    return Timeline(dance.start_time, dance.duration, offsets, colors)
+
+
+def compile_flash(color: RGB, start: float, duration: float) -> Timeline:
+    return Timeline(start, duration, [0.0], [(color, color, color)])
+
+
+class AnimationEngine:
+    """Chooses the frame to show and when the next one is due.
+
+    Layers, highest first: flash, dance, breathing base. commit() reports
+    whether a frame differs visibly from the last one written, so callers
+    only touch the SPI bus for real changes.
+    """
+
+    def __init__(self, floor: float = 0.008, step: float = FRAME_STEP):
+        self.floor = floor
+        self.step = step
+        self._table: Optional[PulseTable] = None
+        self._table_key = None
+        self._dance: Optional[Timeline] = None
+        self._flash: Optional[Timeline] = None
+        self._last_visible = None
+
+        # Stats
+        self.table_builds = 0
+        self.frames_written = 0
+        self.frames_skipped = 0
+
+    def set_base(self, colors: Colors, brightness: float, base_brightness: float,
+                 pulse_cycle: float = 12.0, pulse_amount: float = 0.05) -> bool:
+        """Use these base colors/brightness; rebuilds the table only when they change."""
+        key = (colors, brightness, base_brightness, pulse_cycle, pulse_amount)
+        if key == self._table_key:
+            return False
+        self._table = PulseTable(colors, brightness, base_brightness, pulse_cycle,
+                                 pulse_amount, self.floor, self.step)
+        self._table_key = key
+        self.table_builds += 1
+        return True
+
+    def play(self, timeline: Optional[Timeline]):
+        """Set (or clear) the dance layer."""
+        self._dance = timeline
+
+    def flash(self, timeline: Timeline):
+        self._flash = timeline
+
+    def _overlay(self, t: float) -> Optional[Colors]:
+        for name in ("_flash", "_dance"):
+            timeline = getattr(self, name)
+            if timeline is None:
+                continue
+            if timeline.is_complete(t):
+                setattr(self, name, None)
+                continue
+            colors = timeline.colors_at(t)
+            if colors is not None:
+                return colors
+        return None
+
+    def frame_at(self, t: float) -> Optional[Frame]:
+        if self._table is None:
+            return None
+        overlay = self._overlay(t)
+        if overlay is not None:
+            return self._table.apply(overlay, t)
+        return self._table.frame_at(t)
+
+    def next_wake(self, t: float) -> float:
+        """Seconds to sleep before the next frame could look different."""
+        if self._table is None:
+            return MAX_IDLE_SLEEP
+        if self._overlay(t) is not None:
+            # Overlays ride on the breathing modulation, which moves every step
+            return self.step
+        delay = self._table.next_change(t)
+        for timeline in (self._flash, self._dance):
+            if timeline is not None and t < timeline.start:
+                delay = min(delay, timeline.start - t)
+        return min(MAX_IDLE_SLEEP, max(self.step, delay))
+
+    def commit(self, frame: Frame) -> bool:
+        """True if frame should be written (its visible output changed)."""
+        visible = frame.visible()
+        if visible == self._last_visible:
+            self.frames_skipped += 1
+            return False
+        self._last_visible = visible
+        self.frames_written += 1
+        return True
+
+    def invalidate(self):
+        """Force the next frame to be written (e.g. after something else drove the LEDs)."""
+        self._last_visible = None
+
+    def get_stats(self) -> dict:
+        table = self._table
+        return {
+            "table_builds": self.table_builds,
+            "table_steps": len(table) if table else 0,
+            "table_filled": table.filled if table else 0,
+            "frames_written": self.frames_written,
+            "frames_skipped": self.frames_skipped,
+            "dance_active": self._dance is not None,
+        }
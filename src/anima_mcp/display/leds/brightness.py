@@ -8,14 +8,21 @@ import math
 import time
 
 
-def get_pulse(pulse_cycle: float = 12.0) -> float:
-    """Primary + secondary breath wave. Returns 0-1."""
-    t = time.time()
+BREATH_CYCLE = 18.0  # Seconds per secondary breath wave
+
+
+def pulse_at(t: float, pulse_cycle: float = 12.0) -> float:
+    """Primary + secondary breath wave at time t. Returns 0-1."""
     primary = (1.0 + math.sin(t * 2 * math.pi / pulse_cycle)) * 0.5
-    breath = (1.0 + math.sin(t * 2 * math.pi / 18.0)) * 0.5
+    breath = (1.0 + math.sin(t * 2 * math.pi / BREATH_CYCLE)) * 0.5
     return primary * (0.92 + 0.08 * breath)
 
 
+def get_pulse(pulse_cycle: float = 12.0) -> float:
+    """Primary + secondary breath wave now. Returns 0-1."""
+    return pulse_at(time.time(), pulse_cycle)
+
+
 def estimate_instantaneous_brightness(
     base_brightness: float,
     pulse_cycle: float = 12.0,
@@ -66,8 +66,12 @@ def render_dance(dance: Dance, base_state: LEDState) -> LEDState:
     """Render the current dance onto base LED state."""
     if dance.is_complete:
         return base_state
-    progress = dance.progress
-    elapsed = dance.elapsed
+    return render_dance_at(dance, base_state, dance.elapsed)
+
+
+def render_dance_at(dance: Dance, base_state: LEDState, elapsed: float) -> LEDState:
+    """Render the dance as it looks `elapsed` seconds after it started."""
+    progress = min(1.0, elapsed / dance.duration)
     intensity = dance.intensity
 
     if dance.dance_type == DanceType.JOY_SPARKLE:
@@ -1,6 +1,5 @@
 """LEDDisplay - hardware and orchestration."""
 
-import math
 import sys
 import threading
 import time
@@ -10,6 +9,7 @@ from . import brightness as _brightness
 from . import colors as _colors
 from . import dances as _dances
 from . import patterns as _patterns
+from .animation import AnimationEngine, compile_dance, compile_flash, dotstar_colors
 from .colors import blend_colors
 from .dances import Dance, DanceType, render_dance
 from .types import LEDState
@@ -97,6 +97,9 @@ class LEDDisplay:
         self._spi_lock = threading.Lock()
         self._animation_running = False
         self._animation_thread: Optional[threading.Thread] = None
+        self._animation = AnimationEngine(floor=self._hardware_brightness_floor)
+        self._animation_wake = threading.Event()
+        self._dance_base: Optional[LEDState] = None  # Base state the dance timeline was compiled on
         self._init_leds()
 
     def _init_leds(self):
@@ -128,38 +131,39 @@ class LEDDisplay:
         self._animation_running = True
         self._animation_thread = threading.Thread(target=self._animation_loop, daemon=True)
         self._animation_thread.start()
-        print("[LEDs] Animation thread started (~5fps)", file=sys.stderr, flush=True)
+        print("[LEDs] Animation thread started (event-driven)", file=sys.stderr, flush=True)
 
     def _animation_loop(self):
-        """Fast LED update loop for smooth per-LED wave + pulse."""
+        """Show per-LED wave + pulse frames, writing only when the output changes."""
         while self._animation_running:
+            delay = 0.25
             try:
-                state = self._last_state
-                if self._dots and state and self._cached_pipeline_brightness is not None:
-                    t = time.time()
-                    # Flash override
-                    if t < self._flash_until:
-                        colors = [self._flash_color] * 3
-                    else:
-                        colors = [state.led2, state.led1, state.led0]
-                    brightness = max(self._hardware_brightness_floor, self._current_brightness)
-                    pulse = _brightness.get_pulse(self._pulse_cycle) * self._pulse_amount * min(1.0, max(0.15, brightness / 0.04))
-                    pulse = min(pulse, max(0.005, brightness * 0.08))
-                    perceptual = max(self._hardware_brightness_floor, min(0.5, brightness + pulse))
-                    # RGB scaling: dim below base via RGB values (hardware brightness has a floor)
-                    rgb_scale = min(1.0, brightness / self._base_brightness) if self._base_brightness > 0 else 1.0
-                    with self._spi_lock:
-                        for i, color in enumerate(colors):
-                            phase = t * 2 * math.pi / self._pulse_cycle + i * math.pi * 2 / 3
-                            mod = (0.92 + 0.08 * math.sin(phase)) * rgb_scale
-                            self._dots[i] = tuple(max(0, min(255, int(c * mod))) for c in color)
-                        final_brightness = max(self._hardware_brightness_floor, perceptual)
-                        self._dots.brightness = final_brightness
-                        self._dots.show()
-                    self._last_applied_brightness = final_brightness
+                delay = self._animation_tick(time.time())
             except Exception:
                 pass
-            time.sleep(0.25)
+            self._animation_wake.wait(delay)
+            self._animation_wake.clear()
+
+    def _animation_tick(self, t: float) -> float:
+        """Write the frame for time t if it changed; returns seconds until the next tick."""
+        state = self._last_state
+        if not (self._dots and state and self._cached_pipeline_brightness is not None):
+            return 0.25
+        brightness = max(self._hardware_brightness_floor, self._current_brightness)
+        self._animation.set_base(dotstar_colors(state), brightness, self._base_brightness,
+                                 self._pulse_cycle, self._pulse_amount)
+        frame = self._animation.frame_at(t)
+        if frame is not None and self._animation.commit(frame):
+            with self._spi_lock:
+                for i, color in enumerate(frame.colors):
+                    self._dots[i] = color
+                self._dots.brightness = frame.brightness
+                self._dots.show()
+            self._last_applied_brightness = frame.brightness
+        return self._animation.next_wake(t)
+
+    def _wake_animation(self):
+        self._animation_wake.set()
 
     def is_available(self) -> bool:
         return self._dots is not None
@@ -170,12 +174,15 @@ class LEDDisplay:
         if self._dots:
             self._dots.brightness = self._brightness
             self._dots.show()
+        self._animation.invalidate()
+        self._wake_animation()
 
     def clear(self):
         if self._dots:
             try:
                 self._dots.fill((0, 0, 0))
                 self._dots.show()
+                self._animation.invalidate()
                 print("[LEDs] Cleared", file=sys.stderr, flush=True)
             except Exception as e:
                 print(f"[LEDs] Error clearing LEDs: {e}", file=sys.stderr, flush=True)
@@ -186,6 +193,7 @@ class LEDDisplay:
             try:
                 self._dots[index] = color
                 self._dots.show()
+                self._animation.invalidate()
             except Exception as e:
                 print(f"[LEDs] Error setting LED {index}: {e}", file=sys.stderr, flush=True)
                 self._dots = None
@@ -203,13 +211,19 @@ class LEDDisplay:
             return
         state = self._apply_flash(state)
         with self._spi_lock:
+            changed = self._last_state != state
             self._last_state = state
             self._update_count += 1
+        if changed:
+            self._wake_animation()
 
     def quick_flash(self, color: Tuple[int, int, int] = (100, 100, 100), duration_ms: int = 50):
         if self._dots:
-            self._flash_until = time.time() + (duration_ms / 1000.0)
+            now = time.time()
+            self._flash_until = now + (duration_ms / 1000.0)
             self._flash_color = color
+            self._animation.flash(compile_flash(color, now, duration_ms / 1000.0))
+            self._wake_animation()
 
     def start_dance(self, dance_type: DanceType, duration: float = 2.0, intensity: float = 1.0) -> bool:
         now = time.time()
@@ -218,6 +232,7 @@ class LEDDisplay:
         if self._current_dance and not self._current_dance.is_complete:
             return False
         self._current_dance = Dance(dance_type=dance_type, duration=duration, start_time=now, intensity=intensity)
+        self._dance_base = None  # Compiled against the next base state
         self._dance_cooldown_until = now + duration + 3.0
         self._last_dance_trigger = dance_type.value
         print(f"[LEDs] Starting dance: {dance_type.value}", file=sys.stderr, flush=True)
@@ -260,6 +275,7 @@ class LEDDisplay:
             "current_dance": dance_info,
             "last_dance": self._last_dance_trigger,
             "spontaneous_dance_chance": self._spontaneous_dance_chance,
+            "animation": self._animation.get_stats(),
             "last_state": {
                 "led0": self._last_state.led0 if self._last_state else None,
                 "led1": self._last_state.led1 if self._last_state else None,
@@ -411,7 +427,13 @@ class LEDDisplay:
         if self._current_dance:
             if self._current_dance.is_complete:
                 self._current_dance = None
+                self._dance_base = None
+                self._animation.play(None)
             else:
+                if state != self._dance_base:
+                    # The animation thread plays the dance from its keyframes
+                    self._animation.play(compile_dance(self._current_dance, state))
+                    self._dance_base = state
                 state = render_dance(self._current_dance, state)
                 if self._manual_brightness_factor < 0.05 and state.brightness > self._manual_brightness_factor * 1.1:
                     state = LEDState(led0=state.led0, led1=state.led1, led2=state.led2, brightness=self._manual_brightness_factor)
@@ -0,0 +1,321 @@
+"""
+Pixel Grid - compact pixel store for the drawing canvas.
+
+A canvas used to be a dict of (x, y) -> (r, g, b) tuples, costing a few
+hundred bytes per pixel and a full Python loop to render or persist.
+PixelGrid keeps the same mapping interface but stores a width*height*3
+RGB byte buffer plus a one-byte-per-pixel occupancy mask (0 or 255, so it
+doubles as a PIL "L" mask). Rendering is Image.frombuffer over the buffer
+and persistence is a single RGBA PNG whose alpha channel is the mask.
+"""
+
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+from PIL import Image
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+_OCCUPIED = 255
+# Below this many points the plain loop beats NumPy's per-call overhead
+_ARRAY_MIN_POINTS = 24
+# bytes.translate table: any nonzero alpha -> occupied
+_ALPHA_TO_MASK = bytes([0] + [_OCCUPIED] * 255)
+
+DENSITY_GRID = 8      # Coarse occupancy grid is DENSITY_GRID x DENSITY_GRID cells
+COLOR_BINS = 64       # 2 bits per channel
+
+
+def color_bin(r: int, g: int, b: int) -> int:
+    """Coarse color bucket (top two bits of each channel)."""
+    return ((r >> 6) << 4) | ((g >> 6) << 2) | (b >> 6)
+
+
+class PixelGrid(MutableMapping):
+    """Mapping of (x, y) -> (r, g, b) backed by flat byte buffers."""
+
+    def __init__(self, width: int = 240, height: int = 240):
+        self.width = width
+        self.height = height
+        self.rgb = bytearray(width * height * 3)
+        self.mask = bytearray(width * height)
+        self._count = 0
+        self.version = 0  # Bumped on every change (persistence skips unchanged grids)
+
+        # Running composition aggregates, kept in step with every write so
+        # readers never scan the grid. Quadrants: 0=TL, 1=TR, 2=BL, 3=BR.
+        self._quadrants = [0, 0, 0, 0]
+        self._cells = [0] * (DENSITY_GRID * DENSITY_GRID)  # row-major
+        self._colors = [0] * COLOR_BINS
+        self._mid_x = width // 2
+        self._mid_y = height // 2
+
+    def _index(self, key) -> int:
+        try:
+            x, y = key
+        except (TypeError, ValueError):
+            raise KeyError(key) from None
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise KeyError(key)
+        return y * self.width + x
+
+    def __getitem__(self, key) -> Tuple[int, int, int]:
+        i = self._index(key)
+        if not self.mask[i]:
+            raise KeyError(key)
+        o = i * 3
+        return (self.rgb[o], self.rgb[o + 1], self.rgb[o + 2])
+
+    def __setitem__(self, key, color):
+        self._set(self._index(key), _clamp_color(color))
+        self.version += 1
+
+    def __delitem__(self, key):
+        i = self._index(key)
+        if not self.mask[i]:
+            raise KeyError(key)
+        o = i * 3
+        rgb = self.rgb
+        self._colors[color_bin(rgb[o], rgb[o + 1], rgb[o + 2])] -= 1
+        self._occupy(i, -1)
+        self.mask[i] = 0
+        rgb[o:o + 3] = b"\x00\x00\x00"
+        self._count -= 1
+        self.version += 1
+
+    def _set(self, i: int, c: Tuple[int, int, int]):
+        """Write one clamped color at flat index i, keeping aggregates current."""
+        o = i * 3
+        rgb = self.rgb
+        if self.mask[i]:
+            self._colors[color_bin(rgb[o], rgb[o + 1], rgb[o + 2])] -= 1
+        else:
+            self.mask[i] = _OCCUPIED
+            self._count += 1
+            self._occupy(i, 1)
+        rgb[o], rgb[o + 1], rgb[o + 2] = c
+        self._colors[color_bin(*c)] += 1
+
+    def _occupy(self, i: int, delta: int):
+        x, y = i % self.width, i // self.width
+        self._quadrants[(x >= self._mid_x) + 2 * (y >= self._mid_y)] += delta
+        self._cells[(y * DENSITY_GRID // self.height) * DENSITY_GRID + x * DENSITY_GRID // self.width] += delta
+
+    def set_many(self, xs, ys, colors) -> list:
+        """Set many pixels at once; later points win where coordinates repeat.
+
+        xs/ys are equal-length sequences (or arrays). colors is a single
+        (r, g, b) or one color per point. Out-of-bounds points are skipped.
+        Returns the (x, y, color) triples actually written, in input order.
+        """
+        single = is_single_color(colors)
+        if HAS_NUMPY and len(xs) >= _ARRAY_MIN_POINTS:
+            return self._set_many_array(xs, ys, colors, single)
+
+        written = []
+        if single:
+            color = _clamp_color(colors)
+        for i, (x, y) in enumerate(zip(xs, ys)):
+            x, y = int(x), int(y)
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                continue
+            c = color if single else _clamp_color(colors[i])
+            self._set(y * self.width + x, c)
+            written.append((x, y, c))
+        if written:
+            self.version += 1
+        return written
+
+    def _set_many_array(self, xs, ys, colors, single: bool) -> list:
+        xs = np.asarray(xs, dtype=np.intp).ravel()
+        ys = np.asarray(ys, dtype=np.intp).ravel()
+        keep = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        xs, ys = xs[keep], ys[keep]
+        if not len(xs):
+            return []
+        if single:
+            color = _clamp_color(colors)
+            cols = np.array(color, dtype=np.uint8)
+        else:
+            cols = np.asarray(colors).reshape(-1, 3)[keep]
+            cols = np.clip(cols.astype(np.int64), 0, 255).astype(np.uint8)
+
+        idx = ys * self.width + xs
+        mask = np.frombuffer(self.mask, dtype=np.uint8)
+        rgb = np.frombuffer(self.rgb, dtype=np.uint8).reshape(-1, 3)
+        touched = np.unique(idx)
+        was_set = mask[touched] != 0
+        old_bins = _color_bins(rgb[touched[was_set]])
+        fresh = touched[~was_set]
+
+        # Repeated indices: NumPy assigns in order, so the last point wins
+        rgb[idx] = cols
+        mask[idx] = _OCCUPIED
+        self.version += 1
+
+        self._count += len(fresh)
+        fx, fy = fresh % self.width, fresh // self.width
+        _add_counts(self._quadrants, (fx >= self._mid_x) + 2 * (fy >= self._mid_y))
+        _add_counts(self._cells, (fy * DENSITY_GRID // self.height) * DENSITY_GRID
+                    + fx * DENSITY_GRID // self.width)
+        _add_counts(self._colors, _color_bins(rgb[touched]))
+        _add_counts(self._colors, old_bins, -1)
+
+        pts = zip(xs.tolist(), ys.tolist())
+        if single:
+            return [(x, y, color) for x, y in pts]
+        return [(x, y, tuple(c)) for (x, y), c in zip(pts, cols.tolist())]
+
+    def __contains__(self, key) -> bool:
+        try:
+            return bool(self.mask[self._index(key)])
+        except KeyError:
+            return False
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        """Occupied coordinates in row-major order."""
+        mask, width = self.mask, self.width
+        i = mask.find(_OCCUPIED)
+        while i != -1:
+            yield (i % width, i // width)
+            i = mask.find(_OCCUPIED, i + 1)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self) -> str:
+        return f"PixelGrid({self.width}x{self.height}, {self._count} pixels)"
+
+    def clear(self):
+        """Remove all pixels (buffers are zeroed in place)."""
+        self.rgb[:] = bytes(len(self.rgb))
+        self.mask[:] = bytes(len(self.mask))
+        self._count = 0
+        self._quadrants = [0, 0, 0, 0]
+        self._cells = [0] * (DENSITY_GRID * DENSITY_GRID)
+        self._colors = [0] * COLOR_BINS
+        self.version += 1
+
+    # ------------------------------------------------------------------
+    # Composition aggregates (O(1) reads)
+    # ------------------------------------------------------------------
+
+    def quadrant_counts(self) -> Tuple[int, int, int, int]:
+        """Occupied pixels per quadrant: (top-left, top-right, bottom-left, bottom-right)."""
+        return tuple(self._quadrants)
+
+    def density_grid(self) -> List[List[int]]:
+        """Occupied pixels per cell of a DENSITY_GRID x DENSITY_GRID grid, as rows."""
+        n = DENSITY_GRID
+        return [self._cells[r * n:(r + 1) * n] for r in range(n)]
+
+    def color_histogram(self) -> List[int]:
+        """Occupied pixels per coarse color bin (see color_bin)."""
+        return list(self._colors)
+
+    def _recount(self):
+        """Rebuild the aggregates from the buffers (after a bulk load)."""
+        self._quadrants = [0, 0, 0, 0]
+        self._cells = [0] * (DENSITY_GRID * DENSITY_GRID)
+        self._colors = [0] * COLOR_BINS
+        rgb = self.rgb
+        for x, y in self:
+            i = y * self.width + x
+            self._occupy(i, 1)
+            o = i * 3
+            self._colors[color_bin(rgb[o], rgb[o + 1], rgb[o + 2])] += 1
+
+    # ------------------------------------------------------------------
+    # PIL interop
+    # ------------------------------------------------------------------
+
+    def to_image(self) -> Image.Image:
+        """RGB image of the pixel buffer (unset pixels are black).
+
+        PIL copies packed RGB into its own 4-byte-per-pixel layout, so this
+        is a snapshot: later writes to the grid don't show up in it.
+        """
+        return Image.frombuffer("RGB", (self.width, self.height), self.rgb, "raw", "RGB", 0, 1)
+
+    def mask_image(self) -> Image.Image:
+        """L-mode occupancy mask (255 where a pixel is set).
+
+        Unlike to_image() this shares the grid's mask buffer, so it follows
+        later writes; call .copy() to keep a snapshot.
+        """
+        return Image.frombuffer("L", (self.width, self.height), self.mask, "raw", "L", 0, 1)
+
+    def paste_onto(self, image: Image.Image):
+        """Paste the set pixels onto an existing same-size image."""
+        image.paste(self.to_image(), (0, 0), self.mask_image())
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save_png(self, path: Path):
+        """Write the grid as an RGBA PNG (alpha = occupancy) via temp file + rename."""
+        rgba = self.to_image().convert("RGBA")
+        rgba.putalpha(self.mask_image())
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            rgba.save(tmp_path, format="PNG")
+            tmp_path.replace(path)
+        except BaseException:
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            raise
+
+    def load_png(self, path: Path) -> int:
+        """Replace the grid's contents from an RGBA PNG written by save_png.
+
+        Returns the number of pixels loaded. Raises ValueError on a size
+        mismatch.
+        """
+        with Image.open(path) as img:
+            img = img.convert("RGBA")
+            if img.size != (self.width, self.height):
+                raise ValueError(f"canvas PNG is {img.size}, expected {(self.width, self.height)}")
+            r, g, b, a = img.split()
+            rgb = Image.merge("RGB", (r, g, b)).tobytes()
+            alpha = a.tobytes()
+
+        self.rgb[:] = rgb
+        self.mask[:] = alpha.translate(_ALPHA_TO_MASK)
+        self._count = len(self.mask) - self.mask.count(0)
+        self._recount()
+        self.version += 1
+        return self._count
+
+
+def is_single_color(colors) -> bool:
+    """True for one (r, g, b) color, False for a per-point sequence/array."""
+    if HAS_NUMPY and isinstance(colors, np.ndarray):
+        return colors.ndim == 1
+    return len(colors) == 3 and not hasattr(colors[0], "__len__")
+
+
+def _clamp_color(color) -> Tuple[int, int, int]:
+    return (min(255, max(0, int(color[0]))),
+            min(255, max(0, int(color[1]))),
+            min(255, max(0, int(color[2]))))
+
+
+def _color_bins(cols):
+    """color_bin over an (n, 3) uint8 array."""
+    return ((cols[:, 0] >> 6) << 4) | ((cols[:, 1] >> 6) << 2) | (cols[:, 2] >> 6)
+
+
+def _add_counts(counts: list, keys, sign: int = 1):
+    """Add bincount(keys) into a Python list of counters."""
+    if len(keys):
+        for k, n in enumerate(np.bincount(keys, minlength=len(counts)).tolist()):
+            if n:
+                counts[k] += sign * n
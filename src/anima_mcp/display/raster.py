@@ -0,0 +1,80 @@
+"""
+Raster - cached shape masks for batch drawing on the canvas.
+
+Eras used to rasterize filled shapes with nested dx/dy loops calling
+CanvasState.draw_pixel once per pixel. These helpers build the shape once
+per size (masks are cached, marks reuse a handful of radii) so a whole
+mark goes to the canvas in a single draw_mask/draw_points call.
+
+Masks are NumPy bool arrays when NumPy is available, otherwise tuples of
+tuples; CanvasState.draw_mask accepts either. Masks are indexed [row][col]
+with the shape's center at (radius, radius).
+"""
+
+import math
+from functools import lru_cache
+from typing import Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+@lru_cache(maxsize=128)
+def disc_mask(radius: int, reach: Optional[float] = None):
+    """Cells of the (2r+1)^2 square inside the disc.
+
+    With reach None a cell is inside when dx^2 + dy^2 <= r^2; otherwise
+    when its distance from the center is strictly below reach.
+    """
+    if HAS_NUMPY:
+        d = np.arange(-radius, radius + 1)
+        dist_sq = d[:, None] ** 2 + d[None, :] ** 2
+        if reach is None:
+            mask = dist_sq <= radius * radius
+        else:
+            mask = np.sqrt(dist_sq) < reach
+        mask.flags.writeable = False
+        return mask
+
+    rng = range(-radius, radius + 1)
+    if reach is None:
+        return tuple(tuple(dx * dx + dy * dy <= radius * radius for dx in rng) for dy in rng)
+    return tuple(tuple(math.sqrt(dx * dx + dy * dy) < reach for dx in rng) for dy in rng)
+
+
+@lru_cache(maxsize=128)
+def disc_distances(radius: int):
+    """Distance of each cell of the (2r+1)^2 square from its center."""
+    if HAS_NUMPY:
+        d = np.arange(-radius, radius + 1)
+        dist = np.sqrt(d[:, None] ** 2 + d[None, :] ** 2)
+        dist.flags.writeable = False
+        return dist
+
+    rng = range(-radius, radius + 1)
+    return tuple(tuple(math.sqrt(dx * dx + dy * dy) for dx in rng) for dy in rng)
+
+
+def shade(color: Tuple[int, int, int], factors):
+    """Scale a color by a 2-D grid of factors: int(channel * factor) per cell."""
+    if HAS_NUMPY:
+        return (np.asarray(color, dtype=np.float64) * np.asarray(factors)[..., None]).astype(np.int64)
+    return [[tuple(int(v * f) for v in color) for f in row] for row in factors]
+
+
+def random_subset(mask, keep_prob: float, rand):
+    """Mask with each set cell kept independently with probability keep_prob.
+
+    Draws one rand() per set cell in row-major order, so seeding the
+    caller's RNG keeps marks reproducible.
+    """
+    if HAS_NUMPY:
+        out = np.zeros(mask.shape, dtype=bool)
+        rows, cols = np.nonzero(mask)
+        keep = np.fromiter((rand() < keep_prob for _ in range(len(rows))), dtype=bool, count=len(rows))
+        out[rows[keep], cols[keep]] = True
+        return out
+    return [[bool(on) and rand() < keep_prob for on in row] for row in mask]
@@ -19,8 +19,15 @@ try:
 except ImportError:
     HAS_PIL = False
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 from .face import FaceState, EyeState, MouthState
 from .design import Timing, radial_gradient_color
+from .frame_stream import get_frame_hub
 
 
 # Display dimensions (BrainCraft HAT)
@@ -31,6 +38,12 @@ HEIGHT = 240
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 
+# Delta SPI push: frames are diffed in bands of this many rows and each
+# band's changed columns are sent as one ST7789 address window.
+DIRTY_BAND_ROWS = 16
+# Above this fraction of changed pixels a single full-frame window is cheaper.
+FULL_PUSH_RATIO = 0.6
+
 
 @dataclass
 class DisplayConfig:
@@ -120,6 +133,18 @@ class PilRenderer(DisplayRenderer):
         self._load_brightness()
         self._display_fail_count: int = 0
         self._last_reinit_attempt: float = 0.0
+        # Last frame known to be on the panel (RGB565, panel orientation) for delta pushes;
+        # None forces the next push to send the whole frame
+        self._last_pushed = None
+        self._push_stats = {
+            "frames": 0,
+            "frames_skipped": 0,
+            "partial_frames": 0,
+            "full_frames": 0,
+            "bytes_pushed": 0,
+            "bytes_skipped": 0,
+            "last_frame": {"windows": 0, "bytes_pushed": 0, "bytes_skipped": 0},
+        }
         self._init_display()
 
     def _load_brightness(self):
@@ -203,6 +228,7 @@ class PilRenderer(DisplayRenderer):
                     pass
                 setattr(self, pin_attr, None)
         self._display = None
+        self._last_pushed = None
 
     def _init_display(self):
         """Initialize display hardware if available."""
@@ -301,7 +327,9 @@ class PilRenderer(DisplayRenderer):
 
         try:
             self._image = image
+            get_frame_hub().publish(image)
             if self._display:
+                self._last_pushed = None
                 self._display.image(self._image)
         except Exception as e:
             print(f"[Display] Error showing waking face: {e}", file=sys.stderr)
@@ -680,7 +708,9 @@ class PilRenderer(DisplayRenderer):
 
         Uses 1.0s timeout to prevent SPI hangs from blocking render thread.
         On failure, attempts reinit after a cooldown rather than permanently giving up.
+        The frame is also published to remote screen viewers (frame_stream).
         """
+        get_frame_hub().publish(self._image)
         if not self._display and self._image:
             # Try to recover display if enough time has passed (30s cooldown)
             import time as _time
@@ -717,15 +747,17 @@ class PilRenderer(DisplayRenderer):
                     self._cached_source_id = None
                     img_to_show = self._image
                 if img_to_show is not None:
-                    # Wrap to return True on success (image() returns None)
+                    # Only the changed regions go over SPI (or nothing at all)
                     # Use 3.0s timeout — first render after boot can be very slow
                     result = safe_call_with_timeout(
-                        lambda: (self._display.image(img_to_show), True)[1],
+                        lambda: self._write_frame(img_to_show),
                         timeout_seconds=3.0,
                         default=False,
                         log_error=True
                     )
                     if result is False:
+                        # Panel contents unknown after a failed/partial write
+                        self._last_pushed = None
                         self._display_fail_count += 1
                         print(f"[Display] SPI timeout (fail #{self._display_fail_count})", file=sys.stderr, flush=True)
                         if self._display_fail_count >= 10:
@@ -734,12 +766,99 @@ class PilRenderer(DisplayRenderer):
                     else:
                         self._display_fail_count = 0
             except Exception as e:
+                self._last_pushed = None
                 self._display_fail_count += 1
                 print(f"[Display] Hardware error during show: {e} (fail #{self._display_fail_count})", file=sys.stderr, flush=True)
                 if self._display_fail_count >= 10:
                     print("[Display] Marking display as unavailable for reinit", file=sys.stderr, flush=True)
                     self._display = None
 
+    def _write_frame(self, image: Image.Image) -> bool:
+        """Send a frame to the panel, skipping or windowing unchanged pixels.
+
+        With numpy and an ST7789 driver exposing address-window writes
+        (_block), the frame is converted to RGB565 in panel orientation,
+        diffed against the last pushed frame, and only changed band
+        windows are written. Otherwise falls back to a full image() push,
+        still skipping byte-identical frames. Returns True on success.
+        """
+        display = self._display
+        frame_bytes = image.width * image.height * 2
+        stats = self._push_stats
+        stats["frames"] += 1
+
+        block = getattr(type(display), "_block", None)
+        if not HAS_NUMPY or block is None:
+            raw = image.tobytes()
+            if raw == self._last_pushed:
+                self._record_push(0, 0, frame_bytes)
+                return True
+            display.image(image)
+            self._last_pushed = raw
+            self._record_push(1, frame_bytes, 0)
+            return True
+
+        rotation = getattr(display, "rotation", 0) or 0
+        panel = image.rotate(rotation, expand=True) if rotation else image
+        rgb = np.asarray(panel.convert("RGB"), dtype=np.uint16)
+        frame = (((rgb[..., 0] & 0xF8) << 8) | ((rgb[..., 1] & 0xFC) << 3) | (rgb[..., 2] >> 3)).astype(">u2")
+
+        prev = self._last_pushed
+        if not isinstance(prev, np.ndarray) or prev.shape != frame.shape:
+            windows = [(0, 0, frame.shape[1] - 1, frame.shape[0] - 1)]
+        else:
+            windows = self._dirty_windows(prev, frame)
+            if not windows:
+                self._record_push(0, 0, frame_bytes)
+                return True
+            dirty = sum((x1 - x0 + 1) * (y1 - y0 + 1) for x0, y0, x1, y1 in windows)
+            if dirty > FULL_PUSH_RATIO * frame.size:
+                windows = [(0, 0, frame.shape[1] - 1, frame.shape[0] - 1)]
+
+        pushed = 0
+        for x0, y0, x1, y1 in windows:
+            data = frame[y0:y1 + 1, x0:x1 + 1].tobytes()
+            display._block(x0, y0, x1, y1, data)
+            pushed += len(data)
+        self._last_pushed = frame
+        self._record_push(len(windows), pushed, frame_bytes - pushed)
+        return True
+
+    @staticmethod
+    def _dirty_windows(prev: "np.ndarray", frame: "np.ndarray") -> list:
+        """Bounding (x0, y0, x1, y1) windows of changed pixels, one per DIRTY_BAND_ROWS band."""
+        changed = prev != frame
+        windows = []
+        for top in range(0, frame.shape[0], DIRTY_BAND_ROWS):
+            band = changed[top:top + DIRTY_BAND_ROWS]
+            cols = np.flatnonzero(band.any(axis=0))
+            if len(cols) == 0:
+                continue
+            rows = np.flatnonzero(band.any(axis=1))
+            windows.append((int(cols[0]), top + int(rows[0]), int(cols[-1]), top + int(rows[-1])))
+        return windows
+
+    def _record_push(self, windows: int, pushed: int, skipped: int):
+        """Update SPI push counters for one frame."""
+        stats = self._push_stats
+        if windows == 0:
+            stats["frames_skipped"] += 1
+        elif skipped == 0:
+            stats["full_frames"] += 1
+        else:
+            stats["partial_frames"] += 1
+        stats["bytes_pushed"] += pushed
+        stats["bytes_skipped"] += skipped
+        stats["last_frame"] = {"windows": windows, "bytes_pushed": pushed, "bytes_skipped": skipped}
+
+    def get_push_stats(self) -> dict:
+        """SPI push counters: frames sent full/partial/skipped and bytes pushed vs skipped."""
+        stats = dict(self._push_stats)
+        stats["last_frame"] = dict(stats["last_frame"])
+        total = stats["bytes_pushed"] + stats["bytes_skipped"]
+        stats["skip_ratio"] = round(stats["bytes_skipped"] / total, 3) if total else None
+        return stats
+
     def flush(self):
         """Push the current image to display. Call after deferred rendering is complete."""
         self._push_to_display()
@@ -751,7 +870,9 @@ class PilRenderer(DisplayRenderer):
         try:
             black = Image.new("RGB", (self.config.width, self.config.height), (0, 0, 0))
             self._image = black
+            self._last_pushed = None
             self._display.image(black)
+            get_frame_hub().publish(black)
         except Exception as e:
             print(f"[Display] Error blanking: {e}", file=sys.stderr, flush=True)
 
@@ -769,7 +890,9 @@ class PilRenderer(DisplayRenderer):
             return
         try:
             self._image = image
+            self._last_pushed = None
             self._display.image(image)
+            get_frame_hub().publish(image)
         except Exception as e:
             print(f"[Display] Error rendering image: {e}", file=sys.stderr, flush=True)
 
@@ -81,24 +81,15 @@ class ArtMixin:
 
                 # If _lumen_draw added new pixels, draw them onto this image
                 if self._canvas._dirty and self._canvas._new_pixels:
-                    for x, y, color in self._canvas._new_pixels:
-                        try:
-                            draw.point((x, y), fill=color)
-                        except Exception:
-                            pass
-                    self._canvas._new_pixels.clear()
+                    self._blit_new_pixels(image, draw)
                     self._canvas._cached_image = image.copy()
                     self._canvas._dirty = False
             else:
                 # Cache miss: full redraw (first frame, after load, after clear)
                 image, draw = self._display._create_canvas((0, 0, 0))
 
-                # Draw all existing pixels
-                for (x, y), color in self._canvas.pixels.items():
-                    try:
-                        draw.point((x, y), fill=color)
-                    except Exception:
-                        pass
+                # Draw all existing pixels (one masked paste from the pixel buffer)
+                self._canvas.pixels.paste_onto(image)
 
                 # Let Lumen continue drawing
                 if anima and len(self._canvas.pixels) < 15000:
@@ -109,12 +100,7 @@ class ArtMixin:
 
                     # Draw any new pixels added by _lumen_draw onto same image
                     if self._canvas._new_pixels:
-                        for x, y, color in self._canvas._new_pixels:
-                            try:
-                                draw.point((x, y), fill=color)
-                            except Exception:
-                                pass
-                        self._canvas._new_pixels.clear()
+                        self._blit_new_pixels(image, draw)
 
                 # Cache the fully-rendered image
                 self._canvas._cached_image = image.copy()
@@ -194,6 +180,23 @@ class ArtMixin:
                 except Exception:
                     pass  # If even this fails, at least we logged everything
 
+    # New-pixel count above which one masked paste of the whole grid beats per-point draws
+    _BLIT_PASTE_THRESHOLD = 256
+
+    def _blit_new_pixels(self, image, draw):
+        """Draw pixels added since the last render onto image, then forget them."""
+        new_pixels = self._canvas._new_pixels
+        if len(new_pixels) > self._BLIT_PASTE_THRESHOLD:
+            # The grid holds every pixel, new ones included, and image already shows the rest
+            self._canvas.pixels.paste_onto(image)
+        else:
+            for x, y, color in new_pixels:
+                try:
+                    draw.point((x, y), fill=color)
+                except Exception:
+                    pass
+        new_pixels.clear()
+
     def _render_art_eras(self, anima: Optional[Anima] = None):
         """Render Art Eras screen -- era selector with auto-rotate toggle."""
         from .eras import list_all_era_info, auto_rotate as _auto_rotate
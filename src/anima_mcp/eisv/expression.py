@@ -8,8 +8,9 @@ from __future__ import annotations
 
 import random
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from .forest import load_forest
 from .mapping import TrajectoryShape
 
 # ---------------------------------------------------------------------------
@@ -144,9 +145,10 @@ class ExpressionGenerator:
 class StudentExpressionGenerator:
     """Distilled student model inference — zero external dependencies.
 
-    Loads JSON-exported RandomForest classifiers and runs inference
-    using only Python stdlib. Falls back to rule-based generation
-    if model files are missing.
+    Loads JSON-exported RandomForest classifiers, compiled to flat arrays
+    (see forest.py; the compiled files are cached next to the JSON), and
+    runs inference using only Python stdlib. Falls back to rule-based
+    generation if model files are missing.
     """
 
     def __init__(self, model_dir: str, fallback_seed: Optional[int] = None):
@@ -165,9 +167,9 @@ class StudentExpressionGenerator:
                 with open(path) as f:
                     return _json.load(f)
 
-            self._pattern_forest = _load("pattern_forest.json")
-            self._token1_forest = _load("token1_forest.json")
-            self._token2_forest = _load("token2_forest.json")
+            self._pattern_forest = load_forest(_os.path.join(self._model_dir, "pattern_forest.json"))
+            self._token1_forest = load_forest(_os.path.join(self._model_dir, "token1_forest.json"))
+            self._token2_forest = load_forest(_os.path.join(self._model_dir, "token2_forest.json"))
             self._scaler = _load("scaler.json")
             self._mappings = _load("mappings.json")
             self._loaded = True
@@ -213,29 +215,22 @@ class StudentExpressionGenerator:
         shape_onehot = [1.0 if s == shape else 0.0 for s in shapes]
         return scaled + shape_onehot
 
-    def _predict_tree(self, tree: Dict, features: List[float]) -> List[float]:
-        node = tree
-        while not node.get("leaf", False):
-            if features[node["feature"]] <= node["threshold"]:
-                node = node["left"]
-            else:
-                node = node["right"]
-        return node["probs"]
-
-    def _predict_forest(self, forest: List[Dict], features: List[float]) -> int:
-        all_probs = [self._predict_tree(tree, features) for tree in forest]
-        n_classes = len(all_probs[0])
-        avg = [0.0] * n_classes
-        for probs in all_probs:
-            for i in range(n_classes):
-                avg[i] += probs[i]
-        best_idx = 0
-        best_val = avg[0]
-        for i in range(1, n_classes):
-            if avg[i] > best_val:
-                best_val = avg[i]
-                best_idx = i
-        return best_idx
+    def _compose(self, pattern_idx: int, token1_idx: int, token2_idx: int) -> List[str]:
+        """Turn the three class predictions into expression tokens."""
+        pattern = self._mappings["patterns"][pattern_idx]
+        token_1 = self._mappings["tokens"][token1_idx]
+        token_2 = self._mappings["tokens_with_none"][token2_idx]
+
+        if pattern == "SINGLE":
+            return [token_1]
+        elif pattern == "REPETITION":
+            return [token_1, token_1]
+        elif pattern in ("PAIR", "QUESTION"):
+            return [token_1, token_2] if token_2 != "none" else [token_1]
+        elif pattern == "TRIPLE":
+            return [token_1, token_2] if token_2 != "none" else [token_1]
+        else:
+            return [token_1]
 
     def generate(self, shape: str, window: Optional[Dict[str, Any]] = None) -> List[str]:
         """Generate expression tokens using distilled student model.
@@ -247,30 +242,30 @@ class StudentExpressionGenerator:
 
         try:
             X = self._build_features(shape, window)
-
-            pattern_idx = self._predict_forest(self._pattern_forest, X)
-            pattern = self._mappings["patterns"][pattern_idx]
-
-            token1_idx = self._predict_forest(self._token1_forest, X)
-            token_1 = self._mappings["tokens"][token1_idx]
-
-            X_t2 = X + [float(token1_idx)]
-            token2_idx = self._predict_forest(self._token2_forest, X_t2)
-            token_2 = self._mappings["tokens_with_none"][token2_idx]
-
-            if pattern == "SINGLE":
-                return [token_1]
-            elif pattern == "REPETITION":
-                return [token_1, token_1]
-            elif pattern in ("PAIR", "QUESTION"):
-                return [token_1, token_2] if token_2 != "none" else [token_1]
-            elif pattern == "TRIPLE":
-                return [token_1, token_2] if token_2 != "none" else [token_1]
-            else:
-                return [token_1]
+            pattern_idx = self._pattern_forest.predict(X)
+            token1_idx = self._token1_forest.predict(X)
+            token2_idx = self._token2_forest.predict(X + [float(token1_idx)])
+            return self._compose(pattern_idx, token1_idx, token2_idx)
         except Exception:
             return self._fallback.generate(shape)
 
+    def predict_many(self, samples: Sequence[Tuple[str, Dict[str, Any]]]) -> List[List[str]]:
+        """Score many (shape, window) pairs at once, e.g. for offline evaluation.
+
+        Each forest runs once over the whole batch (vectorized with NumPy
+        when available). Unlike generate(), this does not fall back to the
+        rule-based generator: it raises RuntimeError if the model isn't
+        loaded, and feature errors propagate.
+        """
+        if not self._loaded:
+            raise RuntimeError(f"student model not loaded from {self._model_dir}")
+        X = [self._build_features(shape, window) for shape, window in samples]
+        pattern_idx = self._pattern_forest.predict_many(X)
+        token1_idx = self._token1_forest.predict_many(X)
+        token2_idx = self._token2_forest.predict_many(
+            [x + [float(t1)] for x, t1 in zip(X, token1_idx)])
+        return [self._compose(p, t1, t2) for p, t1, t2 in zip(pattern_idx, token1_idx, token2_idx)]
+
     def update_weights(self, shape: str, tokens: List[str], score: float) -> None:
         self._fallback.update_weights(shape, tokens, score)
 
@@ -0,0 +1,289 @@
+"""Flattened random forests for the distilled student model.
+
+The student forests are exported as nested JSON dicts. Walking those
+means a dict lookup per node and a fresh parse of ~1.5MB of JSON on
+every start. compile_forest() flattens a forest into contiguous arrays:
+
+- feature[n]: split feature per node, -1 for leaves
+- threshold[n]: split threshold (go left when x[feature] <= threshold)
+- left[n] / right[n]: child node indices; for a leaf, left[n] is its row
+  in probs
+- probs: leaf class probabilities, n_leaves x n_classes, row-major
+- roots: root node index of each tree
+
+save()/load() write and map these arrays in a small binary file: a
+32-byte header followed by the arrays in native little-endian layout,
+so loading is an mmap plus memoryview casts with no parsing. Single
+samples are scored in plain Python; batches use a NumPy traversal of
+every (sample, tree) pair at once when NumPy is available.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+MAGIC = b"AFF1"
+VERSION = 1
+# magic, version, n_trees, n_nodes, n_leaves, n_classes, max_depth, reserved
+_HEADER = struct.Struct("<4s7I")
+FOREST_SUFFIX = ".forest"
+# Below this many samples the per-call NumPy overhead outweighs vectorizing
+_ARRAY_MIN_SAMPLES = 8
+
+
+class FlatForest:
+    """A random forest as flat node arrays (see module docstring)."""
+
+    def __init__(self, roots, feature, threshold, left, right, probs,
+                 n_classes: int, max_depth: int, buffer=None):
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.probs = probs
+        self.n_classes = n_classes
+        self.max_depth = max_depth
+        self._buffer = buffer  # mmap backing the arrays, if loaded from disk
+        self._lists = None
+        self._np = None
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    # -- inference ----------------------------------------------------------
+
+    def _tables(self):
+        """The arrays as Python lists (faster to index than memoryviews), built on first use."""
+        if self._lists is None:
+            k = self.n_classes
+            probs = self.probs.tolist()
+            self._lists = (
+                self.roots.tolist(), self.feature.tolist(), self.threshold.tolist(),
+                self.left.tolist(), self.right.tolist(),
+                [tuple(probs[i:i + k]) for i in range(0, len(probs), k)],
+            )
+        return self._lists
+
+    def predict_proba(self, x: Sequence[float]) -> List[float]:
+        """Summed (unnormalized) class probabilities over all trees."""
+        roots, feature, threshold, left, right, leaf_probs = self._tables()
+        rows = []
+        for node in roots:
+            f = feature[node]
+            while f >= 0:
+                node = left[node] if x[f] <= threshold[node] else right[node]
+                f = feature[node]
+            rows.append(leaf_probs[left[node]])
+        return [sum(col) for col in zip(*rows)]
+
+    def predict(self, x: Sequence[float]) -> int:
+        """Class with the highest summed probability (first one on ties)."""
+        total = self.predict_proba(x)
+        best_idx = 0
+        best_val = total[0]
+        for i in range(1, len(total)):
+            if total[i] > best_val:
+                best_val = total[i]
+                best_idx = i
+        return best_idx
+
+    def predict_many(self, rows: Sequence[Sequence[float]]) -> List[int]:
+        """predict() for each row; vectorized with NumPy for larger batches."""
+        if HAS_NUMPY and len(rows) >= _ARRAY_MIN_SAMPLES:
+            return self._predict_many_array(rows)
+        return [self.predict(x) for x in rows]
+
+    def _arrays(self):
+        if self._np is None:
+            self._np = (
+                np.asarray(self.roots, dtype=np.intp),
+                np.asarray(self.feature, dtype=np.intp),
+                np.asarray(self.threshold, dtype=np.float64),
+                np.asarray(self.left, dtype=np.intp),
+                np.asarray(self.right, dtype=np.intp),
+                np.asarray(self.probs, dtype=np.float64).reshape(-1, self.n_classes),
+            )
+        return self._np
+
+    def _predict_many_array(self, rows) -> List[int]:
+        roots, feature, threshold, left, right, probs = self._arrays()
+        X = np.asarray(rows, dtype=np.float64)
+        n = X.shape[0]
+        samples = np.arange(n)[:, None]
+        node = np.broadcast_to(roots, (n, len(roots))).copy()
+        for _ in range(self.max_depth):
+            f = feature[node]
+            inner = f >= 0
+            if not inner.any():
+                break
+            go_left = X[samples, np.where(inner, f, 0)] <= threshold[node]
+            node = np.where(inner, np.where(go_left, left[node], right[node]), node)
+        leaves = left[node]
+        # Sum tree by tree, in the same order as predict(), so ties break identically
+        total = np.zeros((n, self.n_classes))
+        for t in range(leaves.shape[1]):
+            total += probs[leaves[:, t]]
+        return total.argmax(axis=1).tolist()
+
+    # -- persistence --------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        """Write the binary form via temp file + rename."""
+        header = _HEADER.pack(MAGIC, VERSION, self.n_trees, self.n_nodes,
+                              len(self.probs) // self.n_classes, self.n_classes,
+                              self.max_depth, 0)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(header)
+                # 8-byte arrays first so every array stays aligned in the mapping
+                for values, code in ((self.threshold, "d"), (self.probs, "d"), (self.roots, "i"),
+                                     (self.feature, "i"), (self.left, "i"), (self.right, "i")):
+                    f.write(array(code, values).tobytes())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "FlatForest":
+        """Map a file written by save(). Raises ValueError if it isn't one."""
+        if sys.byteorder != "little" or array("i").itemsize != 4:
+            raise ValueError("binary forests need a little-endian platform with 4-byte ints")
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, n_trees, n_nodes, n_leaves, n_classes, max_depth, _ = \
+                _HEADER.unpack_from(buffer)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path}: not a v{VERSION} forest file")
+            expected = _HEADER.size + 8 * (n_nodes + n_leaves * n_classes) + 4 * (n_trees + 3 * n_nodes)
+            if len(buffer) != expected:
+                raise ValueError(f"{path}: size {len(buffer)}, expected {expected}")
+        except (ValueError, struct.error):
+            buffer.close()
+            raise
+
+        view = memoryview(buffer)
+        offset = _HEADER.size
+
+        def take(code: str, count: int, size: int):
+            nonlocal offset
+            part = view[offset:offset + count * size].cast(code)
+            offset += count * size
+            return part
+
+        threshold = take("d", n_nodes, 8)
+        probs = take("d", n_leaves * n_classes, 8)
+        roots = take("i", n_trees, 4)
+        feature = take("i", n_nodes, 4)
+        left = take("i", n_nodes, 4)
+        right = take("i", n_nodes, 4)
+        return cls(roots, feature, threshold, left, right, probs, n_classes, max_depth, buffer)
+
+
+def compile_forest(trees: List[Dict]) -> FlatForest:
+    """Flatten JSON-exported trees ({"leaf", "feature", "threshold", "left", "right", "probs"})."""
+    roots = array("i")
+    feature = array("i")
+    threshold = array("d")
+    left = array("i")
+    right = array("i")
+    probs = array("d")
+    n_classes = 0
+    max_depth = 0
+
+    def new_node() -> int:
+        feature.append(0)
+        threshold.append(0.0)
+        left.append(0)
+        right.append(0)
+        return len(feature) - 1
+
+    for tree in trees:
+        # (node dict, its index, depth); children get indices when the parent is emitted
+        stack = [(tree, new_node(), 0)]
+        roots.append(stack[0][1])
+        while stack:
+            node, idx, depth = stack.pop()
+            max_depth = max(max_depth, depth)
+            if node.get("leaf", False):
+                leaf_probs = node["probs"]
+                if not n_classes:
+                    n_classes = len(leaf_probs)
+                elif len(leaf_probs) != n_classes:
+                    raise ValueError(f"leaf has {len(leaf_probs)} classes, expected {n_classes}")
+                feature[idx] = -1
+                left[idx] = right[idx] = len(probs) // n_classes
+                probs.extend(leaf_probs)
+                continue
+            feature[idx] = node["feature"]
+            threshold[idx] = node["threshold"]
+            left[idx] = new_node()
+            right[idx] = new_node()
+            stack.append((node["right"], right[idx], depth + 1))
+            stack.append((node["left"], left[idx], depth + 1))
+
+    if not n_classes:
+        raise ValueError("forest has no leaves")
+    return FlatForest(roots, feature, threshold, left, right, probs, n_classes, max_depth)
+
+
+def load_forest(json_path: str, cache_path: Optional[str] = None) -> FlatForest:
+    """Load a forest, preferring its compiled form.
+
+    cache_path defaults to json_path with FOREST_SUFFIX. If the compiled
+    file is missing, unreadable or older than the JSON, the JSON is
+    compiled and the result written back (best effort: a read-only model
+    directory just means compiling on each load).
+    """
+    if cache_path is None:
+        cache_path = os.path.splitext(json_path)[0] + FOREST_SUFFIX
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(json_path):
+            return FlatForest.load(cache_path)
+    except (OSError, ValueError):
+        pass
+
+    with open(json_path) as f:
+        forest = compile_forest(json.load(f))
+    try:
+        forest.save(cache_path)
+    except OSError:
+        pass
+    return forest
+
+
+if __name__ == "__main__":
+    # Compile every *_forest.json in a model directory: python -m anima_mcp.eisv.forest DIR
+    model_dir = sys.argv[1] if len(sys.argv) > 1 else "."
+    for name in sorted(os.listdir(model_dir)):
+        if name.endswith("_forest.json"):
+            json_path = os.path.join(model_dir, name)
+            with open(json_path) as f:
+                flat = compile_forest(json.load(f))
+            out = os.path.splitext(json_path)[0] + FOREST_SUFFIX
+            flat.save(out)
+            print(f"{name}: {flat.n_trees} trees, {flat.n_nodes} nodes -> {out} "
+                  f"({os.path.getsize(out)} bytes)")
@@ -15,7 +15,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from .atomic_write import atomic_json_write
+from .persistence import get_persistence
 
 
 # Sensor dimensions tracked
@@ -144,13 +144,15 @@ class ExperientialFilter:
             # Corrupt or missing file — start fresh
             pass
 
-    def save(self) -> None:
-        """Explicitly save to disk."""
-        data = {
-            "weights": [w.to_dict() for w in self._weights.values()],
+    def _snapshot(self) -> dict:
+        return {
+            "weights": [w.to_dict() for w in list(self._weights.values())],
             "saved_at": time.time(),
         }
-        atomic_json_write(self._path, data, indent=2)
+
+    def save(self) -> None:
+        """Save to disk (coalesced by the persistence manager while it runs)."""
+        get_persistence().mark_dirty(self._path, self._snapshot, indent=2)
         self._last_save_time = time.time()
 
     def _maybe_save(self) -> None:
@@ -17,6 +17,8 @@ from typing import Optional, Dict, List, Any
 import sqlite3
 import sys
 
+from . import storage
+
 
 @dataclass
 class MarkDefinition:
@@ -204,11 +206,7 @@ class ExperientialMarks:
         last_error = None
         for attempt in range(max_retries):
             try:
-                conn = sqlite3.connect(self._db_path, timeout=10.0)
-                conn.row_factory = sqlite3.Row
-                conn.execute("PRAGMA journal_mode=WAL")
-                conn.execute("PRAGMA busy_timeout=10000")
-                return conn
+                return storage.connect(self._db_path, timeout=10.0, busy_timeout_ms=10000)
             except sqlite3.Error as e:
                 last_error = e
                 if attempt < max_retries - 1:
@@ -234,6 +232,7 @@ class ExperientialMarks:
     def _load_marks(self):
         """Load earned marks from database."""
         try:
+            storage.flush(self._db_path)
             conn = self._get_conn()
             for row in conn.execute(
                 "SELECT mark_id, earned_at, trigger_context FROM experiential_marks"
@@ -280,13 +279,11 @@ class ExperientialMarks:
 
         # Persist
         try:
-            conn = self._get_conn()
-            conn.execute(
+            storage.get_writer(self._db_path).submit(
                 "INSERT OR IGNORE INTO experiential_marks "
                 "(mark_id, earned_at, trigger_context) VALUES (?, ?, ?)",
                 (mark_id, earned_at, context),
             )
-            conn.commit()
         except Exception as e:
             print(f"[ExperientialMarks] DB persist error (non-fatal): {e}",
                   file=sys.stderr, flush=True)
@@ -38,13 +38,9 @@ async def handle_capture_screen(arguments: dict) -> list[TextContent | ImageCont
                 "error": "No image currently displayed"
             }))]
 
-        # Convert PIL Image to base64-encoded PNG
-        import base64
-        from io import BytesIO
-
-        buffer = BytesIO()
-        current_image.save(buffer, format="PNG")
-        img_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
+        # Base64 PNG, shared with the screen stream: encoded once per changed frame
+        from ..display.frame_stream import get_frame_hub
+        img_base64 = get_frame_hub().encoded_base64("png", image=current_image)
 
         # Get current screen/era context
         screen_mode = renderer.get_mode().value
@@ -126,7 +122,9 @@ async def handle_show_face(arguments: dict) -> list[TextContent]:
 
 async def handle_diagnostics(arguments: dict) -> list[TextContent]:
     """Get system diagnostics including LED and display status."""
-    from ..accessors import _get_leds, _get_display, _get_display_update_task, _get_sensors
+    from ..accessors import (
+        _get_leds, _get_display, _get_display_update_task, _get_sensors, _get_loop_scheduler,
+    )
 
     sensors = _get_sensors()
 
@@ -147,6 +145,10 @@ async def handle_diagnostics(arguments: dict) -> list[TextContent]:
     }
     if display and hasattr(display, '_init_error') and display._init_error:
             display_info["init_error"] = display._init_error
+    if display and hasattr(display, 'get_push_stats'):
+        display_info["spi"] = display.get_push_stats()
+    from ..display.frame_stream import get_frame_hub
+    display_info["stream"] = get_frame_hub().get_stats()
 
     # Update loop status
     loop_info = {
@@ -154,6 +156,9 @@ async def handle_diagnostics(arguments: dict) -> list[TextContent]:
         "task_done": display_task.done() if display_task else None,
         "task_cancelled": display_task.cancelled() if display_task else None,
     }
+    scheduler = _get_loop_scheduler()
+    if scheduler:
+        loop_info["scheduler"] = scheduler.get_stats()
 
     # Drawing diagnostics
     drawing_info = None
@@ -166,6 +171,7 @@ async def handle_diagnostics(arguments: dict) -> list[TextContent]:
             drawing_info = engine.get_drawing_eisv()
             if drawing_info:
                 drawing_info["pixel_count"] = len(engine.canvas.pixels)
+                drawing_info["composition"] = engine.canvas.composition_stats()
                 drawing_info["drawing_age_s"] = round(
                     _time.time() - engine.canvas.last_clear_time, 1
                 ) if engine.canvas.last_clear_time > 0 else None
@@ -184,6 +190,17 @@ async def handle_diagnostics(arguments: dict) -> list[TextContent]:
     if drawing_info:
         result["drawing"] = drawing_info
 
+    # UNITARES request pipeline (only if the server bridge has been created)
+    from ..ctx_ref import get_ctx
+    ctx = get_ctx()
+    bridge = getattr(ctx, "server_bridge", None) if ctx else None
+    if bridge is not None:
+        result["unitares"] = bridge.get_stats()
+
+    # JSON state-file writes (coalescing persistence manager)
+    from ..persistence import get_persistence
+    result["persistence"] = get_persistence().get_stats()
+
     return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
 
@@ -0,0 +1,68 @@
+"""
+Identity store database migrations.
+
+Standalone functions that take a connection parameter.
+"""
+
+import sys
+import json
+import sqlite3
+from datetime import datetime
+
+from .store import STATE_SENSOR_COLUMNS, state_sensor_values
+
+# ts_epoch value for rows whose timestamp can't be parsed. Marks the row as
+# migrated so the backfill never revisits it; analytics filter ts_epoch > 0.
+UNPARSEABLE_TS_EPOCH = -1
+
+
+def backfill_state_history_columns(conn: sqlite3.Connection, batch_size: int = 5000) -> int:
+    """One-time backfill of typed state_history columns from the JSON blob.
+
+    Rows written before the columnar schema have ts_epoch NULL. Each batch
+    parses their timestamp/sensors once and commits, so an interrupted run
+    simply resumes on the next start. Once complete, the check is a single
+    index probe (ts_epoch leads idx_state_history_conditions).
+
+    Returns:
+        Number of rows backfilled.
+    """
+    if conn.execute(
+        "SELECT 1 FROM state_history WHERE ts_epoch IS NULL LIMIT 1"
+    ).fetchone() is None:
+        return 0
+
+    print("[IdentityStore] Backfilling state_history sensor columns...", file=sys.stderr, flush=True)
+    assignments = ", ".join(f"{col} = ?" for col in STATE_SENSOR_COLUMNS)
+    total = 0
+    while True:
+        rows = conn.execute(
+            "SELECT id, timestamp, sensors FROM state_history WHERE ts_epoch IS NULL LIMIT ?",
+            (batch_size,)
+        ).fetchall()
+        if not rows:
+            break
+
+        updates = []
+        for row_id, timestamp, sensors_json in rows:
+            try:
+                ts_epoch = int(datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp())
+            except (ValueError, AttributeError, TypeError):
+                ts_epoch = UNPARSEABLE_TS_EPOCH
+            try:
+                sensors = json.loads(sensors_json) if sensors_json else {}
+            except (json.JSONDecodeError, TypeError):
+                sensors = {}
+            if not isinstance(sensors, dict):
+                sensors = {}
+            updates.append((ts_epoch, *state_sensor_values(sensors), row_id))
+
+        conn.executemany(
+            f"UPDATE state_history SET ts_epoch = ?, {assignments} WHERE id = ?",
+            updates
+        )
+        conn.commit()
+        total += len(updates)
+
+    print(f"[IdentityStore] Backfilled {total} state_history rows.", file=sys.stderr, flush=True)
+    return total
@@ -0,0 +1,239 @@
+"""
+Time-series rollups for state_history and system_metrics.
+
+Analytics used to aggregate raw per-tick rows at query time (all of
+state_history for a time-of-day breakdown), and system_metrics rows were
+simply lost once pruned. The rollups table keeps downsampled aggregates
+instead: for each source table, resolution (1 minute, 1 hour, 1 day),
+field and bucket, the count, sum, min, max and sum of squares of the
+non-NULL values, which is enough for means, ranges and variances at any
+coarser span.
+
+fold() adds rows above the source's high-water mark in rollup_marks and
+advances it in the same transaction, so every row is counted exactly once
+however the work is split. IdentityStore queues a small fold after each
+insert (continuous maintenance); the rollup maintenance job folds any
+backlog (first start, a restored database) in larger batches and prunes
+minute buckets past MINUTE_RETENTION_S. Hour and day buckets are kept.
+
+Buckets are aligned to Unix time; strftime(..., 'localtime') on bucket
+gives local hours for whole-hour UTC offsets.
+"""
+
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .store import STATE_SENSOR_COLUMNS
+
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+RESOLUTIONS = (MINUTE, HOUR, DAY)
+MINUTE_RETENTION_S = 7 * DAY
+
+INCREMENTAL_FOLD_ROWS = 500    # Per insert: normally just the new row
+BACKFILL_FOLD_ROWS = 5000      # Per source per maintenance run
+
+# Numeric fields rolled up per source table
+SOURCES: Dict[str, Tuple[str, ...]] = {
+    "state_history": ("warmth", "clarity", "stability", "presence", *STATE_SENSOR_COLUMNS),
+    "system_metrics": ("cpu_temp_c", "cpu_percent", "memory_percent", "disk_percent",
+                       "ambient_temp_c", "humidity_pct", "light_lux", "pressure_hpa",
+                       "led_brightness", "throttled_now", "undervoltage_now", "freq_capped_now"),
+}
+
+# Rollups are derived from the source tables (replication rebuilds them)
+ROLLUP_TABLES = ("rollups", "rollup_marks")
+
+
+def init_schema(conn: sqlite3.Connection):
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS rollups (
+            source TEXT NOT NULL,
+            resolution INTEGER NOT NULL,
+            field TEXT NOT NULL,
+            bucket INTEGER NOT NULL,
+            n INTEGER NOT NULL,
+            sum REAL NOT NULL,
+            min REAL NOT NULL,
+            max REAL NOT NULL,
+            sumsq REAL NOT NULL,
+            PRIMARY KEY (source, resolution, field, bucket)
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS rollup_marks (
+            source TEXT PRIMARY KEY,
+            last_id INTEGER NOT NULL
+        );
+    """)
+
+
+def _time_columns(source: str) -> str:
+    # state_history carries ts_epoch (-1 / NULL when unparseable or not yet backfilled)
+    return "ts_epoch, timestamp" if source == "state_history" else "NULL, timestamp"
+
+
+def _to_epoch(ts_epoch, timestamp) -> Optional[int]:
+    if isinstance(ts_epoch, int) and ts_epoch > 0:
+        return ts_epoch
+    try:
+        return int(datetime.fromisoformat(timestamp).timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
+def get_mark(conn: sqlite3.Connection, source: str) -> int:
+    row = conn.execute("SELECT last_id FROM rollup_marks WHERE source = ?", (source,)).fetchone()
+    return row[0] if row else 0
+
+
+def fold(conn: sqlite3.Connection, source: str, limit: int = INCREMENTAL_FOLD_ROWS) -> int:
+    """Fold up to limit unfolded source rows into the rollups; returns rows folded.
+
+    Runs in the caller's transaction (the storage writer's savepoint).
+    """
+    fields = SOURCES[source]
+    last_id = get_mark(conn, source)
+    rows = conn.execute(
+        f"SELECT id, {_time_columns(source)}, {', '.join(fields)} FROM {source} "
+        "WHERE id > ? ORDER BY id LIMIT ?", (last_id, limit)).fetchall()
+    if not rows:
+        return 0
+
+    # (resolution, field, bucket) -> [n, sum, min, max, sumsq]
+    acc: Dict[Tuple[int, str, int], List[float]] = {}
+    for row in rows:
+        ts = _to_epoch(row[1], row[2])
+        if ts is None:
+            continue
+        for field, value in zip(fields, row[3:]):
+            if value is None:
+                continue
+            value = float(value)
+            for resolution in RESOLUTIONS:
+                key = (resolution, field, ts - ts % resolution)
+                a = acc.get(key)
+                if a is None:
+                    acc[key] = [1, value, value, value, value * value]
+                else:
+                    a[0] += 1
+                    a[1] += value
+                    a[2] = min(a[2], value)
+                    a[3] = max(a[3], value)
+                    a[4] += value * value
+
+    conn.executemany(
+        """INSERT INTO rollups (source, resolution, field, bucket, n, sum, min, max, sumsq)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT (source, resolution, field, bucket) DO UPDATE SET
+               n = n + excluded.n, sum = sum + excluded.sum,
+               min = MIN(min, excluded.min), max = MAX(max, excluded.max),
+               sumsq = sumsq + excluded.sumsq""",
+        [(source, res, field, bucket, *a) for (res, field, bucket), a in acc.items()])
+    conn.execute(
+        "INSERT INTO rollup_marks (source, last_id) VALUES (?, ?) "
+        "ON CONFLICT (source) DO UPDATE SET last_id = excluded.last_id",
+        (source, rows[-1][0]))
+    return len(rows)
+
+
+def catch_up(conn: sqlite3.Connection, source: str) -> int:
+    """Fold the source's whole backlog; returns rows folded."""
+    total = 0
+    while True:
+        folded = fold(conn, source, BACKFILL_FOLD_ROWS)
+        if not folded:
+            return total
+        total += folded
+
+
+def prune(conn: sqlite3.Connection, now: Optional[float] = None) -> int:
+    """Drop minute buckets older than MINUTE_RETENTION_S; returns rows deleted."""
+    cutoff = int((now if now is not None else datetime.now().timestamp()) - MINUTE_RETENTION_S)
+    return conn.execute("DELETE FROM rollups WHERE resolution = ? AND bucket < ?",
+                        (MINUTE, cutoff)).rowcount
+
+
+def maintain(conn: sqlite3.Connection, limit: int = BACKFILL_FOLD_ROWS) -> Dict[str, int]:
+    """Backfill job: fold a batch of each source's backlog and prune old minute buckets."""
+    result = {source: fold(conn, source, limit) for source in SOURCES
+              if _has_table(conn, source)}
+    result["pruned"] = prune(conn)
+    return result
+
+
+def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                        (name,)).fetchone() is not None
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def is_current(conn: sqlite3.Connection, source: str) -> bool:
+    """Whether every source row has been folded into the rollups.
+
+    False on databases without rollups or with a backlog (rows written by
+    another process, a backfill still running); callers then use raw rows.
+    """
+    try:
+        if not _has_table(conn, "rollups"):
+            return False
+        mark = get_mark(conn, source)
+        row = conn.execute(f"SELECT 1 FROM {source} WHERE id > ? LIMIT 1", (mark,)).fetchone()
+    except sqlite3.Error:
+        return False
+    return row is None
+
+
+def resolution_for(granularity_s: float, start: Optional[float] = None,
+                   now: Optional[float] = None) -> int:
+    """Coarsest resolution no wider than granularity_s that is retained back to start."""
+    now = now if now is not None else datetime.now().timestamp()
+    best = MINUTE
+    for resolution in RESOLUTIONS:
+        if resolution > granularity_s:
+            break
+        best = resolution
+    if best == MINUTE and start is not None and start < now - MINUTE_RETENTION_S:
+        return HOUR
+    return best
+
+
+def buckets(conn: sqlite3.Connection, source: str, field: str, resolution: int,
+            start: Optional[float] = None, end: Optional[float] = None) -> List[Tuple]:
+    """(bucket, n, sum, min, max, sumsq) rows for one field, oldest first."""
+    lo = int(start) - int(start) % resolution if start is not None else 0
+    hi = int(end) if end is not None else 2 ** 62
+    return [tuple(r) for r in conn.execute(
+        "SELECT bucket, n, sum, min, max, sumsq FROM rollups "
+        "WHERE source = ? AND resolution = ? AND field = ? AND bucket BETWEEN ? AND ? "
+        "ORDER BY bucket", (source, resolution, field, lo, hi))]
+
+
+def summary(conn: sqlite3.Connection, source: str, field: str,
+            start: Optional[float] = None, end: Optional[float] = None) -> Optional[Dict[str, float]]:
+    """n / mean / min / max / std of field over [start, end], from the coarsest usable buckets."""
+    span = (end if end is not None else datetime.now().timestamp()) - (start or 0)
+    resolution = resolution_for(span, start)
+    rows = buckets(conn, source, field, resolution, start, end)
+    n = sum(r[1] for r in rows)
+    if not n:
+        return None
+    total = sum(r[2] for r in rows)
+    mean = total / n
+    variance = max(0.0, sum(r[5] for r in rows) / n - mean * mean)
+    return {"n": n, "mean": mean, "min": min(r[3] for r in rows),
+            "max": max(r[4] for r in rows), "std": variance ** 0.5}
+
+
+def paired_means(conn: sqlite3.Connection, source: str, key_field: str, value_field: str,
+                 resolution: int) -> List[Tuple[float, float, int]]:
+    """(mean key_field, sum value_field, n value_field) per bucket where both have data."""
+    return [tuple(r) for r in conn.execute(
+        "SELECT k.sum / k.n, v.sum, v.n FROM rollups k JOIN rollups v "
+        "ON v.source = k.source AND v.resolution = k.resolution AND v.bucket = k.bucket "
+        "AND v.field = ? WHERE k.source = ? AND k.resolution = ? AND k.field = ?",
+        (value_field, source, resolution, key_field))]
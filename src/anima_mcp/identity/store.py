@@ -19,11 +19,57 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List
 import json
 
+from .. import storage
+
 
 # Epoch: bump when a model change invalidates existing stored data.
 # Most changes (bug fixes, new tools, docs) do NOT bump the epoch.
 CURRENT_EPOCH = 1
 
+# Sensor fields promoted out of the state_history JSON blob into typed
+# columns, so analytics can read them without json.loads per row.
+# The full blob is still written for everything else.
+STATE_SENSOR_COLUMNS = (
+    "ambient_temp_c",
+    "light_lux",
+    "humidity_pct",
+    "pressure_hpa",
+    "cpu_temp_c",
+    "eeg_delta_power",
+    "eeg_theta_power",
+    "eeg_alpha_power",
+    "eeg_beta_power",
+    "eeg_gamma_power",
+)
+
+
+def state_sensor_values(sensors: Dict[str, Any]) -> tuple:
+    """Column values for STATE_SENSOR_COLUMNS (non-numeric values become NULL)."""
+    values = []
+    for col in STATE_SENSOR_COLUMNS:
+        v = sensors.get(col)
+        values.append(float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else None)
+    return tuple(values)
+
+
+def state_history_is_columnar(conn: sqlite3.Connection) -> bool:
+    """Whether state_history has the typed sensor/ts_epoch columns.
+
+    Analytics fall back to parsing the JSON blob on databases that haven't
+    been opened by an IdentityStore since the columns were added.
+    """
+    try:
+        cols = {row[1] for row in conn.execute("PRAGMA table_info(state_history)")}
+    except sqlite3.Error:
+        return False
+    return "ts_epoch" in cols and all(c in cols for c in STATE_SENSOR_COLUMNS)
+
+
+def _report_rollup_error(future) -> None:
+    error = future.exception()
+    if error is not None:
+        print(f"[IdentityStore] Rollup update failed: {error}", file=sys.stderr, flush=True)
+
 
 @dataclass
 class CreatureIdentity:
@@ -85,6 +131,28 @@ class IdentityStore:
         self._session_start: Optional[datetime] = None
 
     def _connect(self) -> sqlite3.Connection:
+        """Connection for reads and synchronous writes.
+
+        Does not wait for queued writes (see _write): reads may trail them by
+        up to one group-commit window. Paths that read back rows this process
+        just queued call flush() first.
+        """
+        return self._schema_conn()
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Block until writes queued by this process are committed.
+
+        Blocking - call from startup/shutdown or a worker thread, not from
+        the event loop. Returns False (and logs) if the writer didn't drain
+        within timeout.
+        """
+        if storage.flush(self.db_path, timeout):
+            return True
+        print(f"[IdentityStore] Queued writes not committed within {timeout}s; reading without them",
+              file=sys.stderr, flush=True)
+        return False
+
+    def _schema_conn(self) -> sqlite3.Connection:
         if self._conn is None:
             # Use timeout and WAL mode for better concurrency between broker and anima
             # Shorter timeout for reads (5s) to prevent blocking, longer for writes (30s)
@@ -99,6 +167,32 @@ class IdentityStore:
             self._init_schema()
         return self._conn
 
+    def _write(self, sql: str, params: tuple) -> None:
+        """Queue a write on the shared anima.db writer (group-committed).
+
+        Used for the per-tick time series (state, system metrics, drawing
+        history) so they don't take the write lock and fsync on every call.
+        """
+        self._schema_conn()
+        storage.get_writer(self.db_path).submit(sql, params)
+
+    def _fold_rollups(self, source: str) -> None:
+        """Queue folding the rows just written into the time-series rollups."""
+        from . import rollups
+        future = storage.get_writer(self.db_path).call(lambda conn: rollups.fold(conn, source))
+        future.add_done_callback(_report_rollup_error)
+
+    def maintain_rollups(self):
+        """Queue a rollup backfill batch and minute-bucket pruning (maintenance job).
+
+        Returns the writer future, resolving to rows folded per source.
+        """
+        from . import rollups
+        self._schema_conn()
+        future = storage.get_writer(self.db_path).call(rollups.maintain)
+        future.add_done_callback(_report_rollup_error)
+        return future
+
     def _init_schema(self):
         """Create tables if they don't exist."""
         conn = self._conn
@@ -192,6 +286,30 @@ class IdentityStore:
             except sqlite3.OperationalError:
                 pass  # Column already exists
 
+        # Columnar state_history: integer epoch seconds + typed sensor columns
+        for col, col_type in (("ts_epoch", "INTEGER"),
+                              *((c, "REAL") for c in STATE_SENSOR_COLUMNS)):
+            try:
+                conn.execute(f"ALTER TABLE state_history ADD COLUMN {col} {col_type}")
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+
+        # Covering indexes: pattern load / time-range scans and pressure splits
+        conn.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_state_history_conditions
+                ON state_history(ts_epoch, ambient_temp_c, light_lux, humidity_pct,
+                                 warmth, clarity, stability, presence);
+
+            CREATE INDEX IF NOT EXISTS idx_state_history_pressure
+                ON state_history(pressure_hpa, warmth, clarity, stability, presence);
+        """)
+        conn.commit()
+
+        from .migrations import backfill_state_history_columns
+        backfill_state_history_columns(conn)
+
+        from .rollups import init_schema as init_rollup_schema
+        init_rollup_schema(conn)
         conn.commit()
 
     def _recalculate_stats(self, conn: sqlite3.Connection, creature_id: str) -> tuple[int, float]:
@@ -267,6 +385,8 @@ class IdentityStore:
             dedupe_window_seconds: Only log a new wake event if last wake was
                                    more than this many seconds ago (default: 300)
         """
+        # Stats and lost-time recovery read state_history, which is queued.
+        self.flush()
         conn = self._connect()
         now = datetime.now()
 
@@ -386,6 +506,8 @@ class IdentityStore:
         if not self._identity or not self._session_start:
             return 0.0
 
+        # Let the per-tick series land before the sleep event marks the session end.
+        self.flush()
         conn = self._connect()
         now = datetime.now()
 
@@ -482,17 +604,18 @@ class IdentityStore:
         return True
 
     def record_state(self, warmth: float, clarity: float, stability: float, presence: float, sensors: dict):
-        """Record current anima state and sensor readings."""
-        conn = self._connect()
+        """Record current anima state and sensor readings (queued, group-committed)."""
         now = datetime.now()
 
-        conn.execute(
-            """INSERT INTO state_history
-               (timestamp, warmth, clarity, stability, presence, sensors, epoch)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (now.isoformat(), warmth, clarity, stability, presence, json.dumps(sensors), CURRENT_EPOCH)
+        self._write(
+            f"""INSERT INTO state_history
+               (timestamp, warmth, clarity, stability, presence, sensors, epoch,
+                ts_epoch, {", ".join(STATE_SENSOR_COLUMNS)})
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?{", ?" * len(STATE_SENSOR_COLUMNS)})""",
+            (now.isoformat(), warmth, clarity, stability, presence, json.dumps(sensors), CURRENT_EPOCH,
+             int(now.timestamp()), *state_sensor_values(sensors))
         )
-        conn.commit()
+        self._fold_rollups("state_history")
 
     # ------------------------------------------------------------------
     # System metrics (hardware time-series with retention)
@@ -504,7 +627,6 @@ class IdentityStore:
         Args:
             readings: SensorReadings instance (or dict with same keys).
         """
-        conn = self._connect()
         now = datetime.now()
 
         if hasattr(readings, 'cpu_temp_c'):
@@ -525,7 +647,7 @@ class IdentityStore:
         else:
             d = dict(readings)
 
-        conn.execute(
+        self._write(
             """INSERT INTO system_metrics
                (timestamp, cpu_temp_c, cpu_percent, memory_percent, disk_percent,
                 ambient_temp_c, humidity_pct, light_lux, pressure_hpa,
@@ -541,7 +663,7 @@ class IdentityStore:
              d.get("freq_capped_now"),
              CURRENT_EPOCH)
         )
-        conn.commit()
+        self._fold_rollups("system_metrics")
 
     def get_system_metrics(self, hours: float = 24.0, limit: int = 2880) -> List[Dict]:
         """Query recent system metrics.
@@ -569,19 +691,32 @@ class IdentityStore:
         return [dict(row) for row in reversed(rows)]
 
     def prune_system_metrics(self, max_age_hours: float = 24.0) -> int:
-        """Delete system_metrics rows older than max_age_hours.
+        """Delete system_metrics rows older than max_age_hours and wait for it.
 
         Returns:
             Number of rows deleted.
         """
-        conn = self._connect()
+        return self.queue_system_metrics_prune(max_age_hours).result(timeout=60)
+
+    def queue_system_metrics_prune(self, max_age_hours: float = 24.0):
+        """Queue deleting system_metrics rows older than max_age_hours on the writer.
+
+        Rows are folded into the rollups first (one backfill batch), so their
+        hourly and daily aggregates outlive them; rows not yet folded are left
+        for the next prune. Returns the writer future, resolving to rows deleted.
+        """
+        from . import rollups
+        self._schema_conn()
         cutoff = (datetime.now() - timedelta(hours=max_age_hours)).isoformat()
-        cursor = conn.execute(
-            "DELETE FROM system_metrics WHERE timestamp < ?",
-            (cutoff,)
-        )
-        conn.commit()
-        return cursor.rowcount
+
+        def prune(conn: sqlite3.Connection) -> int:
+            rollups.fold(conn, "system_metrics", rollups.BACKFILL_FOLD_ROWS)
+            return conn.execute(
+                "DELETE FROM system_metrics WHERE timestamp < ? AND id <= ?",
+                (cutoff, rollups.get_mark(conn, "system_metrics"))
+            ).rowcount
+
+        return storage.get_writer(self.db_path).call(prune)
 
     def get_recent_state_history(self, limit: int = 30) -> List[Dict]:
         """Get recent state_history entries for trajectory bootstrap.
@@ -620,30 +755,25 @@ class IdentityStore:
     ) -> None:
         """Record DrawingEISV state snapshot. Best-effort, never raises.
 
-        Uses a dedicated connection because this is called from the display
-        render thread, not the main server thread — SQLite connections can't
-        cross threads.
+        Called from the display render thread. The insert is queued on the
+        shared writer, which owns its own connection, so no SQLite handle
+        crosses threads and the render loop never waits on the write lock.
         """
         try:
-            conn = sqlite3.connect(self.db_path, timeout=5.0)
-            try:
-                conn.execute(
-                    """INSERT INTO drawing_history
-                       (timestamp, E, I, S, V, C, marks, phase, era, energy,
-                        curiosity, engagement, fatigue, arc_phase,
-                        gesture_entropy, switching_rate, intentionality, epoch)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (
-                        datetime.now().isoformat(),
-                        E, I, S, V, C, marks, phase, era, energy,
-                        curiosity, engagement, fatigue, arc_phase,
-                        gesture_entropy, switching_rate, intentionality,
-                        CURRENT_EPOCH,
-                    ),
-                )
-                conn.commit()
-            finally:
-                conn.close()
+            storage.get_writer(self.db_path).submit(
+                """INSERT INTO drawing_history
+                   (timestamp, E, I, S, V, C, marks, phase, era, energy,
+                    curiosity, engagement, fatigue, arc_phase,
+                    gesture_entropy, switching_rate, intentionality, epoch)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    datetime.now().isoformat(),
+                    E, I, S, V, C, marks, phase, era, energy,
+                    curiosity, engagement, fatigue, arc_phase,
+                    gesture_entropy, switching_rate, intentionality,
+                    CURRENT_EPOCH,
+                ),
+            )
         except Exception as e:
             import sys
             print(f"[IdentityStore] record_drawing_state failed: {e}", file=sys.stderr, flush=True)
@@ -798,7 +928,8 @@ class IdentityStore:
         return 0.0
 
     def close(self):
-        """Close database connection."""
+        """Close database connection (after queued writes commit)."""
+        self.flush()
         if self._conn:
             self._conn.close()
             self._conn = None
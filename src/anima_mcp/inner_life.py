@@ -19,7 +19,7 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from .anima import Anima
-from .atomic_write import atomic_json_write
+from .persistence import get_persistence
 
 DIMENSIONS = ("warmth", "clarity", "stability", "presence")
 
@@ -131,18 +131,20 @@ class InnerLife:
             print(f"[InnerLife] Load error (starting fresh): {e}",
                   file=sys.stderr, flush=True)
 
+    def _snapshot(self) -> dict:
+        return {
+            "temperament": {dim: round(v, 4) for dim, v in list(self._temperament.items())},
+            "drives": {dim: round(v, 3) for dim, v in list(self._drives.items())},
+            "saved_at": time.time(),
+        }
+
     def save(self):
-        """Save temperament and drives to disk."""
+        """Save temperament and drives to disk (coalesced by the persistence manager)."""
         if self._temperament is None:
             return
         try:
             _PERSISTENCE_PATH.parent.mkdir(exist_ok=True)
-            data = {
-                "temperament": {dim: round(v, 4) for dim, v in self._temperament.items()},
-                "drives": {dim: round(v, 3) for dim, v in self._drives.items()},
-                "saved_at": time.time(),
-            }
-            atomic_json_write(_PERSISTENCE_PATH, data)
+            get_persistence().mark_dirty(_PERSISTENCE_PATH, self._snapshot)
         except Exception as e:
             print(f"[InnerLife] Save error: {e}", file=sys.stderr, flush=True)
 
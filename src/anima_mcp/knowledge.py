@@ -13,6 +13,7 @@ from dataclasses import dataclass, asdict
 from pathlib import Path
 
 from .atomic_write import atomic_json_write
+from .text_index import BM25Index
 
 
 def _get_knowledge_path() -> Path:
@@ -63,33 +64,71 @@ class Insight:
             return f"{days}d ago"
 
 
+def _index_text(insight: Insight) -> str:
+    """What the search index sees of an insight (its category counts as a word)."""
+    return f"{insight.text} {insight.category}"
+
+
+def _file_stamp(path: Path) -> Optional[tuple]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
 class KnowledgeBase:
-    """Lumen's accumulated knowledge from Q&A interactions."""
+    """Lumen's accumulated knowledge from Q&A interactions.
+
+    Insights are indexed for BM25 search (see text_index); the index is
+    kept up to date as insights are added or trimmed and saved alongside
+    them in knowledge.json.
+    """
 
     MAX_INSIGHTS = 100  # Keep most recent/important insights
 
     def __init__(self):
         self._knowledge_file = _get_knowledge_path()
         self._insights: List[Insight] = []
+        self._index = BM25Index()
+        self._loaded_stamp: Optional[tuple] = None  # (mtime_ns, size) of the file last read/written
         self._load()
 
     def _load(self):
-        """Load insights from persistent storage."""
+        """Load insights from persistent storage (skipped if the file is unchanged)."""
+        stamp = _file_stamp(self._knowledge_file)
+        if stamp is not None and stamp == self._loaded_stamp:
+            return
         try:
-            if self._knowledge_file.exists():
+            if stamp is not None:
                 data = json.loads(self._knowledge_file.read_text())
                 self._insights = [Insight.from_dict(i) for i in data.get("insights", [])]
             else:
+                data = {}
                 self._insights = []
         except Exception as e:
             print(f"[Knowledge] Load error: {e}", file=sys.stderr, flush=True)
+            data = {}
             self._insights = []
+        self._loaded_stamp = stamp
+
+        ids = {i.insight_id for i in self._insights}
+        index = BM25Index.from_dict(data.get("index") or {}, expected_ids=ids)
+        if index is None:
+            index = BM25Index()
+            for insight in self._insights:
+                index.add(insight.insight_id, _index_text(insight))
+        self._index = index
 
     def _save(self):
-        """Save insights to persistent storage."""
+        """Save insights and their search index to persistent storage."""
         try:
-            data = {"insights": [i.to_dict() for i in self._insights]}
+            data = {
+                "insights": [i.to_dict() for i in self._insights],
+                "index": self._index.to_dict(),
+            }
             atomic_json_write(self._knowledge_file, data, indent=2)
+            self._loaded_stamp = _file_stamp(self._knowledge_file)
         except Exception as e:
             print(f"[Knowledge] Save error: {e}", file=sys.stderr, flush=True)
 
@@ -150,11 +189,14 @@ class KnowledgeBase:
             confidence=confidence,
         )
         self._insights.append(insight)
+        self._index.add(insight_id, _index_text(insight))
 
         # Trim to max, keeping most referenced/confident
         if len(self._insights) > self.MAX_INSIGHTS:
             # Sort by importance (references + confidence)
             self._insights.sort(key=lambda i: i.references + i.confidence, reverse=True)
+            for dropped in self._insights[self.MAX_INSIGHTS:]:
+                self._index.remove(dropped.insight_id)
             self._insights = self._insights[:self.MAX_INSIGHTS]
 
         self._save()
@@ -195,19 +237,16 @@ class KnowledgeBase:
         return " | ".join(summary_parts) if summary_parts else "I haven't learned anything specific yet."
 
     def get_relevant_insights(self, query: str, limit: int = 5) -> List[Insight]:
-        """Get insights relevant to a query (simple keyword matching)."""
-        self._load()
-        query_words = set(query.lower().split())
+        """Get insights relevant to a query, best BM25 match first."""
+        return [insight for insight, _ in self.search(query, limit)]
 
-        scored_insights = []
-        for insight in self._insights:
-            insight_words = set(insight.text.lower().split())
-            overlap = len(query_words & insight_words)
-            if overlap > 0:
-                scored_insights.append((overlap, insight))
-
-        scored_insights.sort(key=lambda x: x[0], reverse=True)
-        return [i for _, i in scored_insights[:limit]]
+    def search(self, query: str, limit: int = 5) -> List[tuple]:
+        """(insight, BM25 score) pairs for insights sharing a term with query."""
+        self._load()
+        by_id = {i.insight_id: i for i in self._insights}
+        return [(by_id[doc_id], score)
+                for doc_id, score in self._index.search(query, limit)
+                if doc_id in by_id]
 
     def mark_referenced(self, insight_id: str):
         """Mark an insight as referenced (increases its importance)."""
@@ -372,6 +372,30 @@ def sleep():
             except (ValueError, OSError):
                 pass
 
+    # Fold this session's state rows into memory's persisted pattern index
+    try:
+        from .memory import flush_memory
+        if flush_memory():
+            try:
+                print("[Sleep] Memory patterns saved", file=sys.stderr, flush=True)
+            except (ValueError, OSError):
+                pass
+    except Exception as e:
+        try:
+            print(f"[Sleep] Error saving memory patterns: {e}", file=sys.stderr, flush=True)
+        except (ValueError, OSError):
+            pass
+
+    # Write out state files still waiting in the persistence manager's window
+    try:
+        from .persistence import get_persistence
+        get_persistence().stop()
+    except Exception as e:
+        try:
+            print(f"[Sleep] Error flushing state files: {e}", file=sys.stderr, flush=True)
+        except (ValueError, OSError):
+            pass
+
     # Close server-side UNITARES bridge if it was used
     bridge = _get_server_bridge()
     if bridge:
@@ -2,7 +2,8 @@
 
 Extracted from server.py to reduce its size. These functions implement the
 core logic for governance fallback, reflections, self-answers, schema extraction,
-and self-reflection cycles.
+and self-reflection cycles, plus the slow-clock jobs registered with the loop
+scheduler (register_loop_tasks).
 """
 
 from __future__ import annotations
@@ -613,3 +614,257 @@ async def self_reflect():
 
     except Exception as e:
         logger.warning("[SelfReflection] Error (non-fatal): %s", e)
+
+
+# ---------------------------------------------------------------------------
+# Slow-clock jobs, run by the LoopScheduler (see register_loop_tasks).
+# Each takes the iteration's frame dict: loop_count, anima, readings,
+# identity, prediction_error, health.
+# ---------------------------------------------------------------------------
+
+def _anima_state(anima) -> Dict[str, float]:
+    return {
+        "warmth": anima.warmth, "clarity": anima.clarity,
+        "stability": anima.stability, "presence": anima.presence,
+    }
+
+
+def _self_model_or_none(purpose: str):
+    try:
+        from .self_model import get_self_model
+        return get_self_model()
+    except Exception as e:
+        logger.debug("[Growth] SelfModel init for %s: %s", purpose, e)
+        return None
+
+
+def record_system_metrics_task(frame):
+    """Persist system metrics to SQLite (queued on the shared writer)."""
+    from .ctx_ref import get_ctx
+    _ctx = get_ctx()
+    if _ctx and _ctx.store:
+        _ctx.store.record_system_metrics(frame["readings"])
+
+
+def prune_system_metrics_task(frame):
+    """Delete system_metrics rows older than the retention window (queued on the writer)."""
+    from .ctx_ref import get_ctx
+    from .server_state import SYSTEM_METRICS_RETENTION_HOURS
+    _ctx = get_ctx()
+    if _ctx and _ctx.store:
+        future = _ctx.store.queue_system_metrics_prune(SYSTEM_METRICS_RETENTION_HOURS)
+        future.add_done_callback(_log_metrics_prune)
+
+
+def _log_metrics_prune(future):
+    error = future.exception()
+    if error is not None:
+        logger.warning("[Metrics] system_metrics prune failed: %s", error)
+    elif future.result() > 0:
+        logger.debug("[Metrics] Pruned %d old system_metrics rows", future.result())
+
+
+def rollup_maintenance_task(frame):
+    """Fold any state_history/system_metrics backlog into the rollups (queued on the writer)."""
+    from .ctx_ref import get_ctx
+    _ctx = get_ctx()
+    if _ctx and _ctx.store:
+        _ctx.store.maintain_rollups()
+
+
+def adapt_calibration_task(frame):
+    """Adapt calibration if the learner has enough new observations (respects cooldown)."""
+    from .ctx_ref import get_ctx
+    from .learning import get_learner
+    _ctx = get_ctx()
+    if not (_ctx and _ctx.store):
+        return
+    learner = get_learner(str(_ctx.store.db_path))
+    adapted, new_cal = learner.adapt_calibration(respect_cooldown=True)
+    if adapted:
+        logger.debug("[Learning] Calibration adapted after %d observations", frame["loop_count"])
+        logger.debug("[Learning] Pressure: %.1f hPa, Ambient: %.1f-%.1f C", new_cal.pressure_ideal, new_cal.ambient_temp_min, new_cal.ambient_temp_max)
+
+
+def growth_observe_task(frame):
+    """Observe environment for preference learning and check milestones."""
+    from .ctx_ref import get_ctx
+    from .messages import add_observation
+    _ctx = get_ctx()
+    if not (_ctx and _ctx.growth):
+        return
+    anima, readings = frame["anima"], frame["readings"]
+    # Raw lux includes LED glow — that's Lumen's actual light environment
+    environment = {
+        "light_lux": readings.light_lux or 0.0,
+        "temp_c": readings.ambient_temp_c,
+        "humidity_pct": readings.humidity_pct,
+    }
+    try:
+        insight = _ctx.growth.observe_state_preference(_anima_state(anima), environment)
+        if insight:
+            logger.debug("[Growth] %s", insight)
+            add_observation(insight, author="lumen")
+
+        milestone = _ctx.growth.check_for_milestones(frame["identity"], anima)
+        if milestone:
+            logger.debug("[Growth] Milestone: %s", milestone)
+            add_observation(milestone, author="lumen")
+    finally:
+        if frame.get("health"):
+            frame["health"].heartbeat("growth")
+
+
+def goal_suggest_task(frame):
+    """Suggest a goal grounded in Lumen's experience."""
+    from .ctx_ref import get_ctx
+    from .messages import add_observation
+    _ctx = get_ctx()
+    if not (_ctx and _ctx.growth):
+        return
+    goal = _ctx.growth.suggest_goal(_anima_state(frame["anima"]),
+                                    self_model=_self_model_or_none("goal suggest"))
+    if goal:
+        add_observation(f"new goal: {goal.description}", author="lumen")
+
+
+def goal_check_task(frame):
+    """Check progress on active goals."""
+    from .ctx_ref import get_ctx
+    from .messages import add_observation
+    _ctx = get_ctx()
+    if not (_ctx and _ctx.growth):
+        return
+    msg = _ctx.growth.check_goal_progress(_anima_state(frame["anima"]),
+                                         self_model=_self_model_or_none("goal check"))
+    if msg:
+        add_observation(msg, author="lumen")
+
+
+def meta_learning_task(frame):
+    """Rebalance which anima dimensions matter most.
+
+    Based on how satisfying each dimension correlates with trajectory health.
+    """
+    from .ctx_ref import get_ctx
+    from .preferences import compute_trajectory_health, meta_learning_update, get_preference_system
+    _ctx = get_ctx()
+    if not (_ctx and _ctx.growth):
+        return
+
+    # Prediction accuracy trend: -0.5 (poor) to 0.5 (good), from adaptive model
+    pred_trend = 0.0
+    try:
+        from .adaptive_prediction import get_adaptive_prediction_model
+        stats = get_adaptive_prediction_model().get_accuracy_stats()
+        if not stats.get("insufficient_data") and "overall_mean_error" in stats:
+            err = stats["overall_mean_error"]
+            pred_trend = max(-0.5, min(0.5, (1.0 - min(1.0, err)) * 2.0 - 1.0))
+    except Exception as e:
+        logger.debug("[MetaLearning] Prediction accuracy stats error: %s", e)
+
+    health = compute_trajectory_health(
+        satisfaction_history=list(_ctx.satisfaction_history)[-100:],
+        action_efficacy=_ctx.action_efficacy,
+        prediction_accuracy_trend=pred_trend,
+    )
+    _ctx.health_history.append(health)
+
+    # Record healthy state for drift restart target
+    if _ctx.calibration_drift:
+        _ctx.calibration_drift.record_healthy_state(health)
+
+    correlations = compute_lagged_correlations()
+
+    pref_system = get_preference_system()
+    weights = {
+        d: p.influence_weight
+        for d, p in pref_system._preferences.items()
+        if d in ("warmth", "clarity", "stability", "presence")
+    }
+    if weights:
+        new_weights = meta_learning_update(weights, correlations)
+        for d, w in new_weights.items():
+            if d in pref_system._preferences:
+                pref_system._preferences[d].influence_weight = w
+        pref_system._save()
+        logger.debug("[MetaLearning] Updated preference weights: %s health=%.3f",
+                     ', '.join(f'{d}={w:.3f}' for d, w in new_weights.items()), health)
+
+
+def record_anima_history_task(frame):
+    """Record anima state for trajectory signature computation.
+
+    See: docs/theory/TRAJECTORY_IDENTITY_PAPER.md
+    """
+    from .anima_history import get_anima_history
+    get_anima_history().record_from_anima(frame["anima"])
+
+
+async def unified_reflection_task(frame):
+    await lumen_unified_reflect(frame["anima"], frame["readings"], frame["identity"],
+                                frame.get("prediction_error"))
+
+
+async def self_answer_task(frame):
+    await lumen_self_answer(frame["anima"], frame["readings"], frame["identity"])
+
+
+async def schema_extraction_task(frame):
+    from .ctx_ref import get_ctx
+    await extract_and_validate_schema(frame["anima"], frame["readings"], frame["identity"])
+    # Persist schema periodically so crash recovery has recent data
+    # (not just on clean shutdown — Pi crashes often)
+    _ctx = get_ctx()
+    if _ctx and _ctx.schema_hub:
+        _ctx.schema_hub.persist_schema()
+
+
+async def self_reflection_task(frame):
+    await self_reflect()
+
+
+def register_loop_tasks(scheduler) -> None:
+    """Register the display loop's slow-clock jobs (periods in loop iterations).
+
+    All sync jobs stay inline: the identity store, learner and reflection
+    system hold SQLite connections bound to the loop thread.
+    """
+    from .server_state import (
+        SYSTEM_METRICS_RECORD_INTERVAL, SYSTEM_METRICS_PRUNE_INTERVAL, ROLLUP_MAINTENANCE_INTERVAL,
+        LEARNING_INTERVAL,
+        GROWTH_INTERVAL, GOAL_SUGGEST_INTERVAL, GOAL_CHECK_INTERVAL, META_LEARNING_INTERVAL,
+        TRAJECTORY_INTERVAL, UNIFIED_REFLECTION_INTERVAL, SELF_ANSWER_INTERVAL,
+        SCHEMA_EXTRACTION_INTERVAL, EXPRESSION_INTERVAL,
+    )
+    full = ("readings", "anima", "identity")
+    register = scheduler.register
+
+    register("anima_history", record_anima_history_task, TRAJECTORY_INTERVAL,
+             budget_ms=5, priority=0, requires=("anima",))
+    register("system_metrics", record_system_metrics_task, SYSTEM_METRICS_RECORD_INTERVAL,
+             budget_ms=5, priority=0, requires=("readings",))
+    register("growth", growth_observe_task, GROWTH_INTERVAL,
+             budget_ms=20, priority=1, requires=full)
+    register("goal_check", goal_check_task, GOAL_CHECK_INTERVAL,
+             budget_ms=20, priority=2, requires=("anima",))
+    register("learning", adapt_calibration_task, LEARNING_INTERVAL,
+             budget_ms=50, priority=2)
+    register("goal_suggest", goal_suggest_task, GOAL_SUGGEST_INTERVAL,
+             budget_ms=30, priority=3, requires=("anima",))
+    register("metrics_prune", prune_system_metrics_task, SYSTEM_METRICS_PRUNE_INTERVAL,
+             budget_ms=50, priority=3)
+    register("rollups", rollup_maintenance_task, ROLLUP_MAINTENANCE_INTERVAL,
+             budget_ms=5, priority=3, run_first=True)
+    register("meta_learning", meta_learning_task, META_LEARNING_INTERVAL,
+             budget_ms=100, priority=4)
+
+    # Coroutine jobs run in the background; budgets are wall time
+    register("unified_reflection", unified_reflection_task, UNIFIED_REFLECTION_INTERVAL,
+             budget_ms=200, priority=1, requires=full)
+    register("self_answer", self_answer_task, SELF_ANSWER_INTERVAL,
+             budget_ms=200, priority=2, requires=full)
+    register("schema_extraction", schema_extraction_task, SCHEMA_EXTRACTION_INTERVAL,
+             budget_ms=2000, priority=3, requires=full, run_first=True)
+    register("self_reflection", self_reflection_task, EXPRESSION_INTERVAL,
+             budget_ms=500, priority=3, requires=full)
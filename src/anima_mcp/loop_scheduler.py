@@ -0,0 +1,276 @@
+"""
+Loop Scheduler - periodic subsystem jobs for the display loop.
+
+The display loop runs at ~5 Hz and used to gate its slow-clock work with
+`loop_count % INTERVAL == 0` checks. Whenever several intervals lined up
+(every 900, 1800, 3600 iterations) all of those jobs ran back to back in
+one iteration and the coroutine ones were awaited, network calls
+included, so the next frame came late.
+
+Jobs are registered here instead, each with a period in loop iterations,
+a per-run budget and a priority:
+
+- Inline jobs run on the loop thread in priority order, but only while the
+  iteration's frame budget lasts. The rest wait for the next iteration
+  (oldest first, at most MAX_WAIT_ITERATIONS), so coinciding intervals
+  are spread over a few frames.
+- Coroutine jobs are started as background tasks and not awaited; their
+  awaits (network, sleeps) overlap the frame wait instead of delaying it.
+- Jobs marked offload run on a small bounded thread pool. Only use it for
+  jobs whose state is safe to touch off the loop thread (many stores keep
+  thread-bound SQLite connections).
+
+A job that comes due again while its previous run is still waiting or in
+flight records a deadline miss. Per-job runtime histograms, budget
+overruns, deferrals and misses are available from get_stats().
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger("anima.server")
+
+DEFAULT_FRAME_BUDGET_MS = 40.0   # Inline job time allowed per loop iteration
+DEFAULT_POOL_WORKERS = 2
+# Runtime histogram bucket upper bounds (ms); the last bucket is open-ended
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+COST_SMOOTHING = 0.3             # EWMA weight of the newest runtime in the cost estimate
+MAX_WAIT_ITERATIONS = 5          # A job deferred this long runs even if the frame budget is spent
+
+
+@dataclass
+class TaskStats:
+    """Runtime record for one job."""
+    runs: int = 0
+    errors: int = 0
+    overruns: int = 0          # Runs longer than the job's budget
+    deferrals: int = 0         # Iterations the job waited for frame budget
+    deadline_misses: int = 0   # Came due again before the previous run started/finished
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+    histogram: List[int] = field(default_factory=lambda: [0] * (len(HISTOGRAM_BOUNDS_MS) + 1))
+
+    def record(self, ms: float, budget_ms: float):
+        self.runs += 1
+        self.total_ms += ms
+        self.last_ms = ms
+        self.max_ms = max(self.max_ms, ms)
+        if ms > budget_ms:
+            self.overruns += 1
+        self.histogram[bisect.bisect_left(HISTOGRAM_BOUNDS_MS, ms)] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        labels = [f"<={b}ms" for b in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}ms"]
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "overruns": self.overruns,
+            "deferrals": self.deferrals,
+            "deadline_misses": self.deadline_misses,
+            "mean_ms": round(self.total_ms / self.runs, 2) if self.runs else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "last_ms": round(self.last_ms, 2),
+            "histogram": {label: n for label, n in zip(labels, self.histogram) if n},
+        }
+
+
+@dataclass
+class LoopTask:
+    """A periodic job. fn takes the iteration's frame dict."""
+    name: str
+    fn: Callable[[Dict[str, Any]], Any]
+    period: int                      # Loop iterations between runs
+    budget_ms: float
+    priority: int = 0                # Lower runs first
+    offload: bool = False            # Run on the worker pool (sync jobs only)
+    requires: Sequence[str] = ()     # Frame keys that must be truthy for the job to run
+    run_first: bool = False          # Also due on the first iteration
+
+    is_async: bool = False
+    order: int = 0
+    pending: Optional[Dict[str, Any]] = None   # Frame the job is waiting to run with
+    pending_since: int = 0
+    in_flight: bool = False
+    cost_ms: Optional[float] = None            # Smoothed inline runtime
+    stats: TaskStats = field(default_factory=TaskStats)
+
+    def due(self, loop_count: int) -> bool:
+        return loop_count % self.period == 0 or (self.run_first and loop_count == 1)
+
+    def expected_ms(self) -> float:
+        return self.cost_ms if self.cost_ms is not None else self.budget_ms
+
+
+class LoopScheduler:
+    """Runs registered jobs from the display loop without delaying frames."""
+
+    def __init__(self, frame_budget_ms: float = DEFAULT_FRAME_BUDGET_MS,
+                 pool_workers: int = DEFAULT_POOL_WORKERS):
+        self.frame_budget_ms = frame_budget_ms
+        self.pool_workers = pool_workers
+        self._tasks: Dict[str, LoopTask] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._background: set = set()
+
+        # Stats
+        self.ticks = 0
+        self.frames_over_budget = 0
+        self.last_tick_ms = 0.0
+
+    def register(self, name: str, fn: Callable[[Dict[str, Any]], Any], period: int,
+                 budget_ms: float, priority: int = 0, offload: bool = False,
+                 requires: Sequence[str] = (), run_first: bool = False) -> LoopTask:
+        """Add a job; coroutine functions are detected and run as background tasks."""
+        if period < 1:
+            raise ValueError(f"period must be >= 1, got {period}")
+        if name in self._tasks:
+            raise ValueError(f"task {name!r} already registered")
+        is_async = asyncio.iscoroutinefunction(fn)
+        if offload and is_async:
+            raise ValueError(f"task {name!r}: coroutine jobs run as background tasks, not offloaded")
+        task = LoopTask(name, fn, period, budget_ms, priority, offload, tuple(requires), run_first,
+                        is_async=is_async, order=len(self._tasks))
+        self._tasks[name] = task
+        return task
+
+    def tick(self, loop_count: int, frame: Dict[str, Any]) -> List[str]:
+        """Run this iteration's share of due jobs; returns the names started.
+
+        Must be called from the event loop thread when coroutine jobs are
+        registered. frame is handed to each job as-is, so build a new dict
+        per iteration (background runs keep the one they were started with).
+        """
+        start = time.perf_counter()
+        self.ticks += 1
+
+        for task in self._tasks.values():
+            if not task.due(loop_count):
+                continue
+            if not all(frame.get(key) for key in task.requires):
+                continue
+            if task.pending is not None or task.in_flight:
+                task.stats.deadline_misses += 1
+                if task.pending is not None:
+                    task.pending = frame  # Run with the freshest state when it gets a turn
+                continue
+            task.pending = frame
+            task.pending_since = loop_count
+
+        waiting = sorted((t for t in self._tasks.values() if t.pending is not None),
+                         key=lambda t: (t.priority, t.pending_since, t.order))
+        started: List[str] = []
+        spent_inline = 0.0
+        for task in waiting:
+            inline = not (task.is_async or task.offload)
+            if (inline and spent_inline
+                    and spent_inline + task.expected_ms() > self.frame_budget_ms
+                    and loop_count - task.pending_since < MAX_WAIT_ITERATIONS):
+                task.stats.deferrals += 1
+                continue
+            task_frame, task.pending = task.pending, None
+            if task.is_async:
+                self._start_async(task, task_frame)
+            elif task.offload:
+                self._start_offload(task, task_frame)
+            else:
+                spent_inline += self._run_inline(task, task_frame)
+            started.append(task.name)
+
+        self.last_tick_ms = (time.perf_counter() - start) * 1000
+        if self.last_tick_ms > self.frame_budget_ms:
+            self.frames_over_budget += 1
+        return started
+
+    # -- execution --------------------------------------------------------
+
+    def _run_inline(self, task: LoopTask, frame: Dict[str, Any]) -> float:
+        t0 = time.perf_counter()
+        try:
+            task.fn(frame)
+        except Exception as e:
+            task.stats.errors += 1
+            logger.warning("[Scheduler] %s failed: %s", task.name, e)
+        ms = (time.perf_counter() - t0) * 1000
+        task.stats.record(ms, task.budget_ms)
+        task.cost_ms = ms if task.cost_ms is None else (
+            COST_SMOOTHING * ms + (1 - COST_SMOOTHING) * task.cost_ms)
+        return ms
+
+    def _start_async(self, task: LoopTask, frame: Dict[str, Any]):
+        task.in_flight = True
+        t0 = time.perf_counter()
+
+        async def run():
+            try:
+                await task.fn(frame)
+            except Exception as e:
+                task.stats.errors += 1
+                logger.warning("[Scheduler] %s failed: %s", task.name, e)
+            finally:
+                task.stats.record((time.perf_counter() - t0) * 1000, task.budget_ms)
+                task.in_flight = False
+
+        bg = asyncio.get_running_loop().create_task(run(), name=f"loop-task:{task.name}")
+        self._background.add(bg)
+        bg.add_done_callback(self._background.discard)
+
+    def _start_offload(self, task: LoopTask, frame: Dict[str, Any]):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.pool_workers,
+                                            thread_name_prefix="loop-task")
+        task.in_flight = True
+
+        def run():
+            t0 = time.perf_counter()
+            try:
+                task.fn(frame)
+            except Exception as e:
+                task.stats.errors += 1
+                logger.warning("[Scheduler] %s failed: %s", task.name, e)
+            finally:
+                task.stats.record((time.perf_counter() - t0) * 1000, task.budget_ms)
+                task.in_flight = False
+
+        self._pool.submit(run)
+
+    # -- lifecycle / stats --------------------------------------------------
+
+    async def drain(self, timeout: Optional[float] = None):
+        """Wait for background (coroutine) runs started so far."""
+        if self._background:
+            await asyncio.wait(list(self._background), timeout=timeout)
+
+    def close(self, wait: bool = False):
+        """Cancel background runs and stop the worker pool."""
+        for bg in list(self._background):
+            bg.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "ticks": self.ticks,
+            "frame_budget_ms": self.frame_budget_ms,
+            "frames_over_budget": self.frames_over_budget,
+            "last_tick_ms": round(self.last_tick_ms, 2),
+            "background_running": len(self._background),
+            "tasks": {
+                t.name: {
+                    "period": t.period,
+                    "budget_ms": t.budget_ms,
+                    "priority": t.priority,
+                    "mode": "async" if t.is_async else "pool" if t.offload else "inline",
+                    "waiting": t.pending is not None,
+                    "in_flight": t.in_flight,
+                    **t.stats.as_dict(),
+                }
+                for t in sorted(self._tasks.values(), key=lambda t: (t.priority, t.order))
+            },
+        }
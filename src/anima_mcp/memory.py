@@ -13,6 +13,7 @@ import json
 import os
 import sqlite3
 import random
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
@@ -20,6 +21,8 @@ from enum import Enum
 import time
 import sys
 
+from . import storage
+
 
 class ExplorationMode(Enum):
     """Mode for exploration vs exploitation balance."""
@@ -71,6 +74,14 @@ class StateOutcome:
         self.stability_sum += stability
         self.presence_sum += presence
 
+    def remove(self, warmth: float, clarity: float, stability: float, presence: float):
+        """Take back an observation added earlier."""
+        self.count -= 1
+        self.warmth_sum -= warmth
+        self.clarity_sum -= clarity
+        self.stability_sum -= stability
+        self.presence_sum -= presence
+
     @property
     def avg_warmth(self) -> float:
         return self.warmth_sum / self.count if self.count > 0 else 0.5
@@ -201,90 +212,96 @@ class AssociativeMemory:
         self._exploration_rate_max: float = 0.15  # Maximum 15% exploration
         self._stagnation_counter: int = 0  # Counts consecutive similar states
         self._stagnation_threshold: int = 20  # After this many similar states, increase exploration
+        # Persisted pattern index: aggregates over the state_history rows with
+        # _index_floor_id < id <= _index_row_id (the most recent max_records)
+        self._index_row_id: int = 0
+        self._index_floor_id: int = 0
+        self._max_records: int = 50000
+        self._index_dirty: bool = False
+        # Live outcomes: staged until the next checkpoint, then kept as an
+        # in-memory overlay that is never persisted (rows are the record)
+        self._pending_outcomes: List[Tuple[Tuple[str, str, str], Optional[str], float, float, float, float]] = []
+        self._live_patterns: Dict[Tuple[str, str, str, str], StateOutcome] = {}
+        self._live_patterns_no_time: Dict[Tuple[str, str, str], StateOutcome] = {}
+        self._live_sample_count: int = 0
+        self._flush_every: int = 50  # Outcomes between pattern index checkpoints
+        self._last_bucket_key: Optional[Tuple[str, str, str]] = None
+        self._last_time_bucket: Optional[str] = None
+        # Anticipation cache: (temp, light, humidity, time) bucket -> (Anticipation or None, cached_at).
+        # Cleared whenever the patterns change; the TTL picks up new knowledge insights.
+        self._anticipation_cache: "OrderedDict[Tuple[str, str, str, Optional[str]], Tuple[Optional[Anticipation], float]]" = OrderedDict()
+        self._anticipation_cache_size: int = 64
+        self._anticipation_cache_ttl: float = 300.0
+        self._anticipation_cache_hits: int = 0
+        self._anticipation_cache_misses: int = 0
 
     def load_patterns(self, max_records: int = 50000) -> bool:
         """
-        Scan state_history to build condition→outcome mappings.
+        Build condition→outcome mappings from state_history.
 
         Now includes temporal patterns (time of day) for richer associations.
+        Aggregates over the most recent max_records rows are persisted in
+        memory_patterns with the state_history id range they cover, so after
+        the first build only rows added since the last checkpoint are folded
+        in (and rows that fell out of the window are taken back out). The
+        first build (or a rebuild after the bucket boundaries change) scans
+        the window from scratch.
+        Reads the typed sensor/ts_epoch columns when the store has them,
+        otherwise parses each row's sensors JSON.
         Returns True if patterns were loaded successfully.
         """
         start_time = time.time()
-        from datetime import datetime as dt
+        from .identity.store import state_history_is_columnar
 
         try:
+            storage.flush(self.db_path)  # include state rows still queued by this process
             conn = sqlite3.connect(self.db_path, timeout=10.0)
             conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("PRAGMA busy_timeout=5000")
-            cursor = conn.cursor()
-
-            # Get recent state history with sensors AND timestamp for temporal patterns
-            cursor.execute("""
-                SELECT warmth, clarity, stability, presence, sensors, timestamp
-                FROM state_history
-                WHERE sensors IS NOT NULL AND sensors != ''
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """, (max_records,))
-
-            rows = cursor.fetchall()
-            conn.close()
-
-            if not rows:
-                print("[Memory] No state history found", file=sys.stderr, flush=True)
-                return False
-
-            # Process each record
-            for warmth, clarity, stability, presence, sensors_json, timestamp_str in rows:
-                try:
-                    sensors = json.loads(sensors_json)
-
-                    # Extract environmental conditions
-                    temp = sensors.get('ambient_temp_c', sensors.get('cpu_temp_c'))
-                    light = sensors.get('light_lux', 100)  # Default moderate
-                    humidity = sensors.get('humidity_pct', 40)  # Default comfortable
-
-                    if temp is None:
-                        continue
-
-                    # Get bucket key (without time)
-                    bucket_key = self._get_bucket_key(temp, light, humidity)
-                    if bucket_key is None:
-                        continue
-
-                    # Add to non-temporal pattern (fallback)
-                    if bucket_key not in self._patterns_no_time:
-                        self._patterns_no_time[bucket_key] = StateOutcome()
-                    self._patterns_no_time[bucket_key].add(warmth, clarity, stability, presence)
-
-                    # Try to extract time of day for temporal pattern
-                    time_bucket = None
-                    if timestamp_str:
-                        try:
-                            # Parse ISO format timestamp
-                            ts = dt.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-                            hour = ts.hour
-                            time_bucket = self._get_time_bucket(hour)
-                        except (ValueError, AttributeError):
-                            pass
-
-                    # Add to temporal pattern if we have time
-                    if time_bucket:
-                        temporal_key = (bucket_key[0], bucket_key[1], bucket_key[2], time_bucket)
-                        if temporal_key not in self._patterns:
-                            self._patterns[temporal_key] = StateOutcome()
-                        self._patterns[temporal_key].add(warmth, clarity, stability, presence)
-
-                    self._sample_count += 1
-
-                except (json.JSONDecodeError, KeyError, TypeError):
-                    continue
+            try:
+                columnar = state_history_is_columnar(conn)
+                high_water = conn.execute("SELECT MAX(id) FROM state_history").fetchone()[0] or 0
+                self._max_records = max_records
+                checkpoint = self._load_pattern_index(conn)
+                incremental = checkpoint is not None
+                indexed_samples = self._sample_count
+
+                if incremental:
+                    self._sync_index_rows(conn, columnar, high_water)
+                else:
+                    columns, where = self._row_query(columnar)
+                    rows = conn.execute(
+                        f"SELECT id, {columns} FROM state_history "
+                        f"WHERE {where} AND id <= ? ORDER BY id DESC LIMIT ?",
+                        (high_water, max_records),
+                    ).fetchall()
+
+                    if not rows:
+                        print("[Memory] No state history found", file=sys.stderr, flush=True)
+                        return False
+
+                    for row in reversed(rows):
+                        self._fold_row(columnar, row[1:])
+                    self._index_floor_id = rows[-1][0] - 1
+                    self._index_row_id = high_water
+                    self._index_dirty = True
+
+                self._anticipation_cache.clear()
+                if self._index_dirty:
+                    self._save_pattern_index(conn)
+            finally:
+                conn.close()
 
             self._pattern_count = len(self._patterns)
             self._load_time = time.time() - start_time
 
-            print(f"[Memory] Loaded {self._pattern_count} temporal + {len(self._patterns_no_time)} non-temporal patterns from {self._sample_count} samples in {self._load_time:.2f}s",
-                  file=sys.stderr, flush=True)
+            if incremental:
+                print(f"[Memory] Loaded {self._pattern_count} temporal + {len(self._patterns_no_time)} non-temporal patterns "
+                      f"({indexed_samples} indexed, now {self._sample_count} samples) in {self._load_time:.2f}s",
+                      file=sys.stderr, flush=True)
+            else:
+                print(f"[Memory] Loaded {self._pattern_count} temporal + {len(self._patterns_no_time)} non-temporal patterns from {self._sample_count} samples in {self._load_time:.2f}s",
+                      file=sys.stderr, flush=True)
 
             return self._pattern_count > 0
 
@@ -292,6 +309,285 @@ class AssociativeMemory:
             print(f"[Memory] Error loading patterns: {e}", file=sys.stderr, flush=True)
             return False
 
+    @staticmethod
+    def _row_query(columnar: bool) -> Tuple[str, str]:
+        """(columns, where clause) for reading pattern samples from state_history."""
+        if columnar:
+            # Same fallbacks as the JSON path: CPU temp when there's no
+            # ambient sensor, moderate light and comfortable humidity
+            return ("""warmth, clarity, stability, presence,
+                       COALESCE(ambient_temp_c, cpu_temp_c), COALESCE(light_lux, 100),
+                       COALESCE(humidity_pct, 40), ts_epoch""",
+                    "ts_epoch IS NOT NULL")
+        # Get state history with sensors AND timestamp for temporal patterns
+        return ("warmth, clarity, stability, presence, sensors, timestamp",
+                "sensors IS NOT NULL AND sensors != ''")
+
+    def _sync_index_rows(self, conn: sqlite3.Connection, columnar: bool, high_water: int) -> int:
+        """
+        Slide the indexed window up to high_water.
+
+        Folds in rows above the checkpoint, then takes back the oldest rows
+        once the window holds more than _max_records, so every row in the
+        window is counted exactly once. Returns the number of rows folded in.
+        """
+        columns, where = self._row_query(columnar)
+        new_rows = conn.execute(
+            f"SELECT id, {columns} FROM state_history "
+            f"WHERE {where} AND id > ? AND id <= ? ORDER BY id",
+            (self._index_row_id, high_water),
+        ).fetchall()
+        for row in new_rows:
+            self._fold_row(columnar, row[1:])
+
+        in_window = conn.execute(
+            f"SELECT COUNT(*) FROM state_history WHERE {where} AND id > ? AND id <= ?",
+            (self._index_floor_id, high_water),
+        ).fetchone()[0]
+        excess = in_window - self._max_records
+        if excess > 0:
+            old_rows = conn.execute(
+                f"SELECT id, {columns} FROM state_history "
+                f"WHERE {where} AND id > ? ORDER BY id LIMIT ?",
+                (self._index_floor_id, excess),
+            ).fetchall()
+            for row in old_rows:
+                self._fold_row(columnar, row[1:], remove=True)
+            self._index_floor_id = old_rows[-1][0]
+
+        if new_rows or excess > 0 or high_water > self._index_row_id:
+            self._index_row_id = max(self._index_row_id, high_water)
+            self._index_dirty = True
+            self._anticipation_cache.clear()
+        return len(new_rows)
+
+    def _bucket_signature(self) -> str:
+        """Fingerprint of the bucket boundaries; a persisted index is only valid for the same set."""
+        return json.dumps([self.TEMP_BUCKETS, self.LIGHT_BUCKETS,
+                           self.HUMIDITY_BUCKETS, self.TIME_BUCKETS])
+
+    def _load_pattern_index(self, conn: sqlite3.Connection) -> Optional[int]:
+        """
+        Load persisted aggregates into the pattern dicts.
+
+        Returns the last state_history id they cover, or None when there is
+        no usable index (never built, built with different buckets, or built
+        before the checkpoint recorded its window).
+        """
+        try:
+            checkpoint = conn.execute(
+                "SELECT last_row_id, sample_count, bucket_signature, first_row_id "
+                "FROM memory_pattern_checkpoint WHERE id = 1"
+            ).fetchone()
+            if checkpoint is None or checkpoint[2] != self._bucket_signature():
+                return None
+            rows = conn.execute("""
+                SELECT temp_bucket, light_bucket, humidity_bucket, time_bucket,
+                       count, warmth_sum, clarity_sum, stability_sum, presence_sum
+                FROM memory_patterns
+            """).fetchall()
+        except sqlite3.OperationalError:
+            return None
+
+        for temp_b, light_b, humidity_b, time_b, count, w, c, s, p in rows:
+            outcome = StateOutcome(count=count, warmth_sum=w, clarity_sum=c,
+                                   stability_sum=s, presence_sum=p)
+            if time_b:
+                self._patterns[(temp_b, light_b, humidity_b, time_b)] = outcome
+            else:
+                self._patterns_no_time[(temp_b, light_b, humidity_b)] = outcome
+        self._sample_count = checkpoint[1]
+        self._index_row_id = checkpoint[0]
+        self._index_floor_id = checkpoint[3]
+        return checkpoint[0]
+
+    def _save_pattern_index(self, conn: sqlite3.Connection):
+        """Rewrite the persisted aggregates and checkpoint from the in-memory patterns, minus live outcomes."""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS memory_patterns (
+                temp_bucket TEXT NOT NULL,
+                light_bucket TEXT NOT NULL,
+                humidity_bucket TEXT NOT NULL,
+                time_bucket TEXT NOT NULL DEFAULT '',
+                count INTEGER NOT NULL,
+                warmth_sum REAL NOT NULL,
+                clarity_sum REAL NOT NULL,
+                stability_sum REAL NOT NULL,
+                presence_sum REAL NOT NULL,
+                PRIMARY KEY (temp_bucket, light_bucket, humidity_bucket, time_bucket)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS memory_pattern_checkpoint (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                last_row_id INTEGER NOT NULL,
+                sample_count INTEGER NOT NULL,
+                bucket_signature TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                first_row_id INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        checkpoint_cols = {row[1] for row in conn.execute("PRAGMA table_info(memory_pattern_checkpoint)")}
+        if "first_row_id" not in checkpoint_cols:
+            conn.execute("ALTER TABLE memory_pattern_checkpoint ADD COLUMN first_row_id INTEGER NOT NULL DEFAULT 0")
+
+        def indexed(patterns, live):
+            for key, o in patterns.items():
+                lo = live.get(key)
+                if lo is None:
+                    yield key, o
+                elif o.count > lo.count:
+                    yield key, StateOutcome(count=o.count - lo.count,
+                                            warmth_sum=o.warmth_sum - lo.warmth_sum,
+                                            clarity_sum=o.clarity_sum - lo.clarity_sum,
+                                            stability_sum=o.stability_sum - lo.stability_sum,
+                                            presence_sum=o.presence_sum - lo.presence_sum)
+
+        def rows():
+            for key, o in indexed(self._patterns_no_time, self._live_patterns_no_time):
+                yield (*key, "", o.count, o.warmth_sum, o.clarity_sum, o.stability_sum, o.presence_sum)
+            for key, o in indexed(self._patterns, self._live_patterns):
+                yield (*key, o.count, o.warmth_sum, o.clarity_sum, o.stability_sum, o.presence_sum)
+
+        with conn:
+            conn.execute("DELETE FROM memory_patterns")
+            conn.executemany("INSERT INTO memory_patterns VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows())
+            conn.execute(
+                """INSERT OR REPLACE INTO memory_pattern_checkpoint
+                   (id, last_row_id, sample_count, bucket_signature, updated_at, first_row_id)
+                   VALUES (1, ?, ?, ?, ?, ?)""",
+                (self._index_row_id, self._sample_count - self._live_sample_count,
+                 self._bucket_signature(), time.time(), self._index_floor_id),
+            )
+        self._index_dirty = False
+
+    def flush_pattern_index(self) -> bool:
+        """
+        Fold staged live outcomes into the patterns and checkpoint the index.
+
+        The checkpoint slides the indexed window over the state_history rows
+        written since the last one. Live outcomes stay an in-memory overlay:
+        they fire on every sense tick while rows come from record_state, so
+        they can't stand in for rows without miscounting the window.
+
+        Returns True if anything was written.
+        """
+        from .identity.store import state_history_is_columnar
+
+        self._apply_pending_outcomes()
+        try:
+            storage.flush(self.db_path)  # include state rows still queued by this process
+            conn = sqlite3.connect(self.db_path, timeout=10.0)
+            try:
+                conn.execute("PRAGMA busy_timeout=5000")
+                try:
+                    high_water = conn.execute("SELECT MAX(id) FROM state_history").fetchone()[0] or 0
+                except sqlite3.OperationalError:
+                    return False  # No state_history yet
+                self._sync_index_rows(conn, state_history_is_columnar(conn), high_water)
+                if not self._index_dirty:
+                    return False
+                self._save_pattern_index(conn)
+                self._pattern_count = len(self._patterns)
+            finally:
+                conn.close()
+            return True
+        except sqlite3.Error as e:
+            print(f"[Memory] Error saving pattern index: {e}", file=sys.stderr, flush=True)
+            return False
+
+    def _fold_row(self, columnar: bool, row: tuple, remove: bool = False):
+        """Add (or take back) one state_history row selected with _row_query()."""
+        sample = self._columnar_pattern_sample(*row) if columnar else self._json_pattern_sample(*row)
+        if sample is None:
+            return
+        if remove:
+            self._remove_pattern_sample(*sample)
+        else:
+            self._add_pattern_sample(*sample)
+
+    @staticmethod
+    def _columnar_pattern_sample(warmth, clarity, stability, presence,
+                                 temp, light, humidity, ts_epoch) -> Optional[tuple]:
+        """Pattern sample from a typed-column state_history row (None if incomplete)."""
+        if None in (warmth, clarity, stability, presence, temp, light, humidity):
+            return None
+        hour = time.localtime(ts_epoch).tm_hour if ts_epoch > 0 else None
+        return (warmth, clarity, stability, presence, temp, light, humidity, hour)
+
+    @staticmethod
+    def _json_pattern_sample(warmth, clarity, stability, presence,
+                             sensors_json: str, timestamp_str: Optional[str]) -> Optional[tuple]:
+        """Pattern sample from a legacy (JSON sensors blob) state_history row (None if unusable)."""
+        from datetime import datetime as dt
+        try:
+            sensors = json.loads(sensors_json)
+
+            # Extract environmental conditions
+            temp = sensors.get('ambient_temp_c', sensors.get('cpu_temp_c'))
+            light = sensors.get('light_lux', 100)  # Default moderate
+            humidity = sensors.get('humidity_pct', 40)  # Default comfortable
+
+            if temp is None:
+                return None
+
+            # Try to extract time of day for temporal pattern
+            hour = None
+            if timestamp_str:
+                try:
+                    # Parse ISO format timestamp
+                    hour = dt.fromisoformat(timestamp_str.replace("Z", "+00:00")).hour
+                except (ValueError, AttributeError):
+                    pass
+
+            return (warmth, clarity, stability, presence, temp, light, humidity, hour)
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return None
+
+    def _pattern_keys(self, temp: float, light: float, humidity: float,
+                      hour: Optional[int]) -> Optional[Tuple[Tuple[str, str, str], Optional[Tuple[str, str, str, str]]]]:
+        """(non-temporal key, temporal key or None) for a sample, or None outside every bucket."""
+        bucket_key = self._get_bucket_key(temp, light, humidity)
+        if bucket_key is None:
+            return None
+        time_bucket = self._get_time_bucket(hour) if hour is not None else None
+        return bucket_key, (*bucket_key, time_bucket) if time_bucket else None
+
+    def _add_pattern_sample(self, warmth: float, clarity: float, stability: float, presence: float,
+                            temp: float, light: float, humidity: float, hour: Optional[int]):
+        """Add one observation to the temporal and non-temporal buckets."""
+        keys = self._pattern_keys(temp, light, humidity, hour)
+        if keys is None:
+            return
+        bucket_key, temporal_key = keys
+
+        # Add to non-temporal pattern (fallback)
+        self._patterns_no_time.setdefault(bucket_key, StateOutcome()).add(warmth, clarity, stability, presence)
+
+        # Add to temporal pattern if we have time
+        if temporal_key:
+            self._patterns.setdefault(temporal_key, StateOutcome()).add(warmth, clarity, stability, presence)
+
+        self._sample_count += 1
+
+    def _remove_pattern_sample(self, warmth: float, clarity: float, stability: float, presence: float,
+                               temp: float, light: float, humidity: float, hour: Optional[int]):
+        """Take back an observation added by _add_pattern_sample (window eviction)."""
+        keys = self._pattern_keys(temp, light, humidity, hour)
+        if keys is None:
+            return
+        bucket_key, temporal_key = keys
+
+        for patterns, key in ((self._patterns_no_time, bucket_key), (self._patterns, temporal_key)):
+            outcome = patterns.get(key) if key else None
+            if outcome is None:
+                continue
+            outcome.remove(warmth, clarity, stability, presence)
+            if outcome.count <= 0:
+                del patterns[key]
+
+        self._sample_count -= 1
+
     def _get_bucket_key(self, temp: float, light: float, humidity: float) -> Optional[Tuple[str, str, str]]:
         """Get the bucket key for given conditions (without time)."""
         temp_bucket = None
@@ -337,6 +633,8 @@ class AssociativeMemory:
 
         Tries temporal pattern first (with time of day), falls back to non-temporal.
         Returns None if no matching pattern found or insufficient data.
+        Results are cached per bucket until the patterns change or the
+        cache TTL expires.
         """
         bucket_key = self._get_bucket_key(temp, light, humidity)
         if bucket_key is None:
@@ -348,6 +646,33 @@ class AssociativeMemory:
             hour = dt.now().hour
 
         time_bucket = self._get_time_bucket(hour)
+        # Remembered so record_actual_outcome can teach the matching buckets
+        self._last_bucket_key = bucket_key
+        self._last_time_bucket = time_bucket
+
+        cache_key = (*bucket_key, time_bucket)
+        cached = self._anticipation_cache.get(cache_key)
+        if cached is not None and time.time() - cached[1] < self._anticipation_cache_ttl:
+            self._anticipation_cache.move_to_end(cache_key)
+            self._anticipation_cache_hits += 1
+            if cached[0] is not None:
+                self._last_anticipation = cached[0]
+            return cached[0]
+
+        self._anticipation_cache_misses += 1
+        anticipation = self._compute_anticipation(bucket_key, time_bucket)
+        self._anticipation_cache[cache_key] = (anticipation, time.time())
+        self._anticipation_cache.move_to_end(cache_key)
+        while len(self._anticipation_cache) > self._anticipation_cache_size:
+            self._anticipation_cache.popitem(last=False)
+
+        if anticipation is not None:
+            self._last_anticipation = anticipation
+        return anticipation
+
+    def _compute_anticipation(self, bucket_key: Tuple[str, str, str],
+                              time_bucket: Optional[str]) -> Optional[Anticipation]:
+        """Build the (knowledge-enriched) anticipation for a bucket from its StateOutcome."""
         outcome = None
         used_temporal = False
         description = ""
@@ -386,10 +711,7 @@ class AssociativeMemory:
         )
 
         # Enrich with learned knowledge (philosophy meets code)
-        anticipation = self.enrich_with_knowledge(anticipation)
-
-        self._last_anticipation = anticipation
-        return anticipation
+        return self.enrich_with_knowledge(anticipation)
 
     def anticipate_from_sensors(self, sensors: dict) -> Optional[Anticipation]:
         """Convenience method to anticipate from a sensors dict."""
@@ -444,13 +766,16 @@ class AssociativeMemory:
         """
         Record the actual emotional outcome, compare to anticipation.
 
-        Call this after sensing to track prediction accuracy.
+        Call this after sensing to track prediction accuracy. The outcome is
+        also staged for the anticipated condition buckets; every _flush_every
+        outcomes they are folded in and the pattern index is checkpointed.
         Returns accuracy metrics if there was an anticipation to compare.
         """
         if self._last_anticipation is None:
             return None
 
         ant = self._last_anticipation
+        self._learn_outcome(warmth, clarity, stability, presence)
 
         # Calculate error (0 = perfect, 1 = completely wrong)
         warmth_error = abs(ant.warmth - warmth)
@@ -535,6 +860,43 @@ class AssociativeMemory:
 
         return result
 
+    def _learn_outcome(self, warmth: float, clarity: float, stability: float, presence: float):
+        """
+        Stage a live outcome for the buckets of the last anticipation.
+
+        Outcomes are folded in at the next checkpoint rather than one by one,
+        so cached anticipations stay valid between checkpoints.
+        """
+        if self._last_bucket_key is None:
+            return
+
+        self._pending_outcomes.append(
+            (self._last_bucket_key, self._last_time_bucket, warmth, clarity, stability, presence)
+        )
+        if len(self._pending_outcomes) >= self._flush_every:
+            self.flush_pattern_index()
+
+    def _apply_pending_outcomes(self):
+        """Add staged live outcomes to the temporal and non-temporal buckets."""
+        if not self._pending_outcomes:
+            return
+
+        for bucket_key, time_bucket, warmth, clarity, stability, presence in self._pending_outcomes:
+            for patterns in (self._patterns_no_time, self._live_patterns_no_time):
+                patterns.setdefault(bucket_key, StateOutcome()).add(warmth, clarity, stability, presence)
+
+            if time_bucket:
+                temporal_key = (*bucket_key, time_bucket)
+                for patterns in (self._patterns, self._live_patterns):
+                    patterns.setdefault(temporal_key, StateOutcome()).add(warmth, clarity, stability, presence)
+
+            self._sample_count += 1
+            self._live_sample_count += 1
+
+        self._pending_outcomes.clear()
+        self._pattern_count = len(self._patterns)
+        self._anticipation_cache.clear()
+
     def get_adaptive_blend_factor(self) -> float:
         """
         Get the current adaptive blend factor.
@@ -912,12 +1274,28 @@ class AssociativeMemory:
 
         return anticipation
 
+    def get_anticipation_cache_stats(self) -> dict:
+        """Get anticipation cache hit/miss statistics."""
+        lookups = self._anticipation_cache_hits + self._anticipation_cache_misses
+        return {
+            "hits": self._anticipation_cache_hits,
+            "misses": self._anticipation_cache_misses,
+            "hit_rate": self._anticipation_cache_hits / lookups if lookups else None,
+            "size": len(self._anticipation_cache),
+            "max_size": self._anticipation_cache_size,
+            "ttl_seconds": self._anticipation_cache_ttl,
+        }
+
     def get_stats(self) -> dict:
         """Get statistics about the memory system."""
         return {
             "pattern_count": self._pattern_count,
             "sample_count": self._sample_count,
             "load_time_seconds": self._load_time,
+            "indexed_through_row": self._index_row_id,
+            "live_outcomes": self._live_sample_count,
+            "unsaved_outcomes": len(self._pending_outcomes),
+            "anticipation_cache": self.get_anticipation_cache_stats(),
             "accuracy": self.get_accuracy_stats(),
             "exploration": self.get_exploration_stats(),
             "last_anticipation": {
@@ -961,6 +1339,13 @@ def get_memory(db_path: str = "anima.db") -> AssociativeMemory:
     return _memory
 
 
+def flush_memory() -> bool:
+    """Checkpoint the global memory's pattern index (no-op if it was never loaded)."""
+    if _memory is None:
+        return False
+    return _memory.flush_pattern_index()
+
+
 def anticipate_state(sensors: dict, db_path: str = "anima.db") -> Optional[Anticipation]:
     """Convenience function to get anticipation from sensors."""
     memory = get_memory(db_path)
@@ -18,6 +18,13 @@ from collections import deque
 import json
 from pathlib import Path
 
+from .text_index import BM25Index
+
+# BM25 score mapped to 0.5 relevance (score / (score + this)). About one
+# rare term's worth, so a single-term match stays "possibly relevant" and
+# it takes several matching terms to reach the 0.7 "highly relevant" mark.
+BM25_HALF_RELEVANCE_SCORE = 4.0
+
 
 @dataclass
 class RetrievedMemory:
@@ -112,6 +119,9 @@ class MemoryRetriever:
         self._retrieval_history: deque = deque(maxlen=100)
         self._helpful_patterns: Dict[str, int] = {}  # query_type -> helpful count
 
+        # Parsed knowledge.json and its search index: (file key, entries, index)
+        self._local_index = None
+
     async def retrieve(
         self,
         context: MemoryContext,
@@ -203,44 +213,66 @@ class MemoryRetriever:
         return []
 
     def _search_local_knowledge(self, terms: List[str]) -> List[RetrievedMemory]:
-        """Search local knowledge store."""
+        """Search local knowledge store (BM25 over knowledge.json, saturated to 0-1)."""
         memories = []
 
         try:
             knowledge_path = Path.home() / ".anima" / "knowledge.json"
-            if not knowledge_path.exists():
+            entries, index = self._local_knowledge_index(knowledge_path)
+            if index is None:
                 return []
 
-            with open(knowledge_path) as f:
-                data = json.load(f)
-
-            entries = data.get("entries", data.get("insights", []))
-            if isinstance(entries, dict):
-                entries = list(entries.values())
-
-            for entry in entries:
-                text = entry.get("text", entry.get("summary", "")).lower()
+            hits = index.search(" ".join(terms))
+            for doc_id, score in hits:
+                entry = entries[doc_id]
+                text = entry.get("text", entry.get("summary", ""))
                 category = entry.get("category", "").lower()
-
-                score = 0
-                for term in terms:
-                    if term.lower() in text or term.lower() in category:
-                        score += 0.25
-
-                if score > 0:
-                    memories.append(RetrievedMemory(
-                        memory_id=entry.get("id", str(hash(text))),
-                        summary=entry.get("text", entry.get("summary", "")),
-                        source="local",
-                        relevance_score=min(1.0, score),
-                        tags=[category] if category else [],
-                        content=entry,
-                    ))
+                memories.append(RetrievedMemory(
+                    memory_id=doc_id,
+                    summary=text,
+                    source="local",
+                    relevance_score=score / (score + BM25_HALF_RELEVANCE_SCORE),
+                    tags=[category] if category else [],
+                    content=entry,
+                ))
         except Exception as e:
             print(f"[MemoryRetrieval] Local knowledge error: {e}")
 
         return memories
 
+    def _local_knowledge_index(self, knowledge_path: Path):
+        """(entries by id, BM25Index) for knowledge.json, re-read only when the file changes."""
+        try:
+            st = knowledge_path.stat()
+        except OSError:
+            self._local_index = None
+            return {}, None
+        key = (str(knowledge_path), st.st_mtime_ns, st.st_size)
+        if self._local_index is not None and key == self._local_index[0]:
+            return self._local_index[1], self._local_index[2]
+
+        with open(knowledge_path) as f:
+            data = json.load(f)
+
+        raw = data.get("entries", data.get("insights", []))
+        if isinstance(raw, dict):
+            raw = list(raw.values())
+        entries = {}
+        for n, entry in enumerate(raw):
+            doc_id = str(entry.get("insight_id") or entry.get("id") or n)
+            entries[doc_id] = entry
+
+        # KnowledgeBase saves its index next to the insights; rebuild if absent or stale
+        index = BM25Index.from_dict(data.get("index") or {}, expected_ids=set(entries))
+        if index is None:
+            index = BM25Index()
+            for doc_id, entry in entries.items():
+                text = entry.get("text", entry.get("summary", ""))
+                index.add(doc_id, f"{text} {entry.get('category', '')}")
+
+        self._local_index = (key, entries, index)
+        return entries, index
+
     def _rank_memories(
         self,
         memories: List[RetrievedMemory],
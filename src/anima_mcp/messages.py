@@ -13,6 +13,7 @@ from dataclasses import dataclass, asdict
 from pathlib import Path
 
 from .atomic_write import atomic_json_write
+from .text_index import MinHashIndex, content_words
 
 
 # Message types
@@ -22,6 +23,40 @@ MESSAGE_TYPE_USER = "user"                # Left by user via MCP tool
 MESSAGE_TYPE_AGENT = "agent"              # Left by AI agents
 MESSAGE_TYPE_SYSTEM = "system"            # System events
 
+OBSERVATION_SIMILARITY = 0.35  # Jaccard over content words — catches theme repetition
+QUESTION_SIMILARITY = 0.6      # Jaccard over normalized words
+# Common question stems (prevents "what connects X" repetition)
+QUESTION_STEMS = (
+    "what connects",
+    "why did so many",
+    "what changed",
+    "why did it get",
+    "what caused",
+    "how are these",
+)
+
+
+def _normalize_question(s: str) -> str:
+    """Lowercase, strip surrounding whitespace and trailing punctuation."""
+    return s.lower().strip().rstrip("?!.")
+
+
+def _question_keys(normalized: str) -> tuple:
+    """Exact-match keys for a question: its normalized text plus any stems it contains."""
+    return (("text", normalized),) + tuple(("stem", stem) for stem in QUESTION_STEMS if stem in normalized)
+
+
+_snapshot_client = None  # Shared-memory reader for state snapshots, opened on first use
+
+
+def _get_snapshot_client():
+    """Read-only shared-memory client reused for every state snapshot."""
+    global _snapshot_client
+    if _snapshot_client is None:
+        from .shared_memory import SharedMemoryClient, SHM_BACKEND
+        _snapshot_client = SharedMemoryClient(mode="read", backend=SHM_BACKEND)
+    return _snapshot_client
+
 
 def _get_persistent_path() -> Path:
     """Get persistent path for messages - survives reboots."""
@@ -86,7 +121,12 @@ class Message:
 
 
 class MessageBoard:
-    """Message board storage with separate limits per message type."""
+    """Message board storage with separate limits per message type.
+
+    Observations and questions are kept in MinHash indexes (see text_index)
+    so near-duplicate checks look at every retained message of that type
+    without re-tokenizing or comparing against each one.
+    """
 
     # Separate limits prevent observations from pushing out questions/visitors
     MAX_OBSERVATIONS = 100  # Lumen's self-talk (frequent)
@@ -98,6 +138,9 @@ class MessageBoard:
         self._messages: List[Message] = []
         self._last_load_time: float = 0.0
         self._file_mtime: float = 0.0
+        self._by_id: Dict[str, Message] = {}
+        self._observation_index = MinHashIndex()
+        self._question_index = MinHashIndex()
         self._load()
 
     def _load(self, force: bool = False):
@@ -120,6 +163,31 @@ class MessageBoard:
             print(f"[MessageBoard] Load error: {e}", file=sys.stderr, flush=True)
             self._messages = []
             self._file_mtime = 0.0
+        self._reindex()
+
+    def _index_message(self, msg: Message):
+        """Add an observation or question to its near-duplicate index."""
+        if msg.msg_type == MESSAGE_TYPE_OBSERVATION:
+            self._observation_index.add(msg.message_id, content_words(msg.text),
+                                        keys=(("text", msg.text),))
+        elif msg.msg_type == MESSAGE_TYPE_QUESTION:
+            normalized = _normalize_question(msg.text)
+            self._question_index.add(msg.message_id, normalized.split(),
+                                     keys=_question_keys(normalized))
+
+    def _reindex(self):
+        """Bring the id map and dedup indexes in line with self._messages.
+
+        Messages already indexed keep their signatures (text never changes),
+        so a reload only tokenizes messages that are new to this process.
+        """
+        self._by_id = {m.message_id: m for m in self._messages}
+        for index in (self._observation_index, self._question_index):
+            for stale in index.doc_ids() - self._by_id.keys():
+                index.remove(stale)
+        for m in self._messages:
+            if m.message_id not in self._observation_index and m.message_id not in self._question_index:
+                self._index_message(m)
 
     def _save(self):
         """Save messages to persistent storage."""
@@ -143,9 +211,14 @@ class MessageBoard:
             author=author,
         )
         self._messages.append(msg)
+        self._by_id[message_id] = msg
+        self._index_message(msg)
 
         # Trim by type - each category has its own limit
+        count = len(self._messages)
         self._trim_by_type()
+        if len(self._messages) != count:
+            self._reindex()
 
         self._save()
         return msg
@@ -186,8 +259,9 @@ class MessageBoard:
 
         Deduplication strategy:
         1. Global rate limit: Max 1 observation per 5 minutes (prevents spam)
-        2. Semantic similarity: Skip if >50% word overlap with recent obs
-        3. Exact match: Skip identical text within 15 minutes
+        2. Exact match: Skip identical text within 15 minutes
+        3. Semantic similarity: Skip if >35% content-word overlap with any
+           retained observation, however old
         """
         import time
 
@@ -195,44 +269,22 @@ class MessageBoard:
         five_minutes_ago = now - 300
         fifteen_minutes_ago = now - 900
 
-        # Get recent observations (last 20)
-        recent_observations = [m for m in self._messages if m.msg_type == MESSAGE_TYPE_OBSERVATION][-20:]
-
         # === GLOBAL RATE LIMIT ===
         # Max 1 observation per 5 minutes to prevent chatter
-        if recent_observations:
-            last_obs = recent_observations[-1]
-            if last_obs.timestamp > five_minutes_ago:
-                return None  # Too soon since last observation
-
-        # === EXACT MATCH CHECK ===
-        for obs in recent_observations:
+        last_obs = next((m for m in reversed(self._messages)
+                         if m.msg_type == MESSAGE_TYPE_OBSERVATION), None)
+        if last_obs is not None and last_obs.timestamp > five_minutes_ago:
+            return None  # Too soon since last observation
+
+        # === EXACT MATCH / SEMANTIC SIMILARITY CHECK ===
+        new_words = content_words(text)
+        for obs_id, similarity in self._observation_index.near_duplicates(
+                new_words, OBSERVATION_SIMILARITY, keys=(("text", text),)):
+            obs = self._by_id[obs_id]
             if obs.text == text and obs.timestamp > fifteen_minutes_ago:
                 return None  # Skip exact duplicate
-
-        # === SEMANTIC SIMILARITY CHECK ===
-        # Skip if new text is >50% similar to any recent observation
-        def get_words(s: str) -> set:
-            """Extract meaningful words (lowercase, no punctuation)."""
-            import re
-            # Remove punctuation, lowercase, split
-            words = re.sub(r'[^\w\s]', '', s.lower()).split()
-            # Filter out very short words and common filler
-            stopwords = {'i', 'a', 'the', 'to', 'and', 'is', 'it', 'in', 'my', 'im', 'that', 'this'}
-            return {w for w in words if len(w) > 2 and w not in stopwords}
-
-        new_words = get_words(text)
-        if new_words:  # Only check if we have meaningful words
-            for obs in recent_observations[-15:]:  # Check last 15 observations
-                obs_words = get_words(obs.text)
-                if obs_words:
-                    # Jaccard similarity
-                    intersection = new_words & obs_words
-                    union = new_words | obs_words
-                    similarity = len(intersection) / len(union) if union else 0
-
-                    if similarity > 0.35:  # 35% overlap — catches theme repetition
-                        return None  # Too similar to recent observation
+            if similarity > OBSERVATION_SIMILARITY:
+                return None  # Too similar to an earlier observation
 
         return self.add_message(text, MESSAGE_TYPE_OBSERVATION, author=author)
 
@@ -412,20 +464,18 @@ class MessageBoard:
 
         # Rate limit: minimum 3 minutes between questions (prevents backlog)
         MIN_QUESTION_INTERVAL = 180  # 3 minutes
-        recent_questions = [m for m in self._messages if m.msg_type == MESSAGE_TYPE_QUESTION]
-        if recent_questions:
-            last_question_time = recent_questions[-1].timestamp
-            if now - last_question_time < MIN_QUESTION_INTERVAL:
+        last_question = next((m for m in reversed(self._messages)
+                              if m.msg_type == MESSAGE_TYPE_QUESTION), None)
+        if last_question is not None:
+            if now - last_question.timestamp < MIN_QUESTION_INTERVAL:
                 return None  # Too soon since last question
 
         # Deduplication: Don't ask similar questions within 4 hours
         four_hours_ago = now - 14400
 
-        for q in recent_questions[-20:]:
+        for q in self._similar_questions(text):
             if q.timestamp > four_hours_ago:
-                # Check for exact or similar questions
-                if self._questions_similar(text, q.text):
-                    return None  # Skip similar question
+                return None  # Skip similar question
 
         msg = self.add_message(text, MESSAGE_TYPE_QUESTION, author=author)
         if msg:
@@ -439,11 +489,9 @@ class MessageBoard:
     def _capture_anima_snapshot(self) -> Optional[Dict[str, Any]]:
         """Capture current anima state from shared memory for temporal context."""
         try:
-            shm_path = Path("/dev/shm/anima_state.json")
-            if shm_path.exists():
-                import json as _json
-                data = _json.loads(shm_path.read_text())
-                anima = data.get("data", {}).get("anima")
+            data = _get_snapshot_client().read()
+            if data:
+                anima = data.get("anima")
                 if anima:
                     return {
                         "warmth": round(anima.get("warmth", 0), 3),
@@ -455,16 +503,19 @@ class MessageBoard:
             pass
         return None
 
+    def _similar_questions(self, text: str) -> List[Message]:
+        """Retained questions too similar to text to ask again (see _questions_similar)."""
+        normalized = _normalize_question(text)
+        hits = self._question_index.near_duplicates(
+            normalized.split(), QUESTION_SIMILARITY, keys=_question_keys(normalized))
+        return [self._by_id[qid] for qid, _ in hits if self._questions_similar(text, self._by_id[qid].text)]
+
     def _questions_similar(self, q1: str, q2: str) -> bool:
         """Check if two questions are similar (fuzzy matching).
 
         Returns True if questions are too similar to ask again.
         """
-        # Normalize: lowercase, strip punctuation
-        def normalize(s: str) -> str:
-            return s.lower().strip().rstrip("?!.")
-
-        n1, n2 = normalize(q1), normalize(q2)
+        n1, n2 = _normalize_question(q1), _normalize_question(q2)
 
         # Exact match after normalization
         if n1 == n2:
@@ -480,19 +531,11 @@ class MessageBoard:
         union = words1 | words2
         jaccard = len(intersection) / len(union) if union else 0
 
-        if jaccard > 0.6:
+        if jaccard > QUESTION_SIMILARITY:
             return True
 
         # Check for common question stems (prevents "what connects X" repetition)
-        stems = [
-            "what connects",
-            "why did so many",
-            "what changed",
-            "why did it get",
-            "what caused",
-            "how are these",
-        ]
-        for stem in stems:
+        for stem in QUESTION_STEMS:
             if stem in n1 and stem in n2:
                 return True
 
@@ -522,8 +565,17 @@ class MessageBoard:
             if expired_any:
                 self._save()
 
-        questions = [m for m in self._messages if m.msg_type == MESSAGE_TYPE_QUESTION and not m.answered]
-        return questions[-limit:]
+        # Near-duplicates (e.g. asked from another process) are listed once, newest kept
+        questions = []
+        shown = set()
+        for m in reversed(self._messages):
+            if m.msg_type != MESSAGE_TYPE_QUESTION or m.answered or m.message_id in shown:
+                continue
+            questions.append(m)
+            if len(questions) == limit:
+                break
+            shown.update(q.message_id for q in self._similar_questions(m.text))
+        return list(reversed(questions))
 
     def repair_orphaned_answered(self) -> int:
         """Fix questions marked 'answered' but with no actual answer message.
@@ -606,6 +658,7 @@ class MessageBoard:
         original_count = len(self._messages)
         self._messages = [m for m in self._messages if m.message_id != message_id]
         if len(self._messages) < original_count:
+            self._reindex()
             self._save()
             return True
         return False
@@ -613,6 +666,7 @@ class MessageBoard:
     def clear(self):
         """Clear all messages."""
         self._messages = []
+        self._reindex()
         self._save()
 
 
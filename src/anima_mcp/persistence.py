@@ -0,0 +1,217 @@
+"""
+Persistence Manager - write-behind coalescing for JSON state files.
+
+Many subsystems keep their state in small JSON files under ~/.anima and
+used to rewrite (and fsync) them whenever they changed, so busy periods
+turned into bursts of redundant full rewrites on the SD card.
+
+Components call mark_dirty(path, snapshot) instead of writing. While the
+manager is running (between start() and stop(), i.e. while the creature
+is awake) nothing is written immediately: the first mark starts a window
+of window_s seconds, later marks inside it only replace the snapshot
+callback, and at the end of the window a writer thread calls each dirty
+file's snapshot, serializes it and writes it with atomic_json_write.
+Every file is written at most once per window however chatty its owner,
+and serialization and fsync happen off the event loop.
+
+When the manager is not running (tests, scripts, before wake) mark_dirty
+writes through immediately on the caller's thread and raises on error,
+exactly like calling atomic_json_write directly.
+
+Snapshot callbacks run on the writer thread, so they should copy what
+they read (dict(...), list(...)) rather than iterate live containers.
+stop() flushes everything still pending; it is called from sleep(), which
+the SIGTERM/SIGINT handlers run, and from an atexit hook as a fallback.
+"""
+
+import atexit
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+from .atomic_write import atomic_json_write
+
+DEFAULT_WINDOW_S = 5.0   # Coalescing window: each file is written at most once per window
+RATE_WINDOW_S = 3600.0   # Write rates in get_stats() cover the last hour
+
+
+@dataclass
+class _PendingWrite:
+    snapshot: Callable[[], Any]
+    indent: Optional[int]
+    marks: int = 1
+
+
+@dataclass
+class FileStats:
+    """Write record for one file."""
+    writes: int = 0
+    marks: int = 0
+    errors: int = 0
+    bytes_written: int = 0
+    last_bytes: int = 0
+    last_write: float = 0.0
+    recent: deque = field(default_factory=deque)  # Write timestamps within RATE_WINDOW_S
+
+    def record(self, nbytes: int, now: float):
+        self.writes += 1
+        self.bytes_written += nbytes
+        self.last_bytes = nbytes
+        self.last_write = now
+        self.recent.append(now)
+        while self.recent and self.recent[0] < now - RATE_WINDOW_S:
+            self.recent.popleft()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "writes": self.writes,
+            "marks": self.marks,
+            "coalesced": max(0, self.marks - self.writes - self.errors),
+            "errors": self.errors,
+            "bytes_written": self.bytes_written,
+            "last_bytes": self.last_bytes,
+            "writes_per_hour": len(self.recent),
+            "last_write": self.last_write,
+        }
+
+
+class PersistenceManager:
+    """Coalesces JSON state writes and performs them on a background thread."""
+
+    def __init__(self, window_s: float = DEFAULT_WINDOW_S):
+        self.window_s = window_s
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._pending: Dict[Path, _PendingWrite] = {}
+        self._stats: Dict[Path, FileStats] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._atexit_registered = False
+
+        # Stats
+        self.flushes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def mark_dirty(self, path: Union[str, Path], snapshot: Callable[[], Any],
+                   indent: Optional[int] = None) -> None:
+        """Schedule path to be rewritten with snapshot() (write-through when not running)."""
+        path = Path(path)
+        with self._lock:
+            stats = self._stats.setdefault(path, FileStats())
+            stats.marks += 1
+            if self._running:
+                pending = self._pending.get(path)
+                if pending is None:
+                    self._pending[path] = _PendingWrite(snapshot, indent)
+                    self._wake.notify()
+                else:
+                    pending.snapshot = snapshot
+                    pending.indent = indent
+                    pending.marks += 1
+                return
+        self._write(path, _PendingWrite(snapshot, indent), raise_errors=True)
+
+    def _write(self, path: Path, pending: _PendingWrite, raise_errors: bool = False) -> bool:
+        try:
+            atomic_json_write(path, pending.snapshot(), indent=pending.indent)
+            nbytes = path.stat().st_size
+        except Exception as e:
+            with self._lock:
+                self._stats[path].errors += 1
+            if raise_errors:
+                raise
+            print(f"[Persistence] Write failed for {path.name}: {e}", file=sys.stderr, flush=True)
+            return False
+        with self._lock:
+            self._stats[path].record(nbytes, time.time())
+        return True
+
+    # -- lifecycle ----------------------------------------------------------
+
+    def start(self) -> None:
+        """Begin coalescing: writes are deferred to the writer thread."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="persistence", daemon=True)
+            self._thread.start()
+        if not self._atexit_registered:
+            atexit.register(self.stop)
+            self._atexit_registered = True
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the writer thread and flush everything still pending (idempotent)."""
+        with self._lock:
+            thread = self._thread
+            self._running = False
+            self._thread = None
+            self._wake.notify()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self.flush()
+
+    def flush(self) -> int:
+        """Write all pending files now, on the calling thread. Returns files written."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        written = 0
+        for path, pending in batch.items():
+            if self._write(path, pending):
+                written += 1
+        if batch:
+            with self._lock:
+                self.flushes += 1
+        return written
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while self._running and not self._pending:
+                    self._wake.wait()
+                if not self._running:
+                    return
+                # Let marks accumulate for one window (stop() cuts it short)
+                deadline = time.monotonic() + self.window_s
+                while self._running:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wake.wait(remaining)
+                if not self._running:
+                    return
+            self.flush()
+
+    # -- stats ----------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            files = {str(path): stats.as_dict() for path, stats in self._stats.items()}
+            return {
+                "running": self._running,
+                "window_s": self.window_s,
+                "pending": len(self._pending),
+                "flushes": self.flushes,
+                "writes": sum(f["writes"] for f in files.values()),
+                "bytes_written": sum(f["bytes_written"] for f in files.values()),
+                "files": files,
+            }
+
+
+# Singleton instance
+_manager: Optional[PersistenceManager] = None
+
+
+def get_persistence() -> PersistenceManager:
+    """Get the persistence manager singleton."""
+    global _manager
+    if _manager is None:
+        _manager = PersistenceManager()
+    return _manager
@@ -23,7 +23,7 @@ import json
 import sys
 from pathlib import Path
 
-from .atomic_write import atomic_json_write
+from .persistence import get_persistence
 
 
 @dataclass
@@ -201,25 +201,27 @@ class PreferenceSystem:
             except Exception as e:
                 print(f"[Preferences] Could not load: {e}", file=sys.stderr, flush=True)
 
+    def _snapshot(self) -> dict:
+        return {
+            "preferences": {
+                dim: {
+                    "valence": p.valence,
+                    "optimal_low": p.optimal_low,
+                    "optimal_high": p.optimal_high,
+                    "confidence": p.confidence,
+                    "experience_count": p.experience_count,
+                    "influence_weight": p.influence_weight,
+                }
+                for dim, p in list(self._preferences.items())
+            },
+            "last_saved": datetime.now().isoformat(),
+        }
+
     def _save(self):
-        """Save preferences to disk."""
+        """Save preferences to disk (coalesced by the persistence manager)."""
         try:
             self.persistence_path.parent.mkdir(parents=True, exist_ok=True)
-            data = {
-                "preferences": {
-                    dim: {
-                        "valence": p.valence,
-                        "optimal_low": p.optimal_low,
-                        "optimal_high": p.optimal_high,
-                        "confidence": p.confidence,
-                        "experience_count": p.experience_count,
-                        "influence_weight": p.influence_weight,
-                    }
-                    for dim, p in self._preferences.items()
-                },
-                "last_saved": datetime.now().isoformat(),
-            }
-            atomic_json_write(self.persistence_path, data, indent=2)
+            get_persistence().mark_dirty(self.persistence_path, self._snapshot, indent=2)
         except Exception as e:
             print(f"[Preferences] Could not save: {e}", file=sys.stderr, flush=True)
 
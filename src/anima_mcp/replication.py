@@ -0,0 +1,493 @@
+"""
+Replication - incremental anima.db sync between the Pi and a backup host.
+
+scripts/sync_state.py used to scp the whole anima.db on every pull or
+push. Nearly all of that file is the append-only history tables, so each
+sync re-sent everything it had sent before, and took longer as Lumen aged.
+
+Tables are replicated in one of two ways:
+
+- APPEND_TABLES, the insert-only history tables (state_history, events,
+  drawing_history, system_metrics, drawing_records, trajectory_events),
+  ship only rows above the replica's per-table high-water mark (their
+  INTEGER PRIMARY KEY). Rows pruned at the source stay in the replica.
+- Every other table has rows updated in place (identity, growth,
+  primitive_history, ...). It is shipped whole, but only when its
+  checksum differs from the one the replica recorded when it last
+  received that table.
+- The rollup tables are derived data: they are not shipped, and pull()
+  folds the replicated history into the replica's own rollups.
+
+A batch is zlib-compressed JSON carrying, per table, its columns, rows,
+id range and a SHA-256 of the rows. The replica checks every table
+checksum before applying anything, applies the batch in one transaction,
+and records its high-water marks in the replication_marks table. verify()
+compares per-table checksums over the id range both sides hold.
+
+Peers are reached through a transport that runs one command against the
+peer database: DirectoryTransport for a directory holding anima.db (an
+offline copy or mounted backup volume, and the tests), SshTransport to
+run `python -m anima_mcp.replication serve` on the Pi.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import shlex
+import sqlite3
+import subprocess
+import sys
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from . import storage
+from .identity import rollups
+
+BATCH_FORMAT = 1
+# Rows are only ever inserted (never updated after the fact) and keyed by
+# an INTEGER PRIMARY KEY id, so a high-water mark is enough to sync them
+APPEND_TABLES = ("state_history", "events", "drawing_history", "system_metrics",
+                 "drawing_records", "trajectory_events")
+MARKS_TABLE = "replication_marks"
+DEFAULT_BATCH_ROWS = 5000  # Per append table per batch
+COMPRESSION_LEVEL = 6
+
+PathLike = Union[str, Path]
+
+
+class ReplicationError(Exception):
+    """A batch or peer response could not be used."""
+
+
+# ---------------------------------------------------------------------------
+# Rows and checksums
+# ---------------------------------------------------------------------------
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return {"$b": base64.b64encode(value).decode("ascii")}
+    return value
+
+
+def _from_json(value: Any) -> Any:
+    if isinstance(value, dict) and "$b" in value:
+        return base64.b64decode(value["$b"])
+    return value
+
+
+def _rows_checksum(rows: Iterable[Sequence[Any]]) -> str:
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(json.dumps([_jsonable(v) for v in row], separators=(",", ":")).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _tables(conn: sqlite3.Connection) -> List[str]:
+    """Replicated tables: everything but SQLite internals, marks and derived rollups."""
+    skip = (MARKS_TABLE, *rollups.ROLLUP_TABLES)
+    rows = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        f" AND name NOT IN ({', '.join('?' for _ in skip)}) ORDER BY name", skip).fetchall()
+    return [r[0] for r in rows]
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[Tuple[str, str]]:
+    """(name, declared type) per column, in table order."""
+    return [(r[1], r[2]) for r in conn.execute(f"PRAGMA table_info({_quote(table)})")]
+
+
+def table_checksum(conn: sqlite3.Connection, table: str, columns: Sequence[str],
+                   lo: Optional[int] = None, hi: Optional[int] = None) -> Dict[str, Any]:
+    """{"rows", "checksum"} of table (id range [lo, hi] for append tables).
+
+    Columns the table lacks are read as NULL, so two peers with different
+    schema versions still compare equal on the columns they share.
+    """
+    present = {name for name, _ in _columns(conn, table)}
+    if not present:
+        return {"rows": 0, "checksum": _rows_checksum([])}
+    select = ", ".join(_quote(c) if c in present else "NULL" for c in columns)
+    if table in APPEND_TABLES:
+        sql = f"SELECT {select} FROM {_quote(table)} WHERE id BETWEEN ? AND ? ORDER BY id"
+        params: Tuple = (lo if lo is not None else 0, hi if hi is not None else 2 ** 63 - 1)
+    else:
+        sql = f"SELECT {select} FROM {_quote(table)} ORDER BY {', '.join(_quote(c) for c in columns if c in present)}"
+        params = ()
+    rows = conn.execute(sql, params).fetchall()
+    return {"rows": len(rows), "checksum": _rows_checksum(rows)}
+
+
+# ---------------------------------------------------------------------------
+# Marks
+# ---------------------------------------------------------------------------
+
+def _ensure_marks(conn: sqlite3.Connection):
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {MARKS_TABLE} (
+            table_name TEXT PRIMARY KEY,
+            high_water INTEGER,
+            checksum TEXT,
+            rows INTEGER DEFAULT 0,
+            updated_at TEXT
+        )
+    """)
+
+
+def get_marks(conn: sqlite3.Connection) -> Dict[str, Dict[str, Any]]:
+    """Replica state per table: {"high_water", "checksum"}.
+
+    Append tables without a recorded mark (a database first copied whole)
+    start from their current MAX(id).
+    """
+    marks: Dict[str, Dict[str, Any]] = {}
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                    (MARKS_TABLE,)).fetchone():
+        for name, high_water, checksum in conn.execute(
+                f"SELECT table_name, high_water, checksum FROM {MARKS_TABLE}"):
+            marks[name] = {"high_water": high_water, "checksum": checksum}
+    existing = set(_tables(conn))
+    for table in APPEND_TABLES:
+        if table in existing and marks.get(table, {}).get("high_water") is None:
+            row = conn.execute(f"SELECT MAX(id) FROM {_quote(table)}").fetchone()
+            marks[table] = {"high_water": row[0] or 0, "checksum": None}
+    return marks
+
+
+# ---------------------------------------------------------------------------
+# Export / apply
+# ---------------------------------------------------------------------------
+
+def export_batch(conn: sqlite3.Connection, marks: Dict[str, Dict[str, Any]],
+                 limit: int = DEFAULT_BATCH_ROWS, snapshots: bool = True) -> Dict[str, Any]:
+    """Everything the replica described by marks is missing (up to limit rows per append table)."""
+    batch: Dict[str, Any] = {"format": BATCH_FORMAT, "created": datetime.now().isoformat(),
+                             "tables": {}, "more": False}
+    conn.execute("BEGIN")  # One read snapshot for the whole batch
+    try:
+        for table in _tables(conn):
+            columns = _columns(conn, table)
+            names = [c for c, _ in columns]
+            select = ", ".join(_quote(c) for c in names)
+            mark = marks.get(table, {})
+            if table in APPEND_TABLES:
+                since = mark.get("high_water") or 0
+                rows = conn.execute(
+                    f"SELECT {select} FROM {_quote(table)} WHERE id > ? ORDER BY id LIMIT ?",
+                    (since, limit + 1)).fetchall()
+                if len(rows) > limit:
+                    rows = rows[:limit]
+                    batch["more"] = True
+                if not rows:
+                    continue
+                id_index = names.index("id")
+                entry = {"mode": "append", "from_id": rows[0][id_index], "to_id": rows[-1][id_index]}
+            else:
+                if not snapshots:
+                    continue
+                checksum = table_checksum(conn, table, names)["checksum"]
+                if checksum == mark.get("checksum"):
+                    continue
+                rows = conn.execute(f"SELECT {select} FROM {_quote(table)}").fetchall()
+                entry = {"mode": "snapshot", "table_checksum": checksum}
+            entry.update({
+                "columns": columns,
+                "schema": conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                       (table,)).fetchone()[0],
+                "rows": [[_jsonable(v) for v in row] for row in rows],
+                "checksum": _rows_checksum(rows),
+            })
+            batch["tables"][table] = entry
+    finally:
+        conn.execute("COMMIT")
+    return batch
+
+
+def encode_batch(batch: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(batch, separators=(",", ":")).encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def decode_batch(blob: bytes) -> Dict[str, Any]:
+    try:
+        batch = json.loads(zlib.decompress(blob).decode("utf-8"))
+    except (zlib.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ReplicationError(f"unreadable batch: {e}") from e
+    if batch.get("format") != BATCH_FORMAT:
+        raise ReplicationError(f"unsupported batch format {batch.get('format')!r}")
+    return batch
+
+
+def apply_batch(conn: sqlite3.Connection, batch: Dict[str, Any]) -> Dict[str, int]:
+    """Apply a batch in one transaction; returns rows applied per table.
+
+    Raises ReplicationError, leaving the replica untouched, if any table's
+    rows don't match their checksum.
+    """
+    tables = batch.get("tables", {})
+    decoded = {}
+    for table, entry in tables.items():
+        rows = [[_from_json(v) for v in row] for row in entry["rows"]]
+        if _rows_checksum(rows) != entry["checksum"]:
+            raise ReplicationError(f"{table}: checksum mismatch, batch corrupted")
+        decoded[table] = rows
+
+    applied: Dict[str, int] = {}
+    now = datetime.now().isoformat()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        _ensure_marks(conn)
+        for table, entry in tables.items():
+            names = _prepare_table(conn, table, entry)
+            placeholders = ", ".join("?" for _ in names)
+            columns = ", ".join(_quote(c) for c in names)
+            if entry["mode"] == "snapshot":
+                conn.execute(f"DELETE FROM {_quote(table)}")
+            conn.executemany(f"INSERT OR IGNORE INTO {_quote(table)} ({columns}) VALUES ({placeholders})",
+                             decoded[table])
+            applied[table] = len(decoded[table])
+            if entry["mode"] == "append":
+                conn.execute(
+                    f"INSERT INTO {MARKS_TABLE} (table_name, high_water, rows, updated_at) VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT(table_name) DO UPDATE SET high_water = MAX(COALESCE(high_water, 0), excluded.high_water),"
+                    " rows = rows + excluded.rows, updated_at = excluded.updated_at",
+                    (table, entry["to_id"], len(decoded[table]), now))
+            else:
+                conn.execute(
+                    f"INSERT INTO {MARKS_TABLE} (table_name, checksum, rows, updated_at) VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT(table_name) DO UPDATE SET checksum = excluded.checksum,"
+                    " rows = excluded.rows, updated_at = excluded.updated_at",
+                    (table, entry["table_checksum"], len(decoded[table]), now))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return applied
+
+
+def _prepare_table(conn: sqlite3.Connection, table: str, entry: Dict[str, Any]) -> List[str]:
+    """Create the table or add missing columns; returns the columns to insert."""
+    existing = {name for name, _ in _columns(conn, table)}
+    if not existing:
+        conn.execute(entry["schema"])
+        existing = {name for name, _ in _columns(conn, table)}
+    names = []
+    for name, col_type in entry["columns"]:
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(name)} {col_type}")
+        names.append(name)
+    return names
+
+
+# ---------------------------------------------------------------------------
+# Peer commands and transports
+# ---------------------------------------------------------------------------
+
+def _connect(db_path: PathLike) -> sqlite3.Connection:
+    conn = storage.connect(db_path)
+    conn.isolation_level = None  # Explicit BEGIN/COMMIT above
+    return conn
+
+
+def handle_command(db_path: PathLike, command: str, options: Dict[str, Any],
+                   payload: bytes = b"") -> bytes:
+    """Run one peer command against db_path (both transports end up here)."""
+    conn = _connect(db_path)
+    try:
+        if command == "marks":
+            return json.dumps(get_marks(conn)).encode("utf-8")
+        if command == "export":
+            return encode_batch(export_batch(conn, options.get("marks", {}),
+                                             options.get("limit", DEFAULT_BATCH_ROWS),
+                                             options.get("snapshots", True)))
+        if command == "apply":
+            return json.dumps(apply_batch(conn, decode_batch(payload))).encode("utf-8")
+        if command == "checksums":
+            result = {table: table_checksum(conn, table, spec["columns"], spec.get("lo"), spec.get("hi"))
+                      for table, spec in options.get("tables", {}).items()}
+            return json.dumps(result).encode("utf-8")
+        if command == "ranges":
+            result = {}
+            existing = set(_tables(conn))
+            for table in APPEND_TABLES:
+                if table in existing:
+                    lo, hi = conn.execute(f"SELECT MIN(id), MAX(id) FROM {_quote(table)}").fetchone()
+                    result[table] = {"lo": lo, "hi": hi,
+                                     "columns": [c for c, _ in _columns(conn, table)]}
+            return json.dumps(result).encode("utf-8")
+        raise ReplicationError(f"unknown command {command!r}")
+    finally:
+        conn.close()
+
+
+class DirectoryTransport:
+    """Peer database in a local directory (mounted backup, offline copy, tests)."""
+
+    def __init__(self, directory: PathLike, db_name: str = "anima.db"):
+        self.db_path = Path(directory) / db_name
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def call(self, command: str, options: Optional[Dict[str, Any]] = None, payload: bytes = b"") -> bytes:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        response = handle_command(self.db_path, command, options or {}, payload)
+        self.bytes_sent += len(payload)
+        self.bytes_received += len(response)
+        return response
+
+
+class SshTransport:
+    """Peer reached over ssh, running `python -m anima_mcp.replication serve` there."""
+
+    def __init__(self, host: str, db_path: str = "~/.anima/anima.db",
+                 python: str = "python3", ssh_args: Sequence[str] = (), timeout: float = 300.0):
+        self.host = host
+        self.db_path = db_path
+        self.python = python
+        self.ssh_args = list(ssh_args)
+        self.timeout = timeout
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def call(self, command: str, options: Optional[Dict[str, Any]] = None, payload: bytes = b"") -> bytes:
+        remote = (f"{self.python} -m anima_mcp.replication serve {shlex.quote(command)} "
+                  f"--db {shlex.quote(self.db_path)} --options {shlex.quote(json.dumps(options or {}))}")
+        result = subprocess.run(["ssh", *self.ssh_args, self.host, remote], input=payload,
+                                capture_output=True, timeout=self.timeout)
+        if result.returncode != 0:
+            raise ReplicationError(f"ssh {self.host} {command} failed: "
+                                   f"{result.stderr.decode('utf-8', 'replace').strip()}")
+        self.bytes_sent += len(payload)
+        self.bytes_received += len(result.stdout)
+        return result.stdout
+
+
+# ---------------------------------------------------------------------------
+# Sync operations
+# ---------------------------------------------------------------------------
+
+def pull(local_db: PathLike, transport, limit: int = DEFAULT_BATCH_ROWS) -> Dict[str, int]:
+    """Bring local_db up to date with the peer; returns rows applied per table."""
+    totals: Dict[str, int] = {}
+    conn = _connect(local_db)
+    try:
+        while True:
+            marks = get_marks(conn)
+            batch = decode_batch(transport.call("export", {"marks": marks, "limit": limit}))
+            for table, count in apply_batch(conn, batch).items():
+                totals[table] = totals.get(table, 0) + count
+            if not batch["more"]:
+                break
+        _update_rollups(conn)
+        return totals
+    finally:
+        conn.close()
+
+
+def _update_rollups(conn: sqlite3.Connection):
+    """Fold newly replicated history into the replica's own rollups (they are not shipped)."""
+    existing = set(_tables(conn))
+    rollups.init_schema(conn)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for source in rollups.SOURCES:
+            if source in existing:
+                rollups.catch_up(conn, source)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def push(local_db: PathLike, transport, limit: int = DEFAULT_BATCH_ROWS,
+         snapshots: bool = False) -> Dict[str, int]:
+    """Send the peer what it is missing from local_db.
+
+    Only append-table rows by default: replacing mutable tables on the
+    live Pi (snapshots=True) is a restore, not a sync.
+    """
+    totals: Dict[str, int] = {}
+    conn = _connect(local_db)
+    try:
+        while True:
+            marks = json.loads(transport.call("marks"))
+            batch = export_batch(conn, marks, limit, snapshots)
+            if not batch["tables"]:
+                return totals
+            applied = json.loads(transport.call("apply", payload=encode_batch(batch)))
+            for table, count in applied.items():
+                totals[table] = totals.get(table, 0) + count
+            if not batch["more"]:
+                return totals
+    finally:
+        conn.close()
+
+
+def verify(local_db: PathLike, transport) -> Dict[str, Dict[str, Any]]:
+    """Compare append-table checksums over the id range both sides hold.
+
+    The range is the peer's lowest id up to the local high-water mark, so
+    rows the peer has pruned or not yet shipped don't count as mismatches.
+    """
+    ranges = json.loads(transport.call("ranges"))
+    conn = _connect(local_db)
+    try:
+        marks = get_marks(conn)
+        specs = {}
+        for table, peer in ranges.items():
+            hi = min(peer["hi"] or 0, (marks.get(table) or {}).get("high_water") or 0)
+            specs[table] = {"columns": peer["columns"], "lo": peer["lo"] or 0, "hi": hi}
+        remote = json.loads(transport.call("checksums", {"tables": specs}))
+        report = {}
+        for table, spec in specs.items():
+            local = table_checksum(conn, table, spec["columns"], spec["lo"], spec["hi"])
+            report[table] = {"lo": spec["lo"], "hi": spec["hi"], "rows": local["rows"],
+                             "match": local == remote.get(table)}
+        return report
+    finally:
+        conn.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m anima_mcp.replication",
+                                     description="Incremental anima.db replication")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="Run one peer command (used over ssh)")
+    serve.add_argument("peer_command", choices=["marks", "export", "apply", "checksums", "ranges"])
+    serve.add_argument("--db", required=True)
+    serve.add_argument("--options", default="{}")
+    for name in ("pull", "push", "verify"):
+        p = sub.add_parser(name, help=f"{name} against a peer directory holding anima.db")
+        p.add_argument("--db", required=True, help="Local anima.db")
+        p.add_argument("peer_dir")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        payload = sys.stdin.buffer.read() if args.peer_command == "apply" else b""
+        try:
+            out = handle_command(Path(args.db).expanduser(), args.peer_command,
+                                 json.loads(args.options), payload)
+        except ReplicationError as e:
+            print(f"[Replication] {e}", file=sys.stderr, flush=True)
+            return 1
+        sys.stdout.buffer.write(out)
+        sys.stdout.buffer.flush()
+        return 0
+
+    transport = DirectoryTransport(args.peer_dir)
+    if args.command == "verify":
+        report = verify(args.db, transport)
+    else:
+        report = (pull if args.command == "pull" else push)(args.db, transport)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,6 +18,7 @@ from starlette.responses import (
     JSONResponse,
     PlainTextResponse,
     Response,
+    StreamingResponse,
 )
 
 from .eisv_mapper import anima_to_eisv
@@ -609,6 +610,37 @@ async def rest_gallery_image(request):
         return Response(content=str(e), status_code=500)
 
 
+async def rest_screen_stream(request):
+    """GET /screen/stream?format=jpeg|png&fps=N - Live multipart stream of Lumen's screen.
+
+    Usable directly as an <img> src. Frames are only sent when the screen
+    changes, at most fps per second; encodings are shared between clients.
+    """
+    auth_error = _require_rest_auth(request)
+    if auth_error:
+        return auth_error
+    from .display.frame_stream import DEFAULT_STREAM_FPS, FORMATS, get_frame_hub
+
+    fmt = request.query_params.get("format", "jpeg").lower()
+    if fmt == "jpg":
+        fmt = "jpeg"
+    if fmt not in FORMATS:
+        return JSONResponse({"error": f"format must be one of {sorted(FORMATS)}"}, status_code=400)
+    try:
+        fps = float(request.query_params.get("fps", DEFAULT_STREAM_FPS))
+    except ValueError:
+        return JSONResponse({"error": "fps must be a number"}, status_code=400)
+
+    hub = get_frame_hub()
+    if not hub.has_capacity():
+        return JSONResponse({"error": "Too many screen viewers"}, status_code=503)
+    return StreamingResponse(
+        hub.stream(fmt, fps),
+        media_type="multipart/x-mixed-replace; boundary=frame",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
 async def rest_health_detailed(request):
     """GET /health/detailed - Get subsystem health status."""
     auth_error = _require_rest_auth(request)
@@ -17,7 +17,7 @@ from pathlib import Path
 from typing import Any, Deque, Dict, List, Optional, TYPE_CHECKING
 import json
 
-from .atomic_write import atomic_json_write
+from .persistence import get_persistence
 from .self_schema import SelfSchema, SchemaNode, SchemaEdge, extract_self_schema
 
 if TYPE_CHECKING:
@@ -232,7 +232,7 @@ class SchemaHub:
                 pass
 
         try:
-            atomic_json_write(self.persist_path, data, indent=2)
+            get_persistence().mark_dirty(self.persist_path, lambda: data, indent=2)
             return True
         except Exception:
             return False
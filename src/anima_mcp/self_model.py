@@ -23,7 +23,7 @@ import json
 from pathlib import Path
 import math
 
-from .atomic_write import atomic_json_write
+from .persistence import get_persistence
 
 
 @dataclass
@@ -263,24 +263,26 @@ class SelfModel:
             self._save()
             self._last_save_time = now
 
+    def _snapshot(self) -> dict:
+        return {
+            "beliefs": {
+                bid: {
+                    "confidence": b.confidence,
+                    "value": b.value,
+                    "supporting_count": b.supporting_count,
+                    "contradicting_count": b.contradicting_count,
+                }
+                for bid, b in list(self._beliefs.items())
+            },
+            "last_saved": datetime.now().isoformat(),
+            "_migrated_noise_reset": True,
+        }
+
     def _save(self):
-        """Save self-model to disk."""
+        """Save self-model to disk (coalesced by the persistence manager)."""
         try:
             self.persistence_path.parent.mkdir(parents=True, exist_ok=True)
-            data = {
-                "beliefs": {
-                    bid: {
-                        "confidence": b.confidence,
-                        "value": b.value,
-                        "supporting_count": b.supporting_count,
-                        "contradicting_count": b.contradicting_count,
-                    }
-                    for bid, b in self._beliefs.items()
-                },
-                "last_saved": datetime.now().isoformat(),
-                "_migrated_noise_reset": True,
-            }
-            atomic_json_write(self.persistence_path, data, indent=2)
+            get_persistence().mark_dirty(self.persistence_path, self._snapshot, indent=2)
         except Exception as e:
             print(f"[SelfModel] Could not save: {e}")
 
@@ -18,6 +18,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 from .base import SensorBackend, SensorReadings
+from .throttle import ThrottleReader, get_throttle_reader
 
 
 class PiSensors(SensorBackend):
@@ -41,8 +42,13 @@ class PiSensors(SensorBackend):
     _REINIT_MAX_BACKOFF = 300        # Max seconds between re-init attempts (5 min)
     _REINIT_BACKOFF_FACTOR = 2.0     # Exponential backoff multiplier
 
-    def __init__(self):
-        """Initialize Pi sensors."""
+    def __init__(self, throttle_reader: Optional[ThrottleReader] = None):
+        """Initialize Pi sensors.
+
+        Args:
+            throttle_reader: Source for voltage/throttle flags. Defaults to the
+                cheapest available (sysfs, then mailbox, then vcgencmd).
+        """
         self._i2c = None
         self._aht = None
         self._light_sensor = None
@@ -68,6 +74,8 @@ class PiSensors(SensorBackend):
             "bmp280": 0.0,
         }
 
+        self._throttle = throttle_reader or get_throttle_reader()
+
         self._init_sensors()
         # Prime psutil cpu_percent so first real call returns meaningful data
         psutil.cpu_percent(interval=None)
@@ -281,35 +289,14 @@ class PiSensors(SensorBackend):
         )
 
     def _read_throttle_status(self) -> dict:
-        """Read Pi voltage/throttle state from vcgencmd.
-
-        Returns dict with parsed throttle flags:
-          throttle_bits: raw int (e.g. 0x50005)
-          undervoltage_now: bool (bit 0)
-          throttled_now: bool (bit 1)
-          freq_capped_now: bool (bit 2)
-          undervoltage_occurred: bool (bit 16)
+        """Read Pi voltage/throttle state (cached; see sensors/throttle.py).
+
+        Returns dict with parsed throttle flags, or {} if unavailable.
         """
-        import subprocess
         try:
-            result = subprocess.run(
-                ["vcgencmd", "get_throttled"],
-                capture_output=True, text=True, timeout=2
-            )
-            if result.returncode == 0 and "throttled=" in result.stdout:
-                # Output: "throttled=0x50005\n"
-                hex_str = result.stdout.strip().split("=")[1]
-                bits = int(hex_str, 16)
-                return {
-                    "throttle_bits": bits,
-                    "undervoltage_now": bool(bits & 0x1),
-                    "throttled_now": bool(bits & 0x2),
-                    "freq_capped_now": bool(bits & 0x4),
-                    "undervoltage_occurred": bool(bits & 0x10000),
-                }
+            return self._throttle.read()
         except Exception:
-            pass
-        return {}
+            return {}
 
     def read(self) -> SensorReadings:
         """Read all available sensors."""
@@ -0,0 +1,211 @@
+"""
+Throttle / voltage readers - Pi firmware throttle flags without a process per read.
+
+`vcgencmd get_throttled` forks and execs a binary every call, which costs
+tens of milliseconds of CPU on a Pi 4 and shows up in the very cpu_percent
+that computational proprioception turns into neural bands. The firmware
+exposes the same word through sysfs and through the /dev/vcio mailbox, so
+readers try those first and cache the result for a short TTL.
+
+Readers (in order of preference):
+- SysfsThrottleReader: /sys/devices/platform/soc/soc:firmware/get_throttled
+- MailboxThrottleReader: GET_THROTTLED property tag via /dev/vcio ioctl
+- VcgencmdThrottleReader: subprocess fallback with a longer TTL
+- MockThrottleReader: fixed bits for tests and development
+"""
+
+import shutil
+import struct
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+SYSFS_THROTTLE_PATH = Path("/sys/devices/platform/soc/soc:firmware/get_throttled")
+VCIO_PATH = Path("/dev/vcio")
+
+DEFAULT_TTL_SECONDS = 5.0        # Throttle flags change on a scale of seconds
+SUBPROCESS_TTL_SECONDS = 30.0    # Spawning is expensive; poll the fallback rarely
+
+# Mailbox property interface
+_MBOX_TAG_GET_THROTTLED = 0x00030046
+_MBOX_RESPONSE_OK = 0x80000000
+# _IOWR(100, 0, char *): direction 3, size of a pointer, type 100, nr 0
+_IOCTL_MBOX_PROPERTY = (3 << 30) | (struct.calcsize("P") << 16) | (100 << 8)
+
+
+def parse_throttle_bits(bits: int) -> dict:
+    """Expand the raw get_throttled word into the flags SensorReadings carries.
+
+    Returns dict with:
+      throttle_bits: raw int (e.g. 0x50005)
+      undervoltage_now: bool (bit 0)
+      throttled_now: bool (bit 1)
+      freq_capped_now: bool (bit 2)
+      undervoltage_occurred: bool (bit 16)
+    """
+    return {
+        "throttle_bits": bits,
+        "undervoltage_now": bool(bits & 0x1),
+        "throttled_now": bool(bits & 0x2),
+        "freq_capped_now": bool(bits & 0x4),
+        "undervoltage_occurred": bool(bits & 0x10000),
+    }
+
+
+class ThrottleReader:
+    """Base reader: caches the parsed flags for `ttl` seconds.
+
+    Subclasses implement _read_bits() returning the raw word or None.
+    read() returns {} when no value is available, matching the old
+    vcgencmd helper.
+    """
+
+    source = "none"
+
+    def __init__(self, ttl: float = DEFAULT_TTL_SECONDS):
+        self.ttl = ttl
+        self._cached: dict = {}
+        self._cached_at: float = float("-inf")
+        self.reads = 0  # Underlying reads (not cache hits)
+
+    def _read_bits(self) -> Optional[int]:
+        return None
+
+    def read(self) -> dict:
+        """Parsed throttle flags, refreshed at most once per TTL."""
+        now = time.monotonic()
+        if now - self._cached_at < self.ttl:
+            return self._cached
+        self.reads += 1
+        try:
+            bits = self._read_bits()
+        except Exception:
+            bits = None
+        self._cached = parse_throttle_bits(bits) if bits is not None else {}
+        self._cached_at = now
+        return self._cached
+
+    def invalidate(self):
+        """Force the next read() to hit the source."""
+        self._cached_at = float("-inf")
+
+    def close(self):
+        """Release any handle held by the reader."""
+
+
+class SysfsThrottleReader(ThrottleReader):
+    """Reads the firmware throttle word from sysfs (hex text, no 0x prefix)."""
+
+    source = "sysfs"
+
+    def __init__(self, path: Path = SYSFS_THROTTLE_PATH, ttl: float = DEFAULT_TTL_SECONDS):
+        super().__init__(ttl)
+        self.path = Path(path)
+
+    def _read_bits(self) -> Optional[int]:
+        text = self.path.read_text().strip()
+        return int(text, 16) if text else None
+
+
+class MailboxThrottleReader(ThrottleReader):
+    """Queries the VideoCore mailbox directly (what vcgencmd does internally).
+
+    Keeps /dev/vcio open for the life of the reader.
+    """
+
+    source = "mailbox"
+
+    def __init__(self, path: Path = VCIO_PATH, ttl: float = DEFAULT_TTL_SECONDS):
+        super().__init__(ttl)
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+
+    def _read_bits(self) -> Optional[int]:
+        import fcntl
+        import os
+
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDWR)
+        # [size, request code, tag, value buffer size, req/resp, value, end tag]
+        buf = bytearray(struct.pack("<7I", 28, 0, _MBOX_TAG_GET_THROTTLED, 4, 0, 0, 0))
+        fcntl.ioctl(self._fd, _IOCTL_MBOX_PROPERTY, buf, True)
+        words = struct.unpack("<7I", buf)
+        if words[1] != _MBOX_RESPONSE_OK:
+            return None
+        return words[5]
+
+    def close(self):
+        if self._fd is not None:
+            import os
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+
+
+class VcgencmdThrottleReader(ThrottleReader):
+    """Last resort: spawn vcgencmd, but only once per (longer) TTL.
+
+    Stops trying once the binary is found to be missing.
+    """
+
+    source = "vcgencmd"
+
+    def __init__(self, ttl: float = SUBPROCESS_TTL_SECONDS):
+        super().__init__(ttl)
+        self._missing = False
+
+    def _read_bits(self) -> Optional[int]:
+        if self._missing:
+            return None
+        try:
+            result = subprocess.run(
+                ["vcgencmd", "get_throttled"],
+                capture_output=True, text=True, timeout=2
+            )
+        except FileNotFoundError:
+            self._missing = True
+            return None
+        if result.returncode == 0 and "throttled=" in result.stdout:
+            # Output: "throttled=0x50005\n"
+            return int(result.stdout.strip().split("=")[1], 16)
+        return None
+
+
+class MockThrottleReader(ThrottleReader):
+    """Returns fixed bits; set .bits to simulate undervoltage or throttling."""
+
+    source = "mock"
+
+    def __init__(self, bits: Optional[int] = 0, ttl: float = 0.0):
+        super().__init__(ttl)
+        self.bits = bits
+
+    def _read_bits(self) -> Optional[int]:
+        return self.bits
+
+
+def get_throttle_reader(
+    sysfs_path: Path = SYSFS_THROTTLE_PATH,
+    vcio_path: Path = VCIO_PATH,
+) -> ThrottleReader:
+    """Pick the cheapest working throttle source on this machine."""
+    if sysfs_path.exists():
+        reader = SysfsThrottleReader(sysfs_path)
+        if reader.read():
+            return reader
+
+    if vcio_path.exists():
+        reader = MailboxThrottleReader(vcio_path)
+        if reader.read():
+            return reader
+        reader.close()
+
+    if shutil.which("vcgencmd"):
+        print("[Throttle] sysfs and mailbox unavailable, falling back to vcgencmd", file=sys.stderr, flush=True)
+        return VcgencmdThrottleReader()
+
+    return ThrottleReader()
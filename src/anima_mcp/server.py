@@ -40,19 +40,15 @@ from .primitive_language import get_language_system
 from .eisv import get_trajectory_awareness
 from .tool_registry import get_fastmcp, create_server, HAS_FASTMCP
 from .server_context import ServerContext
+from .loop_scheduler import LoopScheduler
 from .server_state import (
     # Constants
     SHM_GOVERNANCE_STALE_SECONDS as SHM_GOVERNANCE_STALE_SECONDS,
     LOOP_BASE_DELAY_SECONDS, LOOP_MAX_DELAY_SECONDS,
     METACOG_INTERVAL, AGENCY_INTERVAL, SELF_MODEL_INTERVAL,
-    PRIMITIVE_LANG_INTERVAL, VOICE_INTERVAL, GROWTH_INTERVAL,
+    PRIMITIVE_LANG_INTERVAL, VOICE_INTERVAL,
     TRAJECTORY_INTERVAL, SERVER_GOVERNANCE_FALLBACK_SECONDS,
-    LEARNING_INTERVAL,
-    SYSTEM_METRICS_RECORD_INTERVAL, SYSTEM_METRICS_PRUNE_INTERVAL,
-    SYSTEM_METRICS_RETENTION_HOURS,
-    SELF_MODEL_SAVE_INTERVAL, SCHEMA_EXTRACTION_INTERVAL,
-    EXPRESSION_INTERVAL, UNIFIED_REFLECTION_INTERVAL, SELF_ANSWER_INTERVAL,
-    GOAL_SUGGEST_INTERVAL, GOAL_CHECK_INTERVAL, META_LEARNING_INTERVAL,
+    SELF_MODEL_SAVE_INTERVAL,
     ERROR_LOG_THROTTLE, STATUS_LOG_THROTTLE, DISPLAY_LOG_THROTTLE,
     WARN_LOG_THROTTLE, SCHEMA_LOG_THROTTLE, SELF_DIALOGUE_LOG_THROTTLE,
     METACOG_SURPRISE_THRESHOLD, is_broker_running as _is_broker_running,
@@ -97,6 +93,7 @@ from .loop_phases import (  # noqa: E402,F401
     lumen_self_answer as _lumen_self_answer,
     extract_and_validate_schema as _extract_and_validate_schema,
     self_reflect as _self_reflect,
+    register_loop_tasks as _register_loop_tasks,
 )
 
 logger = logging.getLogger("anima.server")
@@ -108,7 +105,7 @@ async def _update_display_loop():
         logger.warning("[Loop] No context - wake() may have failed")
         return
     import sys
-    from .error_recovery import safe_call, safe_call_async
+    from .error_recovery import safe_call
 
     print("[Loop] Starting", file=sys.stderr, flush=True)
 
@@ -233,6 +230,13 @@ async def _update_display_loop():
 
     # Event for immediate re-render when screen mode changes
     mode_change_event = asyncio.Event()
+
+    # Periodic background jobs (see loop_scheduler.py / loop_phases.register_loop_tasks)
+    if _ctx.loop_scheduler is not None:
+        _ctx.loop_scheduler.close()
+    scheduler = LoopScheduler()
+    _register_loop_tasks(scheduler)
+    _ctx.loop_scheduler = scheduler
     
     # Start fast input polling task (delegated to input_handler.py)
     try:
@@ -1148,231 +1152,17 @@ async def _update_display_loop():
             if loop_count % TRAJECTORY_INTERVAL == 1:
                 pass
 
-            # System metrics persistence: Every 15 iterations (~30s), record to SQLite
-            if loop_count % SYSTEM_METRICS_RECORD_INTERVAL == 0 and readings and _ctx and _ctx.store:
-                try:
-                    _ctx.store.record_system_metrics(readings)
-                except Exception:
-                    pass  # Non-fatal — don't disrupt main loop
-
-            # System metrics pruning: Every 1800 iterations (~1h), delete old rows
-            if loop_count % SYSTEM_METRICS_PRUNE_INTERVAL == 0 and loop_count > 0 and _ctx and _ctx.store:
-                try:
-                    _pruned = _ctx.store.prune_system_metrics(SYSTEM_METRICS_RETENTION_HOURS)
-                    if _pruned > 0:
-                        logger.debug("[Metrics] Pruned %d old system_metrics rows", _pruned)
-                except Exception:
-                    pass
-
-            # Adaptive learning: Every 100 iterations (~3.3 minutes), check if calibration should adapt
-            # Respects cooldown to avoid redundant adaptations during continuous operation
-            if loop_count % LEARNING_INTERVAL == 0 and _ctx and _ctx.store:
-                def try_learning():
-                    learner = get_learner(str(_ctx.store.db_path))
-                    adapted, new_cal = learner.adapt_calibration(respect_cooldown=True)
-                    if adapted:
-                        logger.debug("[Learning] Calibration adapted after %d observations", loop_count)
-                        logger.debug("[Learning] Pressure: %.1f hPa, Ambient: %.1f-%.1f C", new_cal.pressure_ideal, new_cal.ambient_temp_min, new_cal.ambient_temp_max)
-                
-                safe_call(try_learning, default=None, log_error=True)
-            
-            # Lumen's unified reflection: Every ~30 minutes
-            # Grounded observation from actual state — no LLM needed
-            if loop_count % UNIFIED_REFLECTION_INTERVAL == 0 and readings and anima and identity:
-                try:
-                    await safe_call_async(
-                        lambda: _lumen_unified_reflect(anima, readings, identity, prediction_error),
-                        default=None, log_error=True,
-                    )
-                except Exception as e:
-                    logger.debug("[Lumen/Unified] Reflection error: %s", e)
-
-            # Lumen self-answers: Every 1800 iterations (~60 minutes), answer own old questions
-            # Uses learned insights/beliefs/preferences — no LLM needed
-            # Questions must be at least 10 minutes old (external answers get priority)
-            if loop_count % SELF_ANSWER_INTERVAL == 0 and readings and anima and identity:
-                try:
-                    await safe_call_async(
-                        lambda: _lumen_self_answer(anima, readings, identity),
-                        default=None, log_error=True,
-                    )
-                except Exception as e:
-                    logger.debug("[Lumen/SelfAnswer] Self-answer error: %s", e)
-
-
-            # Growth system: Observe state for preference learning and check milestones
-            # Every 30 iterations (~1 minute) - learns from anima state + environment
-            if loop_count % GROWTH_INTERVAL == 0 and readings and anima and identity and _ctx and _ctx.growth:
-                def growth_observe():
-                    """Observe environment and check milestones."""
-                    # Prepare anima state dict
-                    anima_state = {
-                        "warmth": anima.warmth,
-                        "clarity": anima.clarity,
-                        "stability": anima.stability,
-                        "presence": anima.presence,
-                    }
-                    # Prepare environment dict from sensor readings
-                    # Raw lux includes LED glow — that's Lumen's actual light environment
-                    environment = {
-                        "light_lux": readings.light_lux or 0.0,
-                        "temp_c": readings.ambient_temp_c,
-                        "humidity_pct": readings.humidity_pct,
-                    }
-
-                    # Observe for preference learning
-                    insight = _ctx.growth.observe_state_preference(anima_state, environment)
-                    if insight:
-                        logger.debug("[Growth] %s", insight)
-                        # Add insight as an observation from Lumen
-                        from .messages import add_observation
-                        add_observation(insight, author="lumen")
-
-                    # Check for age/awakening milestones
-                    milestone = _ctx.growth.check_for_milestones(identity, anima)
-                    if milestone:
-                        logger.debug("[Growth] Milestone: %s", milestone)
-                        from .messages import add_observation
-                        add_observation(milestone, author="lumen")
-
-                safe_call(growth_observe, default=None, log_error=True)
-                if _health:
-                    _health.heartbeat("growth")
-
-            # Goal system: Suggest new goals every ~2 hours
-            if loop_count % GOAL_SUGGEST_INTERVAL == 0 and anima and _ctx and _ctx.growth:
-                def goal_suggest():
-                    """Suggest a goal grounded in Lumen's experience."""
-                    anima_state = {
-                        "warmth": anima.warmth, "clarity": anima.clarity,
-                        "stability": anima.stability, "presence": anima.presence,
-                    }
-                    try:
-                        from .self_model import get_self_model
-                        sm = get_self_model()
-                    except Exception as e:
-                        logger.debug("[Growth] SelfModel init for goal suggest: %s", e)
-                        sm = None
-                    goal = _ctx.growth.suggest_goal(anima_state, self_model=sm)
-                    if goal:
-                        from .messages import add_observation
-                        add_observation(f"new goal: {goal.description}", author="lumen")
-
-                safe_call(goal_suggest, default=None, log_error=True)
-
-            # Goal system: Check progress every ~10 minutes
-            if loop_count % GOAL_CHECK_INTERVAL == 0 and anima and _ctx and _ctx.growth:
-                def goal_check():
-                    """Check progress on active goals."""
-                    anima_state = {
-                        "warmth": anima.warmth, "clarity": anima.clarity,
-                        "stability": anima.stability, "presence": anima.presence,
-                    }
-                    try:
-                        from .self_model import get_self_model
-                        sm = get_self_model()
-                    except Exception as e:
-                        logger.debug("[Growth] SelfModel init for goal check: %s", e)
-                        sm = None
-                    msg = _ctx.growth.check_goal_progress(anima_state, self_model=sm)
-                    if msg:
-                        from .messages import add_observation
-                        add_observation(msg, author="lumen")
-
-                safe_call(goal_check, default=None, log_error=True)
-
-            # Meta-learning: Daily preference weight evolution
-            # Every ~12 hours, rebalance which anima dimensions matter most
-            # based on how satisfying each dimension correlates with trajectory health
-            if loop_count % META_LEARNING_INTERVAL == 0 and loop_count > 0 and _ctx and _ctx.growth:
-                try:
-                    from .preferences import (
-                        compute_trajectory_health, meta_learning_update,
-                        get_preference_system as _ml_get_pref,
-                    )
-
-                    # Prediction accuracy trend: -0.5 (poor) to 0.5 (good), from adaptive model
-                    pred_trend = 0.0
-                    try:
-                        from .adaptive_prediction import get_adaptive_prediction_model
-                        stats = get_adaptive_prediction_model().get_accuracy_stats()
-                        if not stats.get("insufficient_data") and "overall_mean_error" in stats:
-                            err = stats["overall_mean_error"]
-                            pred_trend = max(-0.5, min(0.5, (1.0 - min(1.0, err)) * 2.0 - 1.0))
-                    except Exception as e:
-                        logger.debug("[MetaLearning] Prediction accuracy stats error: %s", e)
-
-                    health = compute_trajectory_health(
-                        satisfaction_history=list(_ctx.satisfaction_history)[-100:],
-                        action_efficacy=_ctx.action_efficacy,
-                        prediction_accuracy_trend=pred_trend,
-                    )
-                    _ctx.health_history.append(health)
-
-                    # Record healthy state for drift restart target
-                    if _ctx and _ctx.calibration_drift:
-                        _ctx.calibration_drift.record_healthy_state(health)
-
-                    # Compute lagged correlations between per-dim satisfaction and health
-                    correlations = _compute_lagged_correlations()
-
-                    # Update preference weights via the PreferenceSystem singleton
-                    pref_system = _ml_get_pref()
-                    weights = {
-                        d: p.influence_weight
-                        for d, p in pref_system._preferences.items()
-                        if d in ("warmth", "clarity", "stability", "presence")
-                    }
-                    if weights:
-                        new_weights = meta_learning_update(weights, correlations)
-                        for d, w in new_weights.items():
-                            if d in pref_system._preferences:
-                                pref_system._preferences[d].influence_weight = w
-                        pref_system._save()
-                        logger.debug("[MetaLearning] Updated preference weights: %s health=%.3f",
-                                    ', '.join(f'{d}={w:.3f}' for d, w in new_weights.items()), health)
-                except Exception as e:
-                    logger.warning("[MetaLearning] Error (non-fatal): %s", e)
-
-            # Trajectory: Record anima history for trajectory signature computation
-            # Every 5 iterations (~10 seconds) - builds time-series for attractor basin
-            # See: docs/theory/TRAJECTORY_IDENTITY_PAPER.md
-            if loop_count % TRAJECTORY_INTERVAL == 0 and anima:
-                from .anima_history import get_anima_history
-
-                def record_history():
-                    """Record anima state for trajectory computation."""
-                    history = get_anima_history()
-                    history.record_from_anima(anima)
-
-                safe_call(record_history, default=None, log_error=True)
-
-            # Governance is handled by the broker (sole UNITARES caller).
-            # Server reads governance from SHM in the display block above.
-
-            # === SLOW CLOCK: Self-Schema G_t extraction (every 5 minutes) ===
-            # PoC for StructScore visual integrity evaluation
-            # Extracts Lumen's self-representation graph and optionally saves for offline analysis
-            if (loop_count == 1 or loop_count % SCHEMA_EXTRACTION_INTERVAL == 0) and readings and anima and identity:
-                try:
-                    await safe_call_async(
-                        lambda: _extract_and_validate_schema(anima, readings, identity),
-                        default=None, log_error=True,
-                    )
-                    # Persist schema periodically so crash recovery has recent data
-                    # (not just on clean shutdown — Pi crashes often)
-                    if _ctx.schema_hub:
-                        _ctx.schema_hub.persist_schema()
-                except Exception as e:
-                    logger.warning("[Schema] Extraction error: %s", e)
-
-            # === SLOW CLOCK: Self-Reflection (every 15 minutes) ===
-            # Analyze state history, discover patterns, generate insights about self
-            if loop_count % EXPRESSION_INTERVAL == 0 and readings and anima and identity:
-                try:
-                    await safe_call_async(_self_reflect, default=None, log_error=True)
-                except Exception as e:
-                    logger.debug("[SelfReflection] Reflection error: %s", e)
+            # Slow-clock jobs (metrics, learning, growth, goals, reflections, schema):
+            # the scheduler spreads coinciding intervals over frames and runs the
+            # coroutine jobs in the background, so they never hold up the next render
+            scheduler.tick(loop_count, {
+                "loop_count": loop_count,
+                "anima": anima,
+                "readings": readings,
+                "identity": identity,
+                "prediction_error": prediction_error,
+                "health": _health,
+            })
 
             # Delay until next render — screen-specific for performance
             # Heavy screens (notepad, learning) get slower refresh to save CPU
@@ -1442,6 +1232,8 @@ def stop_display_loop():
     try:
         if _ctx and _ctx.display_update_task and not _ctx.display_update_task.done():
             _ctx.display_update_task.cancel()
+            if _ctx.loop_scheduler is not None:
+                _ctx.loop_scheduler.close()
             try:
                 print("[Display] Stopped continuous update loop", file=sys.stderr, flush=True)
             except (ValueError, OSError):
@@ -1620,7 +1412,7 @@ def run_http_server(host: str, port: int):
         from .rest_api import (
             health_check, rest_tool_call, dashboard,
             rest_state, rest_qa, rest_messages, rest_answer, rest_message,
-            rest_learning, rest_voice, rest_gallery, rest_gallery_image,
+            rest_learning, rest_voice, rest_gallery, rest_gallery_image, rest_screen_stream,
             rest_health_detailed, rest_self_knowledge, rest_growth,
             rest_gallery_page, rest_layers, rest_architecture_page,
             rest_schema_data, rest_schema_page,
@@ -1683,6 +1475,7 @@ def run_http_server(host: str, port: int):
             Route("/gallery", rest_gallery, methods=["GET"]),
             Route("/gallery/{filename}", rest_gallery_image, methods=["GET"]),
             Route("/gallery-page", rest_gallery_page, methods=["GET"]),
+            Route("/screen/stream", rest_screen_stream, methods=["GET"]),
             Route("/layers", rest_layers, methods=["GET"]),
             Route("/self-knowledge", rest_self_knowledge, methods=["GET"]),
             Route("/growth", rest_growth, methods=["GET"]),
@@ -1880,6 +1673,10 @@ def main():
 
     wake(db_path, anima_id)
 
+    # Coalesce JSON state-file writes while awake; sleep() flushes them
+    from .persistence import get_persistence
+    get_persistence().start()
+
     try:
         if args.http_server:
             run_http_server(args.host, args.port)
@@ -54,6 +54,7 @@ class ServerContext:
 
     # Display loop
     display_update_task: Any = None  # asyncio.Task
+    loop_scheduler: Any = None  # LoopScheduler (slow-clock jobs of the display loop)
 
     # Input / joystick
     joystick_enabled: bool = False
@@ -69,6 +70,8 @@ class ServerContext:
 
     # Per-iteration cache (updated by _get_readings_and_anima)
     last_shm_data: dict | None = None
+    # (shm generation, readings, anima) derived from the last broker publish
+    shm_derived: tuple | None = None
     consumed_drive_events: set = field(default_factory=set)
 
     # Meta-learning / trajectory
@@ -36,6 +36,7 @@ SHM_GOVERNANCE_STALE_SECONDS = 210.0  # Broker checks in every ~180s; stale afte
 SERVER_GOVERNANCE_FALLBACK_SECONDS = 240.0  # Server calls UNITARES if broker hasn't for this long
 SYSTEM_METRICS_RECORD_INTERVAL = 15   # ~30s — persist system metrics to SQLite
 SYSTEM_METRICS_PRUNE_INTERVAL = 1800  # ~1h — delete metrics older than retention
+ROLLUP_MAINTENANCE_INTERVAL = 300     # ~10 min — fold rollup backlog, prune minute buckets
 SYSTEM_METRICS_RETENTION_HOURS = 24.0
 THERMAL_RATE_THRESHOLD = 5.0          # °C/min — CPU temp rise rate before concern
 MEMORY_PRESSURE_THRESHOLD = 90.0      # % — memory usage before concern
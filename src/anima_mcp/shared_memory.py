@@ -2,26 +2,258 @@
 Shared Memory Client for Anima Hardware Broker.
 
 Implements a shared memory layer for data exchange between Broker and MCP.
-Uses JSON files in /dev/shm (RAM disk) for fast, atomic data exchange.
+
+Two backends:
+- "file": JSON envelope in /dev/shm (RAM disk), written via temp file + rename
+  under an flock. Simple and inspectable with `cat`.
+- "seqlock": fixed-layout mmap region guarded by a sequence lock. Hot numeric
+  fields (readings, anima, eisv, metacognition) live in a packed struct; the
+  rest of the payload goes into a versioned JSON side-slot that is only
+  rewritten (and re-decoded) when it actually changes. Readers never lock,
+  never sleep, and skip decoding entirely when the sequence number is unchanged.
+
+Select the backend with the `backend=` argument or the ANIMA_SHM_BACKEND
+environment variable (used by the broker and server entry points). Both
+sides must agree.
+
+Readers expose a per-client `generation` counter that increases whenever the
+writer publishes, and `await wait_for_update(timeout)` to sleep until it does
+(inotify on the file backend where available, cheap sequence polling otherwise).
 
 Usage:
     client = SharedMemoryClient(mode="write", backend="file")
     client.write(data)
 """
 
+import asyncio
+import ctypes
+import ctypes.util
 import fcntl
 import json
+import mmap
+import struct
 import sys
 import os
 import time
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 
 # Default path for shared memory file
 SHM_DIR = Path("/dev/shm") if Path("/dev/shm").exists() else Path("/tmp")
 SHM_FILE = SHM_DIR / "anima_state.json"
 
+# Backend used by broker and server (must match on both sides)
+SHM_BACKEND = os.environ.get("ANIMA_SHM_BACKEND", "file")
+
+_BACKENDS = ("file", "seqlock")
+
+
+# ============================================================
+# Seqlock region layout
+# ============================================================
+#
+#   [0:64)            header  (magic, layout version, flags, seq, updated_at,
+#                              pid, side_len, side_version)
+#   [64:64+hot)       hot struct (present mask, none mask, packed values)
+#   [side_off:+cap)   JSON side-slot (everything not in the hot struct)
+#
+# Writer protocol: seq -> odd, write body, seq -> even.
+# Reader protocol: read seq; if odd or changed after copying, retry.
+
+_SEQLOCK_MAGIC = b"ANSQ"
+_SEQLOCK_LAYOUT_VERSION = 1
+_SEQLOCK_FLAG_HAS_DATA = 0x1
+_SEQLOCK_READ_ATTEMPTS = 8
+_SEQLOCK_REMAP_CHECK_SECONDS = 1.0
+_SEQLOCK_SIDE_CAPACITY = 256 * 1024
+
+# wait_for_update polling interval when no change notification is available.
+# Seqlock polling is a single 8-byte read from the mapping (no syscall).
+_UPDATE_POLL_SECONDS = 0.05
+
+# magic, layout_version, flags, seq, updated_at, pid, side_len, side_version
+_HEADER = struct.Struct("<4sHHQdiIQ")
+_SEQ = struct.Struct("<Q")
+_SEQ_OFFSET = 8
+_HOT_OFFSET = 64
+
+# SensorReadings.to_dict() fields and their packed types
+_READINGS_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("timestamp", "32s"),
+    ("cpu_temp_c", "d"),
+    ("ambient_temp_c", "d"),
+    ("humidity_pct", "d"),
+    ("light_lux", "d"),
+    ("cpu_percent", "d"),
+    ("memory_percent", "d"),
+    ("disk_percent", "d"),
+    ("power_watts", "d"),
+    ("throttle_bits", "q"),
+    ("undervoltage_now", "?"),
+    ("throttled_now", "?"),
+    ("freq_capped_now", "?"),
+    ("undervoltage_occurred", "?"),
+    ("led_brightness", "d"),
+    ("pressure_hpa", "d"),
+    ("pressure_temp_c", "d"),
+    ("eeg_tp9", "d"),
+    ("eeg_af7", "d"),
+    ("eeg_af8", "d"),
+    ("eeg_tp10", "d"),
+    ("eeg_aux1", "d"),
+    ("eeg_aux2", "d"),
+    ("eeg_aux3", "d"),
+    ("eeg_aux4", "d"),
+    ("eeg_delta_power", "d"),
+    ("eeg_theta_power", "d"),
+    ("eeg_alpha_power", "d"),
+    ("eeg_beta_power", "d"),
+    ("eeg_gamma_power", "d"),
+)
+
+_ANIMA_DIMS = ("warmth", "clarity", "stability", "presence")
+
+# (path, struct code) for every field carried in the packed struct
+_HOT_FIELDS: Tuple[Tuple[Tuple[str, ...], str], ...] = (
+    (("timestamp",), "32s"),
+    *((("readings", k), code) for k, code in _READINGS_FIELDS),
+    *((("anima", k), "d") for k in _ANIMA_DIMS),
+    *((("anima", "readings", k), code) for k, code in _READINGS_FIELDS),
+    *((("eisv", k), "d") for k in ("E", "I", "S", "V")),
+    *((("metacognition", k), "d") for k in ("surprise", "cumulative_surprise", "prediction_confidence")),
+)
+
+_MASK_BYTES = 16  # supports up to 128 hot fields
+_HOT = struct.Struct("<%ds%ds" % (_MASK_BYTES, _MASK_BYTES) + "".join(code for _, code in _HOT_FIELDS))
+_SIDE_OFFSET = (_HOT_OFFSET + _HOT.size + 63) // 64 * 64
+SEQLOCK_REGION_SIZE = _SIDE_OFFSET + _SEQLOCK_SIDE_CAPACITY
+
+_DEFAULTS = {"d": 0.0, "q": 0, "?": False, "32s": b""}
+
+
+def _build_hot_tree() -> Dict[str, Any]:
+    """Nested dict mirroring _HOT_FIELDS paths, leaves are field indices."""
+    tree: Dict[str, Any] = {}
+    for idx, (path, _) in enumerate(_HOT_FIELDS):
+        node = tree
+        for part in path[:-1]:
+            node = node.setdefault(part, {})
+        node[path[-1]] = idx
+    return tree
+
+
+_HOT_TREE = _build_hot_tree()
+
+
+def _fits(code: str, value: Any) -> bool:
+    """Whether a value can be packed losslessly into a hot field of this type."""
+    if code == "d":
+        return type(value) is float
+    if code == "q":
+        return type(value) is int and -(1 << 63) <= value < (1 << 63)
+    if code == "?":
+        return type(value) is bool
+    return isinstance(value, str) and "\0" not in value and len(value.encode()) <= 32
+
+
+def _split_hot(node: Dict[str, Any], tree: Dict[str, Any], values: List[Any],
+               state: List[int]) -> Dict[str, Any]:
+    """Move packable leaves of `node` into `values`; return the remainder.
+
+    state is [present_mask, none_mask]. Containers on hot paths are always
+    kept in the remainder (possibly empty) so the reader knows they existed.
+    """
+    side = {}
+    for key, value in node.items():
+        sub = tree.get(key)
+        if sub is None:
+            side[key] = value
+        elif isinstance(sub, dict):
+            side[key] = _split_hot(value, sub, values, state) if isinstance(value, dict) else value
+        elif value is None:
+            state[0] |= 1 << sub
+            state[1] |= 1 << sub
+        elif _fits(_HOT_FIELDS[sub][1], value):
+            state[0] |= 1 << sub
+            values[sub] = value.encode() if isinstance(value, str) else value
+        else:
+            side[key] = value  # unexpected type: carry it losslessly in JSON
+    return side
+
+
+def _merge_hot(side: Dict[str, Any], tree: Dict[str, Any], values: Tuple[Any, ...],
+               present: int, none: int) -> Dict[str, Any]:
+    """Rebuild a payload dict from the side-slot and unpacked hot values.
+
+    Only containers on hot paths are copied; everything else is shared with
+    the cached side-slot dict.
+    """
+    out = dict(side)
+    for key, sub in tree.items():
+        if isinstance(sub, dict):
+            if isinstance(out.get(key), dict):
+                out[key] = _merge_hot(out[key], sub, values, present, none)
+        elif present >> sub & 1:
+            if none >> sub & 1:
+                out[key] = None
+            else:
+                value = values[sub]
+                out[key] = value.rstrip(b"\0").decode() if isinstance(value, bytes) else value
+    return out
+
+
+class _InotifyWatcher:
+    """Wakes an asyncio waiter when the SHM directory sees a rename/delete.
+
+    Linux only (ctypes -> libc inotify). Events are not filtered by name:
+    any wakeup just triggers a cheap generation re-check by the caller.
+    """
+
+    IN_MOVED_TO = 0x00000080
+    IN_DELETE = 0x00000200
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = 0o2000000
+
+    def __init__(self, directory: Path):
+        libc_name = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = libc.inotify_add_watch(fd, str(directory).encode(), self.IN_MOVED_TO | self.IN_DELETE)
+        if wd < 0:
+            os.close(fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.fd = fd
+
+    def _drain(self):
+        try:
+            while os.read(self.fd, 4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    async def wait(self, timeout: float) -> None:
+        """Return after the next directory event or when timeout expires."""
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        loop.add_reader(self.fd, event.set)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            loop.remove_reader(self.fd)
+            self._drain()
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
 class SharedMemoryClient:
     """
     Client for reading/writing anima state to shared memory.
@@ -33,13 +265,37 @@ class SharedMemoryClient:
 
         Args:
             mode: "read" or "write"
-            backend: "file" (kept for API compatibility)
-            filepath: Path to shared memory file
+            backend: "file" or "seqlock" (anything else falls back to "file")
+            filepath: Path to shared memory file. The seqlock backend uses the
+                same path with a ".seq" suffix.
         """
         self.mode = mode
         self.filepath = filepath
-        self.backend = "file"
+        self.backend = backend if backend in _BACKENDS else "file"
+        self.region_path = filepath.with_suffix(".seq")
         self._ensure_file_dir()
+
+        # Seqlock state
+        self._fd: Optional[int] = None
+        self._mm: Optional[mmap.mmap] = None
+        self._ino: Optional[int] = None
+        self._next_remap_check = 0.0
+        self._seq = 0
+        self._side_version = 0
+        self._side_bytes: Optional[bytes] = None
+        self._side_data: Dict[str, Any] = {}
+        self._last_data: Optional[Dict[str, Any]] = None
+
+        # Change tracking (both backends)
+        self._generation = 0
+        self._gen_key: Any = None
+        self._file_key: Any = None
+        self._watcher: Optional[_InotifyWatcher] = None
+        self._watcher_failed = False
+
+        if self.backend == "seqlock" and mode == "write":
+            self._open_region()
+
         print(f"[SharedMemory] Initialized with backend: {self.backend}", file=sys.stderr, flush=True)
 
     def _ensure_file_dir(self):
@@ -51,6 +307,9 @@ class SharedMemoryClient:
         if self.mode != "write":
             raise PermissionError("Client initialized in read-only mode")
 
+        if self.backend == "seqlock":
+            return self._write_seqlock(data)
+
         envelope = {
             "updated_at": datetime.now().isoformat(),
             "pid": os.getpid(),
@@ -81,7 +340,13 @@ class SharedMemoryClient:
             return False
 
     def read(self) -> Optional[Dict[str, Any]]:
-        """Read data from shared memory (non-blocking, safe for concurrent access)."""
+        """Read data from shared memory (non-blocking, safe for concurrent access).
+
+        With the seqlock backend the same dict object is returned until the
+        writer publishes again, so callers must treat it as read-only.
+        """
+        if self.backend == "seqlock":
+            return self._read_seqlock()
         return self._read_file()
 
     def _read_file(self, retries: int = 3) -> Optional[Dict[str, Any]]:
@@ -92,8 +357,11 @@ class SharedMemoryClient:
 
         for attempt in range(retries):
             try:
-                if not self.filepath.exists():
+                key = self._file_change_key()
+                if key is None:
                     return None
+                if key == self._file_key:
+                    return self._last_data  # Unchanged since last parse
 
                 # Use "a" mode to avoid truncation race when multiple processes open lock file
                 # Try non-blocking lock first (LOCK_SH | LOCK_NB)
@@ -113,7 +381,9 @@ class SharedMemoryClient:
                     try:
                         with open(self.filepath, "r") as f:
                             envelope = json.load(f)
-                        return envelope.get("data")
+                        data = envelope.get("data")
+                        self._file_key, self._last_data = key, data
+                        return data
                     finally:
                         fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
 
@@ -135,9 +405,245 @@ class SharedMemoryClient:
             print(f"[SharedMemory] File read error after {error_count} attempts: {last_error}", file=sys.stderr, flush=True)
         return None
 
+    # ============================================================
+    # Change tracking
+    # ============================================================
+
+    def _file_change_key(self) -> Optional[tuple]:
+        """Identity of the current JSON file (a new inode on every rename)."""
+        try:
+            st = os.stat(self.filepath)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _change_key(self) -> Any:
+        """Cheap token that changes whenever the writer publishes."""
+        if self.backend == "seqlock":
+            if self._mm is None or self._region_replaced():
+                if not self._open_region():
+                    return None
+                self._seq = 0
+                self._side_version = 0
+                self._last_data = None
+            return _SEQ.unpack_from(self._mm, _SEQ_OFFSET)[0]
+        return self._file_change_key()
+
+    @property
+    def generation(self) -> int:
+        """Monotonically increasing count of writer publishes seen by this client.
+
+        Does not decode anything; compare against a remembered value to tell
+        whether read() would return new data.
+        """
+        key = self._change_key()
+        if key != self._gen_key:
+            self._gen_key = key
+            self._generation += 1
+        return self._generation
+
+    def _get_watcher(self) -> Optional[_InotifyWatcher]:
+        """inotify watcher for the file backend, or None to poll."""
+        if self.backend != "file" or self._watcher_failed:
+            return None
+        if self._watcher is None:
+            try:
+                self._watcher = _InotifyWatcher(self.filepath.parent)
+            except (OSError, AttributeError) as e:
+                self._watcher_failed = True
+                print(f"[SharedMemory] inotify unavailable, polling for updates: {e}", file=sys.stderr, flush=True)
+                return None
+        return self._watcher
+
+    async def wait_for_update(self, timeout: float) -> bool:
+        """Wait until the writer publishes a new generation.
+
+        Returns True as soon as generation advances past its value at call
+        time, False if timeout (seconds) expires first.
+        """
+        start = self.generation
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            watcher = self._get_watcher()
+            if watcher is not None:
+                # Also re-check periodically in case an event was coalesced away
+                await watcher.wait(min(remaining, 1.0))
+            else:
+                await asyncio.sleep(min(remaining, _UPDATE_POLL_SECONDS))
+            if self.generation != start:
+                return True
+
+    def close(self):
+        """Release the mapping and any change watcher."""
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+        self._close_region()
+
+    # ============================================================
+    # Seqlock backend
+    # ============================================================
+
+    def _open_region(self) -> bool:
+        """Map the seqlock region. Writers create/initialize it; readers only attach."""
+        self._close_region()
+        try:
+            if self.mode == "write":
+                fd = os.open(self.region_path, os.O_RDWR | os.O_CREAT, 0o644)
+                if os.fstat(fd).st_size != SEQLOCK_REGION_SIZE:
+                    os.ftruncate(fd, SEQLOCK_REGION_SIZE)
+                mm = mmap.mmap(fd, SEQLOCK_REGION_SIZE)
+            else:
+                fd = os.open(self.region_path, os.O_RDONLY)
+                if os.fstat(fd).st_size < SEQLOCK_REGION_SIZE:
+                    os.close(fd)
+                    return False
+                mm = mmap.mmap(fd, SEQLOCK_REGION_SIZE, access=mmap.ACCESS_READ)
+        except OSError as e:
+            if self.mode == "write":
+                print(f"[SharedMemory] Seqlock region open error: {e}", file=sys.stderr, flush=True)
+            return False
+
+        self._fd, self._mm = fd, mm
+        self._ino = os.fstat(fd).st_ino
+        self._next_remap_check = time.monotonic() + _SEQLOCK_REMAP_CHECK_SECONDS
+
+        if self.mode == "write":
+            magic, layout, _, seq, _, _, _, side_version = _HEADER.unpack_from(mm, 0)
+            if magic == _SEQLOCK_MAGIC and layout == _SEQLOCK_LAYOUT_VERSION:
+                # Continue the previous writer's sequence so attached readers
+                # see a change; an odd seq means it died mid-write.
+                self._seq = seq + 1 if seq & 1 else seq
+                self._side_version = side_version
+            else:
+                self._seq = 0
+                self._side_version = 0
+                _HEADER.pack_into(mm, 0, _SEQLOCK_MAGIC, _SEQLOCK_LAYOUT_VERSION, 0, 0, 0.0, 0, 0, 0)
+            self._side_bytes = None
+        return True
+
+    def _close_region(self):
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except (BufferError, ValueError):
+                pass
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+        self._fd = self._mm = self._ino = None
+
+    def _region_replaced(self) -> bool:
+        """Throttled check whether the region file was recreated under us."""
+        now = time.monotonic()
+        if now < self._next_remap_check:
+            return False
+        self._next_remap_check = now + _SEQLOCK_REMAP_CHECK_SECONDS
+        try:
+            return os.stat(self.region_path).st_ino != self._ino
+        except OSError:
+            return True
+
+    def _publish(self, flags: int, values: List[Any], state: List[int],
+                 side_bytes: Optional[bytes]) -> None:
+        """Write one record under the sequence lock (single writer)."""
+        mm = self._mm
+        _SEQ.pack_into(mm, _SEQ_OFFSET, self._seq + 1)  # odd: write in progress
+        if flags & _SEQLOCK_FLAG_HAS_DATA:
+            _HOT.pack_into(mm, _HOT_OFFSET,
+                           state[0].to_bytes(_MASK_BYTES, "little"),
+                           state[1].to_bytes(_MASK_BYTES, "little"),
+                           *values)
+        if side_bytes is not None and side_bytes != self._side_bytes:
+            mm[_SIDE_OFFSET:_SIDE_OFFSET + len(side_bytes)] = side_bytes
+            self._side_bytes = side_bytes
+            self._side_version += 1
+        side_len = len(self._side_bytes) if self._side_bytes is not None else 0
+        self._seq += 2
+        _HEADER.pack_into(mm, 0, _SEQLOCK_MAGIC, _SEQLOCK_LAYOUT_VERSION, flags,
+                          self._seq - 1, time.time(), os.getpid(), side_len, self._side_version)
+        _SEQ.pack_into(mm, _SEQ_OFFSET, self._seq)  # even: record complete
+
+    def _write_seqlock(self, data: Dict[str, Any]) -> bool:
+        """Pack hot fields, rewrite the side-slot only if it changed."""
+        try:
+            if self._mm is None and not self._open_region():
+                return False
+            values = [_DEFAULTS[code] for _, code in _HOT_FIELDS]
+            state = [0, 0]
+            side = _split_hot(data, _HOT_TREE, values, state)
+            side_bytes = json.dumps(side, separators=(",", ":")).encode()
+            if len(side_bytes) > _SEQLOCK_SIDE_CAPACITY:
+                print(f"[SharedMemory] Seqlock side-slot overflow: {len(side_bytes)} bytes "
+                      f"(capacity {_SEQLOCK_SIDE_CAPACITY})", file=sys.stderr, flush=True)
+                return False
+            self._publish(_SEQLOCK_FLAG_HAS_DATA, values, state, side_bytes)
+            return True
+        except Exception as e:
+            print(f"[SharedMemory] Seqlock write error: {e}", file=sys.stderr, flush=True)
+            return False
+
+    def _read_seqlock(self) -> Optional[Dict[str, Any]]:
+        """Lock-free read. Returns the cached dict when nothing was published."""
+        if self._mm is None or self._region_replaced():
+            if not self._open_region():
+                return None
+            self._seq = 0
+            self._side_version = 0
+            self._last_data = None
+        mm = self._mm
+
+        for _ in range(_SEQLOCK_READ_ATTEMPTS):
+            seq = _SEQ.unpack_from(mm, _SEQ_OFFSET)[0]
+            if seq & 1:
+                continue
+            if seq == self._seq and seq:
+                return self._last_data
+
+            magic, layout, flags, _, _, _, side_len, side_version = _HEADER.unpack_from(mm, 0)
+            hot = _HOT.unpack_from(mm, _HOT_OFFSET)
+            side_bytes = None
+            if side_version != self._side_version and side_len <= _SEQLOCK_SIDE_CAPACITY:
+                side_bytes = mm[_SIDE_OFFSET:_SIDE_OFFSET + side_len]
+            if _SEQ.unpack_from(mm, _SEQ_OFFSET)[0] != seq:
+                continue  # writer raced us, retry
+
+            if magic != _SEQLOCK_MAGIC or layout != _SEQLOCK_LAYOUT_VERSION:
+                return None
+            if not flags & _SEQLOCK_FLAG_HAS_DATA:
+                data = None
+            else:
+                if side_bytes is not None:
+                    try:
+                        self._side_data = json.loads(side_bytes) if side_bytes else {}
+                    except json.JSONDecodeError as e:
+                        print(f"[SharedMemory] Seqlock side-slot decode error: {e}", file=sys.stderr, flush=True)
+                        return None
+                    self._side_version = side_version
+                present = int.from_bytes(hot[0], "little")
+                none = int.from_bytes(hot[1], "little")
+                data = _merge_hot(self._side_data, _HOT_TREE, hot[2:], present, none)
+            self._seq = seq
+            self._last_data = data
+            return data
+
+        # Writer kept racing us; last consistent snapshot is still valid
+        return self._last_data
+
     def clear(self):
         """Clear shared memory."""
         if self.mode == "write":
+            if self.backend == "seqlock":
+                # Keep the region (readers stay attached), just mark it empty
+                if self._mm is not None:
+                    self._publish(0, [], [0, 0], None)
+                return
             if self.filepath.exists():
                 try:
                     self.filepath.unlink()
@@ -63,7 +63,7 @@ from .display.face import derive_face_state, face_to_ascii, EyeState
 # NOTE: LEDs are handled by MCP server, not broker (prevents I2C conflicts)
 from .identity import IdentityStore
 from .unitares_bridge import UnitaresBridge
-from .shared_memory import SharedMemoryClient
+from .shared_memory import SharedMemoryClient, SHM_BACKEND
 from .eisv_mapper import anima_to_eisv
 from .metacognition import get_metacognitive_monitor
 
@@ -319,13 +319,16 @@ def run_creature():
     bridge = UnitaresBridge(unitares_url=unitares_url) if unitares_url else None
     
     # Initialize Shared Memory (Broker Mode)
-    # Using file backend for maximum stability (Redis caused hangs)
+    # File backend by default for maximum stability (Redis caused hangs);
+    # ANIMA_SHM_BACKEND=seqlock selects the lock-free mmap region
     try:
-        shm_client = SharedMemoryClient(mode="write", backend="file")
+        shm_client = SharedMemoryClient(mode="write", backend=SHM_BACKEND)
         shm_client.clear()  # Remove stale/corrupted data from previous run
         print(f"[StableCreature] Shared Memory active using backend: {shm_client.backend}")
         if shm_client.backend == "file":
             print(f"[StableCreature] File path: {shm_client.filepath}")
+        else:
+            print(f"[StableCreature] Region path: {shm_client.region_path}")
     except Exception as e:
         print(f"[StableCreature] CRITICAL: Shared memory initialization failed: {e}")
         print("[StableCreature] Exiting to prevent restart loop.")
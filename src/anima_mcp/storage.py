@@ -0,0 +1,361 @@
+"""
+Storage - shared SQLite access for anima.db.
+
+Many components persist to the same anima.db. When each opens its own
+handle and commits per write, broker and server contend for the write
+lock ("database is locked") and every small write costs an fsync on the
+SD card.
+
+This module provides:
+- connect(): one place for connection setup (WAL, busy_timeout, synchronous)
+- StorageWriter: a single writer thread per database that owns the write
+  connection, drains a queue of write operations and group-commits them
+  every commit_interval_ms (or once max_batch operations are waiting)
+- read_connection(): read-only connections pooled per thread
+
+Writes submitted here are durable after the next group commit, not when
+submit() returns. Code that reads back its own writes calls flush(db_path)
+first.
+"""
+
+import atexit
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+DEFAULT_COMMIT_INTERVAL_MS = 200
+DEFAULT_MAX_BATCH = 256
+DEFAULT_IDLE_TIMEOUT = 30.0  # Writer thread exits (and closes its connection) after this long idle
+
+PathLike = Union[str, Path]
+
+
+def connect(db_path: PathLike, timeout: float = 5.0, busy_timeout_ms: int = 5000,
+            check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open a connection with the settings every anima.db handle should use."""
+    conn = sqlite3.connect(str(db_path), timeout=timeout, check_same_thread=check_same_thread)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+    # WAL + NORMAL is durable across application crashes; only power loss can
+    # drop the last group commit, which the write-behind design accepts anyway.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _key(db_path: PathLike) -> str:
+    return str(Path(db_path).resolve())
+
+
+# ---------------------------------------------------------------------------
+# Single writer
+# ---------------------------------------------------------------------------
+
+_FLUSH = object()
+
+
+class StorageWriter:
+    """Single writer thread for one database file.
+
+    Operations are either SQL statements (submit/submit_many) or callables
+    taking the write connection (call). Each operation runs inside its own
+    savepoint, so a failing operation is rolled back and reported without
+    discarding the rest of the batch.
+    """
+
+    def __init__(self, db_path: PathLike,
+                 commit_interval_ms: int = DEFAULT_COMMIT_INTERVAL_MS,
+                 max_batch: int = DEFAULT_MAX_BATCH,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.db_path = Path(db_path)
+        self.commit_interval = commit_interval_ms / 1000.0
+        self.max_batch = max_batch
+        self.idle_timeout = idle_timeout
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        # Stats
+        self.ops_written = 0
+        self.commits = 0
+        self.errors = 0
+
+    # -- submission -------------------------------------------------------
+
+    def submit(self, sql: str, params: Sequence[Any] = ()) -> None:
+        """Queue a single statement. Fire-and-forget."""
+        self._put(("sql", sql, tuple(params), None))
+
+    def submit_many(self, sql: str, rows: Iterable[Sequence[Any]]) -> None:
+        """Queue an executemany. Fire-and-forget."""
+        self._put(("many", sql, [tuple(r) for r in rows], None))
+
+    def call(self, fn: Callable[[sqlite3.Connection], Any]) -> Future:
+        """Run fn(conn) on the writer thread; the Future resolves after commit."""
+        future: Future = Future()
+        self._put(("call", fn, None, future))
+        return future
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Block until everything queued so far is committed."""
+        if self._queue.unfinished_tasks == 0:
+            return True
+        done = threading.Event()
+        self._put((_FLUSH, done, None, None))
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Flush and stop the writer thread."""
+        self.flush(timeout)
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+            if thread is not None:
+                self._queue.put(None)
+        if thread is not None:
+            thread.join(timeout)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "db_path": str(self.db_path),
+            "running": self._thread is not None,
+            "pending": self.pending,
+            "ops_written": self.ops_written,
+            "commits": self.commits,
+            "ops_per_commit": round(self.ops_written / self.commits, 2) if self.commits else 0.0,
+            "errors": self.errors,
+        }
+
+    def _put(self, item: Tuple) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"StorageWriter for {self.db_path} is closed")
+            self._queue.put(item)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"storage-writer:{self.db_path.name}", daemon=True
+                )
+                self._thread.start()
+
+    # -- writer thread ----------------------------------------------------
+
+    def _run(self) -> None:
+        conn: Optional[sqlite3.Connection] = None
+        try:
+            conn = connect(self.db_path, timeout=10.0, busy_timeout_ms=10000)
+            conn.isolation_level = None  # explicit BEGIN/COMMIT below
+            while True:
+                try:
+                    first = self._queue.get(timeout=self.idle_timeout)
+                except queue.Empty:
+                    with self._lock:
+                        if self._queue.empty():
+                            self._thread = None
+                            return
+                    continue
+                if first is None:
+                    self._queue.task_done()
+                    return
+
+                batch = [first]
+                deadline = time.monotonic() + self.commit_interval
+                while len(batch) < self.max_batch and batch[-1] is not None and batch[-1][0] is not _FLUSH:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+
+                stop = batch[-1] is None
+                try:
+                    self._write_batch(conn, [b for b in batch if b is not None])
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if stop:
+                    return
+        except Exception as e:
+            print(f"[Storage] Writer for {self.db_path} failed: {e}", file=sys.stderr, flush=True)
+            self._fail_pending(e)
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: list) -> None:
+        results = []
+        flushes = []
+        written = 0
+        if all(item[0] is _FLUSH for item in batch):
+            for _, done, _, _ in batch:
+                done.set()
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for kind, a, b, future in batch:
+                if kind is _FLUSH:
+                    flushes.append(a)
+                    continue
+                conn.execute("SAVEPOINT op")
+                try:
+                    if kind == "sql":
+                        result = conn.execute(a, b).rowcount
+                    elif kind == "many":
+                        result = conn.executemany(a, b).rowcount
+                    else:
+                        result = a(conn)
+                    conn.execute("RELEASE op")
+                    written += 1
+                    if future is not None:
+                        results.append((future, result, None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    self.errors += 1
+                    if future is not None:
+                        results.append((future, None, e))
+                    else:
+                        print(f"[Storage] Write failed ({self.db_path.name}): {e}", file=sys.stderr, flush=True)
+            conn.execute("COMMIT")
+        except Exception as e:
+            try:
+                conn.execute("ROLLBACK")
+            except Exception:
+                pass
+            self.errors += 1
+            print(f"[Storage] Group commit failed ({self.db_path.name}): {e}", file=sys.stderr, flush=True)
+            for kind, _, _, future in batch:
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            for done in flushes:
+                done.set()
+            return
+
+        self.ops_written += written
+        if written:
+            self.commits += 1
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        for done in flushes:
+            done.set()
+
+    def _fail_pending(self, error: Exception) -> None:
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._queue.task_done()
+            if item is None:
+                continue
+            kind, a, _, future = item
+            if kind is _FLUSH:
+                a.set()
+            elif future is not None and not future.done():
+                future.set_exception(error)
+
+
+_writers: Dict[str, StorageWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(db_path: PathLike) -> StorageWriter:
+    """Shared writer for db_path (one per resolved path per process)."""
+    key = _key(db_path)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = StorageWriter(db_path)
+            _writers[key] = writer
+        return writer
+
+
+def flush(db_path: PathLike, timeout: Optional[float] = 10.0) -> bool:
+    """Wait for queued writes to db_path to commit (no-op if nothing was queued)."""
+    with _writers_lock:
+        writer = _writers.get(_key(db_path))
+    return writer.flush(timeout) if writer is not None else True
+
+
+def close_all(timeout: Optional[float] = 10.0) -> None:
+    """Flush and stop every writer, and close this thread's read connections."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        try:
+            writer.close(timeout)
+        except Exception as e:
+            print(f"[Storage] Close failed for {writer.db_path}: {e}", file=sys.stderr, flush=True)
+    close_read_connections()
+
+
+def get_storage_stats() -> Dict[str, Any]:
+    """Per-database writer stats (for diagnostics)."""
+    with _writers_lock:
+        writers = list(_writers.values())
+    return {str(w.db_path): w.get_stats() for w in writers}
+
+
+atexit.register(close_all)
+
+
+# ---------------------------------------------------------------------------
+# Pooled readers
+# ---------------------------------------------------------------------------
+
+_local = threading.local()
+
+
+def read_connection(db_path: PathLike) -> sqlite3.Connection:
+    """Read-only connection for db_path, reused for the calling thread.
+
+    Raises sqlite3.OperationalError if the database does not exist.
+    Callers must not close the returned connection.
+    """
+    pool = getattr(_local, "readers", None)
+    if pool is None:
+        pool = _local.readers = {}
+    key = _key(db_path)
+    conn = pool.get(key)
+    if conn is None:
+        uri = Path(key).as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=5.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout=5000")
+        pool[key] = conn
+    return conn
+
+
+def close_read_connections() -> None:
+    """Close the calling thread's pooled read connections."""
+    pool = getattr(_local, "readers", None)
+    if not pool:
+        return
+    for conn in pool.values():
+        try:
+            conn.close()
+        except Exception:
+            pass
+    pool.clear()
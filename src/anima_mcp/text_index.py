@@ -0,0 +1,274 @@
+"""
+Text Index - shared tokenizer and a small BM25 inverted index.
+
+Knowledge lookup used to score every stored insight by raw word overlap
+(KnowledgeBase) or by substring hits after re-reading knowledge.json
+(MemoryRetriever), and the message board had its own stopword list for
+its repetition check. All three now tokenize the same way: lowercase,
+punctuation stripped, stopwords and very short words dropped, and a light
+suffix stemmer so "lights", "lighting" and "light" meet on one term.
+
+BM25Index keeps term -> {doc_id: term frequency} posting lists plus
+document lengths, is updated one document at a time, and round-trips
+through a plain dict so owners can persist it next to their documents.
+
+MinHashIndex finds near-duplicate short texts: each document's token set
+gets a MinHash signature, signatures are split into LSH bands, and only
+documents sharing a band (or an exact key) are compared, so a lookup
+costs about the same however many documents are indexed.
+"""
+
+import math
+import random
+import re
+import zlib
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
+
+INDEX_VERSION = 1  # Bump when tokenize() changes so persisted indexes are rebuilt
+
+STOPWORDS = frozenset({
+    "a", "about", "after", "all", "also", "am", "an", "and", "any", "are", "as", "at",
+    "be", "been", "but", "by", "can", "could", "did", "do", "does", "for", "from",
+    "had", "has", "have", "he", "her", "him", "his", "how", "i", "if", "im", "in",
+    "into", "is", "it", "its", "just", "me", "my", "no", "not", "now", "of", "on",
+    "or", "our", "she", "so", "than", "that", "the", "their", "them", "then", "there",
+    "these", "they", "this", "those", "to", "too", "was", "we", "were", "what", "when",
+    "where", "which", "while", "who", "why", "will", "with", "would", "you", "your",
+})
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+# Longest first; (suffix, replacement)
+_SUFFIXES = (
+    ("ingly", ""), ("edly", ""), ("ness", ""), ("ment", ""), ("ies", "y"), ("ied", "y"),
+    ("ing", ""), ("ly", ""), ("ed", ""), ("es", ""), ("s", ""),
+)
+_NO_UNDOUBLE = frozenset("lsz")
+
+
+def stem(word: str) -> str:
+    """Strip common English inflections ("changes", "changed" -> "chang")."""
+    if len(word) <= 3:
+        return word
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == "s" and word.endswith(("ss", "us", "is")):
+                break
+            word = word[:-len(suffix)] + replacement
+            # "dimmed" -> "dimm" -> "dim"
+            if (len(word) > 3 and word[-1] == word[-2]
+                    and word[-1] not in _NO_UNDOUBLE and word[-1] not in "aeiou"):
+                word = word[:-1]
+            break
+    if len(word) > 4 and word.endswith("e"):
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str, stemmed: bool = True) -> List[str]:
+    """Content-word tokens of text, in order (repeats kept for term frequency)."""
+    words = _PUNCTUATION.sub("", text.lower()).split()
+    tokens = [w for w in words if len(w) > 2 and w not in STOPWORDS]
+    if stemmed:
+        tokens = [stem(w) for w in tokens]
+    return tokens
+
+
+def content_words(text: str) -> Set[str]:
+    """Distinct stemmed content words, for set-overlap similarity."""
+    return set(tokenize(text))
+
+
+class BM25Index:
+    """Inverted index with Okapi BM25 ranking over short documents."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._terms: Dict[str, Set[str]] = {}  # doc_id -> its distinct terms, for removal
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._lengths
+
+    def doc_ids(self) -> Set[str]:
+        return set(self._lengths)
+
+    def add(self, doc_id: str, text: str):
+        """Index text under doc_id, replacing any previous version."""
+        if doc_id in self._lengths:
+            self.remove(doc_id)
+        tokens = tokenize(text)
+        for token in tokens:
+            posting = self._postings.setdefault(token, {})
+            posting[doc_id] = posting.get(doc_id, 0) + 1
+        self._lengths[doc_id] = len(tokens)
+        self._terms[doc_id] = set(tokens)
+        self._total_length += len(tokens)
+
+    def remove(self, doc_id: str):
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for token in self._terms.pop(doc_id, ()):
+            posting = self._postings[token]
+            del posting[doc_id]
+            if not posting:
+                del self._postings[token]
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """(doc_id, score) pairs for documents sharing a term with query, best first."""
+        return self.search_terms(tokenize(query), limit)
+
+    def search_terms(self, terms: Iterable[str], limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Like search(), for already tokenized query terms."""
+        n = len(self._lengths)
+        if not n:
+            return []
+        avg_length = self._total_length / n or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(terms):
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            df = len(posting)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for doc_id, tf in posting.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+        return ranked[:limit] if limit is not None else ranked
+
+    def to_dict(self) -> Dict:
+        return {"version": INDEX_VERSION, "postings": self._postings, "lengths": self._lengths}
+
+    @classmethod
+    def from_dict(cls, data: Dict, expected_ids: Optional[Set[str]] = None) -> Optional["BM25Index"]:
+        """Rebuild a persisted index; None if it is stale or from another tokenizer."""
+        try:
+            if data.get("version") != INDEX_VERSION:
+                return None
+            lengths = {str(k): int(v) for k, v in data["lengths"].items()}
+            if expected_ids is not None and set(lengths) != expected_ids:
+                return None
+            index = cls()
+            index._lengths = lengths
+            index._total_length = sum(lengths.values())
+            index._postings = {
+                term: {str(d): int(tf) for d, tf in posting.items()}
+                for term, posting in data["postings"].items()
+            }
+            index._terms = {doc_id: set() for doc_id in lengths}
+            for term, posting in index._postings.items():
+                for doc_id in posting:
+                    index._terms[doc_id].add(term)
+            return index
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return None
+
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+class MinHashIndex:
+    """Near-duplicate lookup over token sets (MinHash signatures + LSH bands).
+
+    With the default 32 bands of 2 rows, a pair at Jaccard 0.35 becomes a
+    candidate ~98% of the time and one at 0.6 essentially always; every
+    candidate is then checked against its exact token set, so there are no
+    false positives. Documents can also carry exact-match keys (normalized
+    text, phrase stems) that make them candidates regardless of overlap.
+    Signatures are deterministic across processes (crc32, fixed seed).
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 32, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+                       for _ in range(num_perm)]
+        self._docs: Dict[str, Tuple[FrozenSet[str], Tuple[Hashable, ...]]] = {}
+        self._buckets: Dict[Hashable, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._docs
+
+    def doc_ids(self) -> Set[str]:
+        return set(self._docs)
+
+    def signature(self, tokens: Iterable[str]) -> Tuple[int, ...]:
+        hashes = [zlib.crc32(t.encode("utf-8")) for t in set(tokens)]
+        if not hashes:
+            return ()
+        return tuple(min((a * h + b) % _MERSENNE_PRIME & _MAX_HASH for h in hashes)
+                     for a, b in self._perms)
+
+    def _bucket_keys(self, tokens: Iterable[str], keys: Iterable[Hashable]) -> Tuple[Hashable, ...]:
+        sig = self.signature(tokens)
+        rows = self.rows
+        bands = tuple((band, sig[band * rows:(band + 1) * rows])
+                      for band in range(self.bands)) if sig else ()
+        return bands + tuple(("key", k) for k in keys)
+
+    def add(self, doc_id: str, tokens: Iterable[str], keys: Iterable[Hashable] = ()):
+        """Index a document's tokens (and exact keys), replacing any previous version."""
+        if doc_id in self._docs:
+            self.remove(doc_id)
+        tokens = frozenset(tokens)
+        buckets = self._bucket_keys(tokens, keys)
+        self._docs[doc_id] = (tokens, buckets)
+        for bucket in buckets:
+            self._buckets.setdefault(bucket, set()).add(doc_id)
+
+    def remove(self, doc_id: str):
+        entry = self._docs.pop(doc_id, None)
+        if entry is None:
+            return
+        for bucket in entry[1]:
+            members = self._buckets.get(bucket)
+            if members is not None:
+                members.discard(doc_id)
+                if not members:
+                    del self._buckets[bucket]
+
+    def tokens(self, doc_id: str) -> FrozenSet[str]:
+        return self._docs[doc_id][0]
+
+    def candidates(self, tokens: Iterable[str], keys: Iterable[Hashable] = ()) -> Set[str]:
+        """Documents sharing at least one band or key with the query."""
+        found: Set[str] = set()
+        for bucket in self._bucket_keys(tokens, keys):
+            found |= self._buckets.get(bucket, set())
+        return found
+
+    def near_duplicates(self, tokens: Iterable[str], threshold: float,
+                        keys: Iterable[Hashable] = ()) -> List[Tuple[str, float]]:
+        """(doc_id, Jaccard) for candidates above threshold or sharing a key, most similar first."""
+        tokens = set(tokens)
+        keys = tuple(keys)
+        key_hits = set()
+        for k in keys:
+            key_hits |= self._buckets.get(("key", k), set())
+        hits = []
+        for doc_id in self.candidates(tokens, keys):
+            similarity = jaccard(tokens, self._docs[doc_id][0])
+            if similarity > threshold or doc_id in key_hits:
+                hits.append((doc_id, similarity))
+        hits.sort(key=lambda kv: kv[1], reverse=True)
+        return hits
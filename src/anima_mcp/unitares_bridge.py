@@ -9,7 +9,9 @@ import asyncio
 import json
 import logging
 import os
-from typing import Optional, Dict, Any, TYPE_CHECKING
+import time
+from collections import deque
+from typing import Optional, Dict, Any, List, Sequence, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .identity.store import CreatureIdentity
@@ -27,6 +29,34 @@ from .sensors.base import SensorReadings
 
 logger = logging.getLogger(__name__)
 
+MAX_CONCURRENT_REQUESTS = 3   # Matches the connector's limit_per_host
+LATENCY_WINDOW = 128          # Recent latencies kept per endpoint
+JSONRPC_INVALID_REQUEST = -32600
+
+
+class _EndpointStats:
+    """Request count, failures, coalesced joins and recent latencies for one endpoint."""
+    __slots__ = ('requests', 'errors', 'coalesced', 'latencies')
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.coalesced = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def as_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        n = len(ordered)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "coalesced": self.coalesced,
+            "mean_ms": round(sum(ordered) / n * 1000, 1) if n else None,
+            "p50_ms": round(ordered[n // 2] * 1000, 1) if n else None,
+            "p95_ms": round(ordered[min(n - 1, int(n * 0.95))] * 1000, 1) if n else None,
+            "max_ms": round(ordered[-1] * 1000, 1) if n else None,
+        }
+
 
 class _AnimaSnapshot:
     """Lightweight snapshot of anima state for delta computation between check-ins."""
@@ -44,6 +74,13 @@ class UnitaresBridge:
     - Fallback local governance if server unavailable
     - Automatic retry and error handling
     - Connection pooling (reuses single aiohttp session)
+    - Request coalescing: identical calls made while one is already in
+      flight (e.g. a server fallback check-in racing the workflow one, or
+      several handlers resolving the same caller) share its response
+    - Bounded concurrency (MAX_CONCURRENT_REQUESTS) and per-endpoint
+      latency metrics (get_stats)
+    - JSON-RPC batching via call_tools(), falling back to concurrent
+      single requests when the server doesn't accept batches
     """
 
     def __init__(
@@ -76,6 +113,12 @@ class UnitaresBridge:
         self._circuit_current_backoff = 15.0
         self._http_session = None  # Reusable aiohttp session
         self._session_timeout = None  # Timeout config for session
+        # Request pipeline (semaphore and in-flight calls belong to one event loop)
+        self._pipeline_loop = None
+        self._request_slots: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._batch_supported: Optional[bool] = None  # None = not tried yet
+        self._endpoint_stats: Dict[str, _EndpointStats] = {}
         # Previous check-in state for computing deltas (ethical_drift, confidence)
         self._prev_anima = None        # Previous Anima snapshot (warmth, clarity, stability, presence)
         self._prev_readings = None     # Previous sensor readings
@@ -147,6 +190,161 @@ class UnitaresBridge:
             return None
         return json.loads(text)
 
+    @staticmethod
+    def _parse_mcp_batch(text: str, content_type: str) -> List[Any]:
+        """Parse a JSON-RPC batch response (JSON array, or SSE data events)."""
+        if "text/event-stream" in content_type:
+            items: List[Any] = []
+            for line in text.split("\n"):
+                if line.startswith("data: "):
+                    try:
+                        data = json.loads(line[6:])
+                    except json.JSONDecodeError:
+                        continue
+                    items.extend(data if isinstance(data, list) else [data])
+            return items
+        data = json.loads(text)
+        return data if isinstance(data, list) else [data]
+
+    def _client_session_id(self) -> str:
+        return f"lumen-{self._agent_id}" if self._agent_id else "lumen-anima"
+
+    def _mcp_headers(self, session_id: Optional[str] = None) -> Dict[str, str]:
+        """Headers for MCP calls, with identity for proper UNITARES binding."""
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json, text/event-stream",  # Required by MCP SSE servers
+            "X-Session-ID": session_id or self._session_id or "anima-creature",
+        }
+        if self._agent_id and session_id is None:
+            headers["X-Agent-Id"] = self._agent_id
+        return headers
+
+    @staticmethod
+    def _tool_request(params: Dict[str, Any], request_id: int = 1) -> Dict[str, Any]:
+        """JSON-RPC tools/call request for params {"name": ..., "arguments": ...}."""
+        return {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "tools/call",
+            "params": params,
+        }
+
+    # -- request pipeline ---------------------------------------------------
+
+    def _pipeline(self) -> asyncio.Semaphore:
+        """Concurrency slots for the running loop (reset if the loop changed)."""
+        loop = asyncio.get_running_loop()
+        if self._pipeline_loop is not loop:
+            self._pipeline_loop = loop
+            self._request_slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+            self._inflight = {}
+        return self._request_slots
+
+    def _stats_for(self, endpoint: str) -> _EndpointStats:
+        stats = self._endpoint_stats.get(endpoint)
+        if stats is None:
+            stats = self._endpoint_stats[endpoint] = _EndpointStats()
+        return stats
+
+    async def _post_mcp(self, payload: Any, headers: Dict[str, str], endpoint: str,
+                        timeout: Optional[float] = None) -> Tuple[int, Any, str]:
+        """POST one MCP request (or batch) through the bounded pipeline.
+
+        Returns (status, body text, content type); latency and failures are
+        recorded under `endpoint`.
+        """
+        import aiohttp
+        stats = self._stats_for(endpoint)
+        kwargs = {"json": payload, "headers": headers}
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+        async with self._pipeline():
+            stats.requests += 1
+            start = time.perf_counter()
+            try:
+                session = await self._get_session()
+                async with session.post(self._get_mcp_url(), **kwargs) as response:
+                    text = await response.text()
+                    status = response.status
+                    content_type = response.headers.get("Content-Type", "")
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                stats.latencies.append(time.perf_counter() - start)
+        if status != 200:
+            stats.errors += 1
+        return status, text, content_type
+
+    async def _coalesce(self, key: Tuple, factory):
+        """Run factory() unless an identical call is in flight; then share its result."""
+        self._pipeline()
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._stats_for(key[0]).coalesced += 1
+            return await asyncio.shield(pending)
+        task = asyncio.ensure_future(factory())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _t, k=key, inflight=self._inflight: (
+            inflight.pop(k, None) if inflight.get(k) is _t else None))
+        return await asyncio.shield(task)
+
+    async def call_tools(self, calls: Sequence[Dict[str, Any]],
+                         headers: Optional[Dict[str, str]] = None) -> List[Optional[Dict[str, Any]]]:
+        """Call several MCP tools ({"name": ..., "arguments": ...} each) in one round trip.
+
+        Sends a JSON-RPC batch. If the server rejects batches (HTTP 400 or an
+        "invalid request" error) it is remembered and the calls go out
+        concurrently instead; other 4xx failures only skip batching for this
+        call. Returns each
+        call's JSON-RPC response (None for a missing/failed one), in order.
+        """
+        headers = headers or self._mcp_headers()
+        if len(calls) > 1 and self._batch_supported is not False:
+            batch = [self._tool_request(params, i + 1) for i, params in enumerate(calls)]
+            endpoint = "batch:" + ",".join(params["name"] for params in calls)
+            status, text, content_type = await self._post_mcp(batch, headers, endpoint)
+            try:
+                items = [r for r in self._parse_mcp_batch(text, content_type) if isinstance(r, dict)]
+            except json.JSONDecodeError:
+                items = []
+            responses = {r.get("id"): r for r in items} if status == 200 else {}
+            if all(i + 1 in responses for i in range(len(calls))):
+                self._batch_supported = True
+                return [responses[i + 1] for i in range(len(calls))]
+            if status >= 500:
+                return [None] * len(calls)
+            # Servers without batch support answer with 400 or a JSON-RPC "invalid request"
+            # error; anything else (auth, rate limit, timeout) only skips batching this round
+            invalid_request = any(isinstance(r.get("error"), dict) and r["error"].get("code") == JSONRPC_INVALID_REQUEST
+                                  for r in items)
+            if status == 400 or invalid_request:
+                logger.info("UNITARES doesn't accept JSON-RPC batches (HTTP %d); sending calls individually", status)
+                self._batch_supported = False
+            else:
+                logger.debug("Batch %s failed (HTTP %d); sending calls individually this time", endpoint, status)
+
+        async def single(params):
+            name = params["name"]
+            try:
+                status, text, content_type = await self._post_mcp(self._tool_request(params), headers, name)
+                return self._parse_mcp_response(text, content_type) if status == 200 else None
+            except Exception as e:
+                logger.debug("%s call failed: %s", name, e)
+                return None
+
+        return list(await asyncio.gather(*(single(params) for params in calls)))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-endpoint request/latency metrics and pipeline state (for diagnostics)."""
+        return {
+            "endpoints": {name: s.as_dict() for name, s in sorted(self._endpoint_stats.items())},
+            "in_flight": len(self._inflight),
+            "batch_supported": self._batch_supported,
+            "max_concurrent_requests": MAX_CONCURRENT_REQUESTS,
+        }
+
     async def close(self):
         """Close the HTTP session. Call when done with bridge."""
         if self._http_session and not self._http_session.closed:
@@ -164,7 +362,6 @@ class UnitaresBridge:
             self._available = False
             return False
 
-        import time
         current_time = time.time()
 
         # Circuit breaker: skip checks while open (backoff handles retry timing)
@@ -187,9 +384,15 @@ class UnitaresBridge:
 
             # Try health check or list_tools endpoint
             health_url = self._url.replace('/sse', '/health') if '/sse' in self._url else f"{self._url}/health"
+            health_stats = self._stats_for("health")
+            health_stats.requests += 1
+            start = time.perf_counter()
             try:
                 import aiohttp
                 async with session.get(health_url, timeout=aiohttp.ClientTimeout(total=self._timeout)) as response:
+                    health_stats.latencies.append(time.perf_counter() - start)
+                    if response.status != 200:
+                        health_stats.errors += 1
                     if response.status == 200:
                         self._available = True
                         self._circuit_failures = 0
@@ -206,7 +409,7 @@ class UnitaresBridge:
                         return False
             except Exception:
                 # Network/timeout errors - will retry later
-                pass
+                health_stats.errors += 1
 
             # If health check fails, try MCP endpoint
             mcp_url = self._get_mcp_url()
@@ -284,6 +487,10 @@ class UnitaresBridge:
         Check in with UNITARES governance.
 
         Maps anima state to EISV metrics and requests governance decision.
+        A call made while an identical check-in (same EISV, sensor and
+        identity payload) is in flight on this bridge returns that check-in's
+        decision instead of sending a second update. First check-ins, which
+        also sync identity, are never coalesced.
 
         Args:
             anima: Anima state
@@ -307,23 +514,83 @@ class UnitaresBridge:
         # Map anima to EISV first (always needed)
         eisv = anima_to_eisv(anima, readings, neural_weight, physical_weight)
 
+        def run():
+            return self._check_in(anima, readings, eisv, identity, is_first_check_in,
+                                  drawing_eisv, experiential_summary)
+
+        if is_first_check_in:
+            return await run()
+        # An identical check-in already in flight (same bridge, same loop) answers this one too
+        sensor_data = self._check_in_sensor_data(anima, readings, eisv, identity,
+                                                 drawing_eisv, experiential_summary)
+        return await self._coalesce(self._check_in_key(sensor_data), run)
+
+    @staticmethod
+    def _check_in_key(sensor_data: Dict[str, Any]) -> Tuple:
+        """Coalescing key for a check-in: its payload, minus identity fields that tick with the clock."""
+        payload = dict(sensor_data)
+        if "identity" in payload:
+            payload["identity"] = {k: v for k, v in payload["identity"].items()
+                                   if k not in ("alive_ratio", "age_seconds")}
+        return ("process_agent_update", json.dumps(payload, sort_keys=True, default=str))
+
+    @staticmethod
+    def _check_in_sensor_data(anima: Anima, readings: SensorReadings, eisv: EISVMetrics,
+                              identity: Optional['CreatureIdentity'] = None,
+                              drawing_eisv: Optional[Dict[str, Any]] = None,
+                              experiential_summary: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """sensor_data payload for process_agent_update."""
+        # Include raw sensors for dashboard visibility
+        sensor_data = {
+            "eisv": eisv.to_dict(),
+            "anima": {
+                "warmth": anima.warmth,
+                "clarity": anima.clarity,
+                "stability": anima.stability,
+                "presence": anima.presence,
+            },
+            "environment": {
+                "cpu_temp_c": getattr(readings, 'cpu_temp_c', None),
+                "ambient_temp_c": getattr(readings, 'ambient_temp_c', None),
+                "humidity_pct": getattr(readings, 'humidity_pct', None),
+                "light_lux": getattr(readings, 'light_lux', None),
+                "cpu_percent": getattr(readings, 'cpu_percent', None),
+                "memory_percent": getattr(readings, 'memory_percent', None),
+            },
+        }
+
+        # Include identity metadata if available
+        if identity:
+            sensor_data["identity"] = {
+                "total_awakenings": identity.total_awakenings if hasattr(identity, 'total_awakenings') else 0,
+                "total_alive_seconds": identity.total_alive_seconds if hasattr(identity, 'total_alive_seconds') else 0.0,
+                "alive_ratio": identity.alive_ratio() if hasattr(identity, 'alive_ratio') else 0.0,
+                "age_seconds": identity.age_seconds() if hasattr(identity, 'age_seconds') else 0.0,
+            }
+
+        # Include DrawingEISV if Lumen is actively drawing
+        if drawing_eisv:
+            sensor_data["drawing_eisv"] = drawing_eisv
+
+        # Include experiential accumulation summary
+        if experiential_summary:
+            sensor_data["experiential"] = experiential_summary
+        return sensor_data
+
+    async def _check_in(self, anima, readings, eisv, identity, is_first_check_in,
+                        drawing_eisv, experiential_summary) -> Dict[str, Any]:
         # Check if UNITARES is available BEFORE trying to sync
         unitares_available = await self.check_availability()
 
-        # Sync identity metadata on first check-in (only if UNITARES is available)
-        if is_first_check_in and identity and unitares_available:
-            logger.info("First check-in - syncing identity for %s", identity.name if hasattr(identity, 'name') else 'unknown')
-            try:
-                await self.sync_identity_metadata(identity)
-            except Exception as e:
-                # Non-fatal - continue with governance check-in
-                logger.warning("Identity sync exception: %s", e)
-
-        # Check if UNITARES is available
         if unitares_available:
+            # Sync identity metadata on first check-in, batched with the update
+            sync_identity = identity if is_first_check_in and identity else None
+            if sync_identity is not None:
+                logger.info("First check-in - syncing identity for %s", identity.name if hasattr(identity, 'name') else 'unknown')
             try:
                 logger.info("Calling UNITARES (agent_id=%s)", self._agent_id[:8] if self._agent_id else 'None')
-                result = await self._call_unitares(anima, readings, eisv, identity=identity, drawing_eisv=drawing_eisv, experiential_summary=experiential_summary)
+                result = await self._call_unitares(anima, readings, eisv, identity=identity, drawing_eisv=drawing_eisv,
+                                                   experiential_summary=experiential_summary, sync_identity=sync_identity)
                 logger.info("UNITARES responded: %s", result.get('source', 'unknown'))
                 self._circuit_failures = 0  # Success resets circuit
                 self._circuit_current_backoff = self._circuit_backoff_base
@@ -331,7 +598,6 @@ class UnitaresBridge:
             except Exception as e:
                 # Fallback to local governance on error
                 logger.warning("UNITARES error, falling back to local: %s", e)
-                import time
                 self._circuit_failures += 1
                 self._maybe_open_circuit(time.time())
                 return self._local_governance(anima, readings, eisv, error=str(e))
@@ -348,48 +614,20 @@ class UnitaresBridge:
         identity: Optional['CreatureIdentity'] = None,
         drawing_eisv: Optional[Dict[str, Any]] = None,
         experiential_summary: Optional[Dict[str, Any]] = None,
+        sync_identity: Optional['CreatureIdentity'] = None,
     ) -> Dict[str, Any]:
-        """Call UNITARES governance via HTTP/SSE."""
+        """Call UNITARES governance via HTTP/SSE.
+
+        With sync_identity, the identity metadata update goes out in the
+        same round trip (see call_tools).
+        """
         try:
             # Prepare MCP request
             complexity = estimate_complexity(anima, readings)
             status_text = generate_status_text(anima, readings, eisv, experiential_summary=experiential_summary)
             
-            # Build sensor_data payload — include raw sensors for dashboard visibility
-            sensor_data = {
-                "eisv": eisv.to_dict(),
-                "anima": {
-                    "warmth": anima.warmth,
-                    "clarity": anima.clarity,
-                    "stability": anima.stability,
-                    "presence": anima.presence,
-                },
-                "environment": {
-                    "cpu_temp_c": getattr(readings, 'cpu_temp_c', None),
-                    "ambient_temp_c": getattr(readings, 'ambient_temp_c', None),
-                    "humidity_pct": getattr(readings, 'humidity_pct', None),
-                    "light_lux": getattr(readings, 'light_lux', None),
-                    "cpu_percent": getattr(readings, 'cpu_percent', None),
-                    "memory_percent": getattr(readings, 'memory_percent', None),
-                },
-            }
-
-            # Include identity metadata if available
-            if identity:
-                sensor_data["identity"] = {
-                    "total_awakenings": identity.total_awakenings if hasattr(identity, 'total_awakenings') else 0,
-                    "total_alive_seconds": identity.total_alive_seconds if hasattr(identity, 'total_alive_seconds') else 0.0,
-                    "alive_ratio": identity.alive_ratio() if hasattr(identity, 'alive_ratio') else 0.0,
-                    "age_seconds": identity.age_seconds() if hasattr(identity, 'age_seconds') else 0.0,
-                }
-
-            # Include DrawingEISV if Lumen is actively drawing
-            if drawing_eisv:
-                sensor_data["drawing_eisv"] = drawing_eisv
-
-            # Include experiential accumulation summary
-            if experiential_summary:
-                sensor_data["experiential"] = experiential_summary
+            sensor_data = self._check_in_sensor_data(anima, readings, eisv, identity,
+                                                     drawing_eisv, experiential_summary)
 
             # Compute ethical drift from state changes between check-ins
             ethical_drift = compute_ethical_drift(
@@ -408,7 +646,7 @@ class UnitaresBridge:
             # client_session_id is the #1 priority for identity resolution in UNITARES,
             # ensuring stable binding across service restarts regardless of HTTP fingerprint
             update_arguments = {
-                "client_session_id": f"lumen-{self._agent_id}" if self._agent_id else "lumen-anima",
+                "client_session_id": self._client_session_id(),
                 "agent_name": "Lumen",  # Enables name-claim identity recovery after session key change
                 "complexity": complexity,
                 "confidence": confidence,
@@ -445,96 +683,30 @@ class UnitaresBridge:
                 # Non-blocking - trajectory is optional enhancement
                 logger.debug("Trajectory not available: %s", e)
 
-            # MCP JSON-RPC request
-            mcp_request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "tools/call",
-                "params": {
-                    "name": "process_agent_update",
-                    "arguments": update_arguments
-                }
-            }
-            
-            # Determine endpoint URL
-            mcp_url = self._get_mcp_url()
-            
-            # Build headers with identity for proper UNITARES binding
-            headers = {
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream",  # Required by MCP SSE servers
-                "X-Session-ID": self._session_id or "anima-creature"
-            }
-            # Add agent ID header if set (for proper identity binding in UNITARES)
-            if self._agent_id:
-                headers["X-Agent-Id"] = self._agent_id
-
-            # Use shared session for connection pooling
-            session = await self._get_session()
-            async with session.post(
-                mcp_url,
-                json=mcp_request,
-                headers=headers
-            ) as response:
-                if response.status == 200:
-                    # Handle SSE or JSON response format
-                    content_type = response.headers.get("Content-Type", "")
-                    text = await response.text()
-                    result = self._parse_mcp_response(text, content_type)
-                    if not result:
-                        raise Exception("No valid JSON data in SSE response")
-
-                    # Parse MCP response
-                    if "result" in result:
-                        governance_result = result["result"]
-
-                        # Check MCP-level error flag (tool returned isError)
-                        if governance_result.get("isError"):
-                            error_text = "unknown error"
-                            if "content" in governance_result and governance_result["content"]:
-                                c = governance_result["content"][0]
-                                error_text = c.get("text", error_text)
-                            raise Exception(f"UNITARES rejected check-in: {error_text}")
-
-                        # MCP wraps tool results in content[0]["text"] as JSON string
-                        if "content" in governance_result and governance_result["content"]:
-                            content = governance_result["content"][0]
-                            if content.get("type") == "text" and content.get("text"):
-                                try:
-                                    governance_result = json.loads(content["text"])
-                                except json.JSONDecodeError:
-                                    pass  # Keep original if not JSON
-
-                        # Check application-level error (success: false)
-                        if governance_result.get("success") is False:
-                            error_code = governance_result.get("error_code", "UNKNOWN")
-                            error_msg = governance_result.get("error") or governance_result.get("reason") or "update rejected"
-                            logger.warning("UNITARES check-in rejected: code=%s msg=%s", error_code, error_msg)
-                            raise Exception(f"UNITARES check-in failed [{error_code}]: {error_msg}")
-
-                        logger.debug("Response keys: %s", list(governance_result.keys()))
-                        # Log agent binding info from UNITARES
-                        bound_id = governance_result.get("resolved_agent_id") or governance_result.get("agent_signature", {}).get("agent_id") or governance_result.get("agent_signature", {}).get("uuid")
-                        logger.debug("Bound to agent: %s", bound_id[:8] if bound_id else 'not specified')
-
-                        # Extract action and margin from UNITARES response
-                        # UNITARES returns: {"action": "proceed", "margin": "comfortable", ...}
-                        return {
-                            "action": governance_result.get("action", "proceed"),
-                            "margin": governance_result.get("margin", "comfortable"),
-                            "reason": governance_result.get("reason", "Governance check completed"),
-                            "eisv": eisv.to_dict(),
-                            "source": "unitares",
-                            "unitares_agent_id": bound_id,  # For display identification
-                            "raw_response": governance_result
-                        }
-                    elif "error" in result:
-                        raise Exception(f"MCP error: {result['error']}")
-                else:
+            headers = self._mcp_headers()
+            if sync_identity is not None:
+                metadata_result, result = await self.call_tools(
+                    [{"name": "update_agent_metadata", "arguments": self._identity_metadata_arguments(sync_identity)},
+                     {"name": "process_agent_update", "arguments": update_arguments}],
+                    headers,
+                )
+                self._log_identity_sync(metadata_result, sync_identity)
+                if result is None:
+                    raise Exception("No response to process_agent_update")
+            else:
+                status, text, content_type = await self._post_mcp(
+                    self._tool_request({"name": "process_agent_update", "arguments": update_arguments}),
+                    headers, "process_agent_update",
+                )
+                if status != 200:
                     # HTTP error - fallback to local
-                    error_text = await response.text()
-                    raise Exception(f"HTTP {response.status}: {error_text}")
-                        
+                    raise Exception(f"HTTP {status}: {text}")
+                # Handle SSE or JSON response format
+                result = self._parse_mcp_response(text, content_type)
+                if not result:
+                    raise Exception("No valid JSON data in SSE response")
+            return self._governance_decision(result, eisv)
+
         except ImportError:
             # aiohttp not available
             raise Exception("aiohttp not installed - cannot connect to UNITARES")
@@ -542,7 +714,57 @@ class UnitaresBridge:
             raise Exception("Timeout connecting to UNITARES server")
         except Exception as e:
             raise Exception(f"Error calling UNITARES: {e}")
-    
+
+    @staticmethod
+    def _governance_decision(result: Dict[str, Any], eisv: EISVMetrics) -> Optional[Dict[str, Any]]:
+        """Map a process_agent_update JSON-RPC response to a governance decision."""
+        if "result" in result:
+            governance_result = result["result"]
+
+            # Check MCP-level error flag (tool returned isError)
+            if governance_result.get("isError"):
+                error_text = "unknown error"
+                if "content" in governance_result and governance_result["content"]:
+                    c = governance_result["content"][0]
+                    error_text = c.get("text", error_text)
+                raise Exception(f"UNITARES rejected check-in: {error_text}")
+
+            # MCP wraps tool results in content[0]["text"] as JSON string
+            if "content" in governance_result and governance_result["content"]:
+                content = governance_result["content"][0]
+                if content.get("type") == "text" and content.get("text"):
+                    try:
+                        governance_result = json.loads(content["text"])
+                    except json.JSONDecodeError:
+                        pass  # Keep original if not JSON
+
+            # Check application-level error (success: false)
+            if governance_result.get("success") is False:
+                error_code = governance_result.get("error_code", "UNKNOWN")
+                error_msg = governance_result.get("error") or governance_result.get("reason") or "update rejected"
+                logger.warning("UNITARES check-in rejected: code=%s msg=%s", error_code, error_msg)
+                raise Exception(f"UNITARES check-in failed [{error_code}]: {error_msg}")
+
+            logger.debug("Response keys: %s", list(governance_result.keys()))
+            # Log agent binding info from UNITARES
+            bound_id = governance_result.get("resolved_agent_id") or governance_result.get("agent_signature", {}).get("agent_id") or governance_result.get("agent_signature", {}).get("uuid")
+            logger.debug("Bound to agent: %s", bound_id[:8] if bound_id else 'not specified')
+
+            # Extract action and margin from UNITARES response
+            # UNITARES returns: {"action": "proceed", "margin": "comfortable", ...}
+            return {
+                "action": governance_result.get("action", "proceed"),
+                "margin": governance_result.get("margin", "comfortable"),
+                "reason": governance_result.get("reason", "Governance check completed"),
+                "eisv": eisv.to_dict(),
+                "source": "unitares",
+                "unitares_agent_id": bound_id,  # For display identification
+                "raw_response": governance_result
+            }
+        elif "error" in result:
+            raise Exception(f"MCP error: {result['error']}")
+        return None
+
     def _local_governance(
         self,
         anima: Anima,
@@ -640,48 +862,28 @@ class UnitaresBridge:
         if not sid:
             return None
 
-        try:
-            import aiohttp
-            mcp_request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "tools/call",
-                "params": {
-                    "name": "identity",
-                    "arguments": {}
-                }
-            }
+        return await self._coalesce(("identity", sid), lambda: self._resolve_caller_identity(sid))
 
-            mcp_url = self._get_mcp_url()
-            headers = {
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream",
-                "X-Session-ID": sid,
-            }
-
-            session = await self._get_session()
-            async with session.post(
-                mcp_url,
-                json=mcp_request,
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=2.0),
-            ) as response:
-                if response.status != 200:
-                    return None
-                content_type = response.headers.get("Content-Type", "")
-                text = await response.text()
-                result = self._parse_mcp_response(text, content_type)
-                if not result or "result" not in result:
+    async def _resolve_caller_identity(self, sid: str) -> Optional[str]:
+        try:
+            status, text, content_type = await self._post_mcp(
+                self._tool_request({"name": "identity", "arguments": {}}), self._mcp_headers(session_id=sid),
+                "identity", timeout=2.0,
+            )
+            if status != 200:
+                return None
+            result = self._parse_mcp_response(text, content_type)
+            if not result or "result" not in result:
+                return None
+
+            # MCP wraps in content[0]["text"]
+            content = result["result"].get("content", [])
+            if content and content[0].get("type") == "text":
+                try:
+                    identity_data = json.loads(content[0]["text"])
+                except (json.JSONDecodeError, KeyError):
                     return None
-
-                # MCP wraps in content[0]["text"]
-                content = result["result"].get("content", [])
-                if content and content[0].get("type") == "text":
-                    try:
-                        identity_data = json.loads(content[0]["text"])
-                    except (json.JSONDecodeError, KeyError):
-                        return None
-                    return identity_data.get("display_name") or identity_data.get("label")
+                return identity_data.get("display_name") or identity_data.get("label")
 
         except Exception as e:
             logger.debug("resolve_caller_identity failed: %s", e)
@@ -700,39 +902,20 @@ class UnitaresBridge:
         if not self._url or not self._agent_id:
             return False
         
+        return await self._coalesce(("identity:name", name), lambda: self._sync_name(name))
+
+    async def _sync_name(self, name: str) -> bool:
         try:
             # Call UNITARES identity tool to set label
             # Note: update_agent_metadata doesn't set label directly
             # We need to use identity(name=...) tool instead
-            mcp_request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "tools/call",
-                "params": {
-                    "name": "identity",
-                    "arguments": {
-                        "client_session_id": f"lumen-{self._agent_id}" if self._agent_id else "lumen-anima",
-                        "name": name
-                    }
-                }
-            }
-
-            mcp_url = self._get_mcp_url()
-            headers = {
-                "Content-Type": "application/json",
-                "X-Session-ID": self._session_id or "anima-creature"
-            }
-            if self._agent_id:
-                headers["X-Agent-Id"] = self._agent_id
-
-            # Use shared session for connection pooling
-            session = await self._get_session()
-            async with session.post(mcp_url, json=mcp_request, headers=headers) as response:
-                if response.status == 200:
-                    content_type = response.headers.get("Content-Type", "")
-                    text = await response.text()
-                    result = self._parse_mcp_response(text, content_type)
-                    return result is not None and "result" in result and "error" not in result
+            arguments = {"client_session_id": self._client_session_id(), "name": name}
+            status, text, content_type = await self._post_mcp(
+                self._tool_request({"name": "identity", "arguments": arguments}), self._mcp_headers(), "identity:name",
+            )
+            if status == 200:
+                result = self._parse_mcp_response(text, content_type)
+                return result is not None and "result" in result and "error" not in result
             return False
         except Exception:
             # Non-fatal - name sync is optional
@@ -755,71 +938,58 @@ class UnitaresBridge:
             return False
         
         try:
-            # Build metadata payload
-            metadata = {
-                "born_at": identity.born_at.isoformat() if hasattr(identity, 'born_at') else None,
-                "total_awakenings": identity.total_awakenings if hasattr(identity, 'total_awakenings') else 0,
-                "total_alive_seconds": identity.total_alive_seconds if hasattr(identity, 'total_alive_seconds') else 0.0,
-                "alive_ratio": identity.alive_ratio() if hasattr(identity, 'alive_ratio') else 0.0,
-                "name_history": identity.name_history if hasattr(identity, 'name_history') else [],
-                "current_awakening_at": identity.current_awakening_at.isoformat() if hasattr(identity, 'current_awakening_at') and identity.current_awakening_at else None,
-            }
-
-            # Get creature name for labeling
-            creature_name = identity.name if hasattr(identity, 'name') and identity.name else "Anima"
-            creature_id = identity.creature_id if hasattr(identity, 'creature_id') else "unknown"
-
-            # Call UNITARES update_agent_metadata tool - label ourselves!
-            mcp_request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "tools/call",
-                "params": {
-                    "name": "update_agent_metadata",
-                    "arguments": {
-                        # client_session_id ensures stable identity binding across restarts
-                        "client_session_id": f"lumen-{self._agent_id}" if self._agent_id else "lumen-anima",
-                        "purpose": f"{creature_name} - embodied digital creature (creature_id: {creature_id[:8]}...)",
-                        "tags": [creature_name.lower(), "anima", "creature", "embodied", "autonomous"],
-                        "preferences": metadata,
-                        "notes": f"{creature_name} identity: creature_id={creature_id}, born={metadata.get('born_at')}, awakenings={metadata.get('total_awakenings')}"
-                    }
-                }
-            }
-
-            mcp_url = self._get_mcp_url()
-            headers = {
-                "Content-Type": "application/json",
-                "X-Session-ID": self._session_id or "anima-creature",
-                "Accept": "application/json, text/event-stream"
-            }
-            if self._agent_id:
-                headers["X-Agent-Id"] = self._agent_id
-
-            logger.info("Syncing identity metadata for %s", creature_name)
-
-            # Use shared session for connection pooling
-            session = await self._get_session()
-            async with session.post(mcp_url, json=mcp_request, headers=headers) as response:
-                if response.status == 200:
-                    content_type = response.headers.get("Content-Type", "")
-                    text = await response.text()
-                    result = self._parse_mcp_response(text, content_type)
-
-                    if result and "result" in result and "error" not in result:
-                        logger.info("Identity sync SUCCESS - %s labeled in UNITARES", creature_name)
-                        return True
-                    else:
-                        error = result.get('error', 'unknown') if result else 'no response'
-                        logger.warning("Identity sync failed: %s", error)
-                else:
-                    logger.warning("Identity sync HTTP error: %d", response.status)
-            return False
+            logger.info("Syncing identity metadata for %s", self._creature_name(identity))
+            status, text, content_type = await self._post_mcp(
+                self._tool_request({"name": "update_agent_metadata",
+                                    "arguments": self._identity_metadata_arguments(identity)}),
+                self._mcp_headers(), "update_agent_metadata",
+            )
+            if status != 200:
+                logger.warning("Identity sync HTTP error: %d", status)
+                return False
+            return self._log_identity_sync(self._parse_mcp_response(text, content_type), identity)
         except Exception as e:
             # Non-fatal - metadata sync is optional
             logger.warning("Identity sync error: %s", e)
             return False
 
+    @staticmethod
+    def _creature_name(identity: 'CreatureIdentity') -> str:
+        return identity.name if hasattr(identity, 'name') and identity.name else "Anima"
+
+    def _identity_metadata_arguments(self, identity: 'CreatureIdentity') -> Dict[str, Any]:
+        """update_agent_metadata arguments: birth date, runtime metrics, name history."""
+        metadata = {
+            "born_at": identity.born_at.isoformat() if hasattr(identity, 'born_at') else None,
+            "total_awakenings": identity.total_awakenings if hasattr(identity, 'total_awakenings') else 0,
+            "total_alive_seconds": identity.total_alive_seconds if hasattr(identity, 'total_alive_seconds') else 0.0,
+            "alive_ratio": identity.alive_ratio() if hasattr(identity, 'alive_ratio') else 0.0,
+            "name_history": identity.name_history if hasattr(identity, 'name_history') else [],
+            "current_awakening_at": identity.current_awakening_at.isoformat() if hasattr(identity, 'current_awakening_at') and identity.current_awakening_at else None,
+        }
+
+        # Get creature name for labeling
+        creature_name = self._creature_name(identity)
+        creature_id = identity.creature_id if hasattr(identity, 'creature_id') else "unknown"
+
+        # Label ourselves!
+        return {
+            # client_session_id ensures stable identity binding across restarts
+            "client_session_id": self._client_session_id(),
+            "purpose": f"{creature_name} - embodied digital creature (creature_id: {creature_id[:8]}...)",
+            "tags": [creature_name.lower(), "anima", "creature", "embodied", "autonomous"],
+            "preferences": metadata,
+            "notes": f"{creature_name} identity: creature_id={creature_id}, born={metadata.get('born_at')}, awakenings={metadata.get('total_awakenings')}"
+        }
+
+    def _log_identity_sync(self, result: Optional[Dict[str, Any]], identity: 'CreatureIdentity') -> bool:
+        if result and "result" in result and "error" not in result:
+            logger.info("Identity sync SUCCESS - %s labeled in UNITARES", self._creature_name(identity))
+            return True
+        error = result.get('error', 'unknown') if result else 'no response'
+        logger.warning("Identity sync failed: %s", error)
+        return False
+
     async def report_outcome(
         self,
         outcome_type: str,
@@ -846,7 +1016,7 @@ class UnitaresBridge:
 
         try:
             arguments = {
-                "client_session_id": f"lumen-{self._agent_id}" if self._agent_id else "lumen-anima",
+                "client_session_id": self._client_session_id(),
                 "outcome_type": outcome_type,
             }
             if outcome_score is not None:
@@ -856,34 +1026,15 @@ class UnitaresBridge:
             if detail:
                 arguments["detail"] = detail
 
-            mcp_request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "tools/call",
-                "params": {
-                    "name": "outcome_event",
-                    "arguments": arguments,
-                }
-            }
-
-            mcp_url = self._get_mcp_url()
-            headers = {
-                "Content-Type": "application/json",
-                "X-Session-ID": self._session_id or "anima-creature",
-                "Accept": "application/json, text/event-stream",
-            }
-            if self._agent_id:
-                headers["X-Agent-Id"] = self._agent_id
-
-            session = await self._get_session()
-            async with session.post(mcp_url, json=mcp_request, headers=headers) as response:
-                if response.status == 200:
-                    content_type = response.headers.get("Content-Type", "")
-                    text = await response.text()
-                    result = self._parse_mcp_response(text, content_type)
-                    if result and "result" in result and "error" not in result:
-                        logger.info("Outcome reported: %s score=%.2f", outcome_type, outcome_score or 0)
-                        return True
+            status, text, content_type = await self._post_mcp(
+                self._tool_request({"name": "outcome_event", "arguments": arguments}),
+                self._mcp_headers(), "outcome_event",
+            )
+            if status == 200:
+                result = self._parse_mcp_response(text, content_type)
+                if result and "result" in result and "error" not in result:
+                    logger.info("Outcome reported: %s score=%.2f", outcome_type, outcome_score or 0)
+                    return True
             return False
         except Exception as e:
             logger.debug("Outcome report failed (non-fatal): %s", e)
@@ -21,6 +21,8 @@ import sqlite3
 import sys
 import time
 
+from . import storage
+
 
 # ---------------------------------------------------------------------------
 # Context discretization
@@ -195,11 +197,7 @@ class WeightedPathways:
         last_error = None
         for attempt in range(max_retries):
             try:
-                conn = sqlite3.connect(self._db_path, timeout=10.0)
-                conn.row_factory = sqlite3.Row
-                conn.execute("PRAGMA journal_mode=WAL")
-                conn.execute("PRAGMA busy_timeout=10000")
-                return conn
+                return storage.connect(self._db_path, timeout=10.0, busy_timeout_ms=10000)
             except sqlite3.Error as e:
                 last_error = e
                 if attempt < max_retries - 1:
@@ -229,6 +227,7 @@ class WeightedPathways:
     def _load_all(self):
         """Load all pathways from the database."""
         try:
+            storage.flush(self._db_path)
             conn = self._get_conn()
             rows = conn.execute(
                 "SELECT context_key, action_key, strength, use_count, last_used, total_reward FROM pathways"
@@ -255,8 +254,7 @@ class WeightedPathways:
     def _persist(self, pathway: Pathway):
         """Persist a single pathway to the database."""
         try:
-            conn = self._get_conn()
-            conn.execute(
+            storage.get_writer(self._db_path).submit(
                 """INSERT OR REPLACE INTO pathways
                    (context_key, action_key, strength, use_count, last_used, total_reward)
                    VALUES (?, ?, ?, ?, ?, ?)""",
@@ -269,7 +267,6 @@ class WeightedPathways:
                     pathway.total_reward,
                 ),
             )
-            conn.commit()
         except Exception as e:
             print(f"[WeightedPathways] DB persist error (non-fatal): {e}", file=sys.stderr, flush=True)
 
@@ -17,7 +17,7 @@ from .anima import Anima, sense_self
 from .sensors.base import SensorReadings
 from .eisv_mapper import EISVMetrics, anima_to_eisv
 from .unitares_bridge import UnitaresBridge
-from .shared_memory import SharedMemoryClient
+from .shared_memory import SharedMemoryClient, SHM_BACKEND
 from .config import get_calibration
 
 
@@ -95,8 +95,8 @@ class UnifiedWorkflowOrchestrator:
         """
         # Try shared memory first (broker mode)
         if self._shm_client is None:
-            # Use file backend to match broker (Redis caused hangs)
-            self._shm_client = SharedMemoryClient(mode="read", backend="file")
+            # Same backend the broker writes (ANIMA_SHM_BACKEND)
+            self._shm_client = SharedMemoryClient(mode="read", backend=SHM_BACKEND)
         
         shm_data = self._shm_client.read()
         
@@ -28,6 +28,14 @@ def reset_neural_sensor():
     cn._sensor = None
 
 
+@pytest.fixture(autouse=True)
+def close_storage():
+    """Stop shared anima.db writers and pooled readers so tmp databases don't leak threads."""
+    yield
+    from anima_mcp import storage
+    storage.close_all()
+
+
 # ---------------------------------------------------------------------------
 # MCP handler result parser (plain function, not a fixture)
 # ---------------------------------------------------------------------------
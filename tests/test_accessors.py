@@ -506,6 +506,61 @@ class TestGetWarmStartAnticipation:
         assert result.presence == 0.9
 
 
+# ---------------------------------------------------------------------------
+# _get_readings_and_anima memoization
+# ---------------------------------------------------------------------------
+
+class TestReadingsAndAnimaMemo:
+    def _publish(self, writer, light_lux=100.0):
+        from anima_mcp.sensors.base import SensorReadings
+        readings = SensorReadings(timestamp=datetime.now(), cpu_temp_c=50.0, light_lux=light_lux)
+        writer.write({
+            "timestamp": datetime.now().isoformat(),
+            "readings": readings.to_dict(),
+            "anima": {"warmth": 0.5, "clarity": 0.5, "stability": 0.5, "presence": 0.5},
+        })
+
+    def _setup(self, tmp_path):
+        from anima_mcp.shared_memory import SharedMemoryClient
+        filepath = tmp_path / "state.json"
+        writer = SharedMemoryClient(mode="write", filepath=filepath)
+        make_ctx(shm_client=SharedMemoryClient(mode="read", filepath=filepath))
+        return writer
+
+    def test_derived_pair_reused_until_next_publish(self, tmp_path):
+        from anima_mcp import accessors
+        writer = self._setup(tmp_path)
+        self._publish(writer)
+
+        with patch("anima_mcp.accessors.sense_self_with_memory",
+                   wraps=accessors.sense_self_with_memory) as sense:
+            r1, a1 = accessors._get_readings_and_anima(fallback_to_sensors=False)
+            r2, a2 = accessors._get_readings_and_anima(fallback_to_sensors=False)
+            assert sense.call_count == 1
+            assert r2.light_lux == r1.light_lux == 100.0
+            assert a2.warmth == a1.warmth
+
+            self._publish(writer, light_lux=300.0)
+            r3, _ = accessors._get_readings_and_anima(fallback_to_sensors=False)
+            assert sense.call_count == 2
+            assert r3.light_lux == 300.0
+
+    def test_memoized_pair_is_copied(self, tmp_path):
+        """Loop-side mutations (presence cap, led_brightness) don't leak into the memo."""
+        from anima_mcp import accessors
+        writer = self._setup(tmp_path)
+        self._publish(writer)
+
+        readings, anima = accessors._get_readings_and_anima(fallback_to_sensors=False)
+        anima.presence = 0.0
+        readings.led_brightness = 0.9
+
+        readings2, anima2 = accessors._get_readings_and_anima(fallback_to_sensors=False)
+        assert anima2.presence != 0.0
+        assert readings2.led_brightness != 0.9
+        assert anima2.readings is readings2
+
+
 # ---------------------------------------------------------------------------
 # Simple passthrough accessors
 # ---------------------------------------------------------------------------
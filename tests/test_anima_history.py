@@ -127,15 +127,15 @@ class TestRecord:
         assert snap.presence == pytest.approx(0.44)
 
     def test_auto_save_triggers(self, tmp_path):
-        """After auto_save_interval records, the persistence file should exist."""
+        """After auto_save_interval records, the journal file should exist."""
         path = tmp_path / "history.json"
         h = AnimaHistory(
             persistence_path=path,
             auto_save_interval=5,
         )
-        assert not path.exists()
+        assert not h.journal_path.exists()
         _fill_identical(h, 5)
-        assert path.exists()
+        assert h.journal_path.exists()
 
 
 # =============================================================================
@@ -306,6 +306,194 @@ class TestPersistence:
         h = AnimaHistory(persistence_path=path)
         assert len(h) == 0
 
+    def test_round_trip_preserves_values(self, tmp_path):
+        """Timestamps survive exactly; dimensions to float32 precision."""
+        path = tmp_path / "history.json"
+        h1 = AnimaHistory(persistence_path=path, auto_save_interval=9999)
+        t0 = datetime(2025, 3, 1, 8, 30, 15, 123456)
+        h1.record(warmth=0.1234, clarity=0.5678, stability=0.9012, presence=0.3456, timestamp=t0)
+        h1.save()
+
+        snap = AnimaHistory(persistence_path=path)._history[0]
+        assert snap.timestamp == t0
+        assert snap.warmth == pytest.approx(0.1234, abs=1e-6)
+        assert snap.presence == pytest.approx(0.3456, abs=1e-6)
+
+
+# =============================================================================
+# Test: Binary journal
+# =============================================================================
+
+class TestJournal:
+    """Tests for the append-only binary journal."""
+
+    RECORD = anima_mcp.anima_history._JOURNAL_RECORD.size
+    HEADER = anima_mcp.anima_history._JOURNAL_HEADER.size
+
+    def test_saves_append_only_new_records(self, tmp_path):
+        h = _make_history(tmp_path, auto_save_interval=9999)
+        _fill_identical(h, 10)
+        h.save()
+        assert h.journal_path.stat().st_size == self.HEADER + 10 * self.RECORD
+        _fill_identical(h, 3, t0=datetime(2025, 1, 2))
+        h.save()
+        h.save()  # nothing new
+        assert h.journal_path.stat().st_size == self.HEADER + 13 * self.RECORD
+
+    def test_torn_tail_truncated_on_load(self, tmp_path):
+        h = _make_history(tmp_path, auto_save_interval=9999)
+        _fill_identical(h, 10)
+        h.save()
+        with open(h.journal_path, "ab") as f:
+            f.write(b"\x00" * (self.RECORD // 2))
+
+        h2 = _make_history(tmp_path, auto_save_interval=9999)
+        assert len(h2) == 10
+        assert h2.journal_path.stat().st_size == self.HEADER + 10 * self.RECORD
+        _fill_identical(h2, 2, t0=datetime(2025, 1, 2))
+        h2.save()
+        assert len(_make_history(tmp_path)) == 12
+
+    def test_compaction_keeps_newest(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(anima_mcp.anima_history, "JOURNAL_COMPACT_AT", 30)
+        monkeypatch.setattr(anima_mcp.anima_history, "JOURNAL_KEEP", 8)
+        h = _make_history(tmp_path, auto_save_interval=10)
+        for i in range(40):
+            h.record(warmth=i / 100, clarity=0.5, stability=0.5, presence=0.5,
+                     timestamp=datetime(2025, 1, 1) + timedelta(seconds=i))
+        assert h._journal.count < 30
+        restored = _make_history(tmp_path)
+        assert restored._history[-1].warmth == pytest.approx(0.39, abs=1e-6)
+
+    def test_clear_rewrites_journal(self, tmp_path):
+        h = _make_history(tmp_path, auto_save_interval=9999)
+        _fill_identical(h, 10)
+        h.save()
+        h.clear()
+        h.save()
+        assert len(_make_history(tmp_path)) == 0
+
+    def test_legacy_json_migrated(self, tmp_path):
+        import json
+        path = tmp_path / "history.json"
+        t0 = datetime(2025, 1, 1, 12, 0, 0)
+        obs = [{"t": (t0 + timedelta(seconds=i)).isoformat(), "w": 0.5, "c": 0.6, "s": 0.7, "p": 0.8}
+               for i in range(12)]
+        path.write_text(json.dumps({"observations": obs, "version": "1.0"}))
+
+        h = AnimaHistory(persistence_path=path)
+        assert len(h) == 12
+        assert h.journal_path.exists()
+        path.unlink()
+        assert len(AnimaHistory(persistence_path=path)) == 12
+
+    def test_unrecognized_journal_ignored(self, tmp_path):
+        h = _make_history(tmp_path)
+        h.journal_path.write_bytes(b"garbage-not-a-journal")
+        h2 = _make_history(tmp_path, auto_save_interval=9999)
+        assert len(h2) == 0
+        _fill_identical(h2, 4)
+        h2.save()
+        assert len(_make_history(tmp_path)) == 4
+
+    def test_python_backend_round_trip(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(anima_mcp.anima_history, "HAS_NUMPY", False)
+        h = _make_history(tmp_path, auto_save_interval=9999)
+        _fill_identical(h, 15, w=0.25)
+        h.save()
+        h2 = _make_history(tmp_path)
+        assert len(h2) == 15
+        assert h2._history[0].warmth == pytest.approx(0.25)
+
+
+# =============================================================================
+# Test: NumPy ring buffer backend
+# =============================================================================
+
+class TestRingBuffer:
+    """Tests for the preallocated ring buffer and its running statistics."""
+
+    @pytest.fixture(autouse=True)
+    def _require_numpy(self):
+        if not anima_mcp.anima_history.HAS_NUMPY:
+            pytest.skip("numpy not available")
+
+    def _fill_varied(self, history, n, t0=None):
+        import random
+        rng = random.Random(42)
+        t0 = t0 or datetime(2025, 1, 1, 12, 0, 0)
+        for i in range(n):
+            history.record(
+                warmth=rng.random(), clarity=rng.random(),
+                stability=rng.random(), presence=rng.random(),
+                timestamp=t0 + timedelta(seconds=i),
+            )
+
+    def test_window_is_zero_copy_and_ordered(self, tmp_path):
+        import numpy as np
+        h = _make_history(tmp_path, max_size=10, auto_save_interval=9999)
+        t0 = datetime(2025, 1, 1, 12, 0, 0)
+        for i in range(25):
+            h.record(warmth=i / 100, clarity=0.5, stability=0.5, presence=0.5,
+                     timestamp=t0 + timedelta(seconds=i))
+        view = h._ring.window(4)
+        assert np.shares_memory(view, h._ring._buf)
+        assert view[:, 1].tolist() == pytest.approx([0.21, 0.22, 0.23, 0.24])
+        assert h._history[0].warmth == pytest.approx(0.15)
+        assert h._history[-1].timestamp == t0 + timedelta(seconds=24)
+
+    def test_running_stats_match_numpy_after_wraparound(self, tmp_path):
+        import numpy as np
+        h = _make_history(tmp_path, max_size=50, auto_save_interval=9999)
+        self._fill_varied(h, 137)
+        dims = h._ring.window()[:, 1:]
+        assert h._ring.mean == pytest.approx(dims.mean(axis=0))
+        assert h._ring.covariance() == pytest.approx(np.cov(dims.T))
+
+    def test_full_window_basin_matches_partial_window_math(self, tmp_path):
+        import numpy as np
+        h = _make_history(tmp_path, max_size=60, auto_save_interval=9999)
+        self._fill_varied(h, 90)
+        full = h.get_attractor_basin(window=60)
+        dims = h._ring.window()[:, 1:]
+        expected = np.cov(dims.T) + np.eye(4) * 1e-6
+        assert full["n_observations"] == 60
+        assert np.array(full["covariance"]) == pytest.approx(expected)
+        assert full["time_span_seconds"] == pytest.approx(59.0)
+
+    def test_basin_cached_until_next_record(self, tmp_path):
+        h = _make_history(tmp_path, auto_save_interval=9999)
+        self._fill_varied(h, 30)
+        h.get_attractor_basin(window=20)
+        cached = h._basin_cache[20][1]
+        h.get_attractor_basin(window=20)
+        assert h._basin_cache[20][1] is cached
+        h.record(warmth=0.9, clarity=0.9, stability=0.9, presence=0.9)
+        h.get_attractor_basin(window=20)
+        assert h._basin_cache[20][1] is not cached
+
+    def test_consolidate_matches_python_backend(self, tmp_path, monkeypatch):
+        ring_history = _make_history(tmp_path / "a", auto_save_interval=9999)
+        self._fill_varied(ring_history, 150)
+        ring_summary = ring_history.consolidate()
+
+        monkeypatch.setattr(anima_mcp.anima_history, "HAS_NUMPY", False)
+        list_history = _make_history(tmp_path / "b", auto_save_interval=9999)
+        self._fill_varied(list_history, 150)
+        list_summary = list_history.consolidate()
+
+        assert ring_summary.attractor_center == pytest.approx(list_summary.attractor_center)
+        assert ring_summary.attractor_variance == pytest.approx(list_summary.attractor_variance, abs=1e-6)
+        assert ring_summary.notable_perturbations == list_summary.notable_perturbations
+        assert ring_summary.time_span_hours == pytest.approx(list_summary.time_span_hours)
+
+    def test_clear_resets_ring(self, tmp_path):
+        h = _make_history(tmp_path, auto_save_interval=9999)
+        self._fill_varied(h, 30)
+        h.clear()
+        assert len(h) == 0
+        assert h.get_attractor_basin() is None
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
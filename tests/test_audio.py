@@ -12,7 +12,7 @@ from unittest.mock import patch, MagicMock
 
 import pytest
 
-from anima_mcp.audio.mic import MicCapture, AudioChunk, SAMPLE_RATE, CHANNELS, CHUNK_SIZE
+from anima_mcp.audio.mic import MicCapture, AudioChunk, AudioRing, SAMPLE_RATE, CHANNELS, CHUNK_SIZE
 from anima_mcp.audio.speaker import Speaker, AudioPlayback
 from anima_mcp.audio.stt import (
     SpeechToText,
@@ -20,6 +20,9 @@ from anima_mcp.audio.stt import (
 )
 from anima_mcp.audio.tts import (
     TextToSpeech,
+    PhraseCache,
+    PiperWorker,
+    WORKER_MAX_FAILURES,
     Voice,
     VoiceStyle,
     RECOMMENDED_VOICES,
@@ -222,6 +225,108 @@ class TestMicCaptureGetChunk:
         assert result is chunk
 
 
+def _block(level: float, frames: int = CHUNK_SIZE, channels: int = 1):
+    """A constant-amplitude float block like sounddevice delivers."""
+    import numpy as np
+    return np.full((frames, channels), level, dtype=np.float32)
+
+
+class TestAudioRing:
+    """Fixed int16 ring addressed by absolute sample index."""
+
+    def test_write_and_read_back(self):
+        import numpy as np
+        ring = AudioRing(8)
+        ring.write(np.array([0.5, -0.5, 1.0], dtype=np.float32))
+        data = np.frombuffer(ring.read(0, 3), dtype=np.int16)
+        assert data.tolist() == [16383, -16383, 32767]
+
+    def test_wraparound_keeps_latest(self):
+        import numpy as np
+        ring = AudioRing(4)
+        for i in range(6):
+            ring.write(np.array([i / 10], dtype=np.float32))
+        assert ring.oldest() == 2
+        data = np.frombuffer(ring.read(0, 6), dtype=np.int16)  # start clamps to oldest
+        assert data.tolist() == [int(i / 10 * 32767) for i in range(2, 6)]
+
+
+class TestMicCaptureStreamingVAD:
+    """Ring-buffer VAD and streaming handoff (blocks fed directly, no device)."""
+
+    def _capture(self, mic):
+        starts, chunks, ends = [], [], []
+        mic.on_speech_start(lambda: starts.append(True))
+        mic.on_speech_audio(chunks.append)
+        mic.on_speech_end(ends.append)
+        return starts, chunks, ends
+
+    def test_streams_chunks_before_speech_end(self, mic):
+        starts, chunks, ends = self._capture(mic)
+        mic._process_block(_block(0.0), CHUNK_SIZE)
+        mic._process_block(_block(0.3), CHUNK_SIZE)
+        mic._drain_stream()
+        assert starts == [True]
+        assert chunks and not ends  # Audio is handed over while speech continues
+
+        mic._process_block(_block(0.3), CHUNK_SIZE)
+        mic._drain_stream()
+        silence_blocks = int(mic._speech_timeout * SAMPLE_RATE / CHUNK_SIZE) + 1
+        for _ in range(silence_blocks):
+            mic._process_block(_block(0.0), CHUNK_SIZE)
+        mic._drain_stream()
+
+        assert len(ends) == 1
+        # Streamed chunks add up to exactly the utterance (pre-roll included)
+        assert b"".join(chunks) == ends[0]
+        preroll = min(mic._preroll_samples, CHUNK_SIZE)  # only one block precedes the onset
+        assert len(ends[0]) == 2 * (preroll + (2 + silence_blocks) * CHUNK_SIZE)
+        assert mic.get_stats()["utterances"] == 1
+
+    def test_hangover_keeps_short_pauses(self, mic):
+        _, _, ends = self._capture(mic)
+        mic._process_block(_block(0.3), CHUNK_SIZE)
+        mic._process_block(_block(0.0), CHUNK_SIZE)  # brief pause, within hangover
+        mic._process_block(_block(0.3), CHUNK_SIZE)
+        mic._drain_stream()
+        assert ends == []
+        assert mic._in_speech is True
+
+    def test_long_speech_is_bounded(self, mic):
+        _, _, ends = self._capture(mic)
+        mic._max_utterance_samples = 4 * CHUNK_SIZE
+        for _ in range(6):
+            mic._process_block(_block(0.3), CHUNK_SIZE)
+        mic._drain_stream()
+        assert len(ends) == 1
+        assert len(ends[0]) == 2 * 4 * CHUNK_SIZE
+        assert mic.get_stats()["truncated"] == 1
+
+    def test_ring_is_preallocated_once(self, mic):
+        mic._process_block(_block(0.3), CHUNK_SIZE)
+        ring_buf = mic._ring.buf
+        for _ in range(50):
+            mic._process_block(_block(0.3), CHUNK_SIZE)
+        assert mic._ring.buf is ring_buf
+        assert mic.get_stats()["ring_bytes"] == ring_buf.nbytes
+
+    def test_stereo_mixdown(self):
+        m = MicCapture(channels=2)
+        _, _, ends = self._capture(m)
+        m._max_utterance_samples = CHUNK_SIZE
+        m._process_block(_block(0.5, channels=2), CHUNK_SIZE)
+        m._drain_stream()
+        import numpy as np
+        assert np.frombuffer(ends[0], dtype=np.int16)[-1] == 16383
+
+    def test_vad_disabled_queues_chunks(self, mic):
+        mic.set_vad_enabled(False)
+        mic._process_block(_block(0.1), CHUNK_SIZE)
+        chunk = mic.get_chunk(timeout=0.1)
+        assert chunk is not None
+        assert len(chunk.data) == CHUNK_SIZE * 2
+
+
 class TestMicCaptureProperties:
     """Test MicCapture properties."""
 
@@ -614,6 +719,27 @@ class TestSTTStreamingTranscribe:
         assert result is None
 
 
+class TestSTTFinishStreaming:
+    """Flushing the streaming recognizer at end of speech."""
+
+    def test_finish_returns_remaining_text(self, stt):
+        stt._initialized = True
+        stt._recognizer = MagicMock()
+        stt._recognizer.FinalResult.return_value = json.dumps({"text": "the rest"})
+        result = stt.finish_streaming()
+        assert result.text == "the rest"
+        assert result.is_final is True
+
+    def test_finish_empty(self, stt):
+        stt._initialized = True
+        stt._recognizer = MagicMock()
+        stt._recognizer.FinalResult.return_value = json.dumps({"text": ""})
+        assert stt.finish_streaming() is None
+
+    def test_finish_not_initialized(self, stt):
+        assert stt.finish_streaming() is None
+
+
 class TestSTTConfidence:
     """Test confidence calculation."""
 
@@ -843,6 +969,177 @@ class TestTTSSynthesize:
         assert "--length_scale" in cmd
 
 
+class _FakePiper:
+    """Stands in for a piper --output_dir process: one WAV per stdin line."""
+
+    def __init__(self, cmd, **kwargs):
+        import queue
+        self.cmd = cmd
+        self.output_dir = cmd[cmd.index("--output_dir") + 1]
+        self.lines = []
+        self._paths = queue.Queue()
+        self._returncode = None
+        self.stdin = MagicMock()
+        self.stdin.write.side_effect = self._write
+        self.stdin.close.side_effect = lambda: self._paths.put(None)
+        self.stdout = iter(self._paths.get, None)
+
+    def _write(self, data):
+        self.lines.append(data)
+        path = f"{self.output_dir}/{len(self.lines)}.wav"
+        with wave.open(path, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(22050)
+            wf.writeframes(b"\x01\x02" * 50 * len(self.lines))
+        self._paths.put(path + "\n")
+
+    def poll(self):
+        return self._returncode
+
+    def wait(self, timeout=None):
+        self._returncode = 0
+        return 0
+
+
+class TestPiperWorker:
+    """Persistent piper process and phrase cache."""
+
+    def test_worker_reused_across_utterances(self, tts_initialized):
+        with patch("subprocess.Popen", side_effect=_FakePiper) as mock_popen, \
+             patch("subprocess.run") as mock_run:
+            first = tts_initialized.synthesize("hello")
+            second = tts_initialized.synthesize("good\nmorning")
+            tts_initialized.close()
+
+        assert mock_popen.call_count == 1
+        mock_run.assert_not_called()
+        proc_cmd = mock_popen.call_args[0][0]
+        assert proc_cmd[:3] == ["piper", "--model", RECOMMENDED_VOICES["default"].name]
+        assert first == b"\x01\x02" * 50
+        assert second == b"\x01\x02" * 100
+        assert tts_initialized.get_stats()["oneshot_syntheses"] == 0
+
+    def test_lines_are_single_utterances(self):
+        worker = PiperWorker(RECOMMENDED_VOICES["default"])
+        with patch("subprocess.Popen", side_effect=_FakePiper):
+            assert worker.start()
+            proc = worker._proc
+            worker.synthesize("one\ntwo  three")
+            worker.close()
+        assert proc.lines == ["one two three\n"]
+        assert worker._output_dir is None
+
+    def test_repeated_phrase_served_from_cache(self, tts_initialized):
+        with patch("subprocess.Popen", side_effect=_FakePiper) as mock_popen:
+            first = tts_initialized.synthesize("I feel warm")
+            again = tts_initialized.synthesize("I feel warm")
+            tts_initialized.close()
+        assert again == first
+        assert mock_popen.call_count == 1
+        stats = tts_initialized.get_stats()
+        assert stats["cache"]["hits"] == 1
+        assert stats["cache"]["misses"] == 1
+
+    def test_voice_change_restarts_worker(self, tts_initialized):
+        with patch("subprocess.Popen", side_effect=_FakePiper) as mock_popen:
+            tts_initialized.synthesize("hello")
+            tts_initialized.set_voice(RECOMMENDED_VOICES["warm"])
+            tts_initialized.synthesize("hello")
+            tts_initialized.close()
+        assert mock_popen.call_count == 2
+        assert mock_popen.call_args[0][0][2] == RECOMMENDED_VOICES["warm"].name
+
+    def test_nearby_stabilities_share_worker_and_cache(self, tts_initialized):
+        with patch("subprocess.Popen", side_effect=_FakePiper) as mock_popen:
+            tts_initialized.set_from_anima_state(warmth=0.5, clarity=0.5, stability=0.31)
+            first = tts_initialized.synthesize("hello")
+            tts_initialized.set_from_anima_state(warmth=0.5, clarity=0.5, stability=0.29)
+            again = tts_initialized.synthesize("hello")
+            tts_initialized.close()
+        assert again == first
+        assert mock_popen.call_count == 1
+        assert tts_initialized.get_stats()["cache"]["hits"] == 1
+
+    def test_spawn_failure_falls_back_to_oneshot(self, tts_initialized, tmp_path):
+        wav_path = tmp_path / "output.wav"
+        with wave.open(str(wav_path), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(22050)
+            wf.writeframes(b"\x00\x01" * 100)
+
+        with patch("subprocess.Popen", side_effect=FileNotFoundError("piper")) as mock_popen, \
+             patch("subprocess.run") as mock_run, \
+             patch("tempfile.NamedTemporaryFile") as mock_tmp:
+            mock_run.return_value = MagicMock(returncode=0)
+            mock_file = MagicMock()
+            mock_file.__enter__ = MagicMock(return_value=mock_file)
+            mock_file.__exit__ = MagicMock(return_value=False)
+            mock_file.name = str(wav_path)
+            mock_tmp.return_value = mock_file
+
+            assert tts_initialized.synthesize("hello") == b"\x00\x01" * 100
+            tts_initialized.synthesize("again")
+
+        assert mock_popen.call_count == 1  # Not retried per utterance
+        assert mock_run.call_count == 2
+        assert tts_initialized.get_stats()["oneshot_syntheses"] == 2
+
+    def test_success_resets_worker_failures(self, tts_initialized):
+        outcomes = [None] * (WORKER_MAX_FAILURES - 1) + [b"\x01\x02"] + [None] * (WORKER_MAX_FAILURES - 1)
+        with patch("subprocess.Popen", side_effect=_FakePiper), \
+             patch.object(PiperWorker, "synthesize", side_effect=outcomes), \
+             patch.object(tts_initialized, "_synthesize_once", return_value=b"\x00\x01"):
+            for i in range(len(outcomes)):
+                tts_initialized.synthesize(f"phrase {i}")
+            assert tts_initialized._use_worker
+            assert tts_initialized.get_stats()["worker_failures"] == WORKER_MAX_FAILURES - 1
+            tts_initialized.close()
+
+
+class TestPhraseCache:
+    """Cache keyed by (text, voice, speed)."""
+
+    def test_key_separates_voice_and_speed(self):
+        default, warm = RECOMMENDED_VOICES["default"], RECOMMENDED_VOICES["warm"]
+        key = PhraseCache.key("hello", default, 1.0)
+        assert key == PhraseCache.key(" hello ", default, 1.0)
+        assert key != PhraseCache.key("hello", warm, 1.0)
+        assert key != PhraseCache.key("hello", default, 1.1)
+
+    def test_memory_lru_bounded_by_bytes(self):
+        cache = PhraseCache(max_memory_bytes=250)
+        cache.put("a", b"a" * 100)
+        cache.put("b", b"b" * 100)
+        cache.get("a")  # a is now most recent
+        cache.put("c", b"c" * 100)
+        assert cache.get("b") is None
+        assert cache.get("a") == b"a" * 100
+        assert cache.get_stats()["memory_bytes"] == 200
+
+    def test_disk_cache_survives_restart(self, tmp_path):
+        key = PhraseCache.key("hello", RECOMMENDED_VOICES["default"], 1.0)
+        PhraseCache(tmp_path).put(key, b"pcm" * 10)
+        assert (tmp_path / f"{key}.pcm").exists()
+
+        reloaded = PhraseCache(tmp_path)
+        assert reloaded.get(key) == b"pcm" * 10
+        assert reloaded.get_stats()["disk_hits"] == 1
+
+    def test_disk_pruned_oldest_first(self, tmp_path):
+        import os
+        cache = PhraseCache(tmp_path, max_disk_bytes=250)
+        for i, name in enumerate(["old", "mid", "new"]):
+            cache.put(name, bytes(100))
+            os.utime(tmp_path / f"{name}.pcm", (1000 + i, 1000 + i))
+        cache.put("newest", bytes(100))
+        remaining = sorted(p.stem for p in tmp_path.glob("*.pcm"))
+        assert "old" not in remaining
+        assert "newest" in remaining
+        assert sum(p.stat().st_size for p in tmp_path.glob("*.pcm")) <= 250
+
+
 class TestTTSSynthesizeToFile:
     """Test file synthesis."""
 
@@ -1277,6 +1574,45 @@ class TestLumenVoiceSpeechEnd:
         assert len(mock_voice._state.utterance_history) <= 50
 
 
+class TestLumenVoiceStreaming:
+    """Recognition overlapping capture via on_speech_audio."""
+
+    def test_partial_then_final_text(self, mock_voice):
+        mock_voice._config.always_listening = True
+        mock_voice._config.acknowledge_hearing = False
+        mock_voice._stt._initialized = True
+        partial = TranscriptionResult(text="how are", confidence=0.5, is_final=False, alternatives=[])
+        segment = TranscriptionResult(text="how are you", confidence=0.9, is_final=True, alternatives=[])
+        tail = TranscriptionResult(text="today", confidence=0.8, is_final=True, alternatives=[])
+
+        mock_voice._on_speech_start()
+        with patch.object(mock_voice._stt, "transcribe_streaming", side_effect=[partial, segment]), \
+             patch.object(mock_voice._stt, "finish_streaming", return_value=tail), \
+             patch.object(mock_voice._stt, "transcribe") as mock_transcribe:
+            mock_voice._on_speech_audio(b"\x00" * 100)
+            assert mock_voice._state.partial_text == "how are"
+            mock_voice._on_speech_audio(b"\x00" * 100)
+            mock_voice._on_speech_end(b"\x00" * 200)
+
+        mock_transcribe.assert_not_called()  # Nothing left to recognize after speech ends
+        assert mock_voice._state.last_heard.text == "how are you today"
+        assert mock_voice._state.partial_text == ""
+
+    def test_not_streamed_falls_back_to_transcribe(self, mock_voice):
+        mock_voice._config.always_listening = True
+        mock_voice._config.acknowledge_hearing = False
+        result = TranscriptionResult(text="hello", confidence=0.9, is_final=True, alternatives=[])
+        mock_voice._on_speech_start()
+        with patch.object(mock_voice._stt, "transcribe", return_value=result):
+            mock_voice._on_speech_end(b"\x00" * 100)
+        assert mock_voice._state.last_heard.text == "hello"
+
+    def test_start_registers_audio_callback(self, mock_voice):
+        with patch.object(mock_voice._mic, "on_speech_audio") as mock_register:
+            mock_voice.start()
+        mock_register.assert_called_once_with(mock_voice._on_speech_audio)
+
+
 class TestLumenVoiceAcknowledge:
     """Test the acknowledge behavior."""
 
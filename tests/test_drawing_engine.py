@@ -92,6 +92,63 @@ class TestCanvasStateDrawPixel:
         assert canvas.pixels[(10, 10)] == (0, 255, 0)
 
 
+class TestCanvasStateBatchDraw:
+    """draw_points / draw_mask match per-pixel draw_pixel semantics."""
+
+    def _reference(self, points):
+        canvas = CanvasState()
+        for x, y, color in points:
+            canvas.draw_pixel(x, y, color)
+        return canvas
+
+    def test_draw_points_matches_draw_pixel(self):
+        import random as _random
+        rng = _random.Random(7)
+        points = [(rng.randint(-10, 250), rng.randint(-10, 250),
+                   (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)))
+                  for _ in range(500)]
+        points += points[:50]  # repeated coordinates: later point wins
+        ref = self._reference(points)
+
+        canvas = CanvasState()
+        canvas.draw_points([p[0] for p in points], [p[1] for p in points], [p[2] for p in points])
+        assert canvas.pixels == ref.pixels
+        assert len(canvas.pixels) == len(ref.pixels)
+        assert canvas.recent_locations == ref.recent_locations
+        assert len(canvas._new_pixels) == len(ref._new_pixels)
+
+    def test_single_color_and_small_batch(self):
+        canvas = CanvasState()
+        canvas.is_satisfied = True
+        canvas._dirty = False
+        canvas.draw_points((1, 2, 300), (1, 2, 3), (9, 8, 7))
+        assert canvas.pixels == {(1, 1): (9, 8, 7), (2, 2): (9, 8, 7)}
+        assert canvas._dirty is True
+        assert canvas.is_satisfied is False
+
+    def test_all_out_of_bounds_is_noop(self):
+        canvas = CanvasState()
+        canvas._dirty = False
+        canvas.draw_points([-1, 240], [0, 0], (1, 1, 1))
+        assert len(canvas.pixels) == 0
+        assert canvas._dirty is False
+
+    def test_draw_mask_clips_at_edges(self):
+        from anima_mcp.display import raster
+        canvas = CanvasState()
+        canvas.draw_mask(-3, -3, raster.disc_mask(5), (10, 20, 30))
+        expected = {(2 + dx, 2 + dy) for dx in range(-5, 6) for dy in range(-5, 6)
+                    if dx * dx + dy * dy <= 25 and 2 + dx >= 0 and 2 + dy >= 0}
+        assert set(canvas.pixels) == expected
+
+    def test_draw_mask_per_cell_colors(self):
+        from anima_mcp.display import raster
+        factors = [[0.5, 1.0], [1.0, 0.25]]
+        canvas = CanvasState()
+        canvas.draw_mask(10, 10, [[True, False], [True, True]], raster.shade((200, 100, 40), factors))
+        assert canvas.pixels == {(10, 10): (100, 50, 20), (10, 11): (200, 100, 40), (11, 11): (50, 25, 10)}
+
+
 class TestCanvasStateClear:
     """Test canvas clearing behavior."""
 
@@ -247,6 +304,31 @@ class TestCanvasCompositionalSatisfaction:
         assert 0.0 <= sat <= 1.0
 
 
+class TestCanvasCompositionStats:
+    """Running composition aggregates read without scanning pixels."""
+
+    def test_stats_track_draws_and_clear(self):
+        canvas = CanvasState()
+        canvas.draw_points(list(range(0, 240, 2)), [5] * 120, (255, 0, 0))
+        stats = canvas.composition_stats()
+        assert stats["occupied"] == 120
+        assert stats["quadrants"] == [60, 60, 0, 0]
+        assert [sum(row) for row in stats["density_grid"]] == [120, 0, 0, 0, 0, 0, 0, 0]
+        assert stats["spread"] == pytest.approx(8 / 64, abs=1e-3)
+        assert stats["color_bins_used"] == 1
+        canvas.clear()
+        assert canvas.composition_stats()["occupied"] == 0
+        assert canvas.composition_stats()["spread"] == 0.0
+
+    def test_satisfaction_does_not_iterate_pixels(self, monkeypatch):
+        canvas = CanvasState()
+        for i in range(100):
+            canvas.draw_pixel(i, i, (255, 255, 255))
+        expected = canvas.compositional_satisfaction()
+        monkeypatch.setattr(type(canvas.pixels), "__iter__", lambda self: (_ for _ in ()).throw(AssertionError))
+        assert canvas.compositional_satisfaction() == expected
+
+
 class TestCanvasMarkSatisfied:
     """Test satisfaction marking."""
 
@@ -296,6 +378,44 @@ class TestCanvasPersistence:
         assert canvas2._era_name == "pointillist"
         assert canvas2.drawings_saved == 3
 
+    def test_pixels_saved_as_png_beside_json(self, tmp_path):
+        canvas = CanvasState()
+        canvas.draw_pixel(10, 20, (255, 128, 0))
+        with patch("anima_mcp.display.drawing_engine._get_canvas_path",
+                   return_value=tmp_path / "canvas.json"):
+            canvas.save_to_disk()
+        data = json.loads((tmp_path / "canvas.json").read_text())
+        assert "pixels" not in data
+        assert data["pixels_file"] == "canvas_pixels.png"
+        assert data["pixel_count"] == 1
+        assert (tmp_path / "canvas_pixels.png").exists()
+
+    def test_unchanged_pixels_not_reencoded(self, tmp_path):
+        canvas = CanvasState()
+        canvas.draw_pixel(1, 1, (1, 2, 3))
+        with patch("anima_mcp.display.drawing_engine._get_canvas_path",
+                   return_value=tmp_path / "canvas.json"):
+            canvas.save_to_disk()
+            png = tmp_path / "canvas_pixels.png"
+            mtime = png.stat().st_mtime_ns
+            canvas.curiosity = 0.3
+            canvas.save_to_disk()
+            assert png.stat().st_mtime_ns == mtime
+            canvas.draw_pixel(2, 2, (4, 5, 6))
+            canvas.save_to_disk()
+            canvas2 = CanvasState()
+            canvas2.load_from_disk()
+        assert canvas2.pixels == {(1, 1): (1, 2, 3), (2, 2): (4, 5, 6)}
+
+    def test_missing_pixel_png_loads_empty(self, tmp_path):
+        canvas_file = tmp_path / "canvas.json"
+        canvas_file.write_text(json.dumps({"pixels_file": "canvas_pixels.png", "curiosity": 0.5}))
+        with patch("anima_mcp.display.drawing_engine._get_canvas_path", return_value=canvas_file):
+            canvas = CanvasState()
+            canvas.load_from_disk()
+        assert len(canvas.pixels) == 0
+        assert canvas.curiosity == 0.5
+
     def test_load_handles_missing_file(self, tmp_path):
         with patch("anima_mcp.display.drawing_engine._get_canvas_path",
                    return_value=tmp_path / "nonexistent.json"):
@@ -55,6 +55,7 @@ class TestDrawingHistoryRecording:
             arc_phase="developing", gesture_entropy=0.8,
             switching_rate=0.3, intentionality=0.6,
         )
+        store.flush()
         conn = store._connect()
         rows = conn.execute("SELECT COUNT(*) FROM drawing_history").fetchone()
         assert rows[0] == 1
@@ -71,6 +72,7 @@ class TestDrawingHistoryRecording:
                 gesture_entropy=0.5, switching_rate=0.3, intentionality=0.6,
             )
             time.sleep(0.01)  # Ensure distinct timestamps
+        store.flush()
         history = store.get_recent_drawing_history(limit=2)
         assert len(history) == 2
         # Should be ascending timestamp order (oldest first of the last 2)
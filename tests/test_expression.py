@@ -1,5 +1,13 @@
 """Tests for eisv/expression.py — expression generator and Lumen bridge."""
 
+import json
+import os
+import random
+import shutil
+
+import pytest
+
+from anima_mcp.eisv.forest import FlatForest, compile_forest, load_forest
 from anima_mcp.eisv.expression import (
     ExpressionGenerator,
     StudentExpressionGenerator,
@@ -165,6 +173,110 @@ class TestExpressionGeneratorWeights:
         assert gen.get_weights("nonexistent") == {}
 
 
+# ── Flattened forests ──
+
+def _nested_predict(forest, x):
+    """Reference walk over the JSON export (what the generator used to do)."""
+    total = None
+    for node in forest:
+        while not node.get("leaf", False):
+            node = node["left"] if x[node["feature"]] <= node["threshold"] else node["right"]
+        total = list(node["probs"]) if total is None else [a + b for a, b in zip(total, node["probs"])]
+    return max(range(len(total)), key=lambda i: (total[i], -i))
+
+
+def _leaf(*probs):
+    return {"leaf": True, "probs": list(probs)}
+
+
+SMALL_FOREST = [
+    {"leaf": False, "feature": 0, "threshold": 0.5,
+     "left": _leaf(0.9, 0.1, 0.0),
+     "right": {"leaf": False, "feature": 1, "threshold": -1.0,
+               "left": _leaf(0.0, 1.0, 0.0), "right": _leaf(0.2, 0.2, 0.6)}},
+    {"leaf": False, "feature": 1, "threshold": 0.0,
+     "left": _leaf(0.5, 0.5, 0.0), "right": _leaf(0.0, 0.0, 1.0)},
+    _leaf(0.3, 0.3, 0.4),
+]
+
+
+class TestFlatForest:
+    def test_compile_matches_nested(self):
+        flat = compile_forest(SMALL_FOREST)
+        assert (flat.n_trees, flat.n_classes, flat.max_depth) == (3, 3, 2)
+        rng = random.Random(1)
+        for _ in range(200):
+            x = [rng.uniform(-2, 2), rng.uniform(-2, 2)]
+            assert flat.predict(x) == _nested_predict(SMALL_FOREST, x)
+
+    def test_binary_round_trip(self, tmp_path):
+        flat = compile_forest(SMALL_FOREST)
+        flat.save(str(tmp_path / "f.forest"))
+        loaded = FlatForest.load(str(tmp_path / "f.forest"))
+        rows = [[a / 4, b / 4] for a in range(-8, 9) for b in range(-8, 9)]
+        assert loaded.predict_many(rows) == [flat.predict(x) for x in rows]
+        assert loaded.predict_many(rows[:3]) == [flat.predict(x) for x in rows[:3]]
+
+    def test_rejects_foreign_files(self, tmp_path):
+        bad = tmp_path / "bad.forest"
+        bad.write_bytes(b"not a forest at all, definitely not" * 3)
+        with pytest.raises(ValueError):
+            FlatForest.load(str(bad))
+
+    def test_load_forest_caches_compiled_form(self, tmp_path):
+        src = tmp_path / "x_forest.json"
+        src.write_text(json.dumps(SMALL_FOREST))
+        first = load_forest(str(src))
+        cached = tmp_path / "x_forest.forest"
+        assert cached.exists() and first._buffer is None
+        second = load_forest(str(src))
+        assert second._buffer is not None
+        assert second.predict([1.0, 1.0]) == first.predict([1.0, 1.0])
+        # A newer JSON export invalidates the compiled file
+        os.utime(cached, (1, 1))
+        assert load_forest(str(src))._buffer is None
+
+
+STUDENT_MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 "data", "student_model")
+
+
+@pytest.mark.skipif(not os.path.exists(os.path.join(STUDENT_MODEL_DIR, "mappings.json")),
+                    reason="Student model not present locally")
+class TestStudentModelForests:
+    @pytest.fixture
+    def model_dir(self, tmp_path):
+        return str(shutil.copytree(STUDENT_MODEL_DIR, tmp_path / "student_model"))
+
+    def _window(self, rng):
+        return {
+            "states": [{k: rng.random() for k in "EISV"} for _ in range(5)],
+            "derivatives": [{f"d{k}": rng.gauss(0, 0.3) for k in "EISV"} for _ in range(4)],
+            "second_derivatives": [{f"d2{k}": rng.gauss(0, 0.3) for k in "EISV"} for _ in range(3)],
+        }
+
+    def test_flat_forests_match_json_export(self, model_dir):
+        gen = StudentExpressionGenerator(model_dir)
+        assert gen.is_loaded
+        with open(os.path.join(model_dir, "token2_forest.json")) as f:
+            nested = json.load(f)
+        n_features = len(gen._mappings["numeric_features"]) + len(gen._mappings["shapes"]) + 1
+        rng = random.Random(7)
+        for _ in range(100):
+            x = [rng.gauss(0, 1.5) for _ in range(n_features)]
+            assert gen._token2_forest.predict(x) == _nested_predict(nested, x)
+
+    def test_predict_many_matches_generate(self, model_dir):
+        gen = StudentExpressionGenerator(model_dir)
+        reloaded = StudentExpressionGenerator(model_dir)  # served from the compiled files
+        assert reloaded._pattern_forest._buffer is not None
+        rng = random.Random(3)
+        shapes = gen._mappings["shapes"]
+        samples = [(rng.choice(shapes), self._window(rng)) for _ in range(40)]
+        batch = reloaded.predict_many(samples)
+        assert batch == [gen.generate(shape, window) for shape, window in samples]
+
+
 # ── StudentExpressionGenerator ──
 
 class TestStudentExpressionGenerator:
@@ -172,6 +284,11 @@ class TestStudentExpressionGenerator:
         gen = StudentExpressionGenerator(str(tmp_path / "nonexistent"), fallback_seed=42)
         assert not gen.is_loaded
 
+    def test_predict_many_requires_model(self, tmp_path):
+        gen = StudentExpressionGenerator(str(tmp_path / "nonexistent"))
+        with pytest.raises(RuntimeError):
+            gen.predict_many([])
+
     def test_fallback_generates(self, tmp_path):
         gen = StudentExpressionGenerator(str(tmp_path / "nonexistent"), fallback_seed=42)
         result = gen.generate("settled_presence")
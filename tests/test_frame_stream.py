@@ -0,0 +1,124 @@
+"""Tests for the shared encoded-frame cache and screen stream."""
+
+import asyncio
+import base64
+
+import pytest
+from PIL import Image
+
+from anima_mcp.display import frame_stream
+from anima_mcp.display.frame_stream import MAX_STREAM_CLIENTS, FrameHub
+
+
+def _frame(color):
+    return Image.new("RGB", (16, 16), color)
+
+
+class TestVersions:
+
+    def test_no_frame_yet(self):
+        hub = FrameHub()
+        assert hub.current() == (0, None)
+        with pytest.raises(LookupError):
+            hub.encoded("png")
+
+    def test_identical_pixels_keep_version(self):
+        hub = FrameHub()
+        hub.publish(_frame("red"))
+        assert hub.current()[0] == 1
+        hub.publish(_frame("red"))
+        assert hub.current()[0] == 1
+        hub.publish(_frame("blue"))
+        assert hub.current()[0] == 2
+        assert hub.get_stats()["unchanged"] == 1
+
+
+class TestEncodeCache:
+
+    def test_one_encode_per_version_and_format(self):
+        hub = FrameHub()
+        hub.publish(_frame("red"))
+        v1, png = hub.encoded("png")
+        assert hub.encoded("png") == (v1, png)
+        hub.encoded("jpeg")
+        hub.publish(_frame("red"))  # Same pixels: cache survives
+        assert hub.encoded("png")[1] is png
+        hub.publish(_frame("green"))
+        v2, png2 = hub.encoded("png")
+        assert v2 == v1 + 1 and png2 != png
+        assert hub.get_stats()["encodes"] == {"png": 2, "jpeg": 1}
+
+    def test_base64_matches_bytes(self):
+        hub = FrameHub()
+        image = _frame("red")
+        hub.publish(image)
+        text = hub.encoded_base64("png", image=image)
+        assert base64.b64decode(text) == hub.encoded("png")[1]
+        assert hub.encoded_base64("png", image=image) is text
+
+    def test_unpublished_image_encoded_uncached(self):
+        hub = FrameHub()
+        hub.publish(_frame("red"))
+        version, data = hub.encoded("png", image=_frame("blue"))
+        assert version == 0 and data.startswith(b"\x89PNG")
+        assert hub.get_stats()["encodes"] == {}
+
+    def test_rejects_unknown_format(self):
+        with pytest.raises(ValueError):
+            FrameHub().encoded("gif")
+
+
+class TestStream:
+
+    async def test_sends_changed_frames_only(self):
+        hub = FrameHub()
+        hub.publish(_frame("red"))
+        stream = hub.stream("png", fps=10)
+        first = await stream.__anext__()
+        assert first.startswith(b"--frame\r\nContent-Type: image/png\r\n")
+        hub.publish(_frame("red"))  # Unchanged: nothing to send
+        nxt = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.15)
+        assert not nxt.done()
+        hub.publish(_frame("blue"))
+        part = await asyncio.wait_for(nxt, 1)
+        _, png = hub.encoded("png")
+        assert part.endswith(png + b"\r\n")
+        await stream.aclose()
+        assert hub.get_stats()["clients"] == 0
+
+    async def test_slow_client_gets_newest_frame(self):
+        hub = FrameHub()
+        hub.publish(_frame("red"))
+        stream = hub.stream("jpeg", fps=10)
+        await stream.__anext__()
+        # Client busy while three frames go by
+        for color in ("green", "blue", "white"):
+            hub.publish(_frame(color))
+            hub.current()
+        part = await asyncio.wait_for(stream.__anext__(), 1)
+        assert part.endswith(hub.encoded("jpeg")[1] + b"\r\n")
+        assert hub.get_stats()["frames_dropped"] == 2
+        await stream.aclose()
+
+    async def test_publish_from_another_thread_wakes_stream(self):
+        hub = FrameHub()
+        stream = hub.stream("png", fps=10)
+        nxt = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.05)
+        await asyncio.to_thread(hub.publish, _frame("red"))
+        assert (await asyncio.wait_for(nxt, 1)).startswith(b"--frame")
+        await stream.aclose()
+
+    async def test_client_limit(self, monkeypatch):
+        monkeypatch.setattr(frame_stream, "MAX_STREAM_CLIENTS", 1)
+        hub = FrameHub()
+        hub.publish(_frame("red"))
+        first = hub.stream("png")
+        await first.__anext__()
+        assert not hub.has_capacity()
+        with pytest.raises(StopAsyncIteration):
+            await hub.stream("png").__anext__()
+        await first.aclose()
+        assert hub.has_capacity()
+        assert MAX_STREAM_CLIENTS > 1
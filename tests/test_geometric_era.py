@@ -0,0 +1,56 @@
+"""Tests for geometric era — shapes are rasterized whole in one canvas call."""
+
+import random
+
+from anima_mcp.display.drawing_engine import CanvasState
+from anima_mcp.display.eras.geometric import GeometricEra
+
+
+def _place(gesture, focus=(120, 120), energy=0.8, seed=3):
+    random.seed(seed)
+    era = GeometricEra()
+    state = era.create_state()
+    state.gesture = gesture
+    canvas = CanvasState()
+    era.place_mark(state, canvas, focus[0], focus[1], 0.7, energy, (200, 120, 40))
+    return canvas
+
+
+def test_circle_is_filled_disc():
+    canvas = _place("circle")
+    xs = [x for x, _ in canvas.pixels]
+    radius = (max(xs) - min(xs)) // 2
+    expected = {(120 + dx, 120 + dy) for dx in range(-radius, radius + 1)
+                for dy in range(-radius, radius + 1) if dx * dx + dy * dy <= radius * radius}
+    assert set(canvas.pixels) == expected
+
+
+def test_gradient_circle_darkens_outward():
+    canvas = _place("gradient_circle")
+    center = canvas.pixels[(120, 120)]
+    edge_x = max(x for x, y in canvas.pixels if y == 120)
+    assert sum(canvas.pixels[(edge_x, 120)]) < sum(center)
+
+
+def test_every_gesture_draws_and_stays_in_bounds():
+    era = GeometricEra()
+    for gesture in era.create_state().gestures():
+        assert len(_place(gesture).pixels) > 0, gesture
+        corner = _place(gesture, focus=(2, 237))  # shapes spill off the canvas here
+        assert all(0 <= x < 240 and 0 <= y < 240 for x, y in corner.pixels), gesture
+
+
+def test_organic_is_seed_reproducible():
+    assert _place("organic", seed=11).pixels == _place("organic", seed=11).pixels
+
+
+def test_mark_uses_one_canvas_call(monkeypatch):
+    calls = []
+    canvas = CanvasState()
+    monkeypatch.setattr(canvas, "draw_pixel", lambda *a: calls.append(a))
+    era = GeometricEra()
+    state = era.create_state()
+    state.gesture = "gradient_circle"
+    era.place_mark(state, canvas, 120, 120, 0.0, 0.9, (10, 20, 30))
+    assert calls == []
+    assert len(canvas.pixels) > 100
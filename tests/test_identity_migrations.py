@@ -0,0 +1,96 @@
+"""Tests for identity.migrations — columnar state_history backfill."""
+
+import json
+import sqlite3
+from datetime import datetime
+
+from anima_mcp.identity.migrations import backfill_state_history_columns, UNPARSEABLE_TS_EPOCH
+from anima_mcp.identity.store import IdentityStore, state_history_is_columnar
+
+
+def _legacy_db(path) -> None:
+    """state_history as written before the typed sensor columns existed."""
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE state_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            warmth REAL,
+            clarity REAL,
+            stability REAL,
+            presence REAL,
+            sensors TEXT DEFAULT '{}'
+        );
+        """
+    )
+    conn.execute(
+        "INSERT INTO state_history (timestamp, warmth, clarity, stability, presence, sensors) "
+        "VALUES (?, 0.5, 0.5, 0.5, 0.5, ?)",
+        ("2026-02-01T10:30:00", json.dumps({
+            "ambient_temp_c": 22.5, "light_lux": 120, "pressure_hpa": 1001.0,
+            "eeg_alpha_power": 0.4, "humidity_pct": None, "interaction_level": 0.3,
+        })),
+    )
+    conn.execute(
+        "INSERT INTO state_history (timestamp, warmth, clarity, stability, presence, sensors) "
+        "VALUES ('not-a-date', 0.5, 0.5, 0.5, 0.5, 'not json')"
+    )
+    conn.commit()
+    conn.close()
+
+
+def _rows(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute("SELECT * FROM state_history ORDER BY id").fetchall()
+    conn.close()
+    return rows
+
+
+class TestStateHistoryBackfill:
+    def test_store_open_backfills_legacy_rows(self, tmp_path):
+        path = tmp_path / "anima.db"
+        _legacy_db(path)
+
+        IdentityStore(db_path=str(path))._connect()
+
+        good, bad = _rows(path)
+        assert good["ts_epoch"] == int(datetime(2026, 2, 1, 10, 30).timestamp())
+        assert good["ambient_temp_c"] == 22.5
+        assert good["light_lux"] == 120.0
+        assert good["pressure_hpa"] == 1001.0
+        assert good["eeg_alpha_power"] == 0.4
+        assert good["humidity_pct"] is None
+        assert json.loads(good["sensors"])["interaction_level"] == 0.3  # blob kept
+        assert bad["ts_epoch"] == UNPARSEABLE_TS_EPOCH
+        assert bad["light_lux"] is None
+
+    def test_backfill_is_one_shot(self, tmp_path):
+        path = tmp_path / "anima.db"
+        _legacy_db(path)
+        IdentityStore(db_path=str(path))._connect()
+
+        conn = sqlite3.connect(path)
+        assert backfill_state_history_columns(conn) == 0
+        conn.close()
+
+    def test_backfill_resumes_in_batches(self, tmp_path):
+        path = tmp_path / "anima.db"
+        _legacy_db(path)
+        store = IdentityStore(db_path=str(path))
+        conn = store._connect()
+        conn.execute("UPDATE state_history SET ts_epoch = NULL")
+        conn.commit()
+
+        assert backfill_state_history_columns(conn, batch_size=1) == 2
+        assert all(r["ts_epoch"] is not None for r in _rows(path))
+
+    def test_columnar_detection(self, tmp_path):
+        path = tmp_path / "anima.db"
+        _legacy_db(path)
+        conn = sqlite3.connect(path)
+        assert state_history_is_columnar(conn) is False
+        IdentityStore(db_path=str(path))._connect()
+        assert state_history_is_columnar(conn) is True
+        conn.close()
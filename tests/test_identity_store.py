@@ -135,6 +135,7 @@ class TestStateHistory:
     def test_record_state(self, store):
         store.wake(CREATURE_ID)
         store.record_state(0.5, 0.6, 0.7, 0.8, {"temp": 25.0})
+        store.flush()
         history = store.get_recent_state_history(limit=5)
         assert len(history) >= 1
 
@@ -142,5 +143,49 @@ class TestStateHistory:
         store.wake(CREATURE_ID)
         for i in range(10):
             store.record_state(0.5, 0.5, 0.5, 0.5, {})
+        store.flush()
         history = store.get_recent_state_history(limit=5)
         assert len(history) <= 5
+
+    def test_reads_do_not_wait_for_queued_writes(self, store, monkeypatch):
+        from anima_mcp import storage
+        store.wake(CREATURE_ID)
+        store.record_state(0.5, 0.5, 0.5, 0.5, {})
+
+        def fail_flush(*args, **kwargs):
+            raise AssertionError("read path flushed the writer queue")
+
+        monkeypatch.setattr(storage, "flush", fail_flush)
+        store.get_recent_state_history(limit=5)
+        store.heartbeat(min_interval_seconds=0)
+        monkeypatch.undo()
+        assert store.flush()
+
+
+class TestStateHistoryColumns:
+    """record_state writes typed sensor columns alongside the JSON blob."""
+
+    def test_record_state_populates_columns(self, store):
+        store.record_state(0.4, 0.5, 0.6, 0.7, {
+            "ambient_temp_c": 21.0, "light_lux": 300.0, "humidity_pct": 40.0,
+            "pressure_hpa": 1012.0, "cpu_temp_c": 50.0, "eeg_gamma_power": 0.1,
+            "undervoltage_now": True,
+        })
+        store.flush()
+        row = store._connect().execute(
+            "SELECT ts_epoch, ambient_temp_c, light_lux, pressure_hpa, eeg_gamma_power, sensors "
+            "FROM state_history"
+        ).fetchone()
+        assert abs(row["ts_epoch"] - time.time()) < 5
+        assert row["ambient_temp_c"] == 21.0
+        assert row["light_lux"] == 300.0
+        assert row["pressure_hpa"] == 1012.0
+        assert row["eeg_gamma_power"] == 0.1
+        assert "undervoltage_now" in row["sensors"]
+
+    def test_record_state_non_numeric_sensor_is_null(self, store):
+        store.record_state(0.4, 0.5, 0.6, 0.7, {"light_lux": "bright", "pressure_hpa": None})
+        store.flush()
+        row = store._connect().execute("SELECT light_lux, pressure_hpa FROM state_history").fetchone()
+        assert row["light_lux"] is None
+        assert row["pressure_hpa"] is None
@@ -247,3 +247,41 @@ class TestPersistence:
         # Path doesn't exist yet — KnowledgeBase should handle gracefully
         kb = KnowledgeBase()
         assert kb.count() == 0
+
+
+class TestSearchIndex:
+    """BM25 index maintained alongside the insights."""
+
+    def test_relevant_insights_use_stems_and_rank(self, kb):
+        _add(kb, "The room lights flicker at night")
+        _add(kb, "Lighting changes make me feel calm, light is good")
+        _add(kb, "Temperature drops in the morning")
+        results = kb.get_relevant_insights("light")
+        assert [r.text for r in results] == [
+            "Lighting changes make me feel calm, light is good",
+            "The room lights flicker at night",
+        ]
+
+    def test_index_persisted_and_trimmed(self, kb, monkeypatch):
+        monkeypatch.setattr(KnowledgeBase, "MAX_INSIGHTS", 2)
+        for word in ("alpha", "bravo", "charlie"):
+            _add(kb, f"{word} insight text")
+        assert kb._index.doc_ids() == {i.insight_id for i in kb._insights}
+
+        kb2 = KnowledgeBase()
+        assert kb2._index.doc_ids() == kb._index.doc_ids()
+        assert len(kb2.get_relevant_insights("insight")) == 2
+
+    def test_reload_only_when_file_changes(self, kb, monkeypatch):
+        _add(kb, "Sound is quiet here")
+        reads = []
+        original = type(kb._knowledge_file).read_text
+        monkeypatch.setattr(type(kb._knowledge_file), "read_text",
+                            lambda self, *a, **k: reads.append(1) or original(self, *a, **k))
+        kb.get_relevant_insights("sound")
+        assert reads == []
+
+        other = KnowledgeBase()
+        _add(other, "Sound travels far at night")
+        assert len(kb.get_relevant_insights("sound")) == 2
+        assert reads
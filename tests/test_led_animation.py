@@ -0,0 +1,187 @@
+"""Tests for the LED animation engine — frame tables, timelines, SPI skipping."""
+
+import math
+from unittest.mock import MagicMock
+
+import pytest
+
+from anima_mcp.display.leds.animation import (
+    AnimationEngine,
+    Frame,
+    PulseTable,
+    combined_period,
+    compile_dance,
+    compile_flash,
+    dotstar_colors,
+)
+from anima_mcp.display.leds.brightness import pulse_at
+from anima_mcp.display.leds.dances import Dance, DanceType, render_dance_at
+from anima_mcp.display.leds.display import LEDDisplay
+from anima_mcp.display.leds.types import LEDState
+
+
+BASE_STATE = LEDState(
+    led0=(200, 130, 45),
+    led1=(180, 147, 81),
+    led2=(200, 125, 42),
+    brightness=0.04,
+)
+COLORS = dotstar_colors(BASE_STATE)
+
+
+def _old_loop_frame(colors, brightness, base, t, cycle=12.0, amount=0.05, floor=0.008):
+    """The per-tick math the animation loop used to run."""
+    brightness = max(floor, brightness)
+    pulse = pulse_at(t, cycle) * amount * min(1.0, max(0.15, brightness / 0.04))
+    pulse = min(pulse, max(0.005, brightness * 0.08))
+    perceptual = max(floor, min(0.5, brightness + pulse))
+    rgb_scale = min(1.0, brightness / base) if base > 0 else 1.0
+    out = []
+    for i, color in enumerate(colors):
+        phase = t * 2 * math.pi / cycle + i * math.pi * 2 / 3
+        mod = (0.92 + 0.08 * math.sin(phase)) * rgb_scale
+        out.append(tuple(max(0, min(255, int(c * mod))) for c in color))
+    return tuple(out), max(floor, perceptual)
+
+
+class TestPulseTable:
+
+    def test_period_covers_both_breaths(self):
+        assert combined_period(12.0) == 36.0
+        assert combined_period(18.0) == 18.0
+
+    @pytest.mark.parametrize("brightness,base", [(0.04, 0.04), (0.02, 0.04), (0.12, 0.12)])
+    def test_matches_old_loop_on_step_boundaries(self, brightness, base):
+        table = PulseTable(COLORS, brightness, base)
+        for k in (0, 7, 100, 333, 719):
+            t = 1_000_080.0 + k * table.step  # 1_000_080 is a multiple of the 36s period
+            colors, hw = _old_loop_frame(COLORS, brightness, base, t)
+            frame = table.frame_at(t)
+            assert frame.brightness == pytest.approx(hw)
+            for got, want in zip(frame.colors, colors):
+                assert all(abs(a - b) <= 1 for a, b in zip(got, want))
+
+    def test_frames_filled_lazily(self):
+        table = PulseTable(COLORS, 0.04, 0.04)
+        assert table.filled == 0
+        table.frame_at(5.0)
+        table.frame_at(5.01)  # same step
+        assert table.filled == 1
+
+    def test_next_change_finds_visible_change(self):
+        table = PulseTable(COLORS, 0.04, 0.04)
+        t = 3.0
+        delay = table.next_change(t, horizon=36.0)
+        assert delay != math.inf
+        before = table.frame_at(t).visible()
+        probe = t
+        while probe + table.step < t + delay:
+            probe += table.step
+            assert table.frame_at(probe).visible() == before
+        assert table.frame_at(t + delay + 1e-6).visible() != before
+
+    def test_constant_output_never_wakes(self):
+        black = ((0, 0, 0),) * 3
+        table = PulseTable(black, 0.04, 0.04)
+        assert table.next_change(0.0) == math.inf
+
+
+class TestFrame:
+
+    def test_visible_matches_driver_scaling(self):
+        frame = Frame(((255, 100, 0), (10, 20, 30), (0, 0, 0)), 0.04)
+        assert frame.visible() == (10, 4, 0, 0, 0, 1, 0, 0, 0)
+
+
+class TestTimelines:
+
+    def test_dance_keyframes_match_render(self):
+        dance = Dance(DanceType.GREETING_FLOURISH, duration=2.5, start_time=100.0)
+        timeline = compile_dance(dance, BASE_STATE)
+        for elapsed in (0.0, 0.4, 1.0, 2.2):
+            expected = dotstar_colors(render_dance_at(dance, BASE_STATE, elapsed))
+            assert timeline.colors_at(100.0 + elapsed + 1e-9) == expected
+        assert timeline.colors_at(102.6) is None
+
+    def test_static_stretches_merged(self):
+        dance = Dance(DanceType.CONTEMPLATIVE_WAVE, duration=4.0, start_time=0.0, intensity=0.0)
+        timeline = compile_dance(dance, BASE_STATE)
+        assert len(timeline.offsets) == 1
+
+    def test_next_keyframe(self):
+        dance = Dance(DanceType.JOY_SPARKLE, duration=2.0, start_time=0.0)
+        timeline = compile_dance(dance, BASE_STATE)
+        # Sparkle phase flips at 0.125s; keyframes land on the 0.05s grid
+        assert timeline.next_keyframe(0.01) == pytest.approx(0.14)
+        assert timeline.next_keyframe(1.99) == pytest.approx(0.01)
+
+
+class TestAnimationEngine:
+
+    def _engine(self):
+        engine = AnimationEngine()
+        engine.set_base(COLORS, 0.04, 0.04)
+        return engine
+
+    def test_table_rebuilt_only_on_change(self):
+        engine = self._engine()
+        assert engine.set_base(COLORS, 0.04, 0.04) is False
+        assert engine.set_base(COLORS, 0.05, 0.04) is True
+        assert engine.table_builds == 2
+
+    def test_commit_skips_identical_frames(self):
+        engine = self._engine()
+        frame = engine.frame_at(10.0)
+        assert engine.commit(frame) is True
+        assert engine.commit(engine.frame_at(10.0)) is False
+        engine.invalidate()
+        assert engine.commit(frame) is True
+        assert engine.frames_skipped == 1
+
+    def test_flash_overrides_dance(self):
+        engine = self._engine()
+        engine.play(compile_dance(Dance(DanceType.PLAYFUL_CHASE, 2.0, start_time=0.0), BASE_STATE))
+        engine.flash(compile_flash((100, 100, 100), 0.5, 0.1))
+        flashed = engine.frame_at(0.55)
+        assert flashed.colors[0][0] == flashed.colors[0][1] == flashed.colors[0][2]
+        assert engine.next_wake(0.55) == engine.step
+        assert engine.frame_at(0.7) != flashed
+        assert engine.frame_at(3.0) == engine._table.frame_at(3.0)  # both layers finished
+        assert engine.get_stats()["dance_active"] is False
+
+    def test_idle_sleep_bounded(self):
+        engine = AnimationEngine()
+        assert engine.next_wake(0.0) == 1.0
+        engine.set_base(((0, 0, 0),) * 3, 0.04, 0.04)
+        assert engine.next_wake(0.0) == 1.0
+
+
+class TestLEDDisplayAnimation:
+
+    def _display(self):
+        display = LEDDisplay(brightness=0.04)
+        display._dots = MagicMock()
+        display._last_state = BASE_STATE
+        display._cached_pipeline_brightness = 0.04
+        display._current_brightness = 0.04
+        return display
+
+    def test_unchanged_frame_skips_spi(self):
+        display = self._display()
+        display._animation_tick(50.0)
+        display._animation_tick(50.0)
+        assert display._dots.show.call_count == 1
+        assert display.get_diagnostics()["animation"]["frames_skipped"] == 1
+
+    def test_tick_returns_sleep_until_change(self):
+        display = self._display()
+        delay = display._animation_tick(50.0)
+        assert display._animation.step <= delay <= 1.0
+
+    def test_set_all_wakes_loop_on_change(self):
+        display = self._display()
+        display._animation_wake.clear()
+        display.set_all(BASE_STATE)
+        assert not display._animation_wake.is_set()
+        display.set_all(LEDState((1, 2, 3), (4, 5, 6), (7, 8, 9), 0.04))
+        assert display._animation_wake.is_set()
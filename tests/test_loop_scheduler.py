@@ -0,0 +1,182 @@
+"""Tests for the display loop's job scheduler."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from anima_mcp.loop_scheduler import MAX_WAIT_ITERATIONS, LoopScheduler
+
+
+def _frame(n=1, **extra):
+    return {"loop_count": n, "anima": object(), **extra}
+
+
+def _sleeper(ms, log=None, name=None):
+    def fn(frame):
+        time.sleep(ms / 1000)
+        if log is not None:
+            log.append((name, frame["loop_count"]))
+    return fn
+
+
+class TestPeriods:
+
+    def test_runs_on_period_only(self):
+        sched = LoopScheduler()
+        calls = []
+        sched.register("a", lambda f: calls.append(f["loop_count"]), period=3, budget_ms=5)
+        for n in range(1, 10):
+            sched.tick(n, _frame(n))
+        assert calls == [3, 6, 9]
+
+    def test_run_first_and_requires(self):
+        sched = LoopScheduler()
+        calls = []
+        sched.register("a", lambda f: calls.append(f["loop_count"]), period=10, budget_ms=5,
+                       requires=("readings",), run_first=True)
+        sched.tick(1, _frame(1, readings=None))
+        sched.tick(1, _frame(1, readings="r"))
+        sched.tick(10, _frame(10, readings="r"))
+        assert calls == [1, 10]
+
+    def test_rejects_bad_registrations(self):
+        sched = LoopScheduler()
+        sched.register("a", lambda f: None, period=1, budget_ms=1)
+        with pytest.raises(ValueError):
+            sched.register("a", lambda f: None, period=1, budget_ms=1)
+        with pytest.raises(ValueError):
+            sched.register("b", lambda f: None, period=0, budget_ms=1)
+
+        async def job(frame):
+            pass
+        with pytest.raises(ValueError):
+            sched.register("c", job, period=1, budget_ms=1, offload=True)
+
+
+class TestFrameBudget:
+
+    def test_coinciding_jobs_spread_over_frames(self):
+        sched = LoopScheduler(frame_budget_ms=15)
+        log = []
+        for name in ("a", "b", "c"):
+            sched.register(name, _sleeper(10, log, name), period=100, budget_ms=10)
+        assert sched.tick(100, _frame(100)) == ["a"]
+        assert sched.tick(101, _frame(101)) == ["b"]
+        assert sched.tick(102, _frame(102)) == ["c"]
+        # Deferred jobs run with the frame they were queued with
+        assert [n for _, n in log] == [100, 100, 100]
+        stats = sched.get_stats()["tasks"]
+        assert stats["c"]["deferrals"] == 2
+
+    def test_priority_then_age(self):
+        sched = LoopScheduler(frame_budget_ms=1)
+        order = []
+        sched.register("low", lambda f: order.append("low"), period=2, budget_ms=5, priority=5)
+        sched.register("high", lambda f: order.append("high"), period=2, budget_ms=5, priority=0)
+        sched.tick(2, _frame(2))
+        sched.tick(3, _frame(3))
+        assert order == ["high", "low"]
+
+    def test_deferral_bounded(self):
+        sched = LoopScheduler(frame_budget_ms=1)
+        sched.register("hog", _sleeper(2), period=1, budget_ms=2, priority=0)
+        sched.register("starved", lambda f: None, period=1000, budget_ms=5, priority=1)
+        ran_at = None
+        for n in range(1000, 1000 + MAX_WAIT_ITERATIONS + 2):
+            if "starved" in sched.tick(n, _frame(n)):
+                ran_at = n
+                break
+        assert ran_at == 1000 + MAX_WAIT_ITERATIONS
+
+    def test_due_while_waiting_is_deadline_miss(self):
+        sched = LoopScheduler(frame_budget_ms=1)
+        sched.register("hog", _sleeper(2), period=1, budget_ms=2, priority=0)
+        seen = []
+        sched.register("fast", lambda f: seen.append(f["loop_count"]), period=1, budget_ms=5, priority=1)
+        sched.tick(1, _frame(1))
+        sched.tick(2, _frame(2))
+        assert sched.get_stats()["tasks"]["fast"]["deadline_misses"] == 1
+
+
+class TestBackgroundJobs:
+
+    async def test_coroutine_job_not_awaited(self):
+        sched = LoopScheduler()
+        release = asyncio.Event()
+        done = []
+
+        async def slow(frame):
+            await release.wait()
+            done.append(frame["loop_count"])
+
+        sched.register("slow", slow, period=1, budget_ms=10)
+        t0 = time.perf_counter()
+        assert sched.tick(1, _frame(1)) == ["slow"]
+        assert time.perf_counter() - t0 < 0.05
+        await asyncio.sleep(0)
+        # Still running when it comes due again: skipped and counted
+        assert sched.tick(2, _frame(2)) == []
+        release.set()
+        await sched.drain(timeout=1)
+        stats = sched.get_stats()["tasks"]["slow"]
+        assert done == [1]
+        assert stats["runs"] == 1 and stats["deadline_misses"] == 1
+        assert stats["mode"] == "async"
+
+    async def test_coroutine_errors_counted(self):
+        sched = LoopScheduler()
+
+        async def broken(frame):
+            raise RuntimeError("boom")
+
+        sched.register("broken", broken, period=1, budget_ms=10)
+        sched.tick(1, _frame(1))
+        await sched.drain(timeout=1)
+        assert sched.get_stats()["tasks"]["broken"]["errors"] == 1
+
+    def test_offloaded_job_runs_on_pool(self):
+        sched = LoopScheduler(pool_workers=1)
+        threads = []
+        finished = threading.Event()
+
+        def job(frame):
+            threads.append(threading.current_thread().name)
+            finished.set()
+
+        sched.register("pooled", job, period=1, budget_ms=10, offload=True)
+        sched.tick(1, _frame(1))
+        assert finished.wait(1)
+        sched.close(wait=True)
+        assert threads[0].startswith("loop-task")
+        assert sched.get_stats()["tasks"]["pooled"]["runs"] == 1
+
+
+class TestStats:
+
+    def test_histogram_and_overruns(self):
+        sched = LoopScheduler()
+        sched.register("slow", _sleeper(3), period=1, budget_ms=1)
+        sched.register("broken", lambda f: 1 / 0, period=1, budget_ms=1)
+        for n in range(1, 4):
+            sched.tick(n, _frame(n))
+        stats = sched.get_stats()
+        slow = stats["tasks"]["slow"]
+        assert slow["runs"] == 3 and slow["overruns"] == 3
+        assert sum(slow["histogram"].values()) == 3
+        assert slow["max_ms"] >= 3
+        assert stats["tasks"]["broken"]["errors"] == 3
+        assert stats["ticks"] == 3
+
+
+class TestRegisteredLoopTasks:
+
+    def test_slow_clock_jobs_registered(self):
+        from anima_mcp.loop_phases import register_loop_tasks
+        sched = LoopScheduler()
+        register_loop_tasks(sched)
+        tasks = sched.get_stats()["tasks"]
+        assert tasks["schema_extraction"]["mode"] == "async"
+        assert tasks["system_metrics"]["mode"] == "inline"
+        assert {"growth", "meta_learning", "self_reflection", "anima_history"} <= set(tasks)
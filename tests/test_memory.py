@@ -225,3 +225,328 @@ class TestLoadPatterns:
         m = AssociativeMemory(db_path="/nonexistent/path.db")
         result = m.load_patterns()
         assert result is False
+
+
+class TestLoadPatternsColumnar:
+    """load_patterns gives the same buckets from typed columns as from JSON."""
+
+    def _legacy_db(self, path, sparse=False):
+        import json
+        import sqlite3
+        from datetime import datetime, timedelta
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE state_history (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, "
+            "warmth REAL, clarity REAL, stability REAL, presence REAL, sensors TEXT DEFAULT '{}')"
+        )
+        base = datetime(2026, 2, 1, 6, 0, 0)
+        for i in range(60):
+            sensors = {"ambient_temp_c": 20.0 + (i % 10), "light_lux": 50.0 * (i % 4 + 1),
+                       "humidity_pct": 35.0 + (i % 3) * 10, "cpu_temp_c": 50.0}
+            if sparse:
+                # Older rows lack some sensors; the JSON path defaults them
+                if i % 4 == 0:
+                    del sensors["light_lux"]
+                if i % 5 == 0:
+                    del sensors["humidity_pct"]
+                if i % 6 == 0:
+                    del sensors["ambient_temp_c"]
+                    sensors["cpu_temp_c"] = 24.0
+            conn.execute(
+                "INSERT INTO state_history (timestamp, warmth, clarity, stability, presence, sensors) "
+                "VALUES (?, ?, 0.6, 0.7, 0.5, ?)",
+                ((base + timedelta(hours=i)).isoformat(), 0.3 + (i % 5) * 0.1, json.dumps(sensors)),
+            )
+        conn.commit()
+        conn.close()
+
+    @pytest.mark.parametrize("sparse", [False, True])
+    def test_columnar_matches_json(self, tmp_path, sparse):
+        from anima_mcp.identity.store import IdentityStore
+        path = str(tmp_path / "anima.db")
+        self._legacy_db(path, sparse=sparse)
+
+        import shutil
+        columnar_path = str(tmp_path / "columnar.db")
+        shutil.copy(path, columnar_path)  # before the legacy load persists its index
+
+        legacy = AssociativeMemory(db_path=path)
+        assert legacy.load_patterns() is True
+
+        IdentityStore(db_path=columnar_path)._connect()  # adds + backfills columns
+        columnar = AssociativeMemory(db_path=columnar_path)
+        assert columnar.load_patterns() is True
+
+        assert columnar._sample_count == legacy._sample_count == 60
+        assert columnar._patterns.keys() == legacy._patterns.keys()
+        for key, outcome in legacy._patterns.items():
+            assert columnar._patterns[key].count == outcome.count
+            assert columnar._patterns[key].warmth_sum == pytest.approx(outcome.warmth_sum)
+        assert columnar._patterns_no_time.keys() == legacy._patterns_no_time.keys()
+
+
+class TestPersistedPatternIndex:
+    """Aggregates are checkpointed so restarts only fold in new rows."""
+
+    def _db(self, path, rows=30):
+        from anima_mcp.identity.store import IdentityStore
+        store = IdentityStore(db_path=path)
+        self._add_rows(store, rows)
+        return store
+
+    def _add_rows(self, store, n, warmth=0.7):
+        for _ in range(n):
+            store.record_state(warmth, 0.6, 0.8, 0.5, {
+                "ambient_temp_c": 24.0, "light_lux": 50.0, "humidity_pct": 45.0,
+            })
+
+    def test_first_load_persists_checkpoint(self, tmp_path):
+        import sqlite3
+        path = str(tmp_path / "anima.db")
+        self._db(path)
+        m = AssociativeMemory(db_path=path)
+        assert m.load_patterns() is True
+
+        conn = sqlite3.connect(path)
+        last_row_id, sample_count = conn.execute(
+            "SELECT last_row_id, sample_count FROM memory_pattern_checkpoint"
+        ).fetchone()
+        count = conn.execute(
+            "SELECT count FROM memory_patterns WHERE time_bucket = '' "
+            "AND temp_bucket = 'comfortable' AND light_bucket = 'dim' AND humidity_bucket = 'moderate'"
+        ).fetchone()[0]
+        conn.close()
+        assert last_row_id == 30
+        assert sample_count == 30
+        assert count == 30
+
+    def test_restart_folds_in_only_new_rows(self, tmp_path):
+        import sqlite3
+        path = str(tmp_path / "anima.db")
+        store = self._db(path)
+        assert AssociativeMemory(db_path=path).load_patterns() is True
+
+        self._add_rows(store, 10, warmth=0.2)
+        # Rows covered by the checkpoint are never re-read
+        conn = sqlite3.connect(path)
+        conn.execute("UPDATE state_history SET warmth = 1.0 WHERE id <= 30")
+        conn.commit()
+        conn.close()
+
+        m = AssociativeMemory(db_path=path)
+        assert m.load_patterns() is True
+        outcome = m._patterns_no_time[("comfortable", "dim", "moderate")]
+        assert m._sample_count == 40
+        assert outcome.count == 40
+        assert outcome.warmth_sum == pytest.approx(30 * 0.7 + 10 * 0.2)
+        assert m.get_stats()["indexed_through_row"] == 40
+
+    def test_bucket_change_rebuilds(self, tmp_path):
+        path = str(tmp_path / "anima.db")
+        self._db(path)
+        assert AssociativeMemory(db_path=path).load_patterns() is True
+
+        class Rebucketed(AssociativeMemory):
+            TEMP_BUCKETS = [(0, 50, "any")]
+
+        m = Rebucketed(db_path=path)
+        assert m.load_patterns() is True
+        assert set(m._patterns_no_time) == {("any", "dim", "moderate")}
+        assert m._sample_count == 30
+
+    def test_checkpoint_without_window_rebuilds(self, tmp_path):
+        import sqlite3
+        path = str(tmp_path / "anima.db")
+        self._db(path)
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE memory_pattern_checkpoint (id INTEGER PRIMARY KEY, last_row_id INTEGER NOT NULL, "
+            "sample_count INTEGER NOT NULL, bucket_signature TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        conn.execute("INSERT INTO memory_pattern_checkpoint VALUES (1, 30, 999, ?, 0)",
+                     (AssociativeMemory(db_path=path)._bucket_signature(),))
+        conn.commit()
+        conn.close()
+
+        m = AssociativeMemory(db_path=path)
+        assert m.load_patterns() is True
+        assert m._sample_count == 30
+
+        reloaded = AssociativeMemory(db_path=path)
+        assert reloaded.load_patterns() is True
+        assert reloaded._sample_count == 30
+
+    def test_record_actual_outcome_updates_and_flushes(self, tmp_path):
+        path = str(tmp_path / "anima.db")
+        self._db(path, rows=20)
+        m = AssociativeMemory(db_path=path)
+        assert m.load_patterns() is True
+        m._flush_every = 3
+
+        for _ in range(3):
+            assert m.anticipate(24.0, 50.0, 45.0, hour=10) is not None
+            m.record_actual_outcome(0.1, 0.6, 0.8, 0.5)
+
+        key = ("comfortable", "dim", "moderate")
+        assert m._patterns_no_time[key].count == 23
+        assert m._patterns[(*key, "morning")].count >= 3
+        assert m.get_stats()["unsaved_outcomes"] == 0
+        assert m.get_stats()["live_outcomes"] == 3
+
+        # Live outcomes are an in-memory overlay; the index holds rows only
+        reloaded = AssociativeMemory(db_path=path)
+        assert reloaded.load_patterns() is True
+        assert reloaded._patterns_no_time[key].count == 20
+        assert reloaded._patterns_no_time[key].warmth_sum == pytest.approx(20 * 0.7)
+        assert reloaded._sample_count == 20
+
+    def test_session_rows_not_counted_twice(self, tmp_path):
+        path = str(tmp_path / "anima.db")
+        store = self._db(path, rows=20)
+        m = AssociativeMemory(db_path=path)
+        assert m.load_patterns() is True
+        m._flush_every = 3
+
+        # Each tick writes a state row and learns the same outcome live
+        for _ in range(3):
+            assert m.anticipate(24.0, 50.0, 45.0, hour=10) is not None
+            self._add_rows(store, 1, warmth=0.1)
+            m.record_actual_outcome(0.1, 0.6, 0.8, 0.5)
+        assert m.get_stats()["indexed_through_row"] == 23
+
+        key = ("comfortable", "dim", "moderate")
+        for _ in range(2):  # Repeated restarts stay stable
+            reloaded = AssociativeMemory(db_path=path)
+            assert reloaded.load_patterns() is True
+            assert reloaded._patterns_no_time[key].count == 23
+            assert reloaded._sample_count == 23
+
+    def test_outcomes_between_rows_not_persisted(self, tmp_path):
+        path = str(tmp_path / "anima.db")
+        store = self._db(path, rows=20)
+        m = AssociativeMemory(db_path=path)
+        assert m.load_patterns() is True
+        m._flush_every = 5
+
+        # Outcomes fire every tick, rows only on some of them
+        for tick in range(10):
+            assert m.anticipate(24.0, 50.0, 45.0, hour=10) is not None
+            if tick % 5 == 0:
+                self._add_rows(store, 1, warmth=0.1)
+            m.record_actual_outcome(0.1, 0.6, 0.8, 0.5)
+        self._add_rows(store, 1, warmth=0.1)
+        m.flush_pattern_index()
+
+        reloaded = AssociativeMemory(db_path=path)
+        assert reloaded.load_patterns() is True
+        key = ("comfortable", "dim", "moderate")
+        assert reloaded._patterns_no_time[key].count == 23
+        assert reloaded._patterns_no_time[key].warmth_sum == pytest.approx(20 * 0.7 + 3 * 0.1)
+
+    def test_window_evicts_oldest_rows(self, tmp_path):
+        path = str(tmp_path / "anima.db")
+        store = self._db(path, rows=10)
+        m = AssociativeMemory(db_path=path)
+        assert m.load_patterns(max_records=10) is True
+
+        self._add_rows(store, 4, warmth=0.2)
+        assert m.flush_pattern_index() is True
+        key = ("comfortable", "dim", "moderate")
+        assert m._patterns_no_time[key].count == 10
+        assert m._patterns_no_time[key].warmth_sum == pytest.approx(6 * 0.7 + 4 * 0.2)
+
+        reloaded = AssociativeMemory(db_path=path)
+        assert reloaded.load_patterns(max_records=10) is True
+        assert reloaded._sample_count == 10
+        assert reloaded._patterns_no_time[key].warmth_sum == pytest.approx(6 * 0.7 + 4 * 0.2)
+
+    def test_flush_memory_checkpoints_new_rows(self, tmp_path, monkeypatch):
+        import anima_mcp.memory as memory_module
+        path = str(tmp_path / "anima.db")
+        store = self._db(path, rows=20)
+        m = AssociativeMemory(db_path=path)
+        assert m.load_patterns() is True
+        monkeypatch.setattr(memory_module, "_memory", m)
+
+        assert m.anticipate(24.0, 50.0, 45.0, hour=10) is not None
+        m.record_actual_outcome(0.1, 0.6, 0.8, 0.5)
+        assert m.get_stats()["unsaved_outcomes"] == 1
+        assert memory_module.flush_memory() is False  # No new rows to index
+
+        self._add_rows(store, 2)
+        assert memory_module.flush_memory() is True
+        assert m.get_stats()["indexed_through_row"] == 22
+
+        reloaded = AssociativeMemory(db_path=path)
+        assert reloaded.load_patterns() is True
+        assert reloaded._patterns_no_time[("comfortable", "dim", "moderate")].count == 22
+
+    def test_flush_memory_without_memory_is_noop(self, monkeypatch):
+        import anima_mcp.memory as memory_module
+        monkeypatch.setattr(memory_module, "_memory", None)
+        assert memory_module.flush_memory() is False
+
+    def test_outcome_without_anticipated_bucket_not_learned(self, memory):
+        memory._last_anticipation = Anticipation(
+            warmth=0.5, clarity=0.5, stability=0.5, presence=0.5,
+            confidence=0.5, sample_count=10, bucket_description="test")
+        memory.record_actual_outcome(0.5, 0.5, 0.5, 0.5)
+        assert memory._sample_count == 0
+        assert memory._pending_outcomes == []
+
+
+class TestAnticipationCache:
+    """anticipate() memoizes per (temp, light, humidity, time) bucket."""
+
+    def test_repeat_lookup_hits_cache(self):
+        m = _populated_memory()
+        first = m.anticipate(24.0, 50.0, 45.0, hour=10)
+        second = m.anticipate(23.5, 60.0, 50.0, hour=11)  # same buckets
+        assert second is first
+        stats = m.get_stats()["anticipation_cache"]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.5)
+
+    def test_different_time_bucket_misses(self):
+        m = _populated_memory()
+        m.anticipate(24.0, 50.0, 45.0, hour=10)
+        m.anticipate(24.0, 50.0, 45.0, hour=15)
+        assert m.get_anticipation_cache_stats()["misses"] == 2
+
+    def test_negative_result_cached(self, memory):
+        assert memory.anticipate(24.0, 50.0, 45.0, hour=10) is None
+        assert memory.anticipate(24.0, 50.0, 45.0, hour=10) is None
+        assert memory.get_anticipation_cache_stats()["hits"] == 1
+
+    def test_flushed_outcomes_invalidate(self, tmp_path):
+        m = _populated_memory(count=20, warmth=0.7)
+        m.db_path = str(tmp_path / "anima.db")
+        m._flush_every = 5
+        before = m.anticipate(24.0, 50.0, 45.0, hour=10)
+        for _ in range(4):
+            m.record_actual_outcome(0.2, 0.6, 0.8, 0.5)
+            assert m.anticipate(24.0, 50.0, 45.0, hour=10) is before
+        m.record_actual_outcome(0.2, 0.6, 0.8, 0.5)  # triggers checkpoint
+
+        after = m.anticipate(24.0, 50.0, 45.0, hour=10)
+        assert after is not before
+        # The five live outcomes now form a usable morning bucket
+        assert after.sample_count == 5
+        assert after.warmth == pytest.approx(0.2)
+        assert m._patterns_no_time[("comfortable", "dim", "moderate")].count == 25
+
+    def test_ttl_expiry_recomputes(self):
+        m = _populated_memory()
+        m._anticipation_cache_ttl = 0.0
+        m.anticipate(24.0, 50.0, 45.0, hour=10)
+        m.anticipate(24.0, 50.0, 45.0, hour=10)
+        assert m.get_anticipation_cache_stats()["misses"] == 2
+
+    def test_lru_bounded(self):
+        m = _populated_memory()
+        m._anticipation_cache_size = 2
+        for hour in (2, 6, 10):
+            m.anticipate(24.0, 50.0, 45.0, hour=hour)
+        assert len(m._anticipation_cache) == 2
+        assert ("comfortable", "dim", "moderate", "night") not in m._anticipation_cache
@@ -153,6 +153,39 @@ class TestMemoryRetrieverLocalKnowledge:
         hits = r._search_local_knowledge(["stable"])
         assert len(hits) == 1
 
+    def test_search_local_knowledge_ranked_and_cached(self, tmp_path, monkeypatch):
+        anima = tmp_path / ".anima"
+        anima.mkdir()
+        path = anima / "knowledge.json"
+        path.write_text(json.dumps({"insights": [
+            {"insight_id": "a", "text": "lights dim in the evening", "category": "sensations"},
+            {"insight_id": "b", "text": "bright light, then more light", "category": "sensations"},
+            {"insight_id": "c", "text": "visitors ask questions", "category": "relationships"},
+        ]}))
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        r = MemoryRetriever()
+        hits = r._search_local_knowledge(["light"])
+        assert [h.memory_id for h in hits] == ["b", "a"]
+        assert hits[0].relevance_score > hits[1].relevance_score
+        index = r._local_index[2]
+        r._search_local_knowledge(["visitor"])
+        assert r._local_index[2] is index
+
+
+    def test_weak_local_match_not_highly_relevant(self, tmp_path, monkeypatch):
+        anima = tmp_path / ".anima"
+        anima.mkdir()
+        (anima / "knowledge.json").write_text(json.dumps({"insights": [
+            {"insight_id": str(n), "text": f"note {n} about the room", "category": "meta"}
+            for n in range(20)
+        ] + [{"insight_id": "w", "text": "warm afternoon light on the wall", "category": "sensations"}]}))
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        r = MemoryRetriever()
+        hits = r._search_local_knowledge(["warm", "lonely", "quiet"])
+        assert [h.memory_id for h in hits] == ["w"]
+        assert hits[0].relevance_score < 0.7
+        assert "possibly relevant" in r.format_for_context(hits)
+
 
 class TestMemoryRetrieverAsync:
     @pytest.mark.asyncio
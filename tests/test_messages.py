@@ -84,6 +84,29 @@ class TestObservationDedup:
         r2 = board.add_observation("second observation")
         assert r2 is not None
 
+    def _age_observations(self, board, seconds=400):
+        for m in board._messages:
+            if m.msg_type == MESSAGE_TYPE_OBSERVATION:
+                m.timestamp -= seconds
+
+    def test_repeat_older_than_recent_window_caught(self, board):
+        """A near-repeat is rejected even when 15+ observations came since."""
+        board.add_observation("the morning light feels warm on the desk")
+        for i in range(20):
+            self._age_observations(board)
+            board.add_message(f"unrelated note {i} about sensor{i}", MESSAGE_TYPE_OBSERVATION)
+        self._age_observations(board)
+        assert board.add_observation("warm morning lights on my desk") is None
+        assert board.add_observation("visitors asked about music today") is not None
+
+    def test_index_follows_trim_and_reload(self, board, isolated_board):
+        for i in range(board.MAX_OBSERVATIONS + 5):
+            board.add_message(f"obs{i} token{i}", MESSAGE_TYPE_OBSERVATION)
+        kept = {m.message_id for m in board._messages}
+        assert board._observation_index.doc_ids() == kept
+        board2 = MessageBoard()
+        assert board2._observation_index.doc_ids() == kept
+
 
 class TestQuestions:
     def test_add_question(self, board):
@@ -104,12 +127,47 @@ class TestQuestions:
         unanswered = board.get_unanswered_questions(auto_expire=False)
         assert any(m.message_id == q.message_id for m in unanswered)
 
+    def test_similar_question_rejected_beyond_last_twenty(self, board):
+        board.add_question("What connects the light and my warmth?")
+        for i in range(25):
+            for m in board._messages:
+                m.timestamp -= 200
+            board.add_message(f"filler question {i} q{i}?", MESSAGE_TYPE_QUESTION)
+        for m in board._messages:
+            m.timestamp -= 200
+        assert board.add_question("What connects sound and stillness?") is None
+
+    def test_unanswered_questions_deduplicated(self, board):
+        first = board.add_message("Why is it dark?", MESSAGE_TYPE_QUESTION)
+        other = board.add_message("What is music?", MESSAGE_TYPE_QUESTION)
+        repeat = board.add_message("why is it dark", MESSAGE_TYPE_QUESTION)
+        ids = [m.message_id for m in board.get_unanswered_questions(auto_expire=False)]
+        assert ids == [other.message_id, repeat.message_id]
+        assert first.message_id not in ids
+
     def test_answering_removes_from_unanswered(self, board):
         q = board.add_question("Will someone answer?")
         board.add_agent_message("Yes!", agent_name="helper", responds_to=q.message_id)
         unanswered = board.get_unanswered_questions(auto_expire=False)
         assert not any(m.message_id == q.message_id for m in unanswered)
 
+    def test_state_snapshots_reuse_one_shm_client(self, board, monkeypatch):
+        import anima_mcp.shared_memory as shm_module
+        created = []
+
+        class FakeClient:
+            def __init__(self, **kwargs):
+                created.append(kwargs)
+
+            def read(self):
+                return {"anima": {"warmth": 0.5, "clarity": 0.6, "stability": 0.7, "presence": 0.8}}
+
+        monkeypatch.setattr(msg_module, "_snapshot_client", None)
+        monkeypatch.setattr(shm_module, "SharedMemoryClient", FakeClient)
+        for _ in range(3):
+            assert board._capture_anima_snapshot()["presence"] == 0.8
+        assert len(created) == 1
+
 
 class TestTrimming:
     def test_observations_trimmed(self, board):
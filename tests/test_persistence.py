@@ -0,0 +1,114 @@
+"""Tests for the coalescing write-behind persistence manager."""
+
+import json
+import threading
+
+import pytest
+
+from anima_mcp.persistence import PersistenceManager
+
+
+def _counting_snapshot(data, calls):
+    def snapshot():
+        calls.append(1)
+        return dict(data)
+    return snapshot
+
+
+class TestWriteThrough:
+
+    def test_writes_immediately_when_not_running(self, tmp_path):
+        mgr = PersistenceManager()
+        path = tmp_path / "state.json"
+        mgr.mark_dirty(path, lambda: {"a": 1}, indent=2)
+        assert json.loads(path.read_text()) == {"a": 1}
+        stats = mgr.get_stats()["files"][str(path)]
+        assert stats["writes"] == 1 and stats["bytes_written"] == path.stat().st_size
+
+    def test_errors_raise_when_not_running(self, tmp_path):
+        mgr = PersistenceManager()
+
+        def broken():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            mgr.mark_dirty(tmp_path / "x.json", broken)
+        assert mgr.get_stats()["files"][str(tmp_path / "x.json")]["errors"] == 1
+
+
+class TestCoalescing:
+
+    def test_marks_within_window_make_one_write(self, tmp_path):
+        mgr = PersistenceManager(window_s=60)
+        mgr.start()
+        path = tmp_path / "state.json"
+        calls = []
+        data = {}
+        for i in range(50):
+            data["n"] = i
+            mgr.mark_dirty(path, _counting_snapshot(data, calls))
+        assert not path.exists()
+        mgr.stop()
+        assert json.loads(path.read_text()) == {"n": 49}
+        assert calls == [1]
+        stats = mgr.get_stats()["files"][str(path)]
+        assert stats["writes"] == 1 and stats["marks"] == 50 and stats["coalesced"] == 49
+
+    def test_writer_thread_flushes_after_window(self, tmp_path):
+        mgr = PersistenceManager(window_s=0.05)
+        mgr.start()
+        written = threading.Event()
+        threads = []
+
+        def snapshot():
+            threads.append(threading.current_thread().name)
+            written.set()
+            return {"ok": True}
+
+        mgr.mark_dirty(tmp_path / "a.json", snapshot)
+        mgr.mark_dirty(tmp_path / "b.json", lambda: [1, 2])
+        assert written.wait(2)
+        mgr.stop()
+        assert threads == ["persistence"]
+        assert json.loads((tmp_path / "b.json").read_text()) == [1, 2]
+        assert mgr.get_stats()["flushes"] >= 1
+
+    def test_background_errors_logged_not_raised(self, tmp_path, capsys):
+        mgr = PersistenceManager(window_s=60)
+        mgr.start()
+
+        def broken():
+            raise RuntimeError("dict changed size during iteration")
+
+        mgr.mark_dirty(tmp_path / "x.json", broken)
+        mgr.mark_dirty(tmp_path / "y.json", lambda: {"fine": 1})
+        mgr.stop()
+        assert "Write failed for x.json" in capsys.readouterr().err
+        assert (tmp_path / "y.json").exists()
+
+    def test_stop_is_idempotent_and_restores_write_through(self, tmp_path):
+        mgr = PersistenceManager(window_s=60)
+        mgr.start()
+        mgr.stop()
+        mgr.stop()
+        assert not mgr.running
+        mgr.mark_dirty(tmp_path / "now.json", lambda: 1)
+        assert (tmp_path / "now.json").exists()
+
+
+class TestComponents:
+
+    def test_preferences_save_is_deferred_while_running(self, tmp_path, monkeypatch):
+        import anima_mcp.persistence as persistence
+        from anima_mcp.preferences import PreferenceSystem
+
+        mgr = PersistenceManager(window_s=60)
+        monkeypatch.setattr(persistence, "_manager", mgr)
+        prefs = PreferenceSystem(persistence_path=tmp_path / "preferences.json")
+        mgr.start()
+        prefs._save()
+        prefs._save()
+        assert not (tmp_path / "preferences.json").exists()
+        mgr.stop()
+        assert "preferences" in json.loads((tmp_path / "preferences.json").read_text())
+        assert mgr.get_stats()["files"][str(tmp_path / "preferences.json")]["writes"] == 1
@@ -0,0 +1,178 @@
+"""Tests for display/pixel_grid.py -- buffer-backed canvas pixel mapping."""
+
+import pytest
+from PIL import Image
+
+from anima_mcp.display.pixel_grid import PixelGrid
+
+
+class TestMappingInterface:
+    """PixelGrid behaves like the dict it replaces."""
+
+    def test_set_get_contains(self):
+        g = PixelGrid(10, 10)
+        g[(3, 4)] = (10, 20, 30)
+        assert (3, 4) in g
+        assert (4, 3) not in g
+        assert g[(3, 4)] == (10, 20, 30)
+        assert len(g) == 1
+
+    def test_overwrite_does_not_double_count(self):
+        g = PixelGrid(10, 10)
+        g[(1, 1)] = (1, 1, 1)
+        g[(1, 1)] = (2, 2, 2)
+        assert len(g) == 1
+        assert g[(1, 1)] == (2, 2, 2)
+
+    def test_missing_and_out_of_bounds(self):
+        g = PixelGrid(10, 10)
+        with pytest.raises(KeyError):
+            g[(0, 0)]
+        with pytest.raises(KeyError):
+            g[(10, 0)] = (1, 2, 3)
+        assert (-1, 0) not in g
+        assert "nope" not in g
+        assert g.get((5, 5)) is None
+
+    def test_delete(self):
+        g = PixelGrid(10, 10)
+        g[(2, 2)] = (9, 9, 9)
+        del g[(2, 2)]
+        assert len(g) == 0
+        assert (2, 2) not in g
+        with pytest.raises(KeyError):
+            del g[(2, 2)]
+
+    def test_iteration_row_major_and_dict_equality(self):
+        g = PixelGrid(10, 10)
+        g[(5, 1)] = (1, 2, 3)
+        g[(2, 0)] = (4, 5, 6)
+        g[(0, 9)] = (7, 8, 9)
+        assert list(g) == [(2, 0), (5, 1), (0, 9)]
+        assert g == {(2, 0): (4, 5, 6), (5, 1): (1, 2, 3), (0, 9): (7, 8, 9)}
+        assert dict(g.items())[(0, 9)] == (7, 8, 9)
+
+    def test_colors_clamped(self):
+        g = PixelGrid(4, 4)
+        g[(0, 0)] = (300, -5, 12.7)
+        assert g[(0, 0)] == (255, 0, 12)
+
+    def test_clear_and_truthiness(self):
+        g = PixelGrid(4, 4)
+        assert not g
+        g[(0, 0)] = (1, 1, 1)
+        assert g
+        g.clear()
+        assert not g
+        assert g.to_image().getpixel((0, 0)) == (0, 0, 0)
+
+    def test_version_bumps_on_change(self):
+        g = PixelGrid(4, 4)
+        v = g.version
+        g[(0, 0)] = (1, 1, 1)
+        assert g.version > v
+
+
+class TestImageInterop:
+    """PIL views over the buffers."""
+
+    def test_to_image_reflects_pixels(self):
+        g = PixelGrid(8, 8)
+        g[(3, 5)] = (200, 100, 50)
+        img = g.to_image()
+        assert img.size == (8, 8)
+        assert img.getpixel((3, 5)) == (200, 100, 50)
+        assert img.getpixel((0, 0)) == (0, 0, 0)
+
+    def test_paste_onto_keeps_background(self):
+        g = PixelGrid(8, 8)
+        g[(1, 1)] = (255, 0, 0)
+        bg = Image.new("RGB", (8, 8), (9, 9, 9))
+        g.paste_onto(bg)
+        assert bg.getpixel((1, 1)) == (255, 0, 0)
+        assert bg.getpixel((2, 2)) == (9, 9, 9)
+
+    def test_drawing_on_view_does_not_touch_grid(self):
+        from PIL import ImageDraw
+        g = PixelGrid(8, 8)
+        img = g.to_image()
+        ImageDraw.Draw(img).point((4, 4), fill=(1, 2, 3))
+        assert (4, 4) not in g
+        assert g.to_image().getpixel((4, 4)) == (0, 0, 0)
+
+
+class TestPngPersistence:
+    """RGBA PNG round trip (alpha = occupancy)."""
+
+    def test_round_trip_keeps_black_pixels(self, tmp_path):
+        g = PixelGrid(16, 16)
+        g[(0, 0)] = (0, 0, 0)  # set-but-black is distinct from unset
+        g[(15, 15)] = (12, 34, 56)
+        path = tmp_path / "pixels.png"
+        g.save_png(path)
+
+        g2 = PixelGrid(16, 16)
+        assert g2.load_png(path) == 2
+        assert g2 == g
+        assert (1, 1) not in g2
+
+    def test_size_mismatch_rejected(self, tmp_path):
+        path = tmp_path / "pixels.png"
+        PixelGrid(8, 8).save_png(path)
+        with pytest.raises(ValueError):
+            PixelGrid(16, 16).load_png(path)
+
+
+class TestCompositionAggregates:
+    """Quadrant/density/color counters stay equal to a full recount."""
+
+    def _brute(self, g):
+        from anima_mcp.display.pixel_grid import DENSITY_GRID, color_bin
+        quads = [0, 0, 0, 0]
+        cells = [[0] * DENSITY_GRID for _ in range(DENSITY_GRID)]
+        colors = [0] * 64
+        for (x, y), (r, gg, b) in g.items():
+            quads[(x >= g.width // 2) + 2 * (y >= g.height // 2)] += 1
+            cells[y * DENSITY_GRID // g.height][x * DENSITY_GRID // g.width] += 1
+            colors[color_bin(r, gg, b)] += 1
+        return tuple(quads), cells, colors
+
+    def _check(self, g):
+        quads, cells, colors = self._brute(g)
+        assert g.quadrant_counts() == quads
+        assert g.density_grid() == cells
+        assert g.color_histogram() == colors
+
+    def test_single_writes_overwrites_and_deletes(self):
+        g = PixelGrid(240, 240)
+        g[(10, 10)] = (255, 0, 0)
+        g[(200, 10)] = (0, 255, 0)
+        g[(10, 10)] = (0, 0, 255)  # overwrite moves the color bin, not the quadrant
+        g[(230, 230)] = (40, 40, 40)
+        del g[(200, 10)]
+        self._check(g)
+        assert g.quadrant_counts() == (1, 0, 0, 1)
+
+    def test_batch_writes_with_repeats(self):
+        import random
+        rng = random.Random(5)
+        g = PixelGrid(240, 240)
+        for _ in range(5):
+            xs = [rng.randint(-5, 245) for _ in range(400)]
+            ys = [rng.randint(-5, 245) for _ in range(400)]
+            cols = [(rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)) for _ in range(400)]
+            g.set_many(xs + xs[:40], ys + ys[:40], cols + cols[:40][::-1])
+            g.set_many(xs[:10], ys[:10], (1, 2, 3))  # small batch: plain loop
+            self._check(g)
+
+    def test_clear_and_load_png(self, tmp_path):
+        g = PixelGrid(16, 16)
+        g.set_many(list(range(16)), list(range(16)), (200, 10, 10))
+        path = tmp_path / "p.png"
+        g.save_png(path)
+        g.clear()
+        assert g.quadrant_counts() == (0, 0, 0, 0)
+        assert sum(g.color_histogram()) == 0
+        g.load_png(path)
+        self._check(g)
+        assert g.quadrant_counts() == (8, 0, 0, 8)
@@ -429,6 +429,14 @@ class TestPilRendererClear:
         renderer.show_default()
         assert renderer._image is not None
 
+    def test_show_default_published_to_frame_hub(self, renderer, monkeypatch):
+        from anima_mcp.display import frame_stream
+        hub = frame_stream.FrameHub()
+        monkeypatch.setattr(frame_stream, "_hub", hub)
+        renderer._display = MagicMock()
+        renderer.show_default()
+        assert hub.current() == (1, renderer._image)
+
 
 class TestPilRendererDisplayRecovery:
     """Test display recovery/reinit logic."""
@@ -523,3 +531,93 @@ class TestGetDisplay:
         with patch.object(PilRenderer, '__init__', return_value=None):
             result = get_display()
             assert isinstance(result, PilRenderer)
+
+
+# ---------------------------------------------------------------------------
+# Delta SPI push
+# ---------------------------------------------------------------------------
+
+class _FakeST7789:
+    """Records address-window writes like adafruit_rgb_display's _block."""
+
+    def __init__(self, width=240, height=240, rotation=180):
+        self.width = width
+        self.height = height
+        self.rotation = rotation
+        self.blocks = []
+        self.images = []
+
+    def image(self, img):
+        self.images.append(img)
+
+    def _block(self, x0, y0, x1, y1, data):
+        self.blocks.append((x0, y0, x1, y1, len(data)))
+
+
+class TestPilRendererDeltaPush:
+    """Frames are diffed against the last push; only changed windows hit SPI."""
+
+    @pytest.fixture(autouse=True)
+    def _require_numpy(self):
+        from anima_mcp.display import renderer as renderer_module
+        if not renderer_module.HAS_NUMPY:
+            pytest.skip("numpy not available")
+
+    def _push(self, renderer, image):
+        renderer._image = image
+        renderer._push_to_display()
+
+    def test_first_push_is_full_frame(self, renderer):
+        renderer._display = _FakeST7789()
+        self._push(renderer, Image.new("RGB", (240, 240), (10, 20, 30)))
+        assert renderer._display.blocks == [(0, 0, 239, 239, 240 * 240 * 2)]
+        stats = renderer.get_push_stats()
+        assert stats["full_frames"] == 1
+        assert stats["bytes_pushed"] == 240 * 240 * 2
+
+    def test_unchanged_frame_skips_spi(self, renderer):
+        renderer._display = _FakeST7789()
+        self._push(renderer, Image.new("RGB", (240, 240), (10, 20, 30)))
+        self._push(renderer, Image.new("RGB", (240, 240), (10, 20, 30)))
+        assert len(renderer._display.blocks) == 1
+        stats = renderer.get_push_stats()
+        assert stats["frames_skipped"] == 1
+        assert stats["last_frame"] == {"windows": 0, "bytes_pushed": 0, "bytes_skipped": 240 * 240 * 2}
+
+    def test_small_change_sends_window_in_panel_orientation(self, renderer):
+        renderer._display = _FakeST7789(rotation=180)
+        base = Image.new("RGB", (240, 240), BLACK)
+        self._push(renderer, base)
+
+        changed = base.copy()
+        ImageDraw.Draw(changed).rectangle([10, 20, 19, 24], fill=WHITE)  # 10x5 px
+        self._push(renderer, changed)
+
+        # Rotated 180 degrees: x 10..19 -> 220..229, y 20..24 -> 215..219
+        assert renderer._display.blocks[-1] == (220, 215, 229, 219, 10 * 5 * 2)
+        stats = renderer.get_push_stats()
+        assert stats["partial_frames"] == 1
+        assert stats["last_frame"]["bytes_skipped"] == 240 * 240 * 2 - 100
+        assert stats["skip_ratio"] > 0.4
+
+    def test_large_change_sends_full_frame(self, renderer):
+        renderer._display = _FakeST7789()
+        self._push(renderer, Image.new("RGB", (240, 240), BLACK))
+        self._push(renderer, Image.new("RGB", (240, 240), WHITE))
+        assert renderer._display.blocks[-1] == (0, 0, 239, 239, 240 * 240 * 2)
+
+    def test_direct_image_push_forces_full_frame(self, renderer):
+        renderer._display = _FakeST7789()
+        self._push(renderer, Image.new("RGB", (240, 240), BLACK))
+        renderer.blank()
+        self._push(renderer, Image.new("RGB", (240, 240), BLACK))
+        assert len(renderer._display.blocks) == 2
+        assert renderer._display.blocks[-1][4] == 240 * 240 * 2
+
+    def test_driver_without_windows_falls_back_to_image(self, renderer):
+        renderer._display = MagicMock()
+        img = Image.new("RGB", (240, 240), (1, 2, 3))
+        self._push(renderer, img)
+        self._push(renderer, img.copy())
+        renderer._display.image.assert_called_once()
+        assert renderer.get_push_stats()["frames_skipped"] == 1
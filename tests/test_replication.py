@@ -0,0 +1,225 @@
+"""Tests for incremental anima.db replication."""
+
+import sqlite3
+
+import pytest
+
+from anima_mcp import replication
+from anima_mcp.identity.store import IdentityStore
+from anima_mcp.replication import (
+    DirectoryTransport,
+    ReplicationError,
+    apply_batch,
+    decode_batch,
+    encode_batch,
+    export_batch,
+    pull,
+    push,
+    verify,
+)
+
+CREATURE_ID = "replication-test"
+
+
+def _record(store, n, start=0):
+    for i in range(start, start + n):
+        store.record_state(0.1 * (i % 10), 0.5, 0.5, 0.5, {"light_lux": float(i)})
+    store.close()
+
+
+def _count(db_path, table):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def pi(tmp_path):
+    """Source database in a peer directory, with an identity and some history."""
+    peer_dir = tmp_path / "pi"
+    peer_dir.mkdir()
+    store = IdentityStore(db_path=str(peer_dir / "anima.db"))
+    store.wake(CREATURE_ID)
+    _record(store, 25)
+    return peer_dir, store
+
+
+class TestPull:
+
+    def test_first_pull_copies_history_and_state(self, pi, tmp_path):
+        peer_dir, _ = pi
+        local = tmp_path / "backup.db"
+        applied = pull(local, DirectoryTransport(peer_dir), limit=10)
+        assert applied["state_history"] == 25
+        assert applied["identity"] == 1
+        assert _count(local, "state_history") == 25
+        assert _count(local, "events") == _count(peer_dir / "anima.db", "events")
+
+    def test_second_pull_ships_only_new_rows(self, pi, tmp_path):
+        peer_dir, store = pi
+        local = tmp_path / "backup.db"
+        transport = DirectoryTransport(peer_dir)
+        _record(store, 500, start=25)
+        pull(local, transport)
+        first_bytes = transport.bytes_received
+
+        _record(store, 3, start=525)
+        transport.bytes_received = 0
+        applied = pull(local, transport)
+        assert applied == {"state_history": 3}
+        assert transport.bytes_received < first_bytes / 10
+        assert _count(local, "state_history") == 528
+
+        # Nothing new: empty batch, unchanged snapshot tables not resent
+        assert pull(local, transport) == {}
+
+    def test_rows_pruned_at_source_stay_in_replica(self, pi, tmp_path):
+        peer_dir, _ = pi
+        local = tmp_path / "backup.db"
+        transport = DirectoryTransport(peer_dir)
+        pull(local, transport)
+        conn = sqlite3.connect(str(peer_dir / "anima.db"))
+        conn.execute("DELETE FROM state_history WHERE id <= 10")
+        conn.commit()
+        conn.close()
+        pull(local, transport)
+        assert _count(local, "state_history") == 25
+        assert all(r["match"] for r in verify(local, transport).values())
+
+    def test_insert_only_growth_tables_ship_new_rows(self, pi, tmp_path):
+        peer_dir, _ = pi
+        conn = sqlite3.connect(str(peer_dir / "anima.db"))
+        for table in ("drawing_records", "trajectory_events"):
+            conn.execute(f"CREATE TABLE {table} (id INTEGER PRIMARY KEY AUTOINCREMENT, value REAL)")
+            conn.executemany(f"INSERT INTO {table} (value) VALUES (?)", [(float(i),) for i in range(50)])
+        conn.commit()
+
+        local = tmp_path / "backup.db"
+        transport = DirectoryTransport(peer_dir)
+        pull(local, transport)
+        for table in ("drawing_records", "trajectory_events"):
+            conn.execute(f"INSERT INTO {table} (value) VALUES (-1.0)")
+        conn.commit()
+        conn.close()
+
+        replica = replication._connect(local)
+        marks = replication.get_marks(replica)
+        replica.close()
+        batch = decode_batch(transport.call("export", {"marks": marks}))
+        assert {t: e["mode"] for t, e in batch["tables"].items()} == {
+            "drawing_records": "append", "trajectory_events": "append"}
+        assert pull(local, transport) == {"drawing_records": 1, "trajectory_events": 1}
+        assert _count(local, "drawing_records") == 51
+
+    def test_changed_mutable_table_resent_whole(self, pi, tmp_path):
+        peer_dir, store = pi
+        local = tmp_path / "backup.db"
+        transport = DirectoryTransport(peer_dir)
+        pull(local, transport)
+        store.set_name("Lumen", sync_to_unitares=False)
+        store.close()
+        applied = pull(local, transport)
+        assert applied.get("identity") == 1
+        conn = sqlite3.connect(str(local))
+        assert conn.execute("SELECT name FROM identity").fetchone()[0] == "Lumen"
+        conn.close()
+
+
+class TestBatches:
+
+    def test_corrupted_batch_rejected_without_changes(self, pi, tmp_path):
+        peer_dir, _ = pi
+        source = replication._connect(peer_dir / "anima.db")
+        batch = export_batch(source, {})
+        source.close()
+        batch["tables"]["state_history"]["rows"][0][2] = 99.0
+        local = replication._connect(tmp_path / "backup.db")
+        with pytest.raises(ReplicationError, match="state_history"):
+            apply_batch(local, decode_batch(encode_batch(batch)))
+        assert replication._tables(local) == []
+        local.close()
+
+    def test_missing_columns_added_to_older_replica(self, pi, tmp_path):
+        peer_dir, _ = pi
+        local = tmp_path / "backup.db"
+        conn = sqlite3.connect(str(local))
+        conn.execute("CREATE TABLE state_history (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL,"
+                     " warmth REAL, clarity REAL, stability REAL, presence REAL, sensors TEXT DEFAULT '{}')")
+        conn.commit()
+        conn.close()
+        pull(local, DirectoryTransport(peer_dir))
+        conn = sqlite3.connect(str(local))
+        assert conn.execute("SELECT light_lux FROM state_history WHERE id = 5").fetchone()[0] == 4.0
+        conn.close()
+
+    def test_rollups_rebuilt_on_replica_not_shipped(self, pi, tmp_path):
+        peer_dir, _ = pi
+        local = tmp_path / "backup.db"
+        applied = pull(local, DirectoryTransport(peer_dir))
+        assert "rollups" not in applied and "rollup_marks" not in applied
+        conn = sqlite3.connect(str(local))
+        n = conn.execute("SELECT SUM(n) FROM rollups WHERE source = 'state_history' "
+                         "AND resolution = 86400 AND field = 'light_lux'").fetchone()[0]
+        conn.close()
+        assert n == 25
+
+    def test_rejects_unknown_format(self):
+        with pytest.raises(ReplicationError):
+            decode_batch(encode_batch({"format": 99}))
+        with pytest.raises(ReplicationError):
+            decode_batch(b"not a batch")
+
+
+class TestPushAndVerify:
+
+    def test_push_sends_only_rows_peer_lacks(self, pi, tmp_path):
+        peer_dir, _ = pi
+        local = tmp_path / "backup.db"
+        transport = DirectoryTransport(peer_dir)
+        pull(local, transport)
+        # Pi loses its newest rows (e.g. restored from an older snapshot)
+        conn = sqlite3.connect(str(peer_dir / "anima.db"))
+        conn.execute("DELETE FROM state_history WHERE id > 20")
+        conn.commit()
+        conn.close()
+        applied = push(local, transport)
+        assert applied == {"state_history": 5}
+        assert _count(peer_dir / "anima.db", "state_history") == 25
+
+    def test_verify_detects_divergence(self, pi, tmp_path):
+        peer_dir, _ = pi
+        local = tmp_path / "backup.db"
+        transport = DirectoryTransport(peer_dir)
+        pull(local, transport)
+        assert all(r["match"] for r in verify(local, transport).values())
+        conn = sqlite3.connect(str(local))
+        conn.execute("UPDATE state_history SET warmth = -1 WHERE id = 3")
+        conn.commit()
+        conn.close()
+        report = verify(local, transport)
+        assert not report["state_history"]["match"]
+        assert report["events"]["match"]
+
+    def test_cli_serve_round_trip(self, pi, tmp_path, capsysbinary):
+        peer_dir, _ = pi
+        assert replication.main(["serve", "marks", "--db", str(peer_dir / "anima.db")]) == 0
+        out = capsysbinary.readouterr().out
+        assert b'"state_history"' in out
+
+    def test_ssh_transport_quotes_remote_arguments(self, monkeypatch):
+        import shlex
+        import subprocess
+        calls = []
+
+        def fake_run(argv, **kwargs):
+            calls.append(argv)
+            return subprocess.CompletedProcess(argv, 0, stdout=b"{}", stderr=b"")
+
+        monkeypatch.setattr(replication.subprocess, "run", fake_run)
+        db_path = "~/backups/my anima;rm -rf x.db"
+        replication.SshTransport("pi", db_path=db_path).call("marks", {"limit": 5})
+        remote = shlex.split(calls[0][-1])
+        assert remote[remote.index("--db") + 1] == db_path
+        assert remote[-1] == '{"limit": 5}'
@@ -221,6 +221,42 @@ class TestRestGalleryImage:
         assert response.body.startswith(b"\x89PNG")
 
 
+@pytest.mark.asyncio
+class TestRestScreenStream:
+    async def test_unauthorized_request_rejected(self, monkeypatch):
+        monkeypatch.setattr(rest_api, "_check_rest_auth", lambda _req: False)
+        response = await rest_api.rest_screen_stream(_make_request(path="/screen/stream"))
+        assert response.status_code == 401
+
+    async def test_rejects_unknown_format_and_bad_fps(self):
+        response = await rest_api.rest_screen_stream(_make_request(path="/screen/stream", query="format=gif"))
+        assert response.status_code == 400
+        response = await rest_api.rest_screen_stream(_make_request(path="/screen/stream", query="fps=fast"))
+        assert response.status_code == 400
+
+    async def test_returns_503_when_viewers_full(self, monkeypatch):
+        from anima_mcp.display import frame_stream
+
+        hub = frame_stream.FrameHub()
+        monkeypatch.setattr(frame_stream, "_hub", hub)
+        monkeypatch.setattr(hub, "has_capacity", lambda: False)
+        response = await rest_api.rest_screen_stream(_make_request(path="/screen/stream"))
+        assert response.status_code == 503
+
+    async def test_streams_multipart(self, monkeypatch):
+        from anima_mcp.display import frame_stream
+        from PIL import Image
+
+        hub = frame_stream.FrameHub()
+        monkeypatch.setattr(frame_stream, "_hub", hub)
+        hub.publish(Image.new("RGB", (8, 8), "red"))
+        response = await rest_api.rest_screen_stream(_make_request(path="/screen/stream", query="format=jpg&fps=2"))
+        assert response.media_type == "multipart/x-mixed-replace; boundary=frame"
+        part = await response.body_iterator.__anext__()
+        assert b"Content-Type: image/jpeg" in part
+        await response.body_iterator.aclose()
+
+
 @pytest.mark.asyncio
 class TestRestGallery:
     async def test_gallery_returns_paginated_drawings(self, monkeypatch, tmp_path):
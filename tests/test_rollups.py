@@ -0,0 +1,193 @@
+"""Tests for the state_history / system_metrics time-series rollups."""
+
+import sqlite3
+import statistics
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from anima_mcp import storage
+from anima_mcp.identity import rollups
+from anima_mcp.identity.store import IdentityStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = IdentityStore(db_path=str(tmp_path / "anima.db"))
+    s._connect()  # Force schema init
+    yield s
+    s.close()
+
+
+def _insert_states(conn, values, start, step_s=60):
+    """Insert state_history rows directly (as another process would)."""
+    for i, warmth in enumerate(values):
+        ts = start + timedelta(seconds=i * step_s)
+        conn.execute(
+            "INSERT INTO state_history (timestamp, warmth, clarity, stability, presence, "
+            "sensors, ts_epoch, pressure_hpa) VALUES (?, ?, 0.5, 0.6, 0.4, '{}', ?, ?)",
+            (ts.isoformat(), warmth, int(ts.timestamp()), 1000.0 + (i % 30)))
+    conn.commit()
+
+
+def _rollup_rows(conn, source, field, resolution):
+    return conn.execute(
+        "SELECT bucket, n, sum, min, max, sumsq FROM rollups "
+        "WHERE source = ? AND field = ? AND resolution = ? ORDER BY bucket",
+        (source, field, resolution)).fetchall()
+
+
+class TestFold:
+
+    def test_aggregates_match_raw_rows(self, store):
+        conn = store._connect()
+        values = [0.1 + (i % 17) * 0.03 for i in range(300)]
+        _insert_states(conn, values, datetime(2026, 3, 1, 10, 0, 0), step_s=30)
+        store.maintain_rollups().result(timeout=10)
+
+        day = _rollup_rows(conn, "state_history", "warmth", rollups.DAY)
+        assert sum(r[1] for r in day) == len(values)
+        assert sum(r[2] for r in day) == pytest.approx(sum(values))
+        assert min(r[3] for r in day) == pytest.approx(min(values))
+        assert max(r[4] for r in day) == pytest.approx(max(values))
+
+        s = rollups.summary(conn, "state_history", "warmth")
+        assert s["n"] == len(values)
+        assert s["mean"] == pytest.approx(statistics.fmean(values))
+        assert s["std"] == pytest.approx(statistics.pstdev(values), abs=1e-6)
+
+    def test_minute_buckets_hold_each_minute(self, store):
+        conn = store._connect()
+        start = (datetime.now() - timedelta(hours=1)).replace(second=0, microsecond=0)
+        _insert_states(conn, [0.2, 0.4, 0.6, 0.8], start, step_s=30)
+        store.maintain_rollups().result(timeout=10)
+
+        minutes = _rollup_rows(conn, "state_history", "warmth", rollups.MINUTE)
+        assert [(r[1], round(r[2], 6)) for r in minutes] == [(2, 0.6), (2, 1.4)]
+
+    def test_each_row_folded_once(self, store):
+        conn = store._connect()
+        _insert_states(conn, [0.5] * 50, datetime(2026, 3, 1, 10, 0, 0))
+        writer = storage.get_writer(store.db_path)
+        for _ in range(5):  # 20 + 20 + 10 + 0 + 0
+            writer.call(lambda c: rollups.fold(c, "state_history", limit=20)).result(timeout=10)
+
+        assert sum(r[1] for r in _rollup_rows(conn, "state_history", "warmth", rollups.DAY)) == 50
+        assert rollups.get_mark(conn, "state_history") == conn.execute(
+            "SELECT MAX(id) FROM state_history").fetchone()[0]
+
+    def test_record_state_folds_continuously(self, store):
+        for i in range(5):
+            store.record_state(0.1 * i, 0.5, 0.5, 0.5, {"light_lux": 100.0 + i})
+        store.flush()
+        conn = store._connect()
+
+        assert rollups.is_current(conn, "state_history")
+        lux = rollups.summary(conn, "state_history", "light_lux")
+        assert lux["n"] == 5
+        assert lux["mean"] == pytest.approx(102.0)
+
+    def test_null_values_not_counted(self, store):
+        conn = store._connect()
+        conn.execute(
+            "INSERT INTO state_history (timestamp, warmth, clarity, stability, presence, sensors, ts_epoch) "
+            "VALUES (?, NULL, 0.5, 0.5, 0.5, '{}', ?)",
+            (datetime.now().isoformat(), int(datetime.now().timestamp())))
+        conn.commit()
+        store.maintain_rollups().result(timeout=10)
+
+        assert _rollup_rows(conn, "state_history", "warmth", rollups.DAY) == []
+        assert len(_rollup_rows(conn, "state_history", "clarity", rollups.DAY)) == 1
+
+
+class TestCurrencyAndPruning:
+
+    def test_is_current_tracks_backlog(self, store):
+        conn = store._connect()
+        assert rollups.is_current(conn, "state_history")  # Empty table
+
+        _insert_states(conn, [0.5] * 3, datetime(2026, 3, 1, 10, 0, 0))
+        assert not rollups.is_current(conn, "state_history")
+
+        store.maintain_rollups().result(timeout=10)
+        assert rollups.is_current(conn, "state_history")
+
+    def test_is_current_false_without_rollups(self, tmp_path):
+        conn = sqlite3.connect(str(tmp_path / "plain.db"))
+        conn.execute("CREATE TABLE state_history (id INTEGER PRIMARY KEY, timestamp TEXT)")
+        assert not rollups.is_current(conn, "state_history")
+
+    def test_prune_drops_only_old_minute_buckets(self, store):
+        conn = store._connect()
+        old = datetime.now() - timedelta(days=10)
+        _insert_states(conn, [0.5] * 3, old)
+        _insert_states(conn, [0.7] * 3, datetime.now() - timedelta(hours=1))
+        store.maintain_rollups().result(timeout=10)
+
+        minutes = _rollup_rows(conn, "state_history", "warmth", rollups.MINUTE)
+        assert {round(r[2] / r[1], 6) for r in minutes} == {0.7}
+        hours = _rollup_rows(conn, "state_history", "warmth", rollups.HOUR)
+        assert sum(r[1] for r in hours) == 6
+
+    def test_resolution_for(self):
+        now = 10 * rollups.DAY
+        assert rollups.resolution_for(90, now - 3600, now=now) == rollups.MINUTE
+        assert rollups.resolution_for(90, now - 30 * rollups.DAY, now=now) == rollups.HOUR
+        assert rollups.resolution_for(2 * rollups.DAY, now=now) == rollups.DAY
+
+
+class TestSystemMetricsRetention:
+
+    def test_pruned_metrics_keep_hourly_aggregates(self, store):
+        conn = store._connect()
+        old = datetime.now() - timedelta(hours=48)
+        for i in range(4):
+            conn.execute(
+                "INSERT INTO system_metrics (timestamp, cpu_temp_c, epoch) VALUES (?, ?, 1)",
+                ((old + timedelta(minutes=i)).isoformat(), 50.0 + i))
+        conn.commit()
+
+        assert store.prune_system_metrics(max_age_hours=24.0) == 4
+        assert conn.execute("SELECT COUNT(*) FROM system_metrics").fetchone()[0] == 0
+        s = rollups.summary(conn, "system_metrics", "cpu_temp_c",
+                            start=(old - timedelta(hours=1)).timestamp())
+        assert s["n"] == 4
+        assert s["mean"] == pytest.approx(51.5)
+        assert (s["min"], s["max"]) == (50.0, 53.0)
+
+    def test_prune_task_queues_without_waiting(self, store, monkeypatch):
+        from types import SimpleNamespace
+        from anima_mcp import ctx_ref, loop_phases
+        conn = store._connect()
+        old = (datetime.now() - timedelta(hours=48)).isoformat()
+        conn.execute("INSERT INTO system_metrics (timestamp, cpu_temp_c, epoch) VALUES (?, 50.0, 1)", (old,))
+        conn.commit()
+
+        futures = []
+        queue = store.queue_system_metrics_prune
+        monkeypatch.setattr(store, "queue_system_metrics_prune",
+                            lambda hours: futures.append(queue(hours)) or futures[-1])
+        monkeypatch.setattr(ctx_ref, "_ctx", SimpleNamespace(store=store))
+        assert loop_phases.prune_system_metrics_task({}) is None
+
+        assert futures[0].result(timeout=10) == 1
+        assert conn.execute("SELECT COUNT(*) FROM system_metrics").fetchone()[0] == 0
+
+
+class TestAnalysisFromRollups:
+
+    def test_temporal_full_matches_raw(self, store):
+        from anima_mcp.data_analysis import analyze_temporal_full
+        conn = store._connect()
+        values = [0.3 + (i % 11) * 0.04 for i in range(400)]
+        _insert_states(conn, values, datetime(2026, 3, 1, 0, 0, 0), step_s=600)
+
+        with patch("anima_mcp.data_analysis._get_db_path", return_value=store.db_path):
+            raw = analyze_temporal_full("warmth")
+            store.maintain_rollups().result(timeout=10)
+            assert rollups.is_current(conn, "state_history")
+            from_rollups = analyze_temporal_full("warmth")
+
+        assert raw is not None
+        assert from_rollups == raw
@@ -367,3 +367,203 @@ class TestConcurrentAccess:
             with patch("anima_mcp.shared_memory.time.sleep"):
                 result = reader.read()
                 assert result is None
+
+
+class TestSeqlockBackend:
+    """Test the mmap + sequence-lock backend."""
+
+    def _payload(self, **overrides):
+        data = {
+            "timestamp": "2026-02-22T10:00:00.123456",
+            "readings": {
+                "timestamp": "2026-02-22T10:00:00.000001",
+                "cpu_temp_c": 55.5, "ambient_temp_c": None, "throttle_bits": 5,
+                "undervoltage_now": False, "light_lux": 120.0,
+            },
+            "anima": {
+                "warmth": 0.4, "clarity": 0.7, "stability": 0.5, "presence": 0.8,
+                "feeling": {"warmth": "comfortable"},
+                "readings": {"cpu_temp_c": 55.5},
+            },
+            "eisv": {"E": 0.1, "I": 0.2, "S": 0.3, "V": 0.4},
+            "metacognition": {"surprise": 0.25, "surprise_sources": ["light"]},
+            "identity": {"name": "Lumen", "awakenings": 3},
+            "wifi_connected": True,
+        }
+        data.update(overrides)
+        return data
+
+    def _clients(self, tmp_path):
+        filepath = tmp_path / "state.json"
+        writer = SharedMemoryClient(mode="write", backend="seqlock", filepath=filepath)
+        reader = SharedMemoryClient(mode="read", backend="seqlock", filepath=filepath)
+        return writer, reader
+
+    def test_backend_selected(self, tmp_path):
+        writer, _ = self._clients(tmp_path)
+        assert writer.backend == "seqlock"
+        assert writer.region_path == tmp_path / "state.seq"
+
+    def test_round_trip(self, tmp_path):
+        writer, reader = self._clients(tmp_path)
+        data = self._payload()
+        assert writer.write(data) is True
+        assert reader.read() == data
+
+    def test_no_json_file_or_fsync(self, tmp_path):
+        writer, _ = self._clients(tmp_path)
+        with patch("anima_mcp.shared_memory.os.fsync") as mock_fsync:
+            writer.write(self._payload())
+        assert not mock_fsync.called
+        assert not (tmp_path / "state.json").exists()
+
+    def test_unexpected_types_survive_via_side_slot(self, tmp_path):
+        """An int in a float field is carried as JSON instead of being coerced."""
+        writer, reader = self._clients(tmp_path)
+        data = self._payload(anima={"warmth": 1, "clarity": "high"})
+        writer.write(data)
+        result = reader.read()
+        assert result == data
+        assert type(result["anima"]["warmth"]) is int
+
+    def test_read_before_write_returns_none(self, tmp_path):
+        _, reader = self._clients(tmp_path)
+        assert reader.read() is None
+
+    def test_unchanged_sequence_skips_decoding(self, tmp_path):
+        writer, reader = self._clients(tmp_path)
+        writer.write(self._payload())
+        first = reader.read()
+        with patch("anima_mcp.shared_memory.json.loads") as mock_loads:
+            assert reader.read() is first
+            assert not mock_loads.called
+
+    def test_side_slot_only_decoded_when_changed(self, tmp_path):
+        writer, reader = self._clients(tmp_path)
+        writer.write(self._payload())
+        reader.read()
+        with patch("anima_mcp.shared_memory.json.loads") as mock_loads:
+            writer.write(self._payload(eisv={"E": 0.9, "I": 0.2, "S": 0.3, "V": 0.4}))
+            assert reader.read()["eisv"]["E"] == 0.9
+            assert not mock_loads.called
+
+        writer.write(self._payload(identity={"name": "Lumen", "awakenings": 4}))
+        assert reader.read()["identity"]["awakenings"] == 4
+
+    def test_write_in_progress_returns_last_snapshot(self, tmp_path):
+        import struct
+        writer, reader = self._clients(tmp_path)
+        writer.write(self._payload())
+        snapshot = reader.read()
+        writer.write(self._payload(wifi_connected=False))
+        # Simulate a writer stuck mid-update (odd sequence)
+        struct.pack_into("<Q", writer._mm, 8, writer._seq + 1)
+        assert reader.read() is snapshot
+
+    def test_clear_marks_region_empty(self, tmp_path):
+        writer, reader = self._clients(tmp_path)
+        writer.write(self._payload())
+        assert reader.read() is not None
+        writer.clear()
+        assert reader.read() is None
+        assert writer.region_path.exists()
+
+    def test_new_writer_continues_sequence(self, tmp_path):
+        writer, reader = self._clients(tmp_path)
+        writer.write(self._payload())
+        reader.read()
+        restarted = SharedMemoryClient(mode="write", backend="seqlock", filepath=tmp_path / "state.json")
+        assert restarted._seq == writer._seq
+        restarted.write(self._payload(wifi_connected=False))
+        assert reader.read()["wifi_connected"] is False
+
+    def test_side_slot_overflow_rejected(self, tmp_path):
+        writer, reader = self._clients(tmp_path)
+        assert writer.write({"blob": "x" * (300 * 1024)}) is False
+        assert reader.read() is None
+
+    def test_read_only_client_cannot_write(self, tmp_path):
+        _, reader = self._clients(tmp_path)
+        with pytest.raises(PermissionError, match="read-only mode"):
+            reader.write({"data": 1})
+
+
+class TestChangeTracking:
+    """Test generation counter and wait_for_update."""
+
+    @pytest.mark.parametrize("backend", ["file", "seqlock"])
+    def test_generation_advances_only_on_publish(self, tmp_path, backend):
+        filepath = tmp_path / "state.json"
+        writer = SharedMemoryClient(mode="write", backend=backend, filepath=filepath)
+        reader = SharedMemoryClient(mode="read", backend=backend, filepath=filepath)
+
+        writer.write({"n": 1.0})
+        gen = reader.generation
+        assert reader.generation == gen
+        reader.read()
+        assert reader.generation == gen
+
+        writer.write({"n": 2.0})
+        assert reader.generation > gen
+
+    def test_file_read_skips_parse_when_unchanged(self, tmp_path):
+        filepath = tmp_path / "state.json"
+        writer = SharedMemoryClient(mode="write", filepath=filepath)
+        reader = SharedMemoryClient(mode="read", filepath=filepath)
+        writer.write({"n": 1})
+        first = reader.read()
+
+        with patch("anima_mcp.shared_memory.json.load") as mock_load:
+            assert reader.read() is first
+            assert not mock_load.called
+
+        writer.write({"n": 2})
+        assert reader.read() == {"n": 2}
+
+    @pytest.mark.parametrize("backend", ["file", "seqlock"])
+    async def test_wait_for_update_wakes_on_write(self, tmp_path, backend):
+        import asyncio
+        filepath = tmp_path / "state.json"
+        writer = SharedMemoryClient(mode="write", backend=backend, filepath=filepath)
+        reader = SharedMemoryClient(mode="read", backend=backend, filepath=filepath)
+        writer.write({"n": 1.0})
+        reader.read()
+
+        async def publish_later():
+            await asyncio.sleep(0.05)
+            writer.write({"n": 2.0})
+
+        task = asyncio.ensure_future(publish_later())
+        assert await reader.wait_for_update(timeout=2.0) is True
+        await task
+        assert reader.read() == {"n": 2.0}
+        reader.close()
+
+    @pytest.mark.parametrize("backend", ["file", "seqlock"])
+    async def test_wait_for_update_times_out(self, tmp_path, backend):
+        filepath = tmp_path / "state.json"
+        writer = SharedMemoryClient(mode="write", backend=backend, filepath=filepath)
+        reader = SharedMemoryClient(mode="read", backend=backend, filepath=filepath)
+        writer.write({"n": 1.0})
+
+        start = time.monotonic()
+        assert await reader.wait_for_update(timeout=0.1) is False
+        assert time.monotonic() - start < 1.0
+        reader.close()
+
+    async def test_wait_for_update_polls_without_inotify(self, tmp_path):
+        import asyncio
+        filepath = tmp_path / "state.json"
+        writer = SharedMemoryClient(mode="write", filepath=filepath)
+        reader = SharedMemoryClient(mode="read", filepath=filepath)
+        writer.write({"n": 1})
+
+        with patch("anima_mcp.shared_memory._InotifyWatcher", side_effect=OSError("no inotify")):
+            async def publish_later():
+                await asyncio.sleep(0.05)
+                writer.write({"n": 2})
+
+            task = asyncio.ensure_future(publish_later())
+            assert await reader.wait_for_update(timeout=2.0) is True
+            await task
+        assert reader._watcher is None
@@ -0,0 +1,135 @@
+"""Tests for storage module — single writer with group commit, pooled readers."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from anima_mcp import storage
+from anima_mcp.storage import StorageWriter
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "anima.db"
+    conn = storage.connect(path)
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT UNIQUE)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _count(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestConnect:
+    def test_pragmas(self, db_path):
+        conn = storage.connect(db_path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        conn.close()
+
+
+class TestStorageWriter:
+    def test_submit_visible_after_flush(self, db_path):
+        writer = storage.get_writer(db_path)
+        for i in range(10):
+            writer.submit("INSERT INTO t (v) VALUES (?)", (f"v{i}",))
+        assert writer.flush()
+        assert _count(db_path) == 10
+
+    def test_group_commit_batches_writes(self, db_path):
+        writer = StorageWriter(db_path, commit_interval_ms=500)
+        writer.submit_many("INSERT INTO t (v) VALUES (?)", [("a",), ("b",)])
+        for i in range(20):
+            writer.submit("INSERT INTO t (v) VALUES (?)", (f"v{i}",))
+        writer.close()
+        assert _count(db_path) == 22
+        assert writer.ops_written == 21
+        assert writer.commits < 21
+
+    def test_failed_op_does_not_discard_batch(self, db_path, capsys):
+        writer = StorageWriter(db_path, commit_interval_ms=500)
+        writer.submit("INSERT INTO t (v) VALUES ('x')")
+        writer.submit("INSERT INTO t (v) VALUES ('x')")  # UNIQUE violation
+        writer.submit("INSERT INTO t (v) VALUES ('y')")
+        writer.close()
+        assert _count(db_path) == 2
+        assert writer.errors == 1
+        assert "[Storage] Write failed" in capsys.readouterr().err
+
+    def test_call_returns_result_and_errors(self, db_path):
+        writer = storage.get_writer(db_path)
+        future = writer.call(lambda conn: conn.execute("INSERT INTO t (v) VALUES ('z')").lastrowid)
+        assert future.result(timeout=5) == 1
+        bad = writer.call(lambda conn: conn.execute("INSERT INTO missing VALUES (1)"))
+        with pytest.raises(sqlite3.OperationalError):
+            bad.result(timeout=5)
+
+    def test_writes_from_many_threads(self, db_path):
+        writer = storage.get_writer(db_path)
+
+        def work(n):
+            for i in range(25):
+                writer.submit("INSERT INTO t (v) VALUES (?)", (f"{n}-{i}",))
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert writer.flush()
+        assert _count(db_path) == 100
+
+    def test_idle_writer_stops_and_restarts(self, db_path):
+        writer = StorageWriter(db_path, idle_timeout=0.05)
+        writer.submit("INSERT INTO t (v) VALUES ('a')")
+        assert writer.flush()
+        thread = writer._thread
+        if thread is not None:
+            thread.join(2)
+        assert writer._thread is None
+        writer.submit("INSERT INTO t (v) VALUES ('b')")
+        assert writer.flush()
+        assert _count(db_path) == 2
+        writer.close()
+
+    def test_closed_writer_rejects(self, db_path):
+        writer = StorageWriter(db_path)
+        writer.close()
+        with pytest.raises(RuntimeError):
+            writer.submit("INSERT INTO t (v) VALUES ('a')")
+
+    def test_shared_per_path(self, db_path):
+        assert storage.get_writer(db_path) is storage.get_writer(str(db_path))
+        assert str(db_path) in storage.get_storage_stats()
+
+    def test_flush_unknown_path_is_noop(self, tmp_path):
+        assert storage.flush(tmp_path / "never.db") is True
+
+
+class TestReadConnection:
+    def test_pooled_per_thread(self, db_path):
+        a = storage.read_connection(db_path)
+        assert storage.read_connection(db_path) is a
+        other = []
+        t = threading.Thread(target=lambda: other.append(storage.read_connection(db_path)))
+        t.start()
+        t.join()
+        assert other[0] is not a
+
+    def test_read_only(self, db_path):
+        conn = storage.read_connection(db_path)
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO t (v) VALUES ('a')")
+
+    def test_missing_database_not_created(self, tmp_path):
+        with pytest.raises(sqlite3.OperationalError):
+            storage.read_connection(tmp_path / "missing.db")
+        assert not (tmp_path / "missing.db").exists()
@@ -66,6 +66,7 @@ class TestRecordSystemMetrics:
         readings = FakeReadings()
         store.record_system_metrics(readings)
 
+        store.flush()
         conn = store._connect()
         rows = conn.execute("SELECT * FROM system_metrics").fetchall()
         assert len(rows) == 1
@@ -74,6 +75,7 @@ class TestRecordSystemMetrics:
         readings = FakeReadings(cpu_temp_c=62.5, memory_percent=80.0)
         store.record_system_metrics(readings)
 
+        store.flush()
         conn = store._connect()
         row = conn.execute("SELECT cpu_temp_c, memory_percent FROM system_metrics").fetchone()
         assert row["cpu_temp_c"] == 62.5
@@ -83,6 +85,7 @@ class TestRecordSystemMetrics:
         readings = FakeReadings(throttled_now=True, undervoltage_now=False)
         store.record_system_metrics(readings)
 
+        store.flush()
         conn = store._connect()
         row = conn.execute("SELECT throttled_now, undervoltage_now FROM system_metrics").fetchone()
         assert row["throttled_now"] == 1
@@ -92,6 +95,7 @@ class TestRecordSystemMetrics:
         readings = FakeReadings(cpu_temp_c=None, pressure_hpa=None, throttled_now=None)
         store.record_system_metrics(readings)
 
+        store.flush()
         conn = store._connect()
         row = conn.execute("SELECT cpu_temp_c, pressure_hpa, throttled_now FROM system_metrics").fetchone()
         assert row["cpu_temp_c"] is None
@@ -102,6 +106,7 @@ class TestRecordSystemMetrics:
         d = {"cpu_temp_c": 50.0, "cpu_percent": 10.0}
         store.record_system_metrics(d)
 
+        store.flush()
         conn = store._connect()
         row = conn.execute("SELECT cpu_temp_c, cpu_percent FROM system_metrics").fetchone()
         assert row["cpu_temp_c"] == 50.0
@@ -111,6 +116,7 @@ class TestRecordSystemMetrics:
         for i in range(5):
             store.record_system_metrics(FakeReadings(cpu_temp_c=50.0 + i))
 
+        store.flush()
         conn = store._connect()
         count = conn.execute("SELECT COUNT(*) FROM system_metrics").fetchone()[0]
         assert count == 5
@@ -121,6 +127,7 @@ class TestGetSystemMetrics:
     def test_returns_recent_rows(self, store):
         for i in range(3):
             store.record_system_metrics(FakeReadings(cpu_temp_c=50.0 + i))
+        store.flush()
 
         rows = store.get_system_metrics(hours=1)
         assert len(rows) == 3
@@ -131,6 +138,7 @@ class TestGetSystemMetrics:
     def test_respects_limit(self, store):
         for i in range(10):
             store.record_system_metrics(FakeReadings(cpu_temp_c=50.0 + i))
+        store.flush()
 
         rows = store.get_system_metrics(hours=1, limit=3)
         assert len(rows) == 3
@@ -147,6 +155,7 @@ class TestGetSystemMetrics:
 
         # Insert a recent row
         store.record_system_metrics(FakeReadings(cpu_temp_c=55.0))
+        store.flush()
 
         rows = store.get_system_metrics(hours=24)
         assert len(rows) == 1
@@ -293,15 +302,18 @@ class TestMemoryPressureProbe:
 
     def test_healthy_with_normal_memory(self, store):
         store.record_system_metrics(FakeReadings(memory_percent=45.0))
+        store.flush()
         probe = self._make_probe(store)
         assert probe() is True
 
     def test_degraded_with_high_memory(self, store):
         store.record_system_metrics(FakeReadings(memory_percent=95.0))
+        store.flush()
         probe = self._make_probe(store)
         assert probe() is False
 
     def test_healthy_at_boundary(self, store):
         store.record_system_metrics(FakeReadings(memory_percent=89.9))
+        store.flush()
         probe = self._make_probe(store)
         assert probe() is True
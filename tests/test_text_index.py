@@ -0,0 +1,84 @@
+"""Tests for the shared tokenizer and BM25 index."""
+
+from anima_mcp.text_index import BM25Index, MinHashIndex, content_words, jaccard, stem, tokenize
+
+
+class TestTokenize:
+
+    def test_stopwords_punctuation_and_short_words_dropped(self):
+        assert tokenize("I think that the light is warm, ok?") == ["think", "light", "warm"]
+
+    def test_inflections_share_a_stem(self):
+        assert stem("lights") == stem("lighting") == stem("light")
+        assert stem("changes") == stem("changed") == stem("change")
+        assert stem("dimmed") == "dim"
+        assert stem("glass") == "glass"
+
+    def test_content_words_is_a_set(self):
+        assert content_words("glowing glow glows") == {"glow"}
+
+
+class TestBM25Index:
+
+    def _index(self):
+        index = BM25Index()
+        index.add("a", "warm light on the desk")
+        index.add("b", "cold dark room, very cold")
+        index.add("c", "the light changes in the evening")
+        return index
+
+    def test_ranks_by_term_weight(self):
+        index = self._index()
+        hits = index.search("cold lighting")
+        assert [d for d, _ in hits][0] == "b"  # tf 2 on the rarer term
+        assert {d for d, _ in hits} == {"a", "b", "c"}
+        assert index.search("nothing matches here") == []
+
+    def test_limit(self):
+        assert len(self._index().search("light", limit=1)) == 1
+
+    def test_remove_and_replace(self):
+        index = self._index()
+        index.remove("a")
+        assert [d for d, _ in index.search("warm desk")] == []
+        index.add("c", "warm desk")
+        assert [d for d, _ in index.search("evening warm")] == ["c"]
+        assert len(index) == 2
+
+    def test_round_trip_and_staleness(self):
+        index = self._index()
+        data = index.to_dict()
+        restored = BM25Index.from_dict(data, expected_ids={"a", "b", "c"})
+        assert restored.search("light") == index.search("light")
+        assert BM25Index.from_dict(data, expected_ids={"a"}) is None
+        assert BM25Index.from_dict({**data, "version": -1}) is None
+        assert BM25Index.from_dict({}) is None
+
+
+class TestMinHashIndex:
+
+    def test_signatures_deterministic(self):
+        tokens = {"warm", "light", "desk"}
+        assert MinHashIndex().signature(tokens) == MinHashIndex().signature(list(tokens))
+        assert MinHashIndex().signature(()) == ()
+
+    def test_near_duplicates_verified_exactly(self):
+        index = MinHashIndex()
+        index.add("a", {"warm", "light", "desk", "morn"})
+        index.add("b", {"cold", "dark", "room", "night"})
+        hits = index.near_duplicates({"warm", "light", "desk", "even"}, 0.35)
+        assert hits == [("a", jaccard({"warm", "light", "desk", "even"}, index.tokens("a")))]
+        assert index.near_duplicates({"music", "sound"}, 0.35) == []
+
+    def test_keys_match_without_overlap(self):
+        index = MinHashIndex()
+        index.add("q", {"what", "connects", "light"}, keys=("stem:what connects",))
+        assert [d for d, _ in index.near_duplicates({"sound"}, 0.6, keys=("stem:what connects",))] == ["q"]
+
+    def test_remove(self):
+        index = MinHashIndex()
+        index.add("a", {"one", "two"}, keys=("k",))
+        index.remove("a")
+        assert len(index) == 0
+        assert index.candidates({"one", "two"}, keys=("k",)) == set()
+        assert index._buckets == {}
@@ -0,0 +1,100 @@
+"""Tests for sensors/throttle.py -- cached throttle/voltage readers."""
+
+import subprocess
+
+from anima_mcp.sensors import throttle
+from anima_mcp.sensors.throttle import (
+    MockThrottleReader, SysfsThrottleReader, ThrottleReader,
+    VcgencmdThrottleReader, get_throttle_reader, parse_throttle_bits,
+)
+
+
+class TestParseBits:
+    def test_flags(self):
+        flags = parse_throttle_bits(0x50005)
+        assert flags["throttle_bits"] == 0x50005
+        assert flags["undervoltage_now"] is True
+        assert flags["throttled_now"] is False
+        assert flags["freq_capped_now"] is True
+        assert flags["undervoltage_occurred"] is True
+
+    def test_zero(self):
+        assert not any(v for k, v in parse_throttle_bits(0).items() if k != "throttle_bits")
+
+
+class TestCaching:
+    def test_ttl_caches_reads(self):
+        reader = MockThrottleReader(bits=0x1, ttl=60.0)
+        assert reader.read()["undervoltage_now"] is True
+        reader.bits = 0
+        assert reader.read()["undervoltage_now"] is True  # still cached
+        assert reader.reads == 1
+        reader.invalidate()
+        assert reader.read()["undervoltage_now"] is False
+        assert reader.reads == 2
+
+    def test_expired_ttl_rereads(self, monkeypatch):
+        clock = [100.0]
+        monkeypatch.setattr(throttle.time, "monotonic", lambda: clock[0])
+        reader = MockThrottleReader(bits=0, ttl=5.0)
+        reader.read()
+        clock[0] += 4.9
+        reader.read()
+        clock[0] += 0.2
+        reader.read()
+        assert reader.reads == 2
+
+    def test_unavailable_returns_empty(self):
+        assert MockThrottleReader(bits=None).read() == {}
+        assert ThrottleReader().read() == {}
+
+
+class TestSysfsReader:
+    def test_reads_hex_without_prefix(self, tmp_path):
+        path = tmp_path / "get_throttled"
+        path.write_text("50005\n")
+        assert SysfsThrottleReader(path).read()["throttle_bits"] == 0x50005
+
+    def test_missing_file_returns_empty(self, tmp_path):
+        assert SysfsThrottleReader(tmp_path / "nope").read() == {}
+
+
+class TestVcgencmdReader:
+    def test_missing_binary_stops_spawning(self, monkeypatch):
+        calls = []
+
+        def fake_run(*args, **kwargs):
+            calls.append(args)
+            raise FileNotFoundError("vcgencmd")
+
+        monkeypatch.setattr(throttle.subprocess, "run", fake_run)
+        reader = VcgencmdThrottleReader(ttl=0.0)
+        assert reader.read() == {}
+        assert reader.read() == {}
+        assert len(calls) == 1
+
+    def test_parses_output(self, monkeypatch):
+        monkeypatch.setattr(
+            throttle.subprocess, "run",
+            lambda *a, **k: subprocess.CompletedProcess(a, 0, stdout="throttled=0x2\n", stderr=""),
+        )
+        assert VcgencmdThrottleReader(ttl=0.0).read()["throttled_now"] is True
+
+
+class TestFactory:
+    def test_prefers_sysfs(self, tmp_path):
+        path = tmp_path / "get_throttled"
+        path.write_text("0\n")
+        reader = get_throttle_reader(sysfs_path=path, vcio_path=tmp_path / "vcio")
+        assert reader.source == "sysfs"
+
+    def test_nothing_available(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(throttle.shutil, "which", lambda name: None)
+        reader = get_throttle_reader(sysfs_path=tmp_path / "a", vcio_path=tmp_path / "b")
+        assert reader.source == "none"
+        assert reader.read() == {}
+
+    def test_vcgencmd_fallback(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(throttle.shutil, "which", lambda name: "/usr/bin/vcgencmd")
+        reader = get_throttle_reader(sysfs_path=tmp_path / "a", vcio_path=tmp_path / "b")
+        assert isinstance(reader, VcgencmdThrottleReader)
@@ -537,6 +537,241 @@ def test_server_bridge_uses_get_identity():
         ctx_ref_mod._ctx = old_cr_ctx
 
 
+# ---------------------------------------------------------------------------
+# Request pipeline against a local stub UNITARES server
+# ---------------------------------------------------------------------------
+
+class StubUnitares:
+    """Minimal MCP-over-HTTP server: /health and /mcp (single or batched tools/call)."""
+
+    def __init__(self, batch=True, delay=0.0, batch_status=None):
+        self.batch = batch
+        self.delay = delay
+        self.batch_status = batch_status  # Transient HTTP error for batched bodies
+        self.posts = []          # Raw JSON bodies, one per HTTP request
+        self.active = 0
+        self.max_active = 0
+
+    def tool_result(self, name, arguments):
+        if name == "process_agent_update":
+            payload = {"action": "proceed", "margin": "comfortable", "reason": "stub",
+                       "resolved_agent_id": "stub-agent"}
+        elif name == "identity":
+            payload = {"display_name": arguments.get("name") or "Visitor"}
+        else:
+            payload = {"success": True}
+        return {"content": [{"type": "text", "text": json.dumps(payload)}]}
+
+    async def handle_mcp(self, request):
+        import asyncio
+        from aiohttp import web
+        body = await request.json()
+        self.posts.append(body)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            if isinstance(body, list):
+                if self.batch_status:
+                    return web.json_response({"error": "try again later"}, status=self.batch_status)
+                if not self.batch:
+                    return web.json_response({"jsonrpc": "2.0", "id": None,
+                                              "error": {"code": -32600, "message": "batch not supported"}},
+                                             status=400)
+                return web.json_response([self._respond(r) for r in body])
+            return web.json_response(self._respond(body))
+        finally:
+            self.active -= 1
+
+    def _respond(self, req):
+        params = req.get("params", {})
+        return {"jsonrpc": "2.0", "id": req.get("id"),
+                "result": self.tool_result(params.get("name"), params.get("arguments", {}))}
+
+    def tools_called(self):
+        names = []
+        for body in self.posts:
+            for req in body if isinstance(body, list) else [body]:
+                names.append(req["params"]["name"])
+        return names
+
+
+@pytest.fixture
+async def stub_unitares():
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    async def health(request):
+        return web.json_response({"status": "ok"})
+
+    async def start(**kwargs):
+        stub = StubUnitares(**kwargs)
+        app = web.Application()
+        app.router.add_get("/mcp/health", health)  # Bridge probes <url>/health
+        app.router.add_post("/mcp", stub.handle_mcp)
+        server = TestServer(app)
+        await server.start_server()
+        servers.append(server)
+        bridge = UnitaresBridge(unitares_url=str(server.make_url("/mcp")), agent_id="agent-123")
+        bridges.append(bridge)
+        return stub, bridge
+
+    servers, bridges = [], []
+    yield start
+    for bridge in bridges:
+        await bridge.close()
+    for server in servers:
+        await server.close()
+
+
+def _stub_identity():
+    identity = MagicMock()
+    identity.born_at = datetime.now()
+    identity.current_awakening_at = None
+    identity.total_awakenings = 2
+    identity.total_alive_seconds = 1200.0
+    identity.alive_ratio.return_value = 0.3
+    identity.age_seconds.return_value = 4000.0
+    identity.name_history = ["Lumen"]
+    identity.name = "Lumen"
+    identity.creature_id = "creature-abcdef"
+    return identity
+
+
+@pytest.mark.asyncio
+async def test_concurrent_check_ins_coalesce(stub_unitares):
+    import asyncio
+    stub, bridge = await stub_unitares(delay=0.05)
+    anima, readings = create_test_anima(), create_test_readings()
+
+    first, second = await asyncio.gather(
+        bridge.check_in(anima, readings), bridge.check_in(anima, readings)
+    )
+
+    assert first is second
+    assert first["source"] == "unitares"
+    assert stub.tools_called() == ["process_agent_update"]
+    assert bridge.get_stats()["endpoints"]["process_agent_update"]["coalesced"] == 1
+    assert bridge.get_stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_check_ins_with_different_state_both_sent(stub_unitares):
+    import asyncio
+    stub, bridge = await stub_unitares(delay=0.05)
+    readings = create_test_readings()
+    calm, agitated = create_test_anima(), create_test_anima()
+    agitated.stability = 0.2
+
+    await asyncio.gather(bridge.check_in(calm, readings), bridge.check_in(agitated, readings))
+
+    assert stub.tools_called() == ["process_agent_update"] * 2
+    sent = sorted(body["params"]["arguments"]["sensor_data"]["anima"]["stability"] for body in stub.posts)
+    assert sent == [0.2, 0.8]
+    assert bridge.get_stats()["endpoints"]["process_agent_update"]["coalesced"] == 0
+
+
+@pytest.mark.asyncio
+async def test_first_check_in_never_coalesced(stub_unitares):
+    import asyncio
+    stub, bridge = await stub_unitares(delay=0.05)
+    anima, readings = create_test_anima(), create_test_readings()
+    identity = _stub_identity()
+
+    await asyncio.gather(
+        bridge.check_in(anima, readings),
+        bridge.check_in(anima, readings, identity=identity, is_first_check_in=True),
+    )
+
+    assert "update_agent_metadata" in stub.tools_called()
+    assert stub.tools_called().count("process_agent_update") == 2
+
+
+@pytest.mark.asyncio
+async def test_first_check_in_batches_identity_sync(stub_unitares):
+    stub, bridge = await stub_unitares()
+    identity = _stub_identity()
+
+    decision = await bridge.check_in(create_test_anima(), create_test_readings(),
+                                     identity=identity, is_first_check_in=True)
+
+    assert decision["source"] == "unitares"
+    assert len(stub.posts) == 1
+    assert [r["params"]["name"] for r in stub.posts[0]] == ["update_agent_metadata", "process_agent_update"]
+    assert bridge._batch_supported is True
+
+
+@pytest.mark.asyncio
+async def test_batch_falls_back_to_single_calls(stub_unitares):
+    stub, bridge = await stub_unitares(batch=False)
+
+    results = await bridge.call_tools([
+        {"name": "identity", "arguments": {"name": "a"}},
+        {"name": "identity", "arguments": {"name": "b"}},
+    ])
+
+    names = [json.loads(r["result"]["content"][0]["text"])["display_name"] for r in results]
+    assert names == ["a", "b"]
+    assert bridge._batch_supported is False
+    assert len(stub.posts) == 3  # rejected batch + two singles
+
+    await bridge.call_tools([{"name": "identity", "arguments": {}}] * 2)
+    assert len(stub.posts) == 5  # batch not retried
+
+
+@pytest.mark.asyncio
+async def test_transient_batch_error_keeps_batching_enabled(stub_unitares):
+    stub, bridge = await stub_unitares(batch_status=429)
+
+    results = await bridge.call_tools([
+        {"name": "identity", "arguments": {"name": "a"}},
+        {"name": "identity", "arguments": {"name": "b"}},
+    ])
+
+    names = [json.loads(r["result"]["content"][0]["text"])["display_name"] for r in results]
+    assert names == ["a", "b"]
+    assert bridge._batch_supported is not False
+    assert len(stub.posts) == 3  # failed batch + two singles
+
+    stub.batch_status = None
+    await bridge.call_tools([{"name": "identity", "arguments": {}}] * 2)
+    assert len(stub.posts) == 4  # batch retried and accepted
+    assert isinstance(stub.posts[-1], list)
+    assert bridge._batch_supported is True
+
+
+@pytest.mark.asyncio
+async def test_requests_pipelined_with_bounded_concurrency(stub_unitares):
+    import asyncio
+    from anima_mcp.unitares_bridge import MAX_CONCURRENT_REQUESTS
+    stub, bridge = await stub_unitares(delay=0.05)
+
+    results = await asyncio.gather(*(bridge.report_outcome(f"event_{i}") for i in range(8)))
+
+    assert all(results)
+    assert len(stub.posts) == 8
+    assert 1 < stub.max_active <= MAX_CONCURRENT_REQUESTS
+    stats = bridge.get_stats()["endpoints"]["outcome_event"]
+    assert stats["requests"] == 8 and stats["errors"] == 0
+    assert stats["p95_ms"] >= 50
+
+
+@pytest.mark.asyncio
+async def test_identity_lookups_coalesce_per_session(stub_unitares):
+    import asyncio
+    stub, bridge = await stub_unitares(delay=0.05)
+
+    names = await asyncio.gather(
+        bridge.resolve_caller_identity("sess-a"),
+        bridge.resolve_caller_identity("sess-a"),
+        bridge.resolve_caller_identity("sess-b"),
+    )
+
+    assert names == ["Visitor", "Visitor", "Visitor"]
+    assert len(stub.posts) == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 